@@ -13,15 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import os
 import re
 import time
+import traceback
 
 import jinja2
 import jinja2.meta
 import jsonschema
 
 from rally.common.i18n import _, _LI
+from rally.common.io import json_stream
 from rally.common import logging
 from rally.common import objects
 from rally import consts
@@ -149,6 +152,9 @@ class Deployment(object):
 class Task(object):
 
     TASK_RESULT_SCHEMA = objects.task.TASK_RESULT_SCHEMA
+    # NOTE: columns of task results that summarize the workloads
+    TASK_RESULT_SUMMARY = (("kw_hash",)
+                           + objects.task.ResultAggregator.COLUMNS)
 
     @staticmethod
     def list(**filters):
@@ -158,6 +164,16 @@ class Task(object):
     def get(task_id):
         return objects.Task.get(task_id)
 
+    @staticmethod
+    def get_summary(task_id):
+        """Get status of the task and the summary of its results.
+
+        :param task_id: str task UUID
+        :returns: dict with status, SLA results of each workload, total
+                  iterations, failures and durations of the task
+        """
+        return objects.Task.get_summary(task_id)
+
     @staticmethod
     def get_detailed(task_id, extended_results=False):
         """Get detailed task data.
@@ -168,10 +184,14 @@ class Task(object):
         :returns: rally.common.db.sqlalchemy.models.Task
         :returns: dict
         """
-        task = objects.Task.get_detailed(task_id)
+        # NOTE: extended results have aggregates of the iterations,
+        #       so the iterations are loaded lazily
+        task = objects.Task.get_detailed(
+            task_id, load_iterations=not extended_results)
         if task and extended_results:
             task = dict(task)
-            task["results"] = objects.Task.extend_results(task["results"])
+            task["results"] = objects.Task.extend_results(
+                task["results"], iterations_loaded=False)
         return task
 
     @classmethod
@@ -287,7 +307,8 @@ class Task(object):
         benchmark_engine.validate()
 
     @classmethod
-    def start(cls, deployment, config, task=None, abort_on_sla_failure=False):
+    def start(cls, deployment, config, task=None, abort_on_sla_failure=False,
+              cleanup_between_workloads=True):
         """Start a task.
 
         Task is a list of benchmarks that will be called one by one, results of
@@ -298,6 +319,10 @@ class Task(object):
         :param task: Task object. If None, it will be created
         :param abort_on_sla_failure: If set to True, the task execution will
                                      stop when any SLA check for it fails
+        :param cleanup_between_workloads: If set to False, resources created
+                                          by workloads which share the
+                                          context are cleaned up only after
+                                          the last of these workloads
         """
         deployment = objects.Deployment.get(deployment)
         task = task or objects.Task(deployment_uuid=deployment["uuid"])
@@ -310,7 +335,8 @@ class Task(object):
                                                          deployment["uuid"]))
         benchmark_engine = engine.TaskEngine(
             config, task, admin=deployment["admin"], users=deployment["users"],
-            abort_on_sla_failure=abort_on_sla_failure)
+            abort_on_sla_failure=abort_on_sla_failure,
+            cleanup_between_workloads=cleanup_between_workloads)
 
         try:
             benchmark_engine.run()
@@ -353,6 +379,79 @@ class Task(object):
             while objects.Task.get_status(task_uuid) not in finished_stages:
                 time.sleep(1)
 
+    @classmethod
+    def load_results(cls, path):
+        """Load task results from the task results JSON file.
+
+        The file is parsed by streaming: results are validated and
+        aggregated in a single pass, and iterations are not kept in memory
+        but read from the file again each time they are iterated over.
+
+        :param path: path to the task results JSON file
+        :raises jsonschema.ValidationError: if a task result is invalid
+        :returns: list of task results with aggregates of iterations
+        """
+        # NOTE: the validator is created once, because jsonschema.validate()
+        #       checks the schema itself each time it is called
+        itr_validator = jsonschema.validators.validator_for(
+            cls.TASK_RESULT_SCHEMA)(
+                cls.TASK_RESULT_SCHEMA["properties"]["result"]["items"])
+        results = []
+        with open(path, "rb") as f:
+            reader = json_stream.JSONStreamReader(f)
+            for idx in reader.iter_array():
+                result = {}
+                first_iterations = []
+                aggregator = objects.task.ResultAggregator()
+                for key in reader.iter_object():
+                    if key != "result":
+                        result[key] = reader.read_value()
+                        continue
+                    result[key] = json_stream.FileArray(path, reader.tell())
+                    for itr_idx in reader.iter_array():
+                        itr = reader.read_value()
+                        itr_validator.validate(itr)
+                        aggregator.add_iteration(itr)
+                        if not first_iterations:
+                            first_iterations.append(itr)
+                # NOTE: the iterations are already validated, so only the
+                #       first one is left to check the rest of the result
+                jsonschema.validate(dict(result, result=first_iterations),
+                                    cls.TASK_RESULT_SCHEMA)
+                result.update(aggregator.aggregates(result))
+                results.append(result)
+        return results
+
+    @classmethod
+    def import_results(cls, deployment, task_results, tag=None):
+        """Import task results into the database as a new task.
+
+        Iterations of each task result are stored by chunks as they are
+        read, so they can be loaded lazily from the source.
+
+        :param deployment: UUID or name of the deployment
+        :param task_results: iterable of task results in the format of
+                             task results JSON file
+        :param tag: tag for the task
+        :returns: Task object
+        """
+        deployment_uuid = objects.Deployment.get(deployment)["uuid"]
+        task = objects.Task(deployment_uuid=deployment_uuid, tag=tag)
+        task.update_status(consts.TaskStatus.RUNNING)
+        try:
+            for result in task_results:
+                task.append_results(result["key"], {
+                    "raw": result["result"],
+                    "sla": result["sla"],
+                    "load_duration": result["load_duration"],
+                    "full_duration": result["full_duration"]})
+        except Exception as e:
+            task.set_failed(type(e).__name__, str(e),
+                            json.dumps(traceback.format_exc()))
+            raise
+        task.update_status(consts.TaskStatus.FINISHED)
+        return task
+
     @classmethod
     def delete(cls, task_uuid, force=False):
         """Delete the task.
@@ -33,6 +33,7 @@ from rally.cli import cliutils
 from rally.cli import envutils
 from rally.common import fileutils
 from rally.common.i18n import _
+from rally.common.io import json_stream
 from rally.common import junit
 from rally.common import logging
 from rally.common import utils as rutils
@@ -206,10 +207,16 @@ class TaskCommands(object):
                    dest="abort_on_sla_failure",
                    help="Abort the execution of a benchmark scenario when"
                         "any SLA check for it fails.")
+    @cliutils.args("--no-cleanup-between-workloads", action="store_false",
+                   dest="cleanup_between_workloads",
+                   help="Don't clean up resources created by scenarios "
+                        "between workloads which share the same context, "
+                        "clean them up after the last of these workloads.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     @plugins.ensure_plugins_are_loaded
     def start(self, task, deployment=None, task_args=None, task_args_file=None,
-              tag=None, do_use=False, abort_on_sla_failure=False):
+              tag=None, do_use=False, abort_on_sla_failure=False,
+              cleanup_between_workloads=True):
         """Start benchmark task.
 
         If both task_args and task_args_file are specified, they will
@@ -231,6 +238,10 @@ class TaskCommands(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param cleanup_between_workloads: if False, resources created by
+                                          workloads which share the context
+                                          are cleaned up only after the last
+                                          of these workloads
         """
 
         task_instance = api.Task.create(deployment, tag)
@@ -252,7 +263,8 @@ class TaskCommands(object):
                 self.use(task_instance["uuid"])
 
             api.Task.start(deployment, input_task, task=task_instance,
-                           abort_on_sla_failure=abort_on_sla_failure)
+                           abort_on_sla_failure=abort_on_sla_failure,
+                           cleanup_between_workloads=cleanup_between_workloads)
             self.detailed(task_id=task_instance["uuid"])
 
         except (exceptions.InvalidTaskException, FailedToLoadTask) as e:
@@ -293,9 +305,16 @@ class TaskCommands(object):
         Returns current status of task
         """
 
-        task = api.Task.get(task_id)
+        task = api.Task.get_summary(task_id)
         print(_("Task %(task_id)s: %(status)s")
               % {"task_id": task_id, "status": task["status"]})
+        if task["status"] in (consts.TaskStatus.FINISHED,
+                              consts.TaskStatus.ABORTED):
+            print(_("Iterations: %(iterations)d, failed: %(failed)d, "
+                    "SLA: %(sla)s")
+                  % {"iterations": task["iterations_count"],
+                     "failed": task["failed_iterations_count"],
+                     "sla": task["pass_sla"] and "PASS" or "FAIL"})
 
     @cliutils.args("--uuid", type=str, dest="task_id",
                    help=("UUID of task. If --uuid is \"last\" the results of "
@@ -469,13 +488,17 @@ class TaskCommands(object):
                     "of %s.") % (task["status"], ", ".join(finished_statuses)))
             return 1
 
-        results = [{"key": x["key"], "result": x["data"]["raw"],
+        # NOTE: iterations are loaded and written by chunks, so the
+        #       results are never kept in memory as a whole
+        results = [{"key": x["key"],
+                    "result": task.iter_result_iterations(x),
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
                     "full_duration": x["data"]["full_duration"]}
-                   for x in task.get_results()]
+                   for x in task.get_results(load_iterations=False)]
 
-        print(json.dumps(results, sort_keys=True, indent=4))
+        json_stream.dump(results, sys.stdout, sort_keys=True, indent=4)
+        print()
 
     @cliutils.args("--deployment", dest="deployment", type=str,
                    metavar="<uuid>", required=False,
@@ -550,6 +573,9 @@ class TaskCommands(object):
                    help="Open the output in a browser.")
     @cliutils.args("--tasks", dest="tasks", nargs="+",
                    help="UUIDs of tasks, or JSON files with task results")
+    @cliutils.args("--workers", dest="workers", type=int, default=None,
+                   help="Number of processes to process workloads in. "
+                        "By default workloads are processed one by one.")
     @cliutils.suppress_warnings
     def trends(self, *args, **kwargs):
         """Generate workloads trends HTML report."""
@@ -563,27 +589,17 @@ class TaskCommands(object):
         results = []
         for task_id in tasks:
             if os.path.exists(os.path.expanduser(task_id)):
-                with open(os.path.expanduser(task_id), "r") as inp_js:
-                    task_results = json.load(inp_js)
-                    for result in task_results:
-                        try:
-                            jsonschema.validate(
-                                result,
-                                api.Task.TASK_RESULT_SCHEMA)
-                        except jsonschema.ValidationError as e:
-                            print(_("ERROR: Invalid task result format in %s")
-                                  % task_id, file=sys.stderr)
-                            print(six.text_type(e), file=sys.stderr)
-                            return 1
+                try:
+                    task_results = api.Task.load_results(
+                        os.path.expanduser(task_id))
+                except jsonschema.ValidationError as e:
+                    print(_("ERROR: Invalid task result format in %s")
+                          % task_id, file=sys.stderr)
+                    print(six.text_type(e), file=sys.stderr)
+                    return 1
 
             elif uuidutils.is_uuid_like(task_id):
-                task_results = map(
-                    lambda x: {"key": x["key"],
-                               "sla": x["data"]["sla"],
-                               "result": x["data"]["raw"],
-                               "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
-                    api.Task.get(task_id).get_results())
+                task_results = self._load_task_results(task_id)
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s")
                       % task_id, file=sys.stderr)
@@ -591,7 +607,7 @@ class TaskCommands(object):
 
             results.extend(task_results)
 
-        result = plot.trends(results)
+        result = plot.trends(results, workers=kwargs.get("workers"))
 
         out = kwargs.get("out")
         if out:
@@ -604,6 +620,87 @@ class TaskCommands(object):
         else:
             print(result)
 
+    @cliutils.args("--base", dest="base", type=str, required=True,
+                   help="UUID of the base task, or JSON file with its "
+                        "results")
+    @cliutils.args("--new", dest="new", type=str, required=True,
+                   help="UUID of the task to compare with the base one, or "
+                        "JSON file with its results")
+    @cliutils.args("--alpha", dest="alpha", type=float, default=0.05,
+                   help="Significance level, differences with greater "
+                        "p-value are ignored.")
+    @cliutils.args("--threshold", dest="threshold", type=float, default=10.0,
+                   help="Minimal difference of medians in percents, "
+                        "smaller differences are ignored.")
+    @cliutils.args("--json", dest="tojson", action="store_true",
+                   help="Output in JSON format.")
+    @cliutils.args("--workers", dest="workers", type=int, default=None,
+                   help="Number of processes to process workloads in. "
+                        "By default workloads are processed one by one.")
+    @cliutils.suppress_warnings
+    def compare(self, base, new, alpha=0.05, threshold=10.0, tojson=False,
+                workers=None):
+        """Compare durations of workloads of two tasks.
+
+        Workloads with the same input configuration are matched, and the
+        durations of their atomic actions are compared by medians and by
+        the Mann-Whitney U test. Significantly slower actions of the new
+        task are regressions.
+
+        :param base: UUID of the base task or path to file with its results
+        :param new: UUID of the new task or path to file with its results
+        :param alpha: float, significance level
+        :param threshold: float, minimal difference of medians in percents
+        :param tojson: bool, whether to output in JSON format
+        :param workers: int, number of processes to process workloads in
+        :returns: Number of regressions
+        """
+        results = []
+        for task_file_or_uuid in (base, new):
+            if os.path.exists(os.path.expanduser(task_file_or_uuid)):
+                try:
+                    results.append(api.Task.load_results(
+                        os.path.expanduser(task_file_or_uuid)))
+                except jsonschema.ValidationError as e:
+                    print(_("ERROR: Invalid task result format in %s")
+                          % task_file_or_uuid, file=sys.stderr)
+                    print(six.text_type(e), file=sys.stderr)
+                    return 1
+            elif uuidutils.is_uuid_like(task_file_or_uuid):
+                results.append(self._load_task_results(task_file_or_uuid))
+            else:
+                print(_("ERROR: Invalid UUID or file name passed: %s")
+                      % task_file_or_uuid, file=sys.stderr)
+                return 1
+
+        data = plot.compare(results[0], results[1], alpha=alpha,
+                            threshold=threshold / 100.0, workers=workers)
+        regressions = sum(w["regressions"] for w in data)
+        if tojson:
+            print(json.dumps(data, sort_keys=True, indent=4))
+            return regressions
+
+        cols = ["Action", "Base median (sec)", "New median (sec)",
+                "Delta (%)", "p-value", "Status"]
+        float_cols = cols[1:5]
+        formatters = dict(zip(float_cols,
+                              [cliutils.pretty_float_formatter(col, 3)
+                               for col in float_cols]))
+        for workload in data:
+            print(cliutils.make_header(workload["name"]))
+            if not workload["matched"]:
+                print(_("Workload is missing in one of the tasks.\n"))
+                continue
+            rows = [dict(zip(cols, (a["name"], a["base"], a["new"],
+                                    a["delta_percent"], a["p_value"],
+                                    a["status"])))
+                    for a in workload["actions"]]
+            cliutils.print_list(rows, fields=cols, formatters=formatters,
+                                sortby_index=None, out=sys.stdout)
+            print()
+        print(_("Regressions found: %d") % regressions)
+        return regressions
+
     @cliutils.args("--tasks", dest="tasks", nargs="+",
                    help="UUIDs of tasks, or JSON files with task results")
     @cliutils.args("--out", metavar="<path>",
@@ -622,9 +719,13 @@ class TaskCommands(object):
     @cliutils.args("--junit", dest="out_format",
                    action="store_const", const="junit",
                    help="Generate the report in the JUnit format.")
+    @cliutils.args("--workers", dest="workers", type=int, default=None,
+                   help="Number of processes to process workloads in. "
+                        "By default workloads are processed one by one.")
     @envutils.default_from_global("tasks", envutils.ENV_TASK, "tasks")
     @cliutils.suppress_warnings
-    def report(self, tasks=None, out=None, open_it=False, out_format="html"):
+    def report(self, tasks=None, out=None, open_it=False, out_format="html",
+               workers=None):
         """Generate report file for specified task.
 
         :param task_id: UUID, task identifier
@@ -632,6 +733,7 @@ class TaskCommands(object):
         :param out: str, output file name
         :param open_it: bool, whether to open output file in web browser
         :param out_format: output format (junit, html or html_static)
+        :param workers: int, number of processes to process workloads in
         """
 
         tasks = isinstance(tasks, list) and tasks or [tasks]
@@ -641,28 +743,18 @@ class TaskCommands(object):
         processed_names = {}
         for task_file_or_uuid in tasks:
             if os.path.exists(os.path.expanduser(task_file_or_uuid)):
-                with open(os.path.expanduser(task_file_or_uuid),
-                          "r") as inp_js:
-                    tasks_results = json.load(inp_js)
-                    for result in tasks_results:
-                        try:
-                            jsonschema.validate(
-                                result,
-                                api.Task.TASK_RESULT_SCHEMA)
-                        except jsonschema.ValidationError as e:
-                            print(_("ERROR: Invalid task result format in %s")
-                                  % task_file_or_uuid, file=sys.stderr)
-                            print(six.text_type(e), file=sys.stderr)
-                            return 1
+                # NOTE: iterations are read from the file lazily
+                try:
+                    tasks_results = api.Task.load_results(
+                        os.path.expanduser(task_file_or_uuid))
+                except jsonschema.ValidationError as e:
+                    print(_("ERROR: Invalid task result format in %s")
+                          % task_file_or_uuid, file=sys.stderr)
+                    print(six.text_type(e), file=sys.stderr)
+                    return 1
 
             elif uuidutils.is_uuid_like(task_file_or_uuid):
-                tasks_results = map(
-                    lambda x: {"key": x["key"],
-                               "sla": x["data"]["sla"],
-                               "result": x["data"]["raw"],
-                               "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
-                    api.Task.get(task_file_or_uuid).get_results())
+                tasks_results = self._load_task_results(task_file_or_uuid)
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
                         ) % task_file_or_uuid,
@@ -679,8 +771,20 @@ class TaskCommands(object):
                 results.append(task_result)
 
         if out_format.startswith("html"):
-            result = plot.plot(results,
-                               include_libs=(out_format == "html_static"))
+            include_libs = out_format == "html_static"
+            if out:
+                # NOTE: the report is written by chunks, so it is never
+                #       kept in memory as a whole
+                output_file = os.path.expanduser(out)
+                with open(output_file, "w+") as f:
+                    plot.plot_to_file(results, f, include_libs=include_libs,
+                                      workers=workers)
+                if open_it:
+                    webbrowser.open_new_tab(
+                        "file://" + os.path.realpath(out))
+                return
+            result = plot.plot(results, include_libs=include_libs,
+                               workers=workers)
         elif out_format == "junit":
             test_suite = junit.JUnit("Rally test suite")
             for result in results:
@@ -746,19 +850,18 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        results = api.Task.get(task_id).get_results()
+        summary = api.Task.get_summary(task_id)
         failed_criteria = 0
         data = []
         STATUS_PASS = "PASS"
         STATUS_FAIL = "FAIL"
-        for result in results:
-            key = result["key"]
-            for sla in sorted(result["data"]["sla"],
+        for workload in summary["sla_results"]["workloads"]:
+            for sla in sorted(workload["sla"],
                               key=lambda x: x["criterion"]):
                 success = sla.pop("success")
                 sla["status"] = success and STATUS_PASS or STATUS_FAIL
-                sla["benchmark"] = key["name"]
-                sla["pos"] = key["pos"]
+                sla["benchmark"] = workload["name"]
+                sla["pos"] = workload["pos"]
                 failed_criteria += int(not success)
                 data.append(sla if tojson else rutils.Struct(**sla))
         if tojson:
@@ -827,6 +930,77 @@ class TaskCommands(object):
                     "name": parsed_obj.scheme
         })
 
+    @cliutils.args("--connection", dest="connection_string", type=str,
+                   required=True,
+                   help="Connection url to the task export system to import "
+                        "task results from.")
+    @cliutils.args("--deployment", dest="deployment", type=str,
+                   metavar="<uuid>", required=False,
+                   help="UUID or name of a deployment.")
+    @cliutils.args("--tag", help="Tag for the imported task")
+    @cliutils.args("--no-use", action="store_false", dest="do_use",
+                   help="Don't set new task as default for future operations.")
+    @cliutils.alias("import")
+    @envutils.with_default_deployment(cli_arg_name="deployment")
+    @plugins.ensure_plugins_are_loaded
+    def import_results(self, connection_string, deployment=None, tag=None,
+                       do_use=False):
+        """Import task results exported to the custom task's exporting system.
+
+        :param connection_string: string used to connect to the system
+        :param deployment: UUID or name of the deployment
+        :param tag: optional tag for the imported task
+        :param do_use: if True, the new task will be stored as the default one
+                       for future operations
+        """
+
+        parsed_obj = urlparse.urlparse(connection_string)
+        try:
+            client = exporter.TaskExporter.get(parsed_obj.scheme)(
+                connection_string)
+        except (exceptions.InvalidConnectionString,
+                exceptions.PluginNotFound) as e:
+            if logging.is_debug():
+                LOG.exception(e)
+            print (e)
+            return 1
+
+        try:
+            task = api.Task.import_results(deployment, client.load(), tag=tag)
+        except (IOError, ValueError, exceptions.RallyException) as e:
+            if logging.is_debug():
+                LOG.exception(e)
+            print (e)
+            return 1
+        print(_("Task %(uuid)s results were successfully imported from "
+                "%(connection)s using %(name)s plugin.") % {
+                    "uuid": task["uuid"],
+                    "connection": connection_string,
+                    "name": parsed_obj.scheme
+        })
+        if do_use:
+            self.use(task["uuid"])
+
+    @staticmethod
+    def _load_task_results(task_id):
+        """Load task results in the format of task results JSON file.
+
+        Iterations are not loaded here but given by lazy iterators, and the
+        summaries of the workloads stored in the DB are added to results.
+
+        :param task_id: UUID, task identifier
+        :returns: list of task results
+        """
+        task = api.Task.get(task_id)
+        return [dict(((k, x[k]) for k in api.Task.TASK_RESULT_SUMMARY
+                      if k in x),
+                     key=x["key"],
+                     sla=x["data"]["sla"],
+                     result=task.iter_result_iterations(x),
+                     load_duration=x["data"]["load_duration"],
+                     full_duration=x["data"]["full_duration"])
+                for x in task.get_results_summaries()]
+
     @staticmethod
     def _print_task_errors(task_id, task_errors):
         print(cliutils.make_header("Task %s has %d error(s)" %
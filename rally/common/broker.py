@@ -84,3 +84,36 @@ def run(publish, consume, consumers_count=1):
 
     for consumer in consumers:
         consumer.join()
+
+
+def run_concurrently(func, args_list, workers=1):
+    """Call func with each of the given arguments in several threads.
+
+    Unlike run(), errors are not swallowed: when all the calls are finished,
+    the error of the first failed call (in order of args_list) is raised.
+
+    :param func: Function to call
+    :param args_list: List of tuples with positional arguments of func
+    :param workers: Number of threads
+    :returns: List of values returned by func in order of args_list
+    """
+    args_list = list(args_list)
+    results = [None] * len(args_list)
+    errors = []
+
+    def publish(queue):
+        queue.extend(enumerate(args_list))
+
+    def consume(cache, item):
+        idx, args = item
+        try:
+            results[idx] = func(*args)
+        except Exception as e:
+            if logging.is_debug():
+                LOG.exception(e)
+            errors.append((idx, e))
+
+    run(publish, consume, max(min(workers, len(args_list)), 1))
+    if errors:
+        raise min(errors, key=lambda error: error[0])[1]
+    return results
@@ -155,18 +155,36 @@ def task_get_status(uuid):
     return get_impl().task_get_status(uuid)
 
 
-def task_get_detailed_last():
-    """Returns the most recently created task."""
-    return get_impl().task_get_detailed_last()
+def task_get_summary(uuid):
+    """Returns status and summary of the task results by uuid.
 
+    :param uuid: UUID of the task.
+    :raises TaskNotFound: if the task does not exist.
+    :returns: dict with uuid, status and summary columns of the task.
+              Summary columns are None if the summary is not stored yet.
+    """
+    return get_impl().task_get_summary(uuid)
 
-def task_get_detailed(uuid):
+
+def task_get_detailed_last(load_iterations=True):
+    """Returns the most recently created task.
+
+    :param load_iterations: whether to merge iterations stored in chunks
+                            into the task results.
+    """
+    return get_impl().task_get_detailed_last(load_iterations)
+
+
+def task_get_detailed(uuid, load_iterations=True):
     """Returns task with results by uuid.
 
     :param uuid: UUID of the task.
+    :param load_iterations: whether to merge iterations stored in chunks
+                            into the task results. If False, only the
+                            aggregates of the iterations are available.
     :returns: task dict with data on the task and its results.
     """
-    return get_impl().task_get_detailed(uuid)
+    return get_impl().task_get_detailed(uuid, load_iterations)
 
 
 def task_create(values):
@@ -211,7 +229,9 @@ def task_list(status=None, deployment=None):
     :param deployment: deployment UUID to filter the returned list on.
                       if set to None tasks from all deployments well be
                       returned.
-    :returns: A list of dicts with data on the tasks.
+    :returns: A list of dicts with data on the tasks, their deployment
+              names and summaries of their results. Large columns (like
+              the verification log) are not included.
     """
     return get_impl().task_list(status=status, deployment=deployment)
 
@@ -231,24 +251,64 @@ def task_delete(uuid, status=None):
     return get_impl().task_delete(uuid, status=status)
 
 
-def task_result_get_all_by_uuid(task_uuid):
+def task_result_get_all_by_uuid(task_uuid, load_iterations=True):
     """Get list of task results.
 
     :param task_uuid: string with UUID of Task instance.
+    :param load_iterations: whether to merge iterations stored in chunks
+                            into the task results.
     :returns: list instances of TaskResult.
     """
-    return get_impl().task_result_get_all_by_uuid(task_uuid)
+    return get_impl().task_result_get_all_by_uuid(task_uuid, load_iterations)
 
 
-def task_result_create(task_uuid, key, data):
+def task_result_create(task_uuid, key, data, kw_hash=None):
     """Append result record to task.
 
     :param task_uuid: string with UUID of Task instance.
     :param key: key expected to update in task result.
     :param data: data expected to update in task result.
+    :param kw_hash: string with hash of the workload config.
     :returns: TaskResult instance appended.
     """
-    return get_impl().task_result_create(task_uuid, key, data)
+    return get_impl().task_result_create(task_uuid, key, data, kw_hash)
+
+
+def task_result_update(result_id, values):
+    """Update the task result.
+
+    :param result_id: int id of TaskResult instance.
+    :param values: dict with record values (data and aggregates of the
+                   iterations), iterations stored in chunks are kept.
+    :returns: TaskResult instance updated.
+    """
+    return get_impl().task_result_update(result_id, values)
+
+
+def task_result_chunk_create(result_id, chunk_order, iterations):
+    """Append chunk of iterations to the task result.
+
+    Iterations of the chunks are merged into data["raw"] of the task result
+    when it is loaded.
+
+    :param result_id: int id of TaskResult instance.
+    :param chunk_order: int number of the chunk in the task result.
+    :param iterations: list of iterations sorted by timestamp.
+    :returns: TaskResultChunk instance appended.
+    """
+    return get_impl().task_result_chunk_create(result_id, chunk_order,
+                                               iterations)
+
+
+def task_result_chunk_get_all(result_id, offset=0, limit=None):
+    """Get chunks of iterations of the task result ordered by chunk_order.
+
+    :param result_id: int id of TaskResult instance.
+    :param offset: int number of chunks to skip.
+    :param limit: int max number of chunks to return, None means no limit.
+    :returns: list of TaskResultChunk instances.
+    """
+    return get_impl().task_result_chunk_get_all(result_id, offset, limit)
 
 
 def deployment_create(values):
@@ -105,6 +105,14 @@ def fix_deployment(fn):
 
 class Connection(object):
 
+    # NOTE: columns of a task that summarize its results
+    TASK_SUMMARY_COLUMNS = ("pass_sla", "iterations_count",
+                            "failed_iterations_count", "load_duration",
+                            "full_duration", "sla_results")
+    TASK_LIST_COLUMNS = (("id", "uuid", "status", "tag", "deployment_uuid",
+                          "created_at", "updated_at")
+                         + TASK_SUMMARY_COLUMNS)
+
     def engine_reset(self):
         global _FACADE
 
@@ -221,8 +229,39 @@ class Connection(object):
     def task_get(self, uuid):
         return self._task_get(uuid)
 
+    def _task_result_merge_chunks(self, results):
+        """Merge iterations stored in chunks into the task results.
+
+        :param results: list of serialized TaskResult dicts
+        :returns: the same list
+        """
+        if not results:
+            return results
+        by_id = dict((r["id"], r) for r in results)
+        chunks = (self.model_query(models.TaskResultChunk).
+                  filter(models.TaskResultChunk.task_result_id.in_(
+                      list(by_id))).
+                  order_by(models.TaskResultChunk.task_result_id,
+                           models.TaskResultChunk.chunk_order))
+        merged = set()
+        for chunk in chunks:
+            result = by_id[chunk.task_result_id]
+            result["data"]["raw"].extend(chunk.data["raw"])
+            merged.add(chunk.task_result_id)
+        for result_id in merged:
+            # NOTE: each chunk is sorted, so it is a merge of sorted runs
+            by_id[result_id]["data"]["raw"].sort(
+                key=lambda itr: itr["timestamp"])
+        return results
+
+    def task_get_detailed(self, uuid, load_iterations=True):
+        task = self._task_get_detailed(uuid)
+        if task and load_iterations:
+            self._task_result_merge_chunks(task["results"])
+        return task
+
     @db_api.serialize
-    def task_get_detailed(self, uuid):
+    def _task_get_detailed(self, uuid):
         return (self.model_query(models.Task).
                 options(sa.orm.joinedload("results")).
                 filter_by(uuid=uuid).first())
@@ -232,7 +271,23 @@ class Connection(object):
         return self._task_get(uuid, load_only="status").status
 
     @db_api.serialize
-    def task_get_detailed_last(self):
+    def task_get_summary(self, uuid):
+        columns = [getattr(models.Task, c)
+                   for c in ("uuid", "status") + self.TASK_SUMMARY_COLUMNS]
+        task = (self.model_query(models.Task).with_entities(*columns).
+                filter_by(uuid=uuid).first())
+        if not task:
+            raise exceptions.TaskNotFound(uuid=uuid)
+        return task._asdict()
+
+    def task_get_detailed_last(self, load_iterations=True):
+        task = self._task_get_detailed_last()
+        if task and load_iterations:
+            self._task_result_merge_chunks(task["results"])
+        return task
+
+    @db_api.serialize
+    def _task_get_detailed_last(self):
         return (self.model_query(models.Task).
                 options(sa.orm.joinedload("results")).
                 order_by(models.Task.id.desc()).first())
@@ -271,7 +326,14 @@ class Connection(object):
 
     @db_api.serialize
     def task_list(self, status=None, deployment=None):
-        query = self.model_query(models.Task)
+        # NOTE: tasks are listed with the name of their deployment and
+        #       without the columns which can be large (e.g. the
+        #       verification log), results are read from their summaries
+        columns = [getattr(models.Task, c) for c in self.TASK_LIST_COLUMNS]
+        query = (self.model_query(models.Task).
+                 join(models.Task.deployment).
+                 with_entities(*columns + [models.Deployment.name.label(
+                     "deployment_name")]))
 
         filters = {}
         if status is not None:
@@ -281,8 +343,9 @@ class Connection(object):
                 deployment)["uuid"]
 
         if filters:
-            query = query.filter_by(**filters)
-        return query.all()
+            query = query.filter(*[getattr(models.Task, k) == v
+                                   for k, v in filters.items()])
+        return [task._asdict() for task in query]
 
     def task_delete(self, uuid, status=None):
         session = get_session()
@@ -292,6 +355,12 @@ class Connection(object):
             if status is not None:
                 query = base_query.filter_by(status=status)
 
+            result_ids = (session.query(models.TaskResult.id).
+                          filter_by(task_uuid=uuid))
+            (self.model_query(models.TaskResultChunk).
+             filter(models.TaskResultChunk.task_result_id.in_(
+                 result_ids.subquery())).
+             delete(synchronize_session=False))
             (self.model_query(models.TaskResult).filter_by(task_uuid=uuid).
              delete(synchronize_session=False))
 
@@ -306,14 +375,52 @@ class Connection(object):
                 raise exceptions.TaskNotFound(uuid=uuid)
 
     @db_api.serialize
-    def task_result_create(self, task_uuid, key, data):
+    def task_result_create(self, task_uuid, key, data, kw_hash=None):
         result = models.TaskResult()
-        result.update({"task_uuid": task_uuid, "key": key, "data": data})
+        result.update({"task_uuid": task_uuid, "key": key, "data": data,
+                       "kw_hash": kw_hash})
         result.save()
         return result
 
     @db_api.serialize
-    def task_result_get_all_by_uuid(self, uuid):
+    def task_result_update(self, result_id, values):
+        session = get_session()
+        with session.begin():
+            result = (self.model_query(models.TaskResult, session=session).
+                      filter_by(id=result_id).first())
+            if not result:
+                raise exceptions.RallyException(
+                    _("Task result with id='%s' not found.") % result_id)
+            result.update(values)
+        return result
+
+    @db_api.serialize
+    def task_result_chunk_create(self, result_id, chunk_order, iterations):
+        chunk = models.TaskResultChunk()
+        chunk.update({"task_result_id": result_id,
+                      "chunk_order": chunk_order,
+                      "data": {"raw": iterations}})
+        chunk.save()
+        return chunk
+
+    @db_api.serialize
+    def task_result_chunk_get_all(self, result_id, offset=0, limit=None):
+        query = (self.model_query(models.TaskResultChunk).
+                 filter_by(task_result_id=result_id).
+                 order_by(models.TaskResultChunk.chunk_order).
+                 offset(offset))
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def task_result_get_all_by_uuid(self, uuid, load_iterations=True):
+        results = self._task_result_get_all_by_uuid(uuid)
+        if load_iterations:
+            self._task_result_merge_chunks(results)
+        return results
+
+    @db_api.serialize
+    def _task_result_get_all_by_uuid(self, uuid):
         return (self.model_query(models.TaskResult).
                 filter_by(task_uuid=uuid).all())
 
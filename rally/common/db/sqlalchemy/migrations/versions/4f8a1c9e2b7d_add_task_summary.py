@@ -0,0 +1,119 @@
+# Copyright (c) 2016 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add summary of task results to tasks
+
+Revision ID: 4f8a1c9e2b7d
+Revises: f33f4610dcda
+Create Date: 2016-10-21 10:12:35.194721
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "4f8a1c9e2b7d"
+down_revision = "f33f4610dcda"
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import sql
+
+from rally.common.db.sqlalchemy import types as sa_types
+
+
+SUMMARY_COLUMNS = ("pass_sla", "iterations_count", "failed_iterations_count",
+                   "load_duration", "full_duration", "sla_results")
+
+FINAL_STATUSES = ("finished", "failed", "aborted")
+
+tasks_helper = sa.Table(
+    "tasks",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("uuid", sa.String(36), nullable=False),
+    sa.Column("status", sa.String(36)),
+    sa.Column("pass_sla", sa.Boolean),
+    sa.Column("iterations_count", sa.Integer),
+    sa.Column("failed_iterations_count", sa.Integer),
+    sa.Column("load_duration", sa.Float),
+    sa.Column("full_duration", sa.Float),
+    sa.Column("sla_results", sa_types.MutableJSONEncodedDict),
+)
+
+task_results_helper = sa.Table(
+    "task_results",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("task_uuid", sa.String(36)),
+    sa.Column("key", sa_types.MutableJSONEncodedDict, nullable=False),
+    sa.Column("data", sa_types.BigMutableJSONEncodedDict, nullable=False),
+    sa.Column("iterations_count", sa.Integer),
+    sa.Column("failed_iterations_count", sa.Integer),
+    sa.Column("load_duration", sa.Float),
+    sa.Column("full_duration", sa.Float),
+)
+
+
+def upgrade():
+    with op.batch_alter_table("tasks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("pass_sla", sa.Boolean(),
+                                      nullable=True))
+        batch_op.add_column(sa.Column("iterations_count", sa.Integer(),
+                                      nullable=True))
+        batch_op.add_column(sa.Column("failed_iterations_count",
+                                      sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("load_duration", sa.Float(),
+                                      nullable=True))
+        batch_op.add_column(sa.Column("full_duration", sa.Float(),
+                                      nullable=True))
+        batch_op.add_column(sa.Column("sla_results",
+                                      sa_types.MutableJSONEncodedDict(),
+                                      nullable=True))
+
+    # NOTE: summaries of finished tasks are computed from the aggregates of
+    #       their results, the rest of tasks are summarized when finished
+    connection = op.get_bind()
+    tasks = connection.execute(
+        sql.select([tasks_helper.c.id, tasks_helper.c.uuid]).where(
+            tasks_helper.c.status.in_(FINAL_STATUSES))).fetchall()
+    for task in tasks:
+        summary = {"pass_sla": True, "iterations_count": 0,
+                   "failed_iterations_count": 0, "load_duration": 0,
+                   "full_duration": 0, "sla_results": {"workloads": []}}
+        results = connection.execute(
+            task_results_helper.select().where(
+                task_results_helper.c.task_uuid == task.uuid).order_by(
+                task_results_helper.c.id))
+        for result in results:
+            sla = result.data.get("sla", [])
+            summary["pass_sla"] = summary["pass_sla"] and all(
+                s.get("success", True) for s in sla)
+            for column in ("iterations_count", "failed_iterations_count",
+                           "load_duration", "full_duration"):
+                summary[column] += getattr(result, column) or 0
+            summary["sla_results"]["workloads"].append(
+                {"name": result.key.get("name"),
+                 "pos": result.key.get("pos"), "sla": sla})
+        connection.execute(
+            tasks_helper.update().where(
+                tasks_helper.c.id == task.id).values(**summary))
+
+
+def downgrade():
+    with op.batch_alter_table("tasks", schema=None) as batch_op:
+        for column in reversed(SUMMARY_COLUMNS):
+            batch_op.drop_column(column)
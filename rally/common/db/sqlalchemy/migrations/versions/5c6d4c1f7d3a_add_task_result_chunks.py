@@ -0,0 +1,94 @@
+# Copyright (c) 2016 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add task result chunks
+
+Revision ID: 5c6d4c1f7d3a
+Revises: 3177d36ea270
+Create Date: 2016-10-18 12:04:11.213017
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "5c6d4c1f7d3a"
+down_revision = "3177d36ea270"
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+
+
+task_results_helper = sa.Table(
+    "task_results",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("data", sa_types.BigMutableJSONEncodedDict, nullable=False),
+)
+
+task_result_chunks_helper = sa.Table(
+    "task_result_chunks",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("task_result_id", sa.Integer, nullable=False),
+    sa.Column("chunk_order", sa.Integer, nullable=False),
+    sa.Column("data", sa_types.BigMutableJSONEncodedDict, nullable=False),
+)
+
+
+def upgrade():
+    op.create_table(
+        "task_result_chunks",
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_result_id", sa.Integer(), nullable=False),
+        sa.Column("chunk_order", sa.Integer(), nullable=False),
+        sa.Column("data", sa_types.BigMutableJSONEncodedDict(),
+                  nullable=False),
+        sa.ForeignKeyConstraint(["task_result_id"], ["task_results.id"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("task_result_chunk_result_id", "task_result_chunks",
+                    ["task_result_id"], unique=False)
+
+
+def downgrade():
+    # NOTE: move iterations from the chunks back to the task results, so
+    #       they are not lost
+    connection = op.get_bind()
+    raw = {}
+    for chunk in connection.execute(
+            task_result_chunks_helper.select().order_by(
+                task_result_chunks_helper.c.task_result_id,
+                task_result_chunks_helper.c.chunk_order)):
+        raw.setdefault(chunk.task_result_id, []).extend(chunk.data["raw"])
+
+    for result in connection.execute(task_results_helper.select()):
+        if result.id not in raw:
+            continue
+        data = dict(result.data)
+        data["raw"] = sorted(data.get("raw", []) + raw[result.id],
+                             key=lambda itr: itr["timestamp"])
+        connection.execute(
+            task_results_helper.update().where(
+                task_results_helper.c.id == result.id).values(data=data))
+
+    op.drop_index("task_result_chunk_result_id",
+                  table_name="task_result_chunks")
+    op.drop_table("task_result_chunks")
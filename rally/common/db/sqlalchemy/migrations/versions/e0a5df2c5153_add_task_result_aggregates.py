@@ -0,0 +1,158 @@
+# Copyright (c) 2016 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add task result aggregates
+
+Revision ID: e0a5df2c5153
+Revises: 5c6d4c1f7d3a
+Create Date: 2016-10-18 15:32:47.507103
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "e0a5df2c5153"
+down_revision = "5c6d4c1f7d3a"
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import sql
+
+from rally.common.db.sqlalchemy import types as sa_types
+
+
+CHUNK_SIZE = 1000
+
+AGGREGATE_COLUMNS = ("iterations_count", "failed_iterations_count",
+                     "min_duration", "max_duration", "tstamp_start",
+                     "load_duration", "full_duration", "pass_sla",
+                     "statistics")
+
+task_results_helper = sa.Table(
+    "task_results",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("data", sa_types.BigMutableJSONEncodedDict, nullable=False),
+    sa.Column("iterations_count", sa.Integer),
+    sa.Column("failed_iterations_count", sa.Integer),
+    sa.Column("min_duration", sa.Float),
+    sa.Column("max_duration", sa.Float),
+    sa.Column("tstamp_start", sa.Float),
+    sa.Column("load_duration", sa.Float),
+    sa.Column("full_duration", sa.Float),
+    sa.Column("pass_sla", sa.Boolean),
+)
+
+task_result_chunks_helper = sa.Table(
+    "task_result_chunks",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("task_result_id", sa.Integer, nullable=False),
+    sa.Column("chunk_order", sa.Integer, nullable=False),
+    sa.Column("data", sa_types.BigMutableJSONEncodedDict, nullable=False),
+)
+
+
+def _aggregate(iterations):
+    aggregates = {"iterations_count": 0, "failed_iterations_count": 0,
+                  "min_duration": 0, "max_duration": 0, "tstamp_start": 0}
+    for itr in iterations:
+        aggregates["iterations_count"] += 1
+        if (not aggregates["tstamp_start"]
+                or itr["timestamp"] < aggregates["tstamp_start"]):
+            aggregates["tstamp_start"] = itr["timestamp"]
+        if itr["error"]:
+            aggregates["failed_iterations_count"] += 1
+            continue
+        duration = itr["duration"] or 0
+        if (not aggregates["min_duration"]
+                or duration < aggregates["min_duration"]):
+            aggregates["min_duration"] = duration
+        if (not aggregates["max_duration"]
+                or duration > aggregates["max_duration"]):
+            aggregates["max_duration"] = duration
+    return aggregates
+
+
+def upgrade():
+    with op.batch_alter_table("task_results", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("iterations_count", sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column("failed_iterations_count", sa.Integer(),
+                      nullable=True))
+        batch_op.add_column(
+            sa.Column("min_duration", sa.Float(), nullable=True))
+        batch_op.add_column(
+            sa.Column("max_duration", sa.Float(), nullable=True))
+        batch_op.add_column(
+            sa.Column("tstamp_start", sa.Float(), nullable=True))
+        batch_op.add_column(
+            sa.Column("load_duration", sa.Float(), nullable=True))
+        batch_op.add_column(
+            sa.Column("full_duration", sa.Float(), nullable=True))
+        batch_op.add_column(
+            sa.Column("pass_sla", sa.Boolean(), nullable=True))
+        batch_op.add_column(
+            sa.Column("statistics", sa_types.MutableJSONEncodedDict(),
+                      nullable=True))
+
+    # NOTE: iterations stored in task results are moved to the chunks, so
+    #       the task results can be loaded without iterations. Statistics
+    #       are left empty and computed when the iterations are loaded.
+    connection = op.get_bind()
+    result_ids = [r.id for r in connection.execute(
+        sql.select([task_results_helper.c.id]))]
+    for result_id in result_ids:
+        result = connection.execute(task_results_helper.select().where(
+            task_results_helper.c.id == result_id)).first()
+        data = dict(result.data)
+        raw = data.get("raw") or []
+
+        chunks = connection.execute(
+            task_result_chunks_helper.select().where(
+                task_result_chunks_helper.c.task_result_id == result_id
+            ).order_by(task_result_chunks_helper.c.chunk_order)).fetchall()
+        chunk_order = chunks[-1].chunk_order + 1 if chunks else 0
+        iterations = list(raw)
+        for chunk in chunks:
+            iterations.extend(chunk.data["raw"])
+
+        for i in range(0, len(raw), CHUNK_SIZE):
+            connection.execute(task_result_chunks_helper.insert().values(
+                task_result_id=result_id, chunk_order=chunk_order,
+                data={"raw": raw[i:i + CHUNK_SIZE]}))
+            chunk_order += 1
+
+        if "raw" in data:
+            data["raw"] = []
+        values = _aggregate(iterations)
+        values.update(
+            data=data,
+            load_duration=data.get("load_duration", 0),
+            full_duration=data.get("full_duration", 0),
+            pass_sla=all(s.get("success", True)
+                         for s in data.get("sla", [])))
+        connection.execute(
+            task_results_helper.update().where(
+                task_results_helper.c.id == result_id).values(**values))
+
+
+def downgrade():
+    with op.batch_alter_table("task_results", schema=None) as batch_op:
+        for column in reversed(AGGREGATE_COLUMNS):
+            batch_op.drop_column(column)
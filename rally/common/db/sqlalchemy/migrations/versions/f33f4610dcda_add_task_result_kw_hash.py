@@ -0,0 +1,87 @@
+# Copyright (c) 2016 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add hash of workload config to task results
+
+Revision ID: f33f4610dcda
+Revises: e0a5df2c5153
+Create Date: 2016-10-19 11:04:12.830551
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "f33f4610dcda"
+down_revision = "e0a5df2c5153"
+branch_labels = None
+depends_on = None
+
+
+import hashlib
+
+from alembic import op
+import six
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+
+
+task_results_helper = sa.Table(
+    "task_results",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("key", sa_types.MutableJSONEncodedDict, nullable=False),
+    sa.Column("kw_hash", sa.String(32)),
+)
+
+
+def _to_str(obj):
+    # NOTE: a copy of rally.common.utils.config_to_str, so the migration
+    #       does not depend on the code that may be changed
+    if obj is None:
+        return "None"
+    elif isinstance(obj, six.string_types + (int, float)):
+        return str(obj).strip()
+    elif isinstance(obj, (list, tuple)):
+        return ",".join(sorted([_to_str(v) for v in obj]))
+    elif isinstance(obj, dict):
+        return "|".join(sorted([":".join([_to_str(k), _to_str(v)])
+                                for k, v in obj.items()]))
+    raise TypeError("Unexpected type %(type)r of object %(obj)r"
+                    % {"obj": obj, "type": type(obj)})
+
+
+def upgrade():
+    with op.batch_alter_table("task_results", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("kw_hash", sa.String(32),
+                                      nullable=True))
+        batch_op.create_index("task_result_kw_hash", ["kw_hash"],
+                              unique=False)
+
+    connection = op.get_bind()
+    for result in connection.execute(task_results_helper.select()):
+        if "kw" not in result.key:
+            continue
+        kw_hash = hashlib.md5(
+            _to_str(result.key["kw"]).encode("utf8")).hexdigest()
+        connection.execute(
+            task_results_helper.update().where(
+                task_results_helper.c.id == result.id).values(
+                    kw_hash=kw_hash))
+
+
+def downgrade():
+    with op.batch_alter_table("task_results", schema=None) as batch_op:
+        batch_op.drop_index("task_result_kw_hash")
+        batch_op.drop_column("kw_hash")
@@ -170,6 +170,16 @@ class Task(BASE, RallyBase):
     verification_log = sa.Column(sa.Text, default="")
     tag = sa.Column(sa.String(64), default="")
 
+    # NOTE: summary of the task results, stored when the task is finished,
+    #       so the tasks can be listed and checked without loading their
+    #       results. None means that the summary was not computed yet
+    pass_sla = sa.Column(sa.Boolean)
+    iterations_count = sa.Column(sa.Integer)
+    failed_iterations_count = sa.Column(sa.Integer)
+    load_duration = sa.Column(sa.Float)
+    full_duration = sa.Column(sa.Float)
+    sla_results = sa.Column(sa_types.MutableJSONEncodedDict)
+
     deployment_uuid = sa.Column(
         sa.String(36),
         sa.ForeignKey(Deployment.uuid),
@@ -186,12 +196,31 @@ class Task(BASE, RallyBase):
 
 class TaskResult(BASE, RallyBase):
     __tablename__ = "task_results"
-    __table_args__ = ()
+    __table_args__ = (
+        sa.Index("task_result_kw_hash", "kw_hash"),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
 
     key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
     data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+    # NOTE: hash of the workload config (key["kw"]), so the results of the
+    #       same workload can be found through all tasks
+    kw_hash = sa.Column(sa.String(32))
+
+    # NOTE: aggregates of the iterations, so the workload can be summarized
+    #       without loading its iterations
+    iterations_count = sa.Column(sa.Integer, default=0)
+    failed_iterations_count = sa.Column(sa.Integer, default=0)
+    min_duration = sa.Column(sa.Float)
+    max_duration = sa.Column(sa.Float)
+    tstamp_start = sa.Column(sa.Float)
+    load_duration = sa.Column(sa.Float, default=0)
+    full_duration = sa.Column(sa.Float, default=0)
+    pass_sla = sa.Column(sa.Boolean, default=True)
+    # NOTE: atomic actions durations and MainStatsTable, None means that
+    #       the statistics were not computed yet
+    statistics = sa.Column(sa_types.MutableJSONEncodedDict)
 
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"))
     task = sa.orm.relationship(Task,
@@ -200,6 +229,25 @@ class TaskResult(BASE, RallyBase):
                                primaryjoin="TaskResult.task_uuid == Task.uuid")
 
 
+class TaskResultChunk(BASE, RallyBase):
+    """Represents a chunk of iterations of a task result.
+
+    Iterations are stored in chunks while the workload is running, so they
+    are not kept in memory until the end of the workload and are available
+    before it is finished.
+    """
+    __tablename__ = "task_result_chunks"
+    __table_args__ = (
+        sa.Index("task_result_chunk_result_id", "task_result_id"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_result_id = sa.Column(sa.Integer, sa.ForeignKey("task_results.id"),
+                               nullable=False)
+    chunk_order = sa.Column(sa.Integer, nullable=False)
+    data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+
+
 class Verification(BASE, RallyBase):
     """Represents a verifier result."""
 
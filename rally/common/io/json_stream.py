@@ -0,0 +1,217 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Streaming JSON serialization and parsing.
+
+Large JSON documents (like results of long tasks) are written and read
+piece by piece, so they are never kept in memory as a whole.
+"""
+
+import codecs
+import itertools
+import json
+
+import six
+
+
+class _LazyList(list):
+    """List that is iterated over lazily by the JSON encoder."""
+
+    def __init__(self, iterable):
+        super(_LazyList, self).__init__()
+        self._iterable = iterable
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def __len__(self):
+        # NOTE: the encoder checks only whether the list is empty, and
+        #       empty iterables are not turned into _LazyList
+        return 1
+
+    def __nonzero__(self):
+        return True
+
+    __bool__ = __nonzero__
+
+
+class StreamingJSONEncoder(json.JSONEncoder):
+    """JSON encoder that writes any iterable as JSON array.
+
+    Iterables that are not lists, tuples or dicts (e.g. generators) are
+    encoded element by element by iterencode(), so they are never loaded
+    into memory. The output is the same as if they were lists.
+    """
+
+    def default(self, o):
+        if hasattr(o, "__iter__") and not isinstance(o, six.string_types):
+            iterator = iter(o)
+            try:
+                first = next(iterator)
+            except StopIteration:
+                return []
+            return _LazyList(itertools.chain([first], iterator))
+        return super(StreamingJSONEncoder, self).default(o)
+
+
+def dump(obj, fp, **kwargs):
+    """Serialize obj as JSON to the file by chunks.
+
+    :param obj: object to serialize, iterables are written as arrays
+    :param fp: file-like object to write to
+    :param kwargs: keyword arguments of json.JSONEncoder
+    """
+    for chunk in StreamingJSONEncoder(**kwargs).iterencode(obj):
+        fp.write(chunk)
+
+
+class JSONStreamReader(object):
+    """Pull parser of JSON document read from a binary file.
+
+    The document is walked with iter_array() and iter_object(), and
+    values are read with read_value(). Only the read values and a buffer
+    of the file are kept in memory.
+    """
+
+    WHITESPACE = " \t\r\n"
+
+    def __init__(self, fp, offset=0, buffer_size=65536):
+        """Init reader.
+
+        :param fp: file-like object opened in binary mode
+        :param offset: position of the file the reader starts at
+        :param buffer_size: minimal number of bytes read from the file
+        """
+        self._fp = fp
+        self._offset = offset
+        self._buffer_size = buffer_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = u""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Read more data from the file.
+
+        :returns: bool, whether more data is read
+        """
+        if self._eof:
+            return False
+        data = self._fp.read(max(self._buffer_size, len(self._buf)))
+        self._eof = not data
+        consumed = self._buf[:self._pos]
+        self._offset += len(consumed.encode("utf-8"))
+        self._buf = self._buf[self._pos:] + self._decoder.decode(
+            data, final=self._eof)
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self):
+        while True:
+            while (self._pos < len(self._buf)
+                   and self._buf[self._pos] in self.WHITESPACE):
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars):
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError("Expecting one of %r at byte %d, got %r"
+                             % (chars, self.tell(), char))
+        self._pos += 1
+        return char
+
+    def tell(self):
+        """Get position of the file the reader is at."""
+        return self._offset + len(self._buf[:self._pos].encode("utf-8"))
+
+    def read_value(self):
+        """Read the next JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buf,
+                                                           self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # NOTE: a number at the end of the buffer can be incomplete
+            if end < len(self._buf) or not self._fill():
+                self._pos = end
+                return value
+
+    def iter_array(self):
+        """Walk over JSON array.
+
+        Each element should be read (or walked) by the caller before
+        the next one is requested.
+
+        :returns: generator, which yields the index of each element
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        for idx in itertools.count():
+            yield idx
+            if self._expect(",]") == "]":
+                return
+
+    def iter_object(self):
+        """Walk over JSON object.
+
+        Each value should be read (or walked) by the caller before the
+        next key is requested.
+
+        :returns: generator, which yields keys of the object
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != "\"":
+                raise ValueError("Expecting property name at byte %d"
+                                 % self.tell())
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+
+class FileArray(object):
+    """JSON array of a file, that is read each time it is iterated over."""
+
+    def __init__(self, path, offset=0):
+        """Init array.
+
+        :param path: path to the file
+        :param offset: position of the array in the file
+        """
+        self.path = path
+        self.offset = offset
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            reader = JSONStreamReader(f, self.offset)
+            for idx in reader.iter_array():
+                yield reader.read_value()
@@ -14,11 +14,15 @@
 #    under the License.
 
 import collections
+import itertools
 import json
 import uuid
 
+import six
+
 from rally.common import db
 from rally.common.i18n import _LE
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from rally.task.processing import charts
@@ -278,6 +282,98 @@ TASK_EXTENDED_RESULT_SCHEMA = {
 }
 
 
+class ResultAggregator(object):
+    """Streaming aggregation of the workload iterations.
+
+    Aggregates are stored with the task result, so the workload can be
+    listed, checked and summarized without loading its iterations.
+    """
+
+    # NOTE: TaskResult columns with the aggregates
+    COLUMNS = ("iterations_count", "failed_iterations_count", "min_duration",
+               "max_duration", "tstamp_start", "load_duration",
+               "full_duration", "pass_sla", "statistics")
+
+    def __init__(self):
+        self.iterations_count = 0
+        self.failed_iterations_count = 0
+        self.min_duration = 0
+        self.max_duration = 0
+        self.tstamp_start = 0
+        self.atomic = collections.OrderedDict()
+        self.stat = charts.MainStatsTable({"atomic": {}})
+
+    def add_iteration(self, itr):
+        self.iterations_count += 1
+        for atomic_name, duration in itr["atomic_actions"].items():
+            duration = duration or 0
+            if atomic_name not in self.atomic:
+                self.atomic[atomic_name] = {"min_duration": duration,
+                                            "max_duration": duration}
+            elif duration < self.atomic[atomic_name]["min_duration"]:
+                self.atomic[atomic_name]["min_duration"] = duration
+            elif duration > self.atomic[atomic_name]["max_duration"]:
+                self.atomic[atomic_name]["max_duration"] = duration
+
+        if not self.tstamp_start or itr["timestamp"] < self.tstamp_start:
+            self.tstamp_start = itr["timestamp"]
+
+        if itr["error"]:
+            self.failed_iterations_count += 1
+        else:
+            duration = itr["duration"] or 0
+            if not self.min_duration or duration < self.min_duration:
+                self.min_duration = duration
+            if not self.max_duration or duration > self.max_duration:
+                self.max_duration = duration
+
+        self.stat.add_iteration(itr)
+
+    def merge(self, other):
+        """Merge aggregates of other iterations, e.g. from a worker process.
+
+        :param other: ResultAggregator instance
+        """
+        self.iterations_count += other.iterations_count
+        self.failed_iterations_count += other.failed_iterations_count
+        for atomic_name, durations in other.atomic.items():
+            if atomic_name not in self.atomic:
+                self.atomic[atomic_name] = dict(durations)
+                continue
+            atomic = self.atomic[atomic_name]
+            atomic["min_duration"] = min(atomic["min_duration"],
+                                         durations["min_duration"])
+            atomic["max_duration"] = max(atomic["max_duration"],
+                                         durations["max_duration"])
+
+        # NOTE: zero values mean that there were no (successful) iterations
+        for key, func in (("tstamp_start", min), ("min_duration", min),
+                          ("max_duration", max)):
+            value = getattr(other, key)
+            if value:
+                current = getattr(self, key)
+                setattr(self, key, func(current, value) if current else value)
+
+        self.stat.merge(other.stat)
+
+    def aggregates(self, data):
+        """Get aggregates to store in the task result.
+
+        :param data: dict, data of the task result with SLA and durations
+        :returns: dict with values of TaskResult columns
+        """
+        return {"iterations_count": self.iterations_count,
+                "failed_iterations_count": self.failed_iterations_count,
+                "min_duration": self.min_duration,
+                "max_duration": self.max_duration,
+                "tstamp_start": self.tstamp_start,
+                "load_duration": data["load_duration"],
+                "full_duration": data["full_duration"],
+                "pass_sla": all(s["success"] for s in data["sla"]),
+                "statistics": {"atomic": self.atomic,
+                               "stat": self.stat.render()}}
+
+
 class Task(object):
     """Represents a task object."""
 
@@ -288,6 +384,19 @@ class Task(object):
     NOT_IMPLEMENTED_STAGES_FOR_ABORT = [consts.TaskStatus.VERIFYING,
                                         consts.TaskStatus.INIT]
 
+    # NOTE: Max number of iterations stored in one chunk by append_results()
+    RESULT_CHUNK_SIZE = 1000
+
+    # NOTE: Task results are not changed anymore in these statuses
+    FINAL_STATUSES = (consts.TaskStatus.FINISHED, consts.TaskStatus.FAILED,
+                      consts.TaskStatus.ABORTED)
+
+    # NOTE: Columns of the task that summarize its results, they are stored
+    #       when the task gets one of FINAL_STATUSES
+    SUMMARY_COLUMNS = ("pass_sla", "iterations_count",
+                       "failed_iterations_count", "load_duration",
+                       "full_duration", "sla_results")
+
     def __init__(self, task=None, temporary=False, **attributes):
         """Task object init
 
@@ -310,14 +419,14 @@ class Task(object):
 
     def to_dict(self):
         db_task = self.task
-        deployment_name = db.deployment_get(
-            self.task["deployment_uuid"])["name"]
-        db_task["deployment_name"] = deployment_name
+        if "deployment_name" not in db_task:
+            db_task["deployment_name"] = db.deployment_get(
+                self.task["deployment_uuid"])["name"]
         return db_task
 
     @staticmethod
-    def get_detailed(task_id):
-        return db.api.task_get_detailed(task_id)
+    def get_detailed(task_id, load_iterations=True):
+        return db.api.task_get_detailed(task_id, load_iterations)
 
     @staticmethod
     def get(uuid):
@@ -327,6 +436,26 @@ class Task(object):
     def get_status(uuid):
         return db.task_get_status(uuid)
 
+    @classmethod
+    def get_summary(cls, uuid):
+        """Get status of the task and the summary of its results.
+
+        The summary is stored when the task is finished. If it is missing
+        (e.g. the task is still running), it is computed from the task
+        results, and stored if the task is finished already.
+
+        :param uuid: str task UUID
+        :returns: dict with uuid, status and SUMMARY_COLUMNS of the task
+        """
+        summary = db.task_get_summary(uuid)
+        if summary["sla_results"] is None:
+            task = cls(dict(summary))
+            summary.update(task.summarize())
+            if summary["status"] in cls.FINAL_STATUSES:
+                task._update(
+                    dict((k, summary[k]) for k in cls.SUMMARY_COLUMNS))
+        return summary
+
     @staticmethod
     def list(status=None, deployment=None):
         return [Task(db_task) for db_task in db.task_list(status, deployment)]
@@ -339,9 +468,23 @@ class Task(object):
         if not self.is_temporary:
             self.task = db.task_update(self.task["uuid"], values)
 
-    def update_status(self, status, allowed_statuses=None):
+    def update_status(self, status, allowed_statuses=None,
+                      load_duration=None):
+        """Update status of the task, store its summary if it is final.
+
+        :param status: new status of the task
+        :param allowed_statuses: statuses the task can be updated from
+        :param load_duration: load duration of the task measured by the
+                              engine, overrides the one computed from
+                              the results in the summary
+        """
         if allowed_statuses:
             db.task_update_status(self.task["uuid"], status, allowed_statuses)
+        elif status in self.FINAL_STATUSES:
+            summary = self.summarize()
+            if load_duration is not None:
+                summary["load_duration"] = load_duration
+            self._update(dict(summary, status=status))
         else:
             self._update({"status": status})
 
@@ -349,17 +492,131 @@ class Task(object):
         self._update({"verification_log": json.dumps(log)})
 
     def set_failed(self, etype, msg, etraceback):
-        self._update({"status": consts.TaskStatus.FAILED,
-                      "verification_log": json.dumps([etype,
-                                                      msg,
-                                                      etraceback
-                                                      ])})
+        self._update(dict(self.summarize(),
+                          status=consts.TaskStatus.FAILED,
+                          verification_log=json.dumps([etype,
+                                                       msg,
+                                                       etraceback
+                                                       ])))
+
+    def get_results(self, load_iterations=True):
+        return db.task_result_get_all_by_uuid(self.task["uuid"],
+                                              load_iterations)
+
+    def get_results_summaries(self):
+        """Get task results without iterations but with their aggregates.
+
+        Aggregates are stored when the workload is finished. If they are
+        missing (e.g. the results were stored by older versions), they are
+        computed once from the iterations and stored for finished tasks, so
+        further calls read only the task results.
+
+        :returns: list of task results with aggregates
+        """
+        results = self.get_results(load_iterations=False)
+        for result in results:
+            if result.get("statistics") is not None:
+                continue
+            aggregator = ResultAggregator()
+            for itr in self.iter_result_iterations(result):
+                aggregator.add_iteration(itr)
+            aggregates = aggregator.aggregates(result["data"])
+            if self.task["status"] in self.FINAL_STATUSES:
+                self.update_result(result["id"], result["data"], aggregates)
+            result.update(aggregates)
+        return results
+
+    def summarize(self):
+        """Summarize the task results.
+
+        :returns: dict with SUMMARY_COLUMNS, "sla_results" has SLA results
+                  of each workload
+        """
+        summary = {"pass_sla": True, "iterations_count": 0,
+                   "failed_iterations_count": 0, "load_duration": 0,
+                   "full_duration": 0, "sla_results": {"workloads": []}}
+        if self.is_temporary:
+            return summary
+        # NOTE: aggregates of the workload are stored when it is finished,
+        #       so unfinished workloads are summarized without iterations
+        loads = []
+        for result in self.get_results(load_iterations=False):
+            sla = result["data"].get("sla", [])
+            summary["pass_sla"] = summary["pass_sla"] and all(
+                s.get("success", True) for s in sla)
+            summary["iterations_count"] += result["iterations_count"] or 0
+            summary["failed_iterations_count"] += (
+                result["failed_iterations_count"] or 0)
+            load_duration = result["data"].get("load_duration", 0)
+            if result.get("tstamp_start"):
+                loads.append((result["tstamp_start"],
+                              result["tstamp_start"] + load_duration))
+            else:
+                summary["load_duration"] += load_duration
+            summary["full_duration"] += result["data"].get("full_duration",
+                                                           0)
+            summary["sla_results"]["workloads"].append(
+                {"name": result["key"]["name"], "pos": result["key"]["pos"],
+                 "sla": sla})
+
+        # NOTE: workloads of subtasks run in parallel overlap, so the load
+        #       duration of the task is the length of the union of loads
+        end = None
+        for load_start, load_end in sorted(loads):
+            if end is not None and load_start < end:
+                load_start = end
+            if load_end > load_start:
+                summary["load_duration"] += load_end - load_start
+            end = max(end, load_end) if end is not None else load_end
+        return summary
 
-    def get_results(self):
-        return db.task_result_get_all_by_uuid(self.task["uuid"])
+    @staticmethod
+    def _fix_iteration_output(itr):
+        if "output" not in itr:
+            itr["output"] = {"additive": [], "complete": []}
+
+            # NOTE(amaretskiy): Deprecated "scenario_output"
+            #     is supported for backward compatibility
+            if ("scenario_output" in itr
+                    and itr["scenario_output"]["data"]):
+                itr["output"]["additive"].append(
+                    {"items": itr["scenario_output"]["data"].items(),
+                     "title": "Scenario output",
+                     "description": "",
+                     "chart": "OutputStackedAreaChart"})
+                del itr["scenario_output"]
+        return itr
+
+    @staticmethod
+    def iter_result_iterations(result, chunks_per_page=10):
+        """Load iterations of the task result lazily.
+
+        Iterations are loaded from the DB by pages of chunks, so arbitrary
+        number of iterations is processed with low memory usage. Each chunk
+        is sorted by timestamp, but the chunks can overlap.
+
+        :param result: dict, task result loaded without iterations
+        :param chunks_per_page: int number of chunks loaded at once
+        :returns: generator of iterations dicts
+        """
+        for itr in result["data"].get("raw", []):
+            yield itr
+        if result.get("id") is None:
+            return
+        offset = 0
+        while True:
+            chunks = db.task_result_chunk_get_all(result["id"], offset,
+                                                  chunks_per_page)
+            for chunk in chunks:
+                for itr in chunk["data"]["raw"]:
+                    yield itr
+            if len(chunks) < chunks_per_page:
+                break
+            offset += chunks_per_page
 
     @classmethod
-    def extend_results(cls, results, serializable=False):
+    def extend_results(cls, results, serializable=False,
+                       iterations_loaded=True):
         """Modify and extend results with aggregated data.
 
         This is a workaround method that tries to adapt task results
@@ -372,9 +629,15 @@ class Task(object):
         its future implementation as generator and gives ability to process
         arbitrary number of iterations with low memory usage.
 
+        The aggregated data is taken from the task result if it was stored
+        there, otherwise it is computed from the iterations.
+
         :param results: list of db.sqlalchemy.models.TaskResult
         :param serializable: bool, whether to convert json non-serializable
                              types (like datetime) to serializable ones
+        :param iterations_loaded: bool, whether the results were loaded with
+                                  iterations. If False, the iterations are
+                                  loaded lazily from the DB.
         :returns: list of dicts, each dict represents scenario results:
                   key - dict, scenario input data
                   sla - list, SLA results
@@ -399,48 +662,29 @@ class Task(object):
         extended = []
         for scenario_result in results:
             scenario = dict(scenario_result)
-            tstamp_start = 0
-            min_duration = 0
-            max_duration = 0
-            iterations_failed = 0
-            atomic = collections.OrderedDict()
-
-            for itr in scenario["data"]["raw"]:
-                for atomic_name, duration in itr["atomic_actions"].items():
-                    duration = duration or 0
-                    if atomic_name not in atomic:
-                        atomic[atomic_name] = {"min_duration": duration,
-                                               "max_duration": duration}
-                    elif duration < atomic[atomic_name]["min_duration"]:
-                        atomic[atomic_name]["min_duration"] = duration
-                    elif duration > atomic[atomic_name]["max_duration"]:
-                        atomic[atomic_name]["max_duration"] = duration
-
-                if not tstamp_start or itr["timestamp"] < tstamp_start:
-                    tstamp_start = itr["timestamp"]
-
-                if "output" not in itr:
-                    itr["output"] = {"additive": [], "complete": []}
-
-                    # NOTE(amaretskiy): Deprecated "scenario_output"
-                    #     is supported for backward compatibility
-                    if ("scenario_output" in itr
-                            and itr["scenario_output"]["data"]):
-                        itr["output"]["additive"].append(
-                            {"items": itr["scenario_output"]["data"].items(),
-                             "title": "Scenario output",
-                             "description": "",
-                             "chart": "OutputStackedAreaChart"})
-                        del itr["scenario_output"]
-
-                if itr["error"]:
-                    iterations_failed += 1
+
+            if scenario.get("statistics") is not None:
+                aggregates = scenario
+            else:
+                if iterations_loaded:
+                    # NOTE: iterations are walked twice, so an iterator
+                    #       is converted to list
+                    scenario["data"]["raw"] = list(scenario["data"]["raw"])
+                    iterations = scenario["data"]["raw"]
                 else:
-                    duration = itr["duration"] or 0
-                    if not min_duration or duration < min_duration:
-                        min_duration = duration
-                    if not max_duration or duration > max_duration:
-                        max_duration = duration
+                    iterations = cls.iter_result_iterations(scenario_result)
+                aggregator = ResultAggregator()
+                for itr in iterations:
+                    aggregator.add_iteration(itr)
+                aggregates = aggregator.aggregates(scenario["data"])
+
+            if iterations_loaded:
+                iterations = scenario["data"]["raw"]
+            else:
+                iterations = cls.iter_result_iterations(scenario_result)
+            iterations = six.moves.map(cls._fix_iteration_output, iterations)
+            if serializable:
+                iterations = list(iterations)
 
             for k in "created_at", "updated_at":
                 if serializable:
@@ -451,36 +695,72 @@ class Task(object):
                 else:
                     del scenario[k]
 
-            durations_stat = charts.MainStatsTable(
-                {"iterations_count": len(scenario["data"]["raw"]),
-                 "atomic": atomic})
-
-            for itr in scenario["data"]["raw"]:
-                durations_stat.add_iteration(itr)
-
             scenario["info"] = {
-                "stat": durations_stat.render(),
-                "atomic": atomic,
-                "iterations_count": len(scenario["data"]["raw"]),
-                "iterations_failed": iterations_failed,
-                "min_duration": min_duration,
-                "max_duration": max_duration,
-                "tstamp_start": tstamp_start,
+                "stat": aggregates["statistics"]["stat"],
+                "atomic": aggregates["statistics"]["atomic"],
+                "iterations_count": aggregates["iterations_count"],
+                "iterations_failed": aggregates["failed_iterations_count"],
+                "min_duration": aggregates["min_duration"],
+                "max_duration": aggregates["max_duration"],
+                "tstamp_start": aggregates["tstamp_start"],
                 "full_duration": scenario["data"]["full_duration"],
                 "load_duration": scenario["data"]["load_duration"]}
-            if serializable:
-                scenario["iterations"] = scenario["data"]["raw"]
-            else:
-                scenario["iterations"] = iter(scenario["data"]["raw"])
+            scenario["iterations"] = iterations
             scenario["sla"] = scenario["data"]["sla"]
             del scenario["data"]
             del scenario["task_uuid"]
             del scenario["id"]
+            scenario.pop("kw_hash", None)
+            for column in ResultAggregator.COLUMNS:
+                scenario.pop(column, None)
             extended.append(scenario)
         return extended
 
     def append_results(self, key, value):
-        db.task_result_create(self.task["uuid"], key, value)
+        """Store results of the whole workload.
+
+        :param key: dict, scenario identifier
+        :param value: dict with "raw" iterations, "sla" and durations.
+                      Iterations can be any iterable, they are stored
+                      by chunks as they are read
+        """
+        aggregator = ResultAggregator()
+        data = dict(value, raw=[])
+        result_id = self.create_result(key, data)
+        iterations = iter(value["raw"])
+        chunk_order = 0
+        chunk = list(itertools.islice(iterations, self.RESULT_CHUNK_SIZE))
+        while chunk:
+            for itr in chunk:
+                aggregator.add_iteration(itr)
+            self.append_result_iterations(result_id, chunk_order, chunk)
+            chunk_order += 1
+            chunk = list(itertools.islice(iterations, self.RESULT_CHUNK_SIZE))
+        self.update_result(result_id, data, aggregator.aggregates(data))
+
+    def create_result(self, key, value):
+        """Create task result, that iterations are appended to later.
+
+        :param key: dict, scenario identifier
+        :param value: dict, initial data of the result
+        :returns: int id of the task result
+        """
+        return db.task_result_create(
+            self.task["uuid"], key, value,
+            kw_hash=utils.make_config_hash(key["kw"]))["id"]
+
+    def append_result_iterations(self, result_id, chunk_order, iterations):
+        db.task_result_chunk_create(result_id, chunk_order, iterations)
+
+    def update_result(self, result_id, value, aggregates=None):
+        """Update data of the task result.
+
+        :param result_id: int id of the task result
+        :param value: dict, data of the result without iterations
+        :param aggregates: dict, aggregates of the iterations returned by
+                           ResultAggregator.aggregates()
+        """
+        db.task_result_update(result_id, dict(aggregates or {}, data=value))
 
     def delete(self, status=None):
         db.task_delete(self.task["uuid"], status=status)
@@ -18,8 +18,6 @@ import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -29,6 +27,11 @@ class StreamingAlgorithm(object):
     def add(self, value):
         """Process a single value from the input stream."""
 
+    def add_values(self, values):
+        """Process a sequence of values from the input stream."""
+        for value in values:
+            self.add(value)
+
     @abc.abstractmethod
     def merge(self, other):
         """Merge results processed by another instance."""
@@ -55,6 +58,10 @@ class MeanComputation(StreamingAlgorithm):
         self.count += 1
         self.total += value
 
+    def add_values(self, values):
+        self.count += len(values)
+        self.total += sum(values)
+
     def merge(self, other):
         self.count += other.count
         self.total += other.total
@@ -123,6 +130,10 @@ class MinComputation(StreamingAlgorithm):
         if self._value is None or value < self._value:
             self._value = value
 
+    def add_values(self, values):
+        if values:
+            self.add(min(self._cast_to_float(v) for v in values))
+
     def merge(self, other):
         if other._value is not None:
             self.add(other._value)
@@ -143,6 +154,10 @@ class MaxComputation(StreamingAlgorithm):
         if self._value is None or value > self._value:
             self._value = value
 
+    def add_values(self, values):
+        if values:
+            self.add(max(self._cast_to_float(v) for v in values))
+
     def merge(self, other):
         if other._value is not None:
             self.add(other._value)
@@ -152,42 +167,255 @@ class MaxComputation(StreamingAlgorithm):
 
 
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
-
-    def __init__(self, percent, length):
+    """Compute percentile value from a stream of numbers.
+
+    Values are stored as is while there are no more than `exact_size` of
+    them, so the result is exact for short streams. Then they are moved to
+    a histogram with logarithmic buckets: value v goes to the bucket
+    ceil(log(|v|) / log(gamma)), where gamma = (1 + accuracy) /
+    (1 - accuracy), and each bucket is represented by the value that is
+    within `accuracy` relative error from any value of the bucket. So the
+    result has relative error not greater than `accuracy` and the memory
+    does not depend on the count of values: the number of buckets grows
+    with log(max / min) only, e.g. about 1400 buckets cover values from
+    1 ms to 1000 s with 0.5% accuracy. If there are more than
+    `max_buckets` buckets, the ones that are closest to zero are collapsed,
+    so only the lowest percentiles lose accuracy.
+
+    Instances with the same accuracy can be merged, so partial results
+    computed from parts of the stream (e.g. by different processes) can be
+    combined.
+    """
+
+    def __init__(self, percent, length=None, accuracy=0.005,
+                 exact_size=10000, max_buckets=2048):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements, not used anymore and
+                       kept for backward compatibility
+        :param accuracy: relative error of the result of long streams
+        :param exact_size: count of values to keep as is
+        :param max_buckets: maximal count of buckets for values of each sign
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
+        if not 0 < accuracy < 1:
+            raise ValueError("Unexpected accuracy: %s" % accuracy)
         self._percent = percent
+        self._accuracy = accuracy
+        self._exact_size = exact_size
+        self._max_buckets = max_buckets
+        gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(gamma)
+        self._bucket_factor = 2 / (1 + gamma)
+
+        self._count = 0
+        self._values = []
+        # NOTE: buckets are None while values are stored as is
+        self._buckets = None
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+    def _add_to_buckets(self, value, count=1):
+        if value == 0:
+            self._zeros += count
+            return
+        buckets = self._buckets if value > 0 else self._negative_buckets
+        key = int(math.ceil(math.log(abs(value)) / self._log_gamma))
+        buckets[key] = buckets.get(key, 0) + count
+        if len(buckets) > self._max_buckets:
+            self._collapse(buckets)
+
+    def _collapse(self, buckets):
+        keys = sorted(buckets)
+        excess = len(keys) - self._max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            buckets[target] += buckets.pop(key)
+
+    def _switch_to_buckets(self):
+        if self._buckets is not None:
+            return
+        self._buckets = {}
+        self._negative_buckets = {}
+        self._zeros = 0
+        values, self._values = self._values, None
+        for value in values:
+            self._add_to_buckets(value)
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        value = self._cast_to_float(value)
+        self._count += 1
+        if self._buckets is None:
+            self._values.append(value)
+            if len(self._values) > self._exact_size:
+                self._switch_to_buckets()
+        else:
+            self._add_to_buckets(value)
+
+    def add_values(self, values):
+        values = [self._cast_to_float(v) for v in values]
+        self._count += len(values)
+        if self._buckets is None:
+            self._values.extend(values)
+            if len(self._values) > self._exact_size:
+                self._switch_to_buckets()
+        else:
+            for value in values:
+                self._add_to_buckets(value)
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if self._accuracy != other._accuracy:
+            raise ValueError("Unable to merge percentiles with different "
+                             "accuracy: %s and %s"
+                             % (self._accuracy, other._accuracy))
+        self._count += other._count
+        if self._buckets is None and other._buckets is None:
+            self._values.extend(other._values)
+            if len(self._values) > self._exact_size:
+                self._switch_to_buckets()
+            return
+
+        self._switch_to_buckets()
+        if other._buckets is None:
+            for value in other._values:
+                self._add_to_buckets(value)
+            return
+
+        self._zeros += other._zeros
+        for buckets, other_buckets in (
+                (self._buckets, other._buckets),
+                (self._negative_buckets, other._negative_buckets)):
+            for key, count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + count
+            if len(buckets) > self._max_buckets:
+                self._collapse(buckets)
+
+    def _get_bucket_value(self, key):
+        return math.exp(self._log_gamma * key) * self._bucket_factor
+
+    def _iter_buckets(self):
+        """Yield (value, count) of the buckets in ascending order."""
+        for key in sorted(self._negative_buckets, reverse=True):
+            yield -self._get_bucket_value(key), self._negative_buckets[key]
+        if self._zeros:
+            yield 0.0, self._zeros
+        for key in sorted(self._buckets):
+            yield self._get_bucket_value(key), self._buckets[key]
+
+    def iter_counts(self):
+        """Yield (value, count) of the processed values in ascending order.
+
+        Values of long streams are represented by their buckets, so equal
+        values of different instances with the same accuracy fall into
+        the same pairs.
+        """
+        if self._buckets is not None:
+            for value, count in self._iter_buckets():
+                yield value, count
+            return
+        values = sorted(self._values)
+        idx = 0
+        while idx < len(values):
+            end = idx + 1
+            while end < len(values) and values[end] == values[idx]:
+                end += 1
+            yield values[idx], end - idx
+            idx = end
+
+    def _get_values(self, ranks):
+        """Return values of the given ranks of the sorted stream."""
+        if self._buckets is None:
+            values = sorted(self._values)
+            return [values[rank] for rank in ranks]
+
+        result = []
+        ranks = iter(ranks)
+        rank = next(ranks)
+        seen = 0
+        for value, count in self._iter_buckets():
+            seen += count
+            while rank is not None and rank < seen:
+                result.append(value)
+                rank = next(ranks, None)
+        return result
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
-            # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
-            k = (len(results) - 1) * self._percent
-            f = math.floor(k)
-            c = math.ceil(k)
-            if f == c:
-                return results[int(k)]
-            d0 = results[int(f)] * (c - k)
-            d1 = results[int(c)] * (k - f)
-            return (d0 + d1)
-        return None
+        return self.percentile(self._percent)
+
+    def percentile(self, percent):
+        """Return any percentile of the values processed so far.
+
+        So a single instance can be used for several percentiles of the
+        same stream.
+
+        :param percent: numeric percent (from 0.00..1 to 0.999..)
+        """
+        if not self._count:
+            return None
+        # NOTE(amaretskiy): Calculate percentile of a list of values
+        k = (self._count - 1) * percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            return self._get_values([int(k)])[0]
+        lower, upper = self._get_values([int(f), int(c)])
+        d0 = lower * (c - k)
+        d1 = upper * (k - f)
+        return (d0 + d1)
+
+
+def mann_whitney_u_test(first, second):
+    """Compare distributions of two streams with the Mann-Whitney U test.
+
+    The test is non-parametric, so it does not assume that the values are
+    normally distributed. The values are ranked by PercentileComputation
+    instances, so the memory does not depend on the length of the streams.
+    If either of the streams is long enough to be stored by buckets, both
+    are ranked by buckets and the values of the same bucket are ties.
+
+    :param first: PercentileComputation instance
+    :param second: PercentileComputation instance with the same accuracy
+    :returns: tuple (U statistic of the first stream, two-sided p-value
+              of the normal approximation), p-value is None if any of the
+              streams is empty
+    """
+    n1 = first._count
+    n2 = second._count
+    if not n1 or not n2:
+        return None, None
+    if first._buckets is not None or second._buckets is not None:
+        # NOTE: the instances are merged into empty ones to be ranked by
+        #       buckets, so the given instances are not changed
+        first, second = _to_buckets(first), _to_buckets(second)
+
+    counts = [dict(first.iter_counts()), dict(second.iter_counts())]
+    rank_sum = 0.0
+    ties = 0.0
+    seen = 0
+    for value in sorted(set(counts[0]) | set(counts[1])):
+        count1 = counts[0].get(value, 0)
+        tied = count1 + counts[1].get(value, 0)
+        rank_sum += count1 * (seen + (tied + 1) / 2.0)
+        ties += tied ** 3 - tied
+        seen += tied
+
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1.0)))
+    if variance <= 0:
+        return u, 1.0
+    # NOTE: continuity correction of the normal approximation
+    z = max(abs(u - n1 * n2 / 2.0) - 0.5, 0) / math.sqrt(variance)
+    return u, math.erfc(z / math.sqrt(2))
+
+
+def _to_buckets(ins):
+    result = PercentileComputation(ins._percent, accuracy=ins._accuracy,
+                                   exact_size=0,
+                                   max_buckets=ins._max_buckets)
+    result._switch_to_buckets()
+    result.merge(ins)
+    return result
 
 
 class IncrementComputation(StreamingAlgorithm):
@@ -199,6 +427,9 @@ class IncrementComputation(StreamingAlgorithm):
     def add(self, *args):
         self._count += 1
 
+    def add_values(self, values):
+        self._count += len(values)
+
     def merge(self, other):
         self._count += other._count
 
@@ -17,6 +17,7 @@ import bisect
 import collections
 import copy
 import ctypes
+import hashlib
 import heapq
 import inspect
 import multiprocessing
@@ -26,6 +27,7 @@ import string
 import sys
 import time
 
+import six
 from six import moves
 
 from rally.common import logging
@@ -472,6 +474,37 @@ def merge(length, *sources):
             return
 
 
+def config_to_str(obj):
+    """Convert configuration object into string.
+
+    The string does not depend on order of dict items and list items.
+
+    :param obj: JSON-like object
+    :returns: str
+    """
+    if obj is None:
+        return "None"
+    elif isinstance(obj, six.string_types + (int, float)):
+        return str(obj).strip()
+    elif isinstance(obj, (list, tuple)):
+        return ",".join(sorted([config_to_str(v) for v in obj]))
+    elif isinstance(obj, dict):
+        return "|".join(sorted([":".join([config_to_str(k),
+                                          config_to_str(v)])
+                                for k, v in obj.items()]))
+    raise TypeError("Unexpected type %(type)r of object %(obj)r"
+                    % {"obj": obj, "type": type(obj)})
+
+
+def make_config_hash(obj):
+    """Make hash of configuration object, see config_to_str().
+
+    :param obj: JSON-like object
+    :returns: str md5 hex digest
+    """
+    return hashlib.md5(config_to_str(obj).encode("utf8")).hexdigest()
+
+
 def interruptable_sleep(sleep_time, atomic_delay=0.1):
     """Return after sleep_time seconds.
 
@@ -512,6 +545,15 @@ def terminate_thread(thread_ident, exc_type=exceptions.ThreadTimeoutException):
         ctypes.c_long(thread_ident), ctypes.py_object(exc_type))
 
 
+def cancel_thread_termination(thread_ident):
+    """Cancel termination of a python thread if it is not raised yet.
+
+    :param thread_ident: threading.Thread.ident value
+    """
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_long(thread_ident), None)
+
+
 def timeout_thread(queue):
     """Terminate threads by timeout.
 
@@ -522,7 +564,9 @@ def timeout_thread(queue):
     where `thread_ident` is Thread.ident value of thread to watch, and
     `deadline` is timestamp when thread should be terminated. Also tuple
     (None, None) should be put when all threads are exited and no more
-    threads to watch.
+    threads to watch. If the watched object has terminate() method, it is
+    called instead of terminate_thread(), so the object can guard against
+    termination of a thread that has already finished its job.
 
     :param queue: Queue object to communicate with parent thread.
     """
@@ -542,7 +586,10 @@ def timeout_thread(queue):
             # ValueError means that timeout lower than 0.
             if thread.isAlive():
                 LOG.info("Thread %s is timed out. Terminating." % thread.ident)
-                terminate_thread(thread.ident)
+                if hasattr(thread, "terminate"):
+                    thread.terminate()
+                else:
+                    terminate_thread(thread.ident)
             all_threads.popleft()
 
         if next_thread == (None, None,):
@@ -0,0 +1,332 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Export of task results into a compact columnar binary file.
+
+The file starts with MAGIC and consists of blocks. Each block is a
+struct BLOCK_HEADER with the block type and the length of its payload,
+followed by the payload compressed with zlib:
+
+* WORKLOAD block is JSON with the task result without iterations. It is
+  followed by ITERATIONS blocks of iterations of the workload.
+* ITERATIONS block is a struct CHUNK_HEADER with the length of JSON
+  header, the JSON header and the columns of the chunk of iterations.
+  The columns are little-endian doubles: COLUMNS and then durations of
+  the atomic actions listed in the header. Atomic actions are referred
+  by their index in the dictionary of atomic action names of the
+  workload, new names are appended to it by the header of each chunk.
+  NaN stands for the missing value. Values that do not fit columns (e.g.
+  errors and output) are stored in the header for the rows that have
+  them, while rows with DEFAULTS values store nothing.
+"""
+
+import array
+import collections
+import copy
+import itertools
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+
+import six
+from six.moves.urllib import parse as urlparse
+
+from rally import api
+from rally.common.i18n import _
+from rally.common import logging
+from rally.common import objects
+from rally import exceptions
+from rally.task import exporter
+
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b"RALLYCOL1\n"
+BLOCK_HEADER = struct.Struct("<cI")
+CHUNK_HEADER = struct.Struct("<I")
+WORKLOAD = b"W"
+ITERATIONS = b"I"
+
+COLUMNS = ("timestamp", "duration", "idle_duration", "scheduled_timestamp")
+DEFAULTS = {"error": [], "output": {"additive": [], "complete": []}}
+
+NAN = float("nan")
+
+
+def _to_bytes(values):
+    column = array.array("d", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tostring() if six.PY2 else column.tobytes()
+
+
+def _from_bytes(data):
+    column = array.array("d")
+    if six.PY2:
+        column.fromstring(data)
+    else:
+        column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _to_value(value):
+    return NAN if value is None else value
+
+
+def _from_value(value):
+    return None if math.isnan(value) else value
+
+
+def encode_chunk(iterations, atomic_names):
+    """Encode chunk of iterations.
+
+    :param iterations: list of iterations dicts
+    :param atomic_names: list, dictionary of atomic action names of the
+                         workload, new names are appended to it
+    :returns: bytes payload of ITERATIONS block
+    """
+    atomic_idx = dict((name, idx) for idx, name in enumerate(atomic_names))
+    new_names = []
+    columns = dict((name, []) for name in COLUMNS)
+    atomic = collections.OrderedDict()
+    sparse = collections.defaultdict(list)
+    atomic_none = []
+    missing = []
+    for row, itr in enumerate(iterations):
+        for name in COLUMNS:
+            value = itr.get(name)
+            if value is None and name in itr:
+                sparse[name].append([row, None])
+            columns[name].append(_to_value(value))
+        for name, duration in itr.get("atomic_actions", {}).items():
+            if name not in atomic_idx:
+                atomic_idx[name] = len(atomic_names)
+                atomic_names.append(name)
+                new_names.append(name)
+            if duration is None:
+                atomic_none.append([row, name])
+                continue
+            atomic.setdefault(atomic_idx[name],
+                              [NAN] * len(iterations))[row] = duration
+        for key, value in itr.items():
+            if key in COLUMNS or key == "atomic_actions":
+                continue
+            if key not in DEFAULTS or value != DEFAULTS[key]:
+                sparse[key].append([row, value])
+        for key in DEFAULTS:
+            if key not in itr:
+                missing.append([row, key])
+
+    header = json.dumps({"count": len(iterations),
+                         "atomic_names": new_names,
+                         "atomic": list(atomic),
+                         "sparse": sparse,
+                         "atomic_none": atomic_none,
+                         "missing": missing}).encode("utf8")
+    payload = [CHUNK_HEADER.pack(len(header)), header]
+    payload.extend(_to_bytes(columns[name]) for name in COLUMNS)
+    payload.extend(_to_bytes(values) for values in atomic.values())
+    return b"".join(payload)
+
+
+def decode_chunk(payload, atomic_names):
+    """Decode chunk of iterations.
+
+    :param payload: bytes payload of ITERATIONS block
+    :param atomic_names: list, dictionary of atomic action names of the
+                         workload, new names are appended to it
+    :returns: list of iterations dicts
+    """
+    header_size = CHUNK_HEADER.size
+    header_len = CHUNK_HEADER.unpack(payload[:header_size])[0]
+    header = json.loads(payload[header_size:header_size + header_len]
+                        .decode("utf8"))
+    atomic_names.extend(header["atomic_names"])
+    count = header["count"]
+    column_size = count * array.array("d").itemsize
+    offset = header_size + header_len
+
+    columns = []
+    for idx in range(len(COLUMNS) + len(header["atomic"])):
+        columns.append(_from_bytes(payload[offset:offset + column_size]))
+        offset += column_size
+
+    iterations = []
+    for row in six.moves.range(count):
+        itr = {"atomic_actions": collections.OrderedDict()}
+        for name, column in zip(COLUMNS, columns):
+            value = _from_value(column[row])
+            if value is not None:
+                itr[name] = value
+        for idx, column in zip(header["atomic"], columns[len(COLUMNS):]):
+            value = _from_value(column[row])
+            if value is not None:
+                itr["atomic_actions"][atomic_names[idx]] = value
+        itr.update(copy.deepcopy(DEFAULTS))
+        iterations.append(itr)
+
+    for key, rows in header["sparse"].items():
+        for row, value in rows:
+            iterations[row][key] = value
+    for row, name in header["atomic_none"]:
+        iterations[row]["atomic_actions"][name] = None
+    for row, key in header["missing"]:
+        iterations[row].pop(key)
+    return iterations
+
+
+@exporter.configure(name="columnar-exporter")
+class ColumnarExporter(exporter.TaskExporter):
+    """Export task results into a compact columnar binary file.
+
+    Iterations are read from the DB and written by chunks, so the task
+    results are never loaded into memory as a whole. The file can be
+    imported back with `rally task import`.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def validate(self):
+        """Validate connection string.
+
+        The format of connection string in columnar plugin is
+        columnar-exporter:///<path>
+        """
+        parse_obj = urlparse.urlparse(self.connection_string)
+        if self.connection_string is None or parse_obj.path in ("", "/"):
+            raise exceptions.InvalidConnectionString(
+                "It should be `columnar-exporter:///<path>`.")
+
+    def __init__(self, connection_string):
+        super(ColumnarExporter, self).__init__(connection_string)
+        self.validate()
+        self.path = os.path.expanduser(urlparse.urlparse(
+            connection_string).path[1:])
+
+    @staticmethod
+    def _write_block(stream, block_type, payload):
+        payload = zlib.compress(payload)
+        stream.write(BLOCK_HEADER.pack(block_type, len(payload)))
+        stream.write(payload)
+
+    @staticmethod
+    def _read_blocks(stream):
+        while True:
+            header = stream.read(BLOCK_HEADER.size)
+            if not header:
+                break
+            if len(header) < BLOCK_HEADER.size:
+                raise exceptions.RallyException(
+                    _("Unexpected end of the file."))
+            block_type, size = BLOCK_HEADER.unpack(header)
+            payload = stream.read(size)
+            if len(payload) < size:
+                raise exceptions.RallyException(
+                    _("Unexpected end of the file."))
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise exceptions.RallyException(
+                    _("Corrupted block of the file: %s.") % e)
+            yield block_type, payload
+
+    def export(self, uuid):
+        """Export results of the task to the file.
+
+        :param uuid: uuid of the task object
+        """
+        task = api.Task.get(uuid)
+        LOG.debug("Got the task object by it's uuid %s. " % uuid)
+
+        results = task.get_results_summaries()
+        if not results:
+            raise exceptions.RallyException(
+                "Task %s results would be available when it will finish."
+                % uuid)
+
+        if os.path.dirname(self.path) and (not os.path.exists(os.path.dirname(
+                self.path))):
+            raise IOError("There is no such directory: %s" %
+                          os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            LOG.debug("Writing task %s results to the %s." % (
+                uuid, self.connection_string))
+            f.write(MAGIC)
+            for result in results:
+                workload = {"key": result["key"],
+                            "sla": result["data"]["sla"],
+                            "load_duration": result["data"]["load_duration"],
+                            "full_duration": result["data"]["full_duration"]}
+                self._write_block(f, WORKLOAD,
+                                  json.dumps(workload).encode("utf8"))
+                atomic_names = []
+                iterations = objects.Task.iter_result_iterations(result)
+                chunk = list(itertools.islice(iterations, self.CHUNK_SIZE))
+                while chunk:
+                    self._write_block(f, ITERATIONS,
+                                      encode_chunk(chunk, atomic_names))
+                    chunk = list(itertools.islice(iterations,
+                                                  self.CHUNK_SIZE))
+            LOG.debug("Task %s results was written to the %s." % (
+                uuid, self.connection_string))
+
+    def load(self):
+        """Load task results from the file.
+
+        Iterations of each task result are read from the file lazily, so
+        they have to be consumed before the next task result.
+
+        :returns: generator of task results
+        """
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise exceptions.RallyException(
+                    _("File %s is not a columnar task results file.")
+                    % self.path)
+            blocks = self._read_blocks(f)
+            block = next(blocks, None)
+            while block:
+                block_type, payload = block
+                if block_type != WORKLOAD:
+                    raise exceptions.RallyException(
+                        _("Unexpected block of the file: %r.") % block_type)
+                result = json.loads(payload.decode("utf8"))
+                pending = []
+                iterations = self._iter_iterations(blocks, pending)
+                result["result"] = iterations
+                yield result
+                # NOTE: iterations that are not consumed are skipped
+                collections.deque(iterations, maxlen=0)
+                block = pending[0] if pending else next(blocks, None)
+
+    @staticmethod
+    def _iter_iterations(blocks, pending):
+        """Read iterations of a workload from ITERATIONS blocks.
+
+        :param blocks: generator of blocks of the file
+        :param pending: list, the block after the iterations is put to it
+        """
+        atomic_names = []
+        for block_type, payload in blocks:
+            if block_type != ITERATIONS:
+                pending.append((block_type, payload))
+                return
+            for itr in decode_chunk(payload, atomic_names):
+                yield itr
@@ -14,12 +14,12 @@
 #    under the License.
 
 
-import json
 import os
 
 from six.moves.urllib import parse as urlparse
 
 from rally import api
+from rally.common.io import json_stream
 from rally.common import logging
 from rally import exceptions
 from rally.task import exporter
@@ -61,26 +61,27 @@ class FileExporter(exporter.TaskExporter):
     def export(self, uuid):
         """Export results of the task to the file.
 
+        Iterations are loaded from the DB and written to the file by
+        chunks, so the task results are never kept in memory as a whole.
+
         :param uuid: uuid of the task object
         """
         task = api.Task.get(uuid)
 
         LOG.debug("Got the task object by it's uuid %s. " % uuid)
 
-        task_results = [{"key": x["key"], "result": x["data"]["raw"],
+        task_results = [{"key": x["key"],
+                         "result": task.iter_result_iterations(x),
                          "sla": x["data"]["sla"],
                          "load_duration": x["data"]["load_duration"],
                          "full_duration": x["data"]["full_duration"]}
-                        for x in task.get_results()]
+                        for x in task.get_results(load_iterations=False)]
 
-        if self.type == "json":
-            if task_results:
-                res = json.dumps(task_results, sort_keys=True, indent=4)
-                LOG.debug("Got the task %s results." % uuid)
-            else:
-                msg = ("Task %s results would be available when it will "
-                       "finish." % uuid)
-                raise exceptions.RallyException(msg)
+        if not task_results:
+            msg = ("Task %s results would be available when it will "
+                   "finish." % uuid)
+            raise exceptions.RallyException(msg)
+        LOG.debug("Got the task %s results." % uuid)
 
         if os.path.dirname(self.path) and (not os.path.exists(os.path.dirname(
                 self.path))):
@@ -89,6 +90,14 @@ class FileExporter(exporter.TaskExporter):
         with open(self.path, "w") as f:
             LOG.debug("Writing task %s results to the %s." % (
                 uuid, self.connection_string))
-            f.write(res)
+            json_stream.dump(task_results, f, sort_keys=True, indent=4)
             LOG.debug("Task %s results was written to the %s." % (
                 uuid, self.connection_string))
+
+    def load(self):
+        """Load task results from the file.
+
+        Iterations are not loaded into memory, but read from the file
+        each time they are iterated over.
+        """
+        return api.Task.load_results(self.path)
@@ -23,6 +23,7 @@ from six.moves import queue as Queue
 from rally.common import logging
 from rally.common import utils
 from rally import consts
+from rally import exceptions
 from rally.task import runner
 from rally.task import utils as butils
 
@@ -115,6 +116,143 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
         collector_thr_by_timeout.join()
 
 
+class _IterationWatcher(object):
+    """Represent a single iteration of a long-living worker thread.
+
+    utils.timeout_thread() terminates threads which are still alive after
+    their deadline. Worker threads of the pool outlive their iterations, so
+    the timeout thread is fed with this object instead: it refers to the
+    worker thread by ident, but is "alive" only while the iteration runs.
+
+    The termination and the finish of the iteration are serialized by a
+    lock, so the thread is never terminated after the iteration is over.
+    """
+
+    def __init__(self):
+        self.ident = threading.current_thread().ident
+        self._lock = threading.Lock()
+        self._finished = False
+        self._terminated = False
+
+    def isAlive(self):
+        return not self._finished
+
+    is_alive = isAlive
+
+    def terminate(self):
+        with self._lock:
+            if not self._finished:
+                self._terminated = True
+                utils.terminate_thread(self.ident)
+
+    def finish(self):
+        with self._lock:
+            self._finished = True
+            if self._terminated:
+                # NOTE: the exception is raised asynchronously, so it can
+                #       be still pending when the iteration is finished
+                utils.cancel_thread_termination(self.ident)
+
+
+def _worker_pool_thread(queue, iteration_gen, timeout, timeout_queue, times,
+                        context, cls, method_name, args, aborted):
+    """Run scenario iterations one by one until all of them are taken.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator, shared between
+                          all threads of all processes
+    :param timeout: operation's timeout
+    :param timeout_queue: queue of utils.timeout_thread(), it is used only
+                          if timeout is specified
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    """
+    while not aborted.is_set():
+        watcher = None
+        result = None
+        try:
+            try:
+                iteration = next(iteration_gen)
+                if iteration >= times:
+                    break
+                scenario_context = runner._get_scenario_context(iteration,
+                                                                context)
+                watcher = _IterationWatcher()
+                if timeout:
+                    timeout_queue.put((watcher, time.time() + timeout))
+                result = runner._run_scenario_once(cls, method_name,
+                                                   scenario_context, args)
+            finally:
+                if watcher:
+                    watcher.finish()
+        except exceptions.ThreadTimeoutException:
+            # NOTE: The timeout is checked and raised asynchronously, so
+            #       it can hit the worker right after the iteration is
+            #       finished, even within watcher.finish(). Once finish()
+            #       is done, the thread can't be terminated anymore.
+            pass
+        if result is not None:
+            queue.put(result)
+
+
+def _worker_pool_process(queue, iteration_gen, timeout, concurrency, times,
+                         context, cls, method_name, args, aborted, info):
+    """Start the scenario within a fixed pool of long-living threads.
+
+    Unlike _worker_process(), a thread is not created per each iteration.
+    Instead, `concurrency' threads are started once and each of them takes
+    iterations numbers from the shared iteration_gen until `times' is
+    reached or load generation is aborted. The process just waits for its
+    threads to finish, so there is no polling.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param concurrency: number of concurrently running scenario iterations
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+
+    runner._log_worker_info(times=times, concurrency=concurrency,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
+
+    timeout_queue = Queue.Queue()
+    if timeout:
+        collector_thr_by_timeout = threading.Thread(
+            target=utils.timeout_thread,
+            args=(timeout_queue, )
+        )
+        collector_thr_by_timeout.start()
+
+    pool = []
+    for i in range(concurrency):
+        thread = threading.Thread(
+            target=_worker_pool_thread,
+            args=(queue, iteration_gen, timeout, timeout_queue, times,
+                  context, cls, method_name, args, aborted))
+        thread.start()
+        pool.append(thread)
+
+    for thread in pool:
+        thread.join()
+
+    if timeout:
+        timeout_queue.put((None, None,))
+        collector_thr_by_timeout.join()
+
+
 @runner.configure(name="constant")
 class ConstantScenarioRunner(runner.ScenarioRunner):
     """Creates constant load executing a scenario a specified number of times.
@@ -127,8 +265,14 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
     number of concurrent scenarios which execute during a single
     iteration in order to simulate the activities of multiple users
     placing load on the cloud under test.
+
+    If worker_pool is set, each worker process keeps `concurrency' long-living
+    threads instead of starting a new thread per each iteration. This
+    significantly reduces CPU usage of the load generator for big `times'.
     """
 
+    WORKER_SLA_SUPPORTED = True
+
     CONFIG_SCHEMA = {
         "type": "object",
         "$schema": consts.JSON_SCHEMA,
@@ -147,9 +291,15 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
             "timeout": {
                 "type": "number",
             },
+            "worker_sla": {
+                "type": "boolean"
+            },
             "max_cpu_count": {
                 "type": "integer",
                 "minimum": 1
+            },
+            "worker_pool": {
+                "type": "boolean"
             }
         },
         "required": ["type"],
@@ -202,8 +352,13 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
+        if self.config.get("worker_pool", False):
+            worker_process = _worker_pool_process
+        else:
+            worker_process = _worker_process
+
         process_pool = self._create_process_pool(
-            processes_to_start, _worker_process,
+            processes_to_start, worker_process,
             worker_args_gen(concurrency_overhead))
         self._join_processes(process_pool, result_queue)
 
@@ -0,0 +1,306 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import multiprocessing
+import time
+
+from rally.common.i18n import _
+from rally.common import logging
+from rally.common import utils
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import utils as butils
+
+try:
+    import asyncio
+except ImportError:
+    # NOTE: asyncio is available since Python 3.4 only
+    asyncio = None
+
+LOG = logging.getLogger(__name__)
+
+
+def _is_awaitable(obj):
+    return asyncio.iscoroutine(obj) or isinstance(obj, asyncio.Future)
+
+
+def _run_scenario_once_async(loop, cls, method_name, context_obj,
+                             scenario_kwargs, timeout=0):
+    """Start one scenario iteration on the event loop.
+
+    This is the event loop counterpart of runner._run_scenario_once(). If the
+    scenario method returns a coroutine (or a future), it is scheduled on the
+    loop and the iteration is finished when it is done. If the scenario is
+    a plain function, it is already finished when it returns, so it blocks
+    the loop for the whole iteration and the timeout doesn't apply to it.
+
+    :param loop: event loop to run the iteration on
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param context_obj: scenario context of the iteration
+    :param scenario_kwargs: scenario args
+    :param timeout: iteration timeout, 0 means no timeout
+    :returns: asyncio.Future with the iteration result dict
+    """
+    iteration = context_obj["iteration"]
+    task_uuid = context_obj["task"]["uuid"]
+
+    # provide arguments isolation between iterations
+    scenario_kwargs = copy.deepcopy(scenario_kwargs)
+
+    LOG.info("Task %(task)s | ITER: %(iteration)s START" %
+             {"task": task_uuid, "iteration": iteration})
+
+    result = asyncio.Future(loop=loop)
+    scenario_inst = cls(context_obj)
+    started_at = time.time()
+
+    def finish(error):
+        duration = time.time() - started_at
+        status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
+        LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
+                 {"task": task_uuid, "iteration": iteration,
+                  "status": status})
+        result.set_result({
+            "duration": duration - scenario_inst.idle_duration(),
+            "timestamp": started_at,
+            "idle_duration": scenario_inst.idle_duration(),
+            "error": error,
+            "output": scenario_inst._output,
+            "atomic_actions": scenario_inst.atomic_actions()})
+
+    def on_done(future):
+        try:
+            future.result()
+        except asyncio.TimeoutError:
+            finish(butils.format_exc(exceptions.ThreadTimeoutException()))
+        # NOTE: CancelledError is not an Exception since Python 3.8
+        except (asyncio.CancelledError, Exception) as e:
+            if logging.is_debug():
+                LOG.exception(e)
+            finish(butils.format_exc(e))
+        else:
+            finish([])
+
+    try:
+        awaitable = getattr(scenario_inst, method_name)(**scenario_kwargs)
+        if not _is_awaitable(awaitable):
+            finish([])
+            return result
+        if not isinstance(awaitable, asyncio.Future):
+            awaitable = loop.create_task(awaitable)
+        if timeout:
+            awaitable = loop.create_task(asyncio.wait_for(awaitable, timeout))
+    except Exception as e:
+        if logging.is_debug():
+            LOG.exception(e)
+        finish(butils.format_exc(e))
+        return result
+
+    awaitable.add_done_callback(on_done)
+    return result
+
+
+class _IterationScheduler(object):
+    """Keep the specified number of iterations running on the event loop.
+
+    A new iteration is started from the done callback of the previous one,
+    so the loop is never polled and the number of iterations in flight is
+    limited only by the concurrency.
+    """
+
+    def __init__(self, loop, queue, iteration_gen, timeout, concurrency,
+                 times, context, cls, method_name, args, aborted):
+        self.loop = loop
+        self.queue = queue
+        self.iteration_gen = iteration_gen
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.times = times
+        self.context = context
+        self.cls = cls
+        self.method_name = method_name
+        self.args = args
+        self.aborted = aborted
+        self.running = 0
+        self.exhausted = False
+        self.finished = asyncio.Future(loop=loop)
+
+    def run(self):
+        self.loop.call_soon(self._launch)
+        self.loop.run_until_complete(self.finished)
+
+    def _launch(self):
+        while not self.exhausted and self.running < self.concurrency:
+            if self.aborted.is_set():
+                self.exhausted = True
+                break
+            iteration = next(self.iteration_gen)
+            if iteration >= self.times:
+                self.exhausted = True
+                break
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            self.context)
+            self.running += 1
+            future = _run_scenario_once_async(
+                self.loop, self.cls, self.method_name, scenario_context,
+                self.args, self.timeout)
+            future.add_done_callback(self._on_iteration_done)
+
+        if self.exhausted and not self.running and not self.finished.done():
+            self.finished.set_result(None)
+
+    def _on_iteration_done(self, future):
+        self.running -= 1
+        self.queue.put(future.result())
+        self._launch()
+
+
+def _worker_process(queue, iteration_gen, timeout, concurrency, times,
+                    context, cls, method_name, args, aborted, info):
+    """Start the scenario iterations on an event loop.
+
+    Unlike the constant runner worker, no thread is created per iteration:
+    all iterations of the worker are interleaved on a single event loop,
+    so the number of concurrent iterations is limited by the scenario I/O
+    rather than by the OS threads.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: iteration timeout, 0 means no timeout
+    :param concurrency: number of concurrently running scenario iterations
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    runner._log_worker_info(times=times, concurrency=concurrency,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
+
+    loop = asyncio.new_event_loop()
+    # NOTE: scenarios get the loop via asyncio.get_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        _IterationScheduler(loop, queue, iteration_gen, timeout, concurrency,
+                            times, context, cls, method_name, args,
+                            aborted).run()
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@runner.configure(name="asyncio")
+class AsyncioScenarioRunner(runner.ScenarioRunner):
+    """Creates constant load running iterations on event loops.
+
+    This runner is like the "constant" one, but each worker process runs
+    its share of the concurrent iterations on a single asyncio event loop
+    instead of a thread per iteration. It makes tens of thousands of
+    iterations in flight possible for I/O-bound scenarios, that are
+    coroutines (e.g. AsyncHttpRequests.check_request). Plain scenarios are
+    supported as well, but they block the loop, so they are executed one
+    by one within a worker process and can't be interrupted by timeout.
+
+    The runner requires Python 3.4 or newer.
+    """
+
+    WORKER_SLA_SUPPORTED = True
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "worker_sla": {
+                "type": "boolean"
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        if asyncio is None:
+            raise exceptions.RallyException(
+                _("Runner `asyncio` requires Python 3.4 or newer."))
+
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+        times = self.config.get("times", 1)
+        concurrency = self.config.get("concurrency", 1)
+        iteration_gen = utils.RAMInt()
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
+
+        processes_to_start = min(max_cpu_used, times, concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start)
+
+        self._log_debug_info(times=times, concurrency=concurrency,
+                             timeout=timeout, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead)
+
+        result_queue = multiprocessing.Queue()
+
+        def worker_args_gen(concurrency_overhead):
+            while True:
+                yield (result_queue, iteration_gen, timeout,
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       times, context, cls, method_name, args, self.aborted)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue)
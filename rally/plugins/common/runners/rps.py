@@ -14,7 +14,9 @@
 #    under the License.
 
 import collections
+import functools
 import multiprocessing
+import random
 import threading
 import time
 
@@ -109,6 +111,157 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
         collector_thr_by_timeout.join()
 
 
+def _get_rps_function(rps):
+    """Return function that calculates the requested rps at given moment.
+
+    :param rps: either a number for a constant rate, or a dict with
+                "start", "end" and "duration" keys for a profile:
+                the rate is changed from "start" to "end" linearly
+                during "duration" seconds (ramp) or, if "step" is specified,
+                it is changed by "step" each "duration" seconds (step).
+                When "end" is reached, the rate stays constant.
+    :returns: function that accepts the number of seconds elapsed since
+              the start of the load and returns rps for this moment
+    """
+    if not isinstance(rps, dict):
+        return lambda elapsed: rps
+
+    start, end, duration = rps["start"], rps["end"], rps["duration"]
+    step = rps.get("step")
+    sign = 1 if end >= start else -1
+
+    def get_rps(elapsed):
+        if step:
+            value = start + sign * step * int(elapsed // duration)
+        else:
+            value = start + (end - start) * elapsed / float(duration)
+        return min(value, end) if sign > 0 else max(value, end)
+
+    return get_rps
+
+
+def _get_interval_function(arrival):
+    """Return function that calculates the gap before the next launch.
+
+    :param arrival: "uniform" for evenly spaced launches or "poisson" for
+                    exponentially distributed gaps (Poisson arrivals)
+    """
+    if arrival == "poisson":
+        return random.expovariate
+    return lambda rate: 1.0 / rate
+
+
+def _scheduled_worker_thread(queue, cls, method_name, context_obj,
+                             scenario_kwargs, scheduled_at, slots):
+    try:
+        result = runner._run_scenario_once(cls, method_name, context_obj,
+                                           scenario_kwargs)
+        result["scheduled_timestamp"] = scheduled_at
+        queue.put(result)
+    finally:
+        slots.release()
+
+
+def _scheduled_worker_process(queue, iteration_gen, timeout, rps, times,
+                              max_concurrent, context, cls, method_name,
+                              args, aborted, info, arrival="uniform"):
+    """Start scenario within threads at precalculated moments.
+
+    Unlike _worker_process(), iterations are launched in open loop: the
+    moment of each launch is calculated in advance from the requested rate
+    (a deadline) and doesn't depend on how long previous iterations run.
+    The worker sleeps until the next deadline and launches a thread. If
+    max_concurrent threads are already running, the launch waits for a free
+    slot, so the iteration starts later than scheduled. Each result contains
+    "scheduled_timestamp" in addition to the actual "timestamp", so the lag
+    (and the coordinated omission) is visible in reports.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param rps: requested rate of this worker, number or profile dict,
+                see _get_rps_function()
+    :param times: total number of scenario iterations to be run
+    :param max_concurrent: maximum worker concurrency
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of runned process
+    :param arrival: "uniform" or "poisson", see _get_interval_function()
+    """
+
+    pool = collections.deque()
+    slots = threading.BoundedSemaphore(max_concurrent)
+    get_rps = _get_rps_function(rps)
+    get_interval = _get_interval_function(arrival)
+
+    runner._log_worker_info(times=times, rps=rps, arrival=arrival,
+                            timeout=timeout, cls=cls,
+                            method_name=method_name, args=args)
+
+    timeout_queue = Queue.Queue()
+    if timeout:
+        collector_thr_by_timeout = threading.Thread(
+            target=utils.timeout_thread,
+            args=(timeout_queue, )
+        )
+        collector_thr_by_timeout.start()
+
+    # NOTE: Shift the schedules of the processes so that they don't
+    #       launch iterations at the same moments
+    start = time.time()
+    scheduled_at = start + (get_interval(get_rps(0))
+                            * info["processes_counter"]
+                            / info["processes_to_start"])
+    is_saturated = False
+
+    i = 0
+    while i < times:
+        delay = scheduled_at - time.time()
+        if delay > 0 and aborted.wait(delay):
+            break
+        if aborted.is_set():
+            break
+
+        if not slots.acquire(False):
+            if not is_saturated:
+                is_saturated = True
+                LOG.warning("Task %(task)s | max concurrency %(max)s is "
+                            "reached, iterations are launched later than "
+                            "scheduled" % {"task": context["task"]["uuid"],
+                                           "max": max_concurrent})
+            slots.acquire()
+
+        scenario_context = runner._get_scenario_context(next(iteration_gen),
+                                                        context)
+        thread = threading.Thread(
+            target=_scheduled_worker_thread,
+            args=(queue, cls, method_name, scenario_context, args,
+                  scheduled_at, slots))
+        thread.start()
+        if timeout:
+            timeout_queue.put((thread, time.time() + timeout))
+        pool.append(thread)
+
+        # NOTE: Forget finished threads, otherwise the pool would
+        #       keep `times' threads objects
+        while pool and not pool[0].isAlive():
+            pool.popleft().join()
+
+        i += 1
+        scheduled_at += get_interval(get_rps(scheduled_at - start))
+
+    while pool:
+        pool.popleft().join()
+
+    if timeout:
+        timeout_queue.put((None, None,))
+        collector_thr_by_timeout.join()
+
+
 @runner.configure(name="rps")
 class RPSScenarioRunner(runner.ScenarioRunner):
     """Scenario runner that does the job with specified frequency.
@@ -120,8 +273,20 @@ class RPSScenarioRunner(runner.ScenarioRunner):
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    With "open_loop" enabled, iterations are launched at precalculated
+    moments regardless of the previous iterations durations, and each
+    iteration result keeps the moment it was scheduled to. In this mode
+    "rps" can also be a profile that changes the rate during the load:
+    linearly ({"start": 1, "end": 10, "duration": 60}) or by steps
+    ({"start": 1, "end": 10, "step": 2, "duration": 60}), and "arrival" can
+    be set to "poisson" to get exponentially distributed gaps between
+    launches instead of even ones. Profiles and poisson arrivals always
+    use the open loop scheduling.
     """
 
+    WORKER_SLA_SUPPORTED = True
+
     CONFIG_SCHEMA = {
         "type": "object",
         "$schema": consts.JSON_SCHEMA,
@@ -134,9 +299,46 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                 "minimum": 1
             },
             "rps": {
-                "type": "number",
-                "exclusiveMinimum": True,
-                "minimum": 0
+                "anyOf": [
+                    {
+                        "type": "number",
+                        "exclusiveMinimum": True,
+                        "minimum": 0
+                    },
+                    {
+                        "type": "object",
+                        "properties": {
+                            "start": {
+                                "type": "number",
+                                "exclusiveMinimum": True,
+                                "minimum": 0
+                            },
+                            "end": {
+                                "type": "number",
+                                "exclusiveMinimum": True,
+                                "minimum": 0
+                            },
+                            "step": {
+                                "type": "number",
+                                "exclusiveMinimum": True,
+                                "minimum": 0
+                            },
+                            "duration": {
+                                "type": "number",
+                                "exclusiveMinimum": True,
+                                "minimum": 0
+                            }
+                        },
+                        "required": ["start", "end", "duration"],
+                        "additionalProperties": False
+                    }
+                ]
+            },
+            "arrival": {
+                "enum": ["uniform", "poisson"]
+            },
+            "open_loop": {
+                "type": "boolean"
             },
             "timeout": {
                 "type": "number",
@@ -145,6 +347,9 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                 "type": "integer",
                 "minimum": 1
             },
+            "worker_sla": {
+                "type": "boolean"
+            },
             "max_cpu_count": {
                 "type": "integer",
                 "minimum": 1
@@ -181,7 +386,8 @@ class RPSScenarioRunner(runner.ScenarioRunner):
 
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
-        rps_per_worker = float(self.config["rps"]) / processes_to_start
+        rps_per_worker = self._get_rps_per_worker(self.config["rps"],
+                                                  processes_to_start)
         times_per_worker, times_overhead = divmod(times, processes_to_start)
 
         # Determine concurrency per worker
@@ -222,7 +428,24 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
+        arrival = self.config.get("arrival", "uniform")
+        if (self.config.get("open_loop", False) or arrival != "uniform"
+                or isinstance(rps_per_worker, dict)):
+            worker_process = functools.partial(_scheduled_worker_process,
+                                               arrival=arrival)
+        else:
+            worker_process = _worker_process
+
         process_pool = self._create_process_pool(
-            processes_to_start, _worker_process,
+            processes_to_start, worker_process,
             worker_args_gen(times_overhead, concurrency_overhead))
         self._join_processes(process_pool, result_queue)
+
+    @staticmethod
+    def _get_rps_per_worker(rps, processes_to_start):
+        """Split the requested rate (or rate profile) between processes."""
+        if isinstance(rps, dict):
+            return dict((k, float(v) / processes_to_start
+                         if k != "duration" else v)
+                        for k, v in rps.items())
+        return float(rps) / processes_to_start
@@ -14,6 +14,7 @@ import random
 
 from rally.plugins.common.scenarios.requests import utils
 from rally.task import scenario
+from rally.task import validation
 
 
 class HttpRequests(utils.RequestScenario):
@@ -49,3 +50,46 @@ class HttpRequests(utils.RequestScenario):
         request = random.choice(requests)
         request.setdefault("status_code", status_code)
         self._check_request(**request)
+
+
+class AsyncHttpRequests(utils.AsyncRequestScenario):
+    """Benchmark scenarios for HTTP requests that run on an event loop.
+
+    These scenarios return futures, so they can be run by the asyncio
+    runner only.
+    """
+
+    @validation.required_runners("asyncio")
+    @scenario.configure()
+    def check_request(self, url, method, status_code, **kwargs):
+        """Benchmark web services with a high number of requests in flight.
+
+        Like HttpRequests.check_request, but the request is made without
+        blocking, so one worker process of the asyncio runner can wait for
+        thousands of responses at the same time.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param kwargs: optional additional request parameters: params,
+                       headers, data, json
+        """
+
+        return self._check_request(url, method, status_code, **kwargs)
+
+    @validation.required_runners("asyncio")
+    @scenario.configure()
+    def check_random_request(self, requests, status_code):
+        """Benchmark the list of requests without blocking.
+
+        This scenario takes random url from list of requests, and raises
+        exception if the response is not the expected response.
+
+        :param requests: List of request dicts
+        :param status_code: Expected Response Code it will
+        be used only if we doesn't specified it in request proper
+        """
+
+        request = random.choice(requests)
+        request.setdefault("status_code", status_code)
+        return self._check_request(**request)
@@ -10,12 +10,24 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import time
+
 import requests
+import six
+from six.moves.urllib import parse
 
 from rally.common.i18n import _
+from rally import exceptions
 from rally.task import atomic
 from rally.task import scenario
 
+try:
+    import asyncio
+except ImportError:
+    # NOTE: asyncio is available since Python 3.4 only
+    asyncio = None
+
 
 class RequestScenario(scenario.Scenario):
     """Base class for Request scenarios with basic atomic actions."""
@@ -37,3 +49,154 @@ class RequestScenario(scenario.Scenario):
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+
+def _build_request(url, method, params=None, headers=None, data=None,
+                   json_data=None):
+    """Build raw HTTP/1.1 request.
+
+    :returns: tuple (host, port, ssl, request bytes)
+    """
+    parts = parse.urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(_("Unsupported URL scheme `%s`") % parts.scheme)
+    is_ssl = parts.scheme == "https"
+    port = parts.port or (443 if is_ssl else 80)
+
+    path = parts.path or "/"
+    query = parts.query
+    if params:
+        query = "&".join(filter(None, [query, parse.urlencode(params)]))
+    if query:
+        path = "%s?%s" % (path, query)
+
+    headers = dict(headers or {})
+    if json_data is not None:
+        data = json.dumps(json_data)
+        headers.setdefault("Content-Type", "application/json")
+    elif isinstance(data, dict):
+        data = parse.urlencode(data)
+        headers.setdefault("Content-Type",
+                           "application/x-www-form-urlencoded")
+    if isinstance(data, six.text_type):
+        data = data.encode("utf-8")
+    data = data or b""
+
+    headers.setdefault("Host", parts.netloc.rsplit("@", 1)[-1])
+    headers["Content-Length"] = str(len(data))
+    headers["Connection"] = "close"
+
+    lines = ["%s %s HTTP/1.1" % (method.upper(), path)]
+    lines.extend("%s: %s" % item for item in sorted(headers.items()))
+    request = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + data
+    return parts.hostname, port, is_ssl, request
+
+
+if asyncio:
+    class _StatusCodeProtocol(asyncio.Protocol):
+        """Send HTTP request and read the status code of the response.
+
+        Only the status line is read, then the connection is closed.
+        """
+
+        def __init__(self, request, waiter):
+            self.request = request
+            self.waiter = waiter
+            self.transport = None
+            self.buffer = b""
+
+        def connection_made(self, transport):
+            self.transport = transport
+            transport.write(self.request)
+
+        def data_received(self, data):
+            self.buffer += data
+            if b"\r\n" not in self.buffer or self.waiter.done():
+                return
+            status_line = self.buffer.split(b"\r\n", 1)[0]
+            try:
+                self.waiter.set_result(int(status_line.split()[1]))
+            except (IndexError, ValueError):
+                self.waiter.set_exception(ValueError(
+                    _("Malformed HTTP status line `%s`") % status_line))
+            self.transport.close()
+
+        def connection_lost(self, exc):
+            if not self.waiter.done():
+                self.waiter.set_exception(exc or IOError(
+                    _("Connection closed before HTTP response")))
+
+
+class AsyncRequestScenario(scenario.Scenario):
+    """Base class for Request scenarios that run on an event loop.
+
+    Scenario methods of the subclasses return futures, so they are
+    interleaved by the asyncio runner without a thread per request.
+    """
+
+    def _check_request(self, url, method, status_code, params=None,
+                       headers=None, data=None, json=None):
+        """Compare request status code with specified code
+
+        Unlike RequestScenario._check_request(), redirects are not followed.
+
+        :param status_code: Expected status code of request
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param params: Dict or list of tuples to be sent in the query string
+        :param headers: Dict of HTTP headers
+        :param data: Dict or string to be sent in the body
+        :param json: Object to be sent in the body as JSON
+        :returns: asyncio.Future that raises ValueError if return http status
+                  code not equal to expected status code
+        :raises RallyException: if asyncio is not available
+        """
+        if asyncio is None:
+            raise exceptions.RallyException(
+                _("Asynchronous requests require Python 3.4 or newer."))
+        loop = asyncio.get_event_loop()
+        result = asyncio.Future(loop=loop)
+        started_at = time.time()
+
+        def on_done(future):
+            # NOTE: it is called on cancel (e.g. by timeout) as well, but
+            #       the duration is recorded for finished requests only
+            if not future.cancelled():
+                name = atomic.ActionTimer._get_atomic_action_name(
+                    self, "requests.check_request")
+                self._atomic_actions[name] = time.time() - started_at
+            if not connection.done():
+                connection.cancel()
+            elif not connection.cancelled() and not connection.exception():
+                connection.result()[0].close()
+
+        def on_status(waiter):
+            exc = waiter.exception()
+            if result.done():
+                return
+            if exc:
+                result.set_exception(exc)
+            elif waiter.result() != status_code:
+                error_msg = _("Expected HTTP request code is `%s` actual `%s`")
+                result.set_exception(
+                    ValueError(error_msg % (status_code, waiter.result())))
+            else:
+                result.set_result(waiter.result())
+
+        def on_connect(connection):
+            if connection.cancelled() or waiter.done():
+                return
+            if connection.exception():
+                waiter.set_exception(connection.exception())
+
+        host, port, is_ssl, request = _build_request(
+            url, method, params=params, headers=headers, data=data,
+            json_data=json)
+        waiter = asyncio.Future(loop=loop)
+        waiter.add_done_callback(on_status)
+        result.add_done_callback(on_done)
+        connection = loop.create_task(loop.create_connection(
+            lambda: _StatusCodeProtocol(request, waiter), host, port,
+            ssl=is_ssl))
+        connection.add_done_callback(on_connect)
+        return result
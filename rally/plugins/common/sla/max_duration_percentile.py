@@ -0,0 +1,89 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+SLA (Service-level agreement) is set of details for determining compliance
+with contracted values such as maximum error rate or minimum response time.
+"""
+
+from rally.common.i18n import _
+from rally import consts
+from rally.task import sla
+
+
+@sla.configure(name="max_duration_percentile")
+class MaxDurationPercentile(sla.SLA):
+    """Maximum duration of the given percentile of iterations in seconds.
+
+    E.g. {"percentile": 95, "max": 10} requires at least 95% of successful
+    iterations to take no longer than 10 seconds.
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "percentile": {"type": "number", "minimum": 0.0,
+                           "exclusiveMinimum": True, "maximum": 100.0,
+                           "exclusiveMaximum": True},
+            "max": {"type": "number", "minimum": 0.0,
+                    "exclusiveMinimum": True}
+        },
+        "required": ["percentile", "max"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxDurationPercentile, self).__init__(criterion_value)
+        self.percentile = self.criterion_value["percentile"]
+        self.max_duration = self.criterion_value["max"]
+        self.iterations = 0
+        self.slow_iterations = 0
+
+    def _check(self):
+        # NOTE: Sorting all durations to get the percentile on each
+        #       iteration is too expensive, so the equivalent condition is
+        #       checked: the share of iterations slower than max should not
+        #       exceed (100 - percentile)%
+        self.success = (self.slow_iterations * 100.0
+                        <= self.iterations * (100.0 - self.percentile))
+        return self.success
+
+    def _get_fast_share(self):
+        """Get percent of successful iterations not slower than max."""
+        if not self.iterations:
+            return 100.0
+        return (self.iterations - self.slow_iterations) * 100.0 / (
+            self.iterations)
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            self.iterations += 1
+            if iteration["duration"] > self.max_duration:
+                self.slow_iterations += 1
+        return self._check()
+
+    def merge(self, other):
+        self.iterations += other.iterations
+        self.slow_iterations += other.slow_iterations
+        return self._check()
+
+    def details(self):
+        # NOTE: the share of fast iterations is reported instead of the
+        #       percentile value, because it is what the status depends on
+        return (_("%(percentile)s%% of iterations take <= %(max).2fs "
+                  "(actually %(share).1f%%) - %(status)s") %
+                {"percentile": self.percentile, "max": self.max_duration,
+                 "share": self._get_fast_share(), "status": self.status()})
@@ -30,7 +30,8 @@ LOG = logging.getLogger(__name__)
 class SeekAndDestroy(object):
     cache = {}
 
-    def __init__(self, manager_cls, admin, users, api_versions=None):
+    def __init__(self, manager_cls, admin, users, api_versions=None,
+                 exclude=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -40,11 +41,13 @@ class SeekAndDestroy(object):
         :param admin: admin credential like in context["admin"]
         :param users: users credentials like in context["users"]
         :param api_versions: dict of client API versions
+        :param exclude: ids of resources which should not be deleted
         """
         self.manager_cls = manager_cls
         self.admin = admin
         self.users = users or []
         self.api_versions = api_versions
+        self.exclude = exclude or set()
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -60,6 +63,13 @@ class SeekAndDestroy(object):
                 user["credential"], api_info=self.api_versions)
         return self.cache[key]
 
+    def _get_resource_id(self, admin, user, raw_resource):
+        return self.manager_cls(
+            resource=raw_resource,
+            admin=self._get_cached_client(admin),
+            user=self._get_cached_client(user),
+            tenant_uuid=user and user["tenant_id"]).id()
+
     def _delete_single_resource(self, resource):
         """Safe resource deletion with retries and timeouts.
 
@@ -138,6 +148,9 @@ class SeekAndDestroy(object):
             def _publish(admin, user, manager):
                 try:
                     for raw_resource in rutils.retry(3, manager.list):
+                        if (self.exclude and self._get_resource_id(
+                                admin, user, raw_resource) in self.exclude):
+                            continue
                         queue.append((admin, user, raw_resource))
                 except Exception as e:
                     LOG.warning(
@@ -193,6 +206,16 @@ class SeekAndDestroy(object):
         broker.run(self._gen_publisher(), self._gen_consumer(),
                    consumers_count=self.manager_cls._threads)
 
+    def list_ids(self):
+        """List ids of all resources for passed users, admin and resource_mgr.
+
+        :returns: set of ids of resources
+        """
+        jobs = []
+        self._gen_publisher()(jobs)
+        return set(self._get_resource_id(admin, user, raw_resource)
+                   for admin, user, raw_resource in jobs)
+
 
 def list_resource_names(admin_required=None):
     """List all resource managers names.
@@ -251,8 +274,25 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def list_resource_ids(names=None, admin_required=None, admin=None,
+                      users=None, api_versions=None):
+    """List ids of existing resources.
+
+    Arguments are the same as the arguments of cleanup().
+
+    :returns: dict with sets of ids of resources, where keys are names of
+              resource managers in format <service>.<resource>
+    """
+    ids = {}
+    for manager in find_resource_managers(names, admin_required):
+        name = "%s.%s" % (manager._service, manager._resource)
+        ids[name] = SeekAndDestroy(manager, admin, users,
+                                   api_versions).list_ids()
+    return ids
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
-            api_versions=None):
+            api_versions=None, exclude=None):
     """Generic cleaner.
 
     This method goes through all plugins. Filter those and left only plugins
@@ -278,9 +318,15 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                     "credential": <rally.common.objects.Credential>
 
                   }
+    :param api_versions: dict of client API versions
+    :param exclude: dict with sets of ids of resources which should not be
+                    deleted, as returned by list_resource_ids()
     """
+    exclude = exclude or {}
     for manager in find_resource_managers(names, admin_required):
         LOG.debug("Cleaning up %(service)s %(resource)s objects" %
                   {"service": manager._service,
                    "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users, api_versions).exterminate()
+        name = "%s.%s" % (manager._service, manager._resource)
+        SeekAndDestroy(manager, admin, users, api_versions,
+                       exclude=exclude.get(name)).exterminate()
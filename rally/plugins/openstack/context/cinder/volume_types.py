@@ -22,7 +22,7 @@ from rally.task import context
 LOG = logging.getLogger(__name__)
 
 
-@context.configure(name="volume_types", order=410)
+@context.configure(name="volume_types", order=410, parallel=True)
 class VolumeTypeGenerator(context.Context):
     """Context class for adding volumes types for benchmarks."""
 
@@ -26,7 +26,8 @@ LOG = logging.getLogger(__name__)
 
 
 # NOTE(amaretskiy): Set order to run this just before UserCleanup
-@context.configure(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True)
+@context.configure(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True,
+                   per_workload=True)
 class AdminCleanup(base.CleanupMixin, context.Context):
     """Context class for admin resources cleanup."""
 
@@ -42,11 +43,13 @@ class AdminCleanup(base.CleanupMixin, context.Context):
                      % missing)
             raise base.NoSuchCleanupResources(missing)
 
+    def _get_cleanup_kwargs(self):
+        return {"names": self.config,
+                "admin_required": True,
+                "admin": self.context["admin"],
+                "users": self.context.get("users", []),
+                "api_versions": self.context["config"].get("api_versions")}
+
     @logging.log_task_wrapper(LOG.info, _("admin resources cleanup"))
     def cleanup(self):
-        manager.cleanup(
-            names=self.config,
-            admin_required=True,
-            admin=self.context["admin"],
-            users=self.context.get("users", []),
-            api_versions=self.context["config"].get("api_versions"))
+        super(AdminCleanup, self).cleanup()
@@ -13,10 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import abc
+
+import six
+
 from rally.common.i18n import _
 from rally.common import logging
 from rally import consts
 from rally import exceptions
+from rally.plugins.openstack.cleanup import manager
 
 
 LOG = logging.getLogger(__name__)
@@ -26,6 +31,7 @@ class NoSuchCleanupResources(exceptions.RallyException):
     msg_fmt = _("Missing cleanup resource managers: %(message)s")
 
 
+@six.add_metaclass(abc.ABCMeta)
 class CleanupMixin(object):
 
     CONFIG_SCHEMA = {
@@ -37,5 +43,20 @@ class CleanupMixin(object):
         "additionalProperties": False
     }
 
+    existing_resources = None
+
+    @abc.abstractmethod
+    def _get_cleanup_kwargs(self):
+        """Returns arguments of manager.cleanup() for the context."""
+
     def setup(self):
-        pass
+        # NOTE: if the other contexts are shared by several workloads, the
+        #       resources which exist before the workload belong to them, so
+        #       they should be kept by the cleanup after the workload
+        if self.context.get("shared_context"):
+            self.existing_resources = manager.list_resource_ids(
+                **self._get_cleanup_kwargs())
+
+    def cleanup(self):
+        manager.cleanup(exclude=self.existing_resources,
+                        **self._get_cleanup_kwargs())
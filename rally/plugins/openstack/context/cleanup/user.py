@@ -26,7 +26,8 @@ LOG = logging.getLogger(__name__)
 
 
 # NOTE(amaretskiy): Set maximum order to run this last
-@context.configure(name="cleanup", order=sys.maxsize, hidden=True)
+@context.configure(name="cleanup", order=sys.maxsize, hidden=True,
+                   per_workload=True)
 class UserCleanup(base.CleanupMixin, context.Context):
     """Context class for user resources cleanup."""
 
@@ -42,11 +43,12 @@ class UserCleanup(base.CleanupMixin, context.Context):
                      % missing)
             raise base.NoSuchCleanupResources(missing)
 
+    def _get_cleanup_kwargs(self):
+        return {"names": self.config,
+                "admin_required": False,
+                "users": self.context.get("users", []),
+                "api_versions": self.context["config"].get("api_versions")}
+
     @logging.log_task_wrapper(LOG.info, _("user resources cleanup"))
     def cleanup(self):
-        manager.cleanup(
-            names=self.config,
-            admin_required=False,
-            users=self.context.get("users", []),
-            api_versions=self.context["config"].get("api_versions")
-        )
+        super(UserCleanup, self).cleanup()
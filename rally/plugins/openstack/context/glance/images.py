@@ -14,6 +14,7 @@
 
 from oslo_config import cfg
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils as rutils
@@ -34,7 +35,7 @@ CONF.import_opt("glance_image_delete_poll_interval",
 LOG = logging.getLogger(__name__)
 
 
-@context.configure(name="images", order=410)
+@context.configure(name="images", order=410, parallel=True)
 class ImageGenerator(context.Context):
     """Context class for adding images to each user for benchmarks."""
 
@@ -70,6 +71,10 @@ class ImageGenerator(context.Context):
             "image_args": {
                 "type": "object",
                 "additionalProperties": True
+            },
+            "resource_management_workers": {
+                "type": "integer",
+                "minimum": 1
             }
         },
         "required": ["image_url", "image_type", "image_container",
@@ -77,62 +82,77 @@ class ImageGenerator(context.Context):
         "additionalProperties": False
     }
 
+    DEFAULT_CONFIG = {
+        "resource_management_workers": 20
+    }
+
+    def _get_glance_wrapper(self, user):
+        clients = osclients.Clients(
+            user["credential"],
+            api_info=self.context["config"].get("api_versions"))
+        return clients, glance_wrapper.wrap(clients.glance, self)
+
+    def _create_images(self, user, tenant_id, image_kwargs):
+        image_name = self.config.get("image_name")
+        glance_wrap = self._get_glance_wrapper(user)[1]
+
+        # NOTE: images are stored in the context as soon as they are
+        #       created, so they are cleaned up even if the setup fails
+        current_images = []
+        self.context["tenants"][tenant_id]["images"] = current_images
+        for i in range(self.config["images_per_tenant"]):
+            if image_name and i > 0:
+                cur_name = image_name + str(i)
+            elif image_name:
+                cur_name = image_name
+            else:
+                cur_name = self.generate_random_name()
+
+            image = glance_wrap.create_image(
+                self.config["image_container"], self.config["image_url"],
+                self.config["image_type"], name=cur_name, **image_kwargs)
+            current_images.append(image.id)
+
+    def _delete_images(self, user, images):
+        clients, glance_wrap = self._get_glance_wrapper(user)
+        # NOTE: request all deletions first and only then wait for them,
+        #       so the images of one tenant are removed in a single batch
+        for image in images:
+            clients.glance().images.delete(image)
+        for image in images:
+            utils.wait_for_status(
+                clients.glance().images.get(image),
+                ["deleted", "pending_delete"],
+                check_deletion=True,
+                update_resource=glance_wrap.get_image,
+                timeout=CONF.benchmark.glance_image_delete_timeout,
+                check_interval=CONF.benchmark.
+                glance_image_delete_poll_interval)
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Images`"))
     def setup(self):
-        image_url = self.config["image_url"]
-        image_type = self.config["image_type"]
-        image_container = self.config["image_container"]
-        images_per_tenant = self.config["images_per_tenant"]
-        image_name = self.config.get("image_name")
+        kwargs = dict(self.config.get("image_args", {}))
+        if self.config.get("min_ram") is not None:
+            LOG.warning("The 'min_ram' argument is deprecated; specify "
+                        "arbitrary arguments with 'image_args' instead")
+            kwargs["min_ram"] = self.config["min_ram"]
+        if self.config.get("min_disk") is not None:
+            LOG.warning("The 'min_disk' argument is deprecated; specify "
+                        "arbitrary arguments with 'image_args' instead")
+            kwargs["min_disk"] = self.config["min_disk"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            current_images = []
-            clients = osclients.Clients(
-                user["credential"],
-                api_info=self.context["config"].get("api_versions"))
-            glance_wrap = glance_wrapper.wrap(clients.glance, self)
-
-            kwargs = self.config.get("image_args", {})
-            if self.config.get("min_ram") is not None:
-                LOG.warning("The 'min_ram' argument is deprecated; specify "
-                            "arbitrary arguments with 'image_args' instead")
-                kwargs["min_ram"] = self.config["min_ram"]
-            if self.config.get("min_disk") is not None:
-                LOG.warning("The 'min_disk' argument is deprecated; specify "
-                            "arbitrary arguments with 'image_args' instead")
-                kwargs["min_disk"] = self.config["min_disk"]
-
-            for i in range(images_per_tenant):
-                if image_name and i > 0:
-                    cur_name = image_name + str(i)
-                elif image_name:
-                    cur_name = image_name
-                else:
-                    cur_name = self.generate_random_name()
-
-                image = glance_wrap.create_image(
-                    image_container, image_url, image_type,
-                    name=cur_name, **kwargs)
-                current_images.append(image.id)
-
-            self.context["tenants"][tenant_id]["images"] = current_images
+        broker.run_concurrently(
+            self._create_images,
+            [(user, tenant_id, kwargs)
+             for user, tenant_id in rutils.iterate_per_tenants(
+                self.context["users"])],
+            workers=self.config["resource_management_workers"])
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            clients = osclients.Clients(
-                user["credential"],
-                api_info=self.context["config"].get("api_versions"))
-            glance_wrap = glance_wrapper.wrap(clients.glance, self)
-            for image in self.context["tenants"][tenant_id].get("images", []):
-                clients.glance().images.delete(image)
-                utils.wait_for_status(
-                    clients.glance().images.get(image),
-                    ["deleted", "pending_delete"],
-                    check_deletion=True,
-                    update_resource=glance_wrap.get_image,
-                    timeout=CONF.benchmark.glance_image_delete_timeout,
-                    check_interval=CONF.benchmark.
-                    glance_image_delete_poll_interval)
+        broker.run_concurrently(
+            self._delete_images,
+            [(user, self.context["tenants"][tenant_id].get("images", []))
+             for user, tenant_id in rutils.iterate_per_tenants(
+                self.context["users"])],
+            workers=self.config["resource_management_workers"])
@@ -70,6 +70,15 @@ class UserContextMixin(object):
                 self._user_choice_method = "random"
         return self._user_choice_method
 
+    def _get_sorted_tenant_ids(self, tenants):
+        # NOTE: tenants are not changed after the context setup, so they
+        #       are sorted once instead of each iteration
+        cached = getattr(self, "_sorted_tenant_ids", None)
+        if (cached is None or cached[0] is not tenants
+                or len(cached[1]) != len(tenants)):
+            cached = self._sorted_tenant_ids = (tenants, sorted(tenants))
+        return cached[1]
+
     def map_for_scenario(self, context_obj):
         """Pass only context of one user and related to it tenant to scenario.
 
@@ -87,7 +96,7 @@ class UserContextMixin(object):
         else:
             # Second and last case - 'round_robin'.
             tenants_amount = len(context_obj["tenants"])
-            tenant_id = sorted(context_obj["tenants"].keys())[
+            tenant_id = self._get_sorted_tenant_ids(context_obj["tenants"])[
                 context_obj["iteration"] % tenants_amount]
             tenant = context_obj["tenants"][tenant_id]
             users = context_obj["tenants"][tenant_id]["users"]
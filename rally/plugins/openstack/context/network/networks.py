@@ -15,6 +15,7 @@
 
 import six
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils
@@ -53,6 +54,10 @@ class Network(context.Context):
             "network_create_args": {
                 "type": "object",
                 "additionalProperties": True
+            },
+            "resource_management_workers": {
+                "type": "integer",
+                "minimum": 1
             }
         },
         "additionalProperties": False
@@ -62,41 +67,57 @@ class Network(context.Context):
         "start_cidr": "10.2.0.0/24",
         "networks_per_tenant": 1,
         "subnets_per_network": 1,
-        "network_create_args": {}
+        "network_create_args": {},
+        "resource_management_workers": 20
     }
 
-    @logging.log_task_wrapper(LOG.info, _("Enter context: `network`"))
-    def setup(self):
+    def _get_network_wrapper(self):
         # NOTE(rkiran): Some clients are not thread-safe. Thus during
         #               multithreading/multiprocessing, it is likely the
         #               sockets are left open. This problem is eliminated by
-        #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
+        #               creating a connection in each worker separately.
+        return network_wrapper.wrap(
             osclients.Clients(self.context["admin"]["credential"]),
             self, config=self.config)
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
-            self.context["tenants"][tenant_id]["networks"] = []
-            for i in range(self.config["networks_per_tenant"]):
-                # NOTE(amaretskiy): add_router and subnets_num take effect
-                #                   for Neutron only.
-                network_create_args = self.config["network_create_args"].copy()
-                network = net_wrapper.create_network(
-                    tenant_id,
-                    add_router=True,
-                    subnets_num=self.config["subnets_per_network"],
-                    network_create_args=network_create_args)
-                self.context["tenants"][tenant_id]["networks"].append(network)
+
+    def _create_networks(self, tenant_id):
+        net_wrapper = self._get_network_wrapper()
+        # NOTE: networks are stored in the context as soon as they are
+        #       created, so they are cleaned up even if the setup fails
+        networks = []
+        self.context["tenants"][tenant_id]["networks"] = networks
+        for i in range(self.config["networks_per_tenant"]):
+            # NOTE(amaretskiy): add_router and subnets_num take effect
+            #                   for Neutron only.
+            network_create_args = self.config["network_create_args"].copy()
+            network = net_wrapper.create_network(
+                tenant_id,
+                add_router=True,
+                subnets_num=self.config["subnets_per_network"],
+                network_create_args=network_create_args)
+            networks.append(network)
+
+    def _delete_networks(self, tenant_id, networks):
+        net_wrapper = self._get_network_wrapper()
+        for network in networks:
+            with logging.ExceptionLogger(
+                    LOG,
+                    _("Failed to delete network for tenant %s") % tenant_id):
+                net_wrapper.delete_network(network)
+
+    @logging.log_task_wrapper(LOG.info, _("Enter context: `network`"))
+    def setup(self):
+        broker.run_concurrently(
+            self._create_networks,
+            [(tenant_id,) for user, tenant_id in (
+                utils.iterate_per_tenants(self.context.get("users", [])))],
+            workers=self.config["resource_management_workers"])
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `network`"))
     def cleanup(self):
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
-        for tenant_id, tenant_ctx in six.iteritems(self.context["tenants"]):
-            for network in tenant_ctx.get("networks", []):
-                with logging.ExceptionLogger(
-                        LOG,
-                        _("Failed to delete network for tenant %s")
-                        % tenant_id):
-                    net_wrapper.delete_network(network)
+        broker.run_concurrently(
+            self._delete_networks,
+            [(tenant_id, tenant_ctx.get("networks", []))
+             for tenant_id, tenant_ctx in six.iteritems(
+                self.context["tenants"])],
+            workers=self.config["resource_management_workers"])
@@ -15,6 +15,7 @@
 
 import novaclient.exceptions
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally import osclients
@@ -28,6 +29,10 @@ LOG = logging.getLogger(__name__)
 @context.configure(name="keypair", order=310)
 class Keypair(context.Context):
 
+    DEFAULT_CONFIG = {
+        "resource_management_workers": 20
+    }
+
     def _generate_keypair(self, credential):
         keypair_name = self.generate_random_name()
 
@@ -48,8 +53,13 @@ class Keypair(context.Context):
 
     @logging.log_task_wrapper(LOG.info, _("Enter context: `keypair`"))
     def setup(self):
-        for user in self.context["users"]:
-            user["keypair"] = self._generate_keypair(user["credential"])
+        users = self.context["users"]
+        keypairs = broker.run_concurrently(
+            self._generate_keypair,
+            [(user["credential"],) for user in users],
+            workers=self.config["resource_management_workers"])
+        for user, keypair in zip(users, keypairs):
+            user["keypair"] = keypair
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `keypair`"))
     def cleanup(self):
@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils as rutils
@@ -59,6 +60,10 @@ class ServerGenerator(context.Context):
             },
             "auto_assign_nic": {
                 "type": "boolean",
+            },
+            "resource_management_workers": {
+                "type": "integer",
+                "minimum": 1
             }
         },
         "required": ["image", "flavor"],
@@ -67,15 +72,44 @@ class ServerGenerator(context.Context):
 
     DEFAULT_CONFIG = {
         "servers_per_tenant": 5,
-        "auto_assign_nic": False
+        "auto_assign_nic": False,
+        "resource_management_workers": 20
     }
 
+    def _boot_tenant_servers(self, iteration, user, tenant_id,
+                             image_id, flavor_id):
+        servers_per_tenant = self.config["servers_per_tenant"]
+        LOG.debug("Booting servers for user tenant %s "
+                  % (user["tenant_id"]))
+        tmp_context = {"user": user,
+                       "tenant": self.context["tenants"][tenant_id],
+                       "task": self.context["task"],
+                       "iteration": iteration}
+        nova_scenario = nova_utils.NovaScenario(tmp_context)
+
+        LOG.debug("Calling _boot_servers with image_id=%(image_id)s "
+                  "flavor_id=%(flavor_id)s "
+                  "servers_per_tenant=%(servers_per_tenant)s"
+                  % {"image_id": image_id,
+                     "flavor_id": flavor_id,
+                     "servers_per_tenant": servers_per_tenant})
+
+        # NOTE: all servers of the tenant are requested at once and only
+        #       then waited for, see NovaScenario._boot_servers
+        servers = nova_scenario._boot_servers(
+            image_id, flavor_id, requests=servers_per_tenant,
+            auto_assign_nic=self.config["auto_assign_nic"])
+        current_servers = [server.id for server in servers]
+
+        # NOTE: servers are stored in the context by the worker, so the
+        #       ones of the other tenants are cleaned up if it fails
+        LOG.debug("Adding booted servers %s to context" % current_servers)
+        self.context["tenants"][tenant_id]["servers"] = current_servers
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Servers`"))
     def setup(self):
         image = self.config["image"]
         flavor = self.config["flavor"]
-        auto_nic = self.config["auto_assign_nic"]
-        servers_per_tenant = self.config["servers_per_tenant"]
 
         clients = osclients.Clients(self.context["users"][0]["credential"])
         image_id = types.GlanceImage.transform(clients=clients,
@@ -83,34 +117,12 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor.transform(clients=clients,
                                            resource_config=flavor)
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
-            LOG.debug("Booting servers for user tenant %s "
-                      % (user["tenant_id"]))
-            tmp_context = {"user": user,
-                           "tenant": self.context["tenants"][tenant_id],
-                           "task": self.context["task"],
-                           "iteration": iter_}
-            nova_scenario = nova_utils.NovaScenario(tmp_context)
-
-            LOG.debug("Calling _boot_servers with image_id=%(image_id)s "
-                      "flavor_id=%(flavor_id)s "
-                      "servers_per_tenant=%(servers_per_tenant)s"
-                      % {"image_id": image_id,
-                         "flavor_id": flavor_id,
-                         "servers_per_tenant": servers_per_tenant})
-
-            servers = nova_scenario._boot_servers(image_id, flavor_id,
-                                                  requests=servers_per_tenant,
-                                                  auto_assign_nic=auto_nic)
-
-            current_servers = [server.id for server in servers]
-
-            LOG.debug("Adding booted servers %s to context"
-                      % current_servers)
-
-            self.context["tenants"][tenant_id][
-                "servers"] = current_servers
+        tenants = rutils.iterate_per_tenants(self.context["users"])
+        broker.run_concurrently(
+            self._boot_tenant_servers,
+            [(iter_, user, tenant_id, image_id, flavor_id)
+             for iter_, (user, tenant_id) in enumerate(tenants)],
+            workers=self.config["resource_management_workers"])
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Servers`"))
     def cleanup(self):
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally import consts
@@ -41,10 +42,18 @@ class Quotas(context.Context):
             "cinder": cinder_quotas.CinderQuotas.QUOTAS_SCHEMA,
             "manila": manila_quotas.ManilaQuotas.QUOTAS_SCHEMA,
             "designate": designate_quotas.DesignateQuotas.QUOTAS_SCHEMA,
-            "neutron": neutron_quotas.NeutronQuotas.QUOTAS_SCHEMA
+            "neutron": neutron_quotas.NeutronQuotas.QUOTAS_SCHEMA,
+            "resource_management_workers": {
+                "type": "integer",
+                "minimum": 1
+            }
         }
     }
 
+    DEFAULT_CONFIG = {
+        "resource_management_workers": 20
+    }
+
     def __init__(self, ctx):
         super(Quotas, self).__init__(ctx)
         self.clients = osclients.Clients(
@@ -62,24 +71,34 @@ class Quotas(context.Context):
     def _service_has_quotas(self, service):
         return len(self.config.get(service, {})) > 0
 
+    def _update_quotas(self, tenant_id):
+        for service in self.manager:
+            if self._service_has_quotas(service):
+                self.manager[service].update(tenant_id,
+                                             **self.config[service])
+
+    def _delete_quotas(self, tenant_id):
+        for service in self.manager:
+            if self._service_has_quotas(service):
+                try:
+                    self.manager[service].delete(tenant_id)
+                except Exception as e:
+                    LOG.warning("Failed to remove quotas for tenant "
+                                "%(tenant_id)s in service %(service)s "
+                                "\n reason: %(exc)s"
+                                % {"tenant_id": tenant_id,
+                                   "service": service, "exc": e})
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `quotas`"))
     def setup(self):
-        for tenant_id in self.context["tenants"]:
-            for service in self.manager:
-                if self._service_has_quotas(service):
-                    self.manager[service].update(tenant_id,
-                                                 **self.config[service])
+        broker.run_concurrently(
+            self._update_quotas,
+            [(tenant_id,) for tenant_id in self.context["tenants"]],
+            workers=self.config["resource_management_workers"])
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `quotas`"))
     def cleanup(self):
-        for service in self.manager:
-            if self._service_has_quotas(service):
-                for tenant_id in self.context["tenants"]:
-                    try:
-                        self.manager[service].delete(tenant_id)
-                    except Exception as e:
-                        LOG.warning("Failed to remove quotas for tenant "
-                                    "%(tenant_id)s in service %(service)s "
-                                    "\n reason: %(exc)s"
-                                    % {"tenant_id": tenant_id,
-                                       "service": service, "exc": e})
+        broker.run_concurrently(
+            self._delete_quotas,
+            [(tenant_id,) for tenant_id in self.context["tenants"]],
+            workers=self.config["resource_management_workers"])
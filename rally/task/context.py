@@ -19,6 +19,7 @@ import copy
 import jsonschema
 import six
 
+from rally.common import broker
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils
@@ -28,7 +29,7 @@ from rally.task import functional
 LOG = logging.getLogger(__name__)
 
 
-def configure(name, order, hidden=False):
+def configure(name, order, hidden=False, per_workload=False, parallel=False):
     """Context class wrapper.
 
     Each context class has to be wrapped by configure() wrapper. It
@@ -41,11 +42,20 @@ def configure(name, order, hidden=False):
                   Contexts with smaller order are run first
     :param hidden: If it is true you won't be able to specify context via
                    task config
+    :param per_workload: If it is true the context is set up and cleaned up
+                         for each workload, even if the other contexts are
+                         reused by several workloads
+    :param parallel: If it is true the context is set up and cleaned up
+                     concurrently with the other parallel contexts of the
+                     same order, so it must neither depend on them nor
+                     change the same parts of the context object
     """
     def wrapper(cls):
         cls = plugin.configure(name=name)(cls)
         cls._meta_set("order", order)
         cls._meta_set("hidden", hidden)
+        cls._meta_set("per_workload", per_workload)
+        cls._meta_set("parallel", parallel)
         return cls
 
     return wrapper
@@ -159,41 +169,107 @@ class Context(plugin.Plugin, functional.FunctionalMixin,
 class ContextManager(object):
     """Create context environment and run method inside it."""
 
-    def __init__(self, context_obj):
+    def __init__(self, context_obj, names=None):
+        """ContextManager constructor.
+
+        :param context_obj: dict with the context, its "config" key contains
+                            configuration of contexts
+        :param names: names of contexts to manage, all the contexts from
+                      the config are managed by default
+        """
         self._visited = []
+        self._mappers = None
         self.context_obj = context_obj
+        self.names = names
 
     @staticmethod
     def validate(ctx, non_hidden=False):
         for name, config in six.iteritems(ctx):
             Context.get(name).validate(config, non_hidden=non_hidden)
 
+    @staticmethod
+    def split_per_workload(config):
+        """Split names of contexts to shared and per-workload ones.
+
+        :param config: dict with configuration of contexts
+        :returns: tuple of two sorted lists of names, the contexts which can
+                  be shared by several workloads and the per-workload ones
+        """
+        shared, per_workload = [], []
+        for name in sorted(config):
+            if Context.get(name)._meta_get("per_workload", default=False):
+                per_workload.append(name)
+            else:
+                shared.append(name)
+        return shared, per_workload
+
     def _get_sorted_context_lst(self):
-        ctxlst = map(Context.get, self.context_obj["config"])
+        names = self.names
+        if names is None:
+            names = self.context_obj["config"]
+        ctxlst = map(Context.get, names)
         return sorted(map(lambda ctx: ctx(self.context_obj), ctxlst))
 
+    @staticmethod
+    def _group_parallel(ctxlst):
+        """Group sorted contexts into lists of contexts run concurrently.
+
+        Parallel contexts (see configure()) with the same order are put to
+        the same group, each of the other contexts has a group of its own.
+        """
+        groups = []
+        last_key = None
+        for ctx in ctxlst:
+            key = None
+            if ctx._meta_get("parallel", default=False):
+                key = ctx.get_order()
+            if key is not None and key == last_key:
+                groups[-1].append(ctx)
+            else:
+                groups.append([ctx])
+            last_key = key
+        return groups
+
+    @staticmethod
+    def _run_concurrently(func, ctxlst):
+        if len(ctxlst) == 1:
+            func(ctxlst[0])
+        else:
+            broker.run_concurrently(func, [(ctx,) for ctx in ctxlst],
+                                    workers=len(ctxlst))
+
+    @staticmethod
+    def _cleanup_context(ctx):
+        try:
+            ctx.cleanup()
+        except Exception as e:
+            LOG.error("Context %s failed during cleanup." % ctx.get_name())
+            LOG.exception(e)
+
     def setup(self):
-        """Creates benchmark environment from config."""
+        """Creates benchmark environment from config.
+
+        Parallel contexts with the same order are set up concurrently.
+        """
 
         self._visited = []
-        for ctx in self._get_sorted_context_lst():
-            self._visited.append(ctx)
-            ctx.setup()
+        for group in self._group_parallel(self._get_sorted_context_lst()):
+            self._visited.extend(group)
+            self._run_concurrently(lambda ctx: ctx.setup(), group)
 
         return self.context_obj
 
     def cleanup(self):
-        """Destroys benchmark environment."""
+        """Destroys benchmark environment.
+
+        Parallel contexts with the same order are cleaned up concurrently.
+        """
 
         ctxlst = self._visited or self._get_sorted_context_lst()
-        for ctx in ctxlst[::-1]:
-            try:
-                ctx.cleanup()
-            except Exception as e:
-                LOG.error("Context %s failed during cleanup." % ctx.get_name())
-                LOG.exception(e)
-
-    def map_for_scenario(self):
+        for group in self._group_parallel(ctxlst)[::-1]:
+            self._run_concurrently(self._cleanup_context, group)
+
+    def map_for_scenario(self, iteration=None):
         """Returns scenario's specific context from full context.
 
         Each context class is able to map context object data as it want.
@@ -203,15 +279,29 @@ class ContextManager(object):
         This method iterates over all context classes used in task
         and performs transformation of each of them to full context, order of
         transformation is the same as order of context creation.
+
+        Context classes are instantiated and sorted only once per manager,
+        so the same manager should be used to map all iterations.
+
+        :param iteration: iteration number to be put to the scenario context
         """
         # NOTE(boris-42): Original context_obj is read only and should not
         #                 be modified
-        context_obj = copy.deepcopy(self.context_obj)
-
-        for ctx in self._get_sorted_context_lst():
+        # NOTE: Context classes build a new object from the passed one
+        #       instead of changing it, so only the top level is copied
+        #       before mapping. The result, which is usually a small part of
+        #       the full context (e.g. the only user and tenant), is deep
+        #       copied to isolate iterations from each other.
+        context_obj = dict(self.context_obj)
+        if iteration is not None:
+            context_obj["iteration"] = iteration
+
+        if self._mappers is None:
+            self._mappers = self._get_sorted_context_lst()
+        for ctx in self._mappers:
             context_obj = ctx.map_for_scenario(context_obj)
 
-        return context_obj
+        return copy.deepcopy(context_obj)
 
     def __enter__(self):
         try:
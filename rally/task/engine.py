@@ -22,6 +22,7 @@ import traceback
 import jsonschema
 import six
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import objects
@@ -34,6 +35,7 @@ from rally.task import context
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
+from rally.task import validation
 
 
 LOG = logging.getLogger(__name__)
@@ -42,6 +44,17 @@ LOG = logging.getLogger(__name__)
 class ResultConsumer(object):
     """ResultConsumer class stores results from ScenarioRunner, checks SLA."""
 
+    # NOTE: How often the DB task status is checked for the abort signal
+    #       sent by another process (e.g. `rally task abort`)
+    ABORT_CHECK_INTERVAL = 2.0
+
+    # NOTE: Iterations are stored to the DB by chunks during the load, so
+    #       the consumer memory doesn't grow with the number of iterations
+    #       and results of a running (or crashed) task are available.
+    ITERATIONS_CHUNK_SIZE = 1000
+    # NOTE: How often an incomplete chunk of iterations is stored
+    CHUNK_FLUSH_INTERVAL = 5.0
+
     def __init__(self, key, task, runner, abort_on_sla_failure):
         """ResultConsumer constructor.
 
@@ -60,43 +73,105 @@ class ResultConsumer(object):
         self.load_finished_at = 0
 
         self.sla_checker = sla.SLAChecker(key["kw"])
+        # NOTE: if SLA is checked by the runner workers, partial SLA and
+        #       statistics aggregates are merged instead of processing
+        #       each result
+        self.sla_in_workers = runner.check_sla_in_workers(key["kw"])
         self.abort_on_sla_failure = abort_on_sla_failure
         self.is_done = threading.Event()
+        # NOTE: is set to wake up wait_and_abort() before the next check
+        self.wakeup = threading.Event()
+        self.abort_requested = False
         self.unexpected_failure = {}
-        self.results = []
+        self.result_id = None
+        self.chunk = []
+        self.chunk_order = 0
+        self.chunk_started_at = None
+        self.iterations_count = 0
+        self.aggregator = objects.task.ResultAggregator()
         self.thread = threading.Thread(
             target=self._consume_results
         )
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
 
     def __enter__(self):
+        self.result_id = self.task.create_result(self.key, {
+            "raw": [],
+            "load_duration": 0,
+            "full_duration": 0,
+            "sla": []})
         self.thread.start()
         self.aborting_checker.start()
         self.start = time.time()
         return self
 
+    def _check_sla(self, success):
+        if self.abort_on_sla_failure and not success:
+            self.sla_checker.set_aborted_on_sla()
+            self.runner.abort()
+
+    def _flush_chunk(self):
+        """Store the buffered iterations to the DB as the next chunk."""
+        if not self.chunk:
+            return
+        # NOTE(boris-42): Sort in order of starting instead of order of ending
+        self.chunk.sort(key=lambda x: x["timestamp"])
+        self.task.append_result_iterations(self.result_id, self.chunk_order,
+                                           self.chunk)
+        self.chunk_order += 1
+        self.chunk = []
+        self.chunk_started_at = None
+
     def _consume_results(self):
         while True:
-            if self.runner.result_queue:
+            # NOTE: the event is cleared before checking is_done and the
+            #       queues, so anything put after that wakes us up again
+            self.runner.results_available.clear()
+            is_done = self.is_done.isSet()
+
+            while self.runner.worker_sla_results:
+                self._check_sla(self.sla_checker.merge(
+                    self.runner.worker_sla_results.popleft()))
+            while self.runner.worker_stats_results:
+                self.aggregator.merge(
+                    self.runner.worker_stats_results.popleft())
+            while self.runner.result_queue:
                 results = self.runner.result_queue.popleft()
-                self.results.extend(results)
+                if self.chunk_started_at is None:
+                    self.chunk_started_at = time.time()
+                self.chunk.extend(results)
+                self.iterations_count += len(results)
                 for r in results:
                     self.load_started_at = min(r["timestamp"],
                                                self.load_started_at)
                     self.load_finished_at = max(r["duration"] + r["timestamp"],
                                                 self.load_finished_at)
-                    success = self.sla_checker.add_iteration(r)
-                    if self.abort_on_sla_failure and not success:
-                        self.sla_checker.set_aborted_on_sla()
-                        self.runner.abort()
-            elif self.is_done.isSet():
+                    if not self.sla_in_workers:
+                        self.aggregator.add_iteration(r)
+                        self._check_sla(self.sla_checker.add_iteration(r))
+                if len(self.chunk) >= self.ITERATIONS_CHUNK_SIZE:
+                    self._flush_chunk()
+
+            if is_done:
                 break
+            if self.chunk:
+                timeout = max(self.chunk_started_at +
+                              self.CHUNK_FLUSH_INTERVAL - time.time(), 0)
+                if not self.runner.results_available.wait(timeout):
+                    self._flush_chunk()
             else:
-                time.sleep(0.1)
+                self.runner.results_available.wait()
+
+    def abort(self):
+        """Abort the runner without waiting for the DB status check."""
+        self.abort_requested = True
+        self.wakeup.set()
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.wakeup.set()
+        self.runner.results_available.set()
         self.aborting_checker.join()
         self.thread.join()
 
@@ -107,8 +182,7 @@ class ResultConsumer(object):
                 self.task["uuid"]) == consts.TaskStatus.ABORTED:
             self.sla_checker.set_aborted_manually()
 
-        # NOTE(boris-42): Sort in order of starting instead of order of ending
-        self.results.sort(key=lambda x: x["timestamp"])
+        self._flush_chunk()
 
         load_duration = max(self.load_finished_at - self.load_started_at, 0)
 
@@ -116,11 +190,12 @@ class ResultConsumer(object):
         LOG.info("Full runner duration is: %s" % self.runner.run_duration)
         LOG.info("Full duration is %s" % (self.finish - self.start))
 
-        self.task.append_results(self.key, {
-            "raw": self.results,
-            "load_duration": load_duration,
-            "full_duration": self.finish - self.start,
-            "sla": self.sla_checker.results()})
+        data = {"raw": [],
+                "load_duration": load_duration,
+                "full_duration": self.finish - self.start,
+                "sla": self.sla_checker.results()}
+        self.task.update_result(self.result_id, data,
+                                self.aggregator.aggregates(data))
 
     @staticmethod
     def is_task_in_aborting_status(task_uuid, check_soft=True):
@@ -144,12 +219,89 @@ class ResultConsumer(object):
         """
 
         while not self.is_done.isSet():
-            if self.is_task_in_aborting_status(self.task["uuid"],
-                                               check_soft=False):
+            if self.abort_requested or self.is_task_in_aborting_status(
+                    self.task["uuid"], check_soft=False):
                 self.runner.abort()
                 self.task.update_status(consts.TaskStatus.ABORTED)
                 break
-            time.sleep(2.0)
+            self.wakeup.wait(self.ABORT_CHECK_INTERVAL)
+
+
+class SharedContext(object):
+    """Context which is set up once for consecutive workloads.
+
+    Workloads which have the same configuration of contexts (except the
+    per-workload ones, e.g. the cleanup of resources created by scenarios)
+    are run in the same context. It is set up before the first workload
+    and is cleaned up after the last one, while the per-workload contexts
+    are set up and cleaned up around each workload.
+
+    Context object of each workload has the "shared_context" key, so the
+    per-workload contexts can tell the resources created by the shared
+    contexts from the ones created by the workload.
+    """
+
+    def __init__(self, context_obj, cleanup_between_workloads=True):
+        """SharedContext constructor.
+
+        :param context_obj: context object of the first workload
+        :param cleanup_between_workloads: if False, the per-workload contexts
+                                          are cleaned up together with the
+                                          shared context
+        """
+        self.cleanup_between_workloads = cleanup_between_workloads
+        self.context_obj = context_obj
+        shared = context.ContextManager.split_per_workload(
+            context_obj["config"])[0]
+        self._manager = context.ContextManager(context_obj, names=shared)
+        self._workloads = []
+
+    @staticmethod
+    def get_key(context_obj):
+        """Returns key that is equal for contexts which can be shared."""
+        config = context_obj["config"]
+        shared = context.ContextManager.split_per_workload(config)[0]
+        return json.dumps(dict((name, config[name]) for name in shared),
+                          sort_keys=True)
+
+    def setup(self):
+        try:
+            self._manager.setup()
+        except Exception:
+            self._manager.cleanup()
+            raise
+
+    def start_workload(self, context_obj):
+        """Set up per-workload contexts of the workload.
+
+        :param context_obj: context object prepared for the workload
+        :returns: context object to run the workload with
+        """
+        workload_obj = dict(self.context_obj)
+        workload_obj["scenario_name"] = context_obj["scenario_name"]
+        workload_obj["config"] = context_obj["config"]
+        workload_obj["shared_context"] = True
+        per_workload = context.ContextManager.split_per_workload(
+            context_obj["config"])[1]
+        manager = context.ContextManager(workload_obj, names=per_workload)
+        self._workloads.append(manager)
+        try:
+            manager.setup()
+        except Exception:
+            self.finish_workload()
+            raise
+        return workload_obj
+
+    def finish_workload(self):
+        """Clean up per-workload contexts of the last started workload."""
+        if self.cleanup_between_workloads and self._workloads:
+            self._workloads.pop().cleanup()
+
+    def cleanup(self):
+        for manager in self._workloads[::-1]:
+            manager.cleanup()
+        self._workloads = []
+        self._manager.cleanup()
 
 
 class TaskEngine(object):
@@ -174,8 +326,11 @@ class TaskEngine(object):
             engine.run()        # to run config
     """
 
+    # NOTE: Number of threads that run semantic validation of workloads
+    VALIDATION_WORKERS = 10
+
     def __init__(self, config, task, admin=None, users=None,
-                 abort_on_sla_failure=False):
+                 abort_on_sla_failure=False, cleanup_between_workloads=True):
         """TaskEngine constructor.
 
         :param config: Dict with configuration of specified benchmark scenarios
@@ -185,6 +340,11 @@ class TaskEngine(object):
         :param users: List of dicts with user credentials
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param cleanup_between_workloads: False if resources created by
+                                          scenarios of the workloads which
+                                          share the context should be
+                                          cleaned up only after the last of
+                                          these workloads
         """
         try:
             self.config = TaskConfig(config)
@@ -198,6 +358,31 @@ class TaskEngine(object):
         self.admin = admin and objects.Credential(**admin) or None
         self.existing_users = users or []
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.cleanup_between_workloads = cleanup_between_workloads
+        # NOTE: context kept for the next workloads and (reuse_previous,
+        #       keep_for_next) flags of workloads keyed by their ids
+        self._shared_context = None
+        self._context_reuse = {}
+        # NOTE: consumers of the running workloads, there are several of
+        #       them if subtasks are run in parallel
+        self.result_consumers = []
+        # NOTE: load duration of the task, the load durations of subtasks
+        #       run in parallel are combined instead of being summed up
+        self.load_duration = 0
+
+    def abort(self, soft=False):
+        """Abort the task running in this process.
+
+        The task status is updated in the DB, as `rally task abort` does,
+        and the running workloads (unless soft) are aborted at once instead
+        of on the next DB status check.
+
+        :param soft: if True, the task is aborted after the current workloads
+        """
+        self.task.abort(soft=soft)
+        if not soft:
+            for result_consumer in list(self.result_consumers):
+                result_consumer.abort()
 
     @logging.log_task_wrapper(LOG.info, _("Task validation check cloud."))
     def _check_cloud(self):
@@ -235,11 +420,12 @@ class TaskEngine(object):
                     raise exceptions.InvalidTaskConfig(**kw)
 
     def _validate_config_semantic_helper(self, admin, user, workload, pos,
-                                         deployment):
+                                         deployment, cache=None):
         try:
             scenario.Scenario.validate(
                 workload.name, workload.to_dict(),
-                admin=admin, users=[user], deployment=deployment)
+                admin=admin, users=[user], deployment=deployment,
+                cache=cache)
         except exceptions.InvalidScenarioArgument as e:
             kw = workload.make_exception_args(pos, six.text_type(e))
             raise exceptions.InvalidTaskConfig(**kw)
@@ -268,15 +454,34 @@ class TaskEngine(object):
         with self._get_user_ctx_for_validation(ctx_conf) as ctx:
             ctx.setup()
             admin = osclients.Clients(self.admin)
-            user = osclients.Clients(ctx_conf["users"][0]["credential"])
 
+            checks = []
             for u in ctx_conf["users"]:
                 user = osclients.Clients(u["credential"])
                 for subtask in config.subtasks:
                     for pos, workload in enumerate(subtask.workloads):
-                        self._validate_config_semantic_helper(
-                            admin, user, workload,
-                            pos, deployment)
+                        checks.append((len(checks), user, workload, pos))
+
+            cache = validation.ValidationCache()
+            errors = []
+
+            def publish(queue):
+                queue.extend(checks)
+
+            def consume(_cache, args):
+                idx, user, workload, pos = args
+                try:
+                    self._validate_config_semantic_helper(
+                        admin, user, workload, pos, deployment, cache)
+                except Exception as e:
+                    errors.append((idx, e))
+
+            broker.run(publish, consume,
+                       min(len(checks), self.VALIDATION_WORKERS))
+
+            # NOTE: report the same error as the sequential validation would
+            if errors:
+                raise min(errors, key=lambda error: error[0])[1]
 
     @logging.log_task_wrapper(LOG.info, _("Task validation."))
     def validate(self):
@@ -314,44 +519,235 @@ class TaskEngine(object):
 
         return context_obj
 
+    def _run_workload(self, pos, workload, consumers):
+        key = workload.make_key(pos)
+        LOG.info("Running benchmark with key: \n%s"
+                 % json.dumps(key, indent=2))
+        runner_obj = self._get_runner(workload.runner)
+        context_obj = self._prepare_context(
+            workload.context, workload.name, self.admin)
+        consumer = None
+        try:
+            consumer = ResultConsumer(key, self.task, runner_obj,
+                                      self.abort_on_sla_failure)
+            with consumer:
+                self.result_consumers.append(consumer)
+                reuse_previous, keep_for_next = self._context_reuse.get(
+                    id(workload), (False, False))
+                if reuse_previous or keep_for_next:
+                    self._run_in_shared_context(
+                        workload, runner_obj, context_obj,
+                        reuse_previous, keep_for_next)
+                else:
+                    with context.ContextManager(context_obj):
+                        runner_obj.run(workload.name, context_obj,
+                                       workload.args)
+        except Exception as e:
+            LOG.exception(e)
+        finally:
+            if consumer in self.result_consumers:
+                self.result_consumers.remove(consumer)
+        if consumer is not None:
+            consumers.append(consumer)
+
+    def _run_in_shared_context(self, workload, runner_obj, context_obj,
+                               reuse_previous, keep_for_next):
+        """Run the workload in the context shared with other workloads.
+
+        :param workload: Workload instance
+        :param runner_obj: runner of the workload
+        :param context_obj: context object prepared for the workload
+        :param reuse_previous: True if the context of the previous workload
+                               should be used
+        :param keep_for_next: True if the context should be kept for the
+                              next workload
+        """
+        if not reuse_previous or self._shared_context is None:
+            self._cleanup_shared_context()
+            shared = SharedContext(context_obj,
+                                   self.cleanup_between_workloads)
+            shared.setup()
+            self._shared_context = shared
+        else:
+            LOG.info("Reusing the context of the previous workload.")
+        shared = self._shared_context
+        try:
+            workload_obj = shared.start_workload(context_obj)
+            try:
+                runner_obj.run(workload.name, workload_obj, workload.args)
+            finally:
+                shared.finish_workload()
+        finally:
+            if not keep_for_next:
+                self._cleanup_shared_context()
+
+    def _cleanup_shared_context(self):
+        if self._shared_context is not None:
+            shared, self._shared_context = self._shared_context, None
+            shared.cleanup()
+
+    def _get_context_key(self, workload):
+        """Returns key of the shared context of the workload or None.
+
+        The errors are not raised here: the workload which context can't
+        be prepared fails on its own run without affecting the others.
+        """
+        try:
+            context_obj = self._prepare_context(
+                workload.context, workload.name, self.admin)
+            return SharedContext.get_key(context_obj)
+        except Exception as e:
+            LOG.debug("Context of workload %s can't be shared: %s"
+                      % (workload.name, e))
+            return None
+
+    def _find_context_reuse(self):
+        """Find consecutive workloads which can share the context.
+
+        Only the workloads of subtasks which are not run in parallel can
+        share the context.
+
+        :returns: dict with (reuse_previous, keep_for_next) tuples keyed by
+                  ids of Workload instances
+        """
+        keys = []
+        for subtasks in self._group_subtasks():
+            if len(subtasks) > 1:
+                keys.append((None, None))
+                continue
+            for workload in subtasks[0].workloads:
+                keys.append((id(workload), self._get_context_key(workload)))
+        keys.append((None, None))
+
+        reuse = {}
+        for idx, (workload_id, key) in enumerate(keys[:-1]):
+            if workload_id is None or key is None:
+                continue
+            reuse_previous = idx > 0 and keys[idx - 1][1] == key
+            keep_for_next = keys[idx + 1][1] == key
+            reuse[workload_id] = (reuse_previous, keep_for_next)
+        return reuse
+
+    def _run_subtask(self, subtask, consumers):
+        """Run workloads of the subtask one by one.
+
+        :param subtask: SubTask instance
+        :param consumers: list to add ResultConsumer of each finished
+                          workload to
+        :returns: False if the task is aborted, True otherwise
+        """
+        for pos, workload in enumerate(subtask.workloads):
+            if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
+                LOG.info("Received aborting signal.")
+                self.task.update_status(consts.TaskStatus.ABORTED)
+                return False
+            self._run_workload(pos, workload, consumers)
+        return True
+
+    @staticmethod
+    def _get_load_duration(consumers):
+        """Get the load duration of the workloads run concurrently.
+
+        Load durations of the workloads overlap, so the load duration is
+        counted from the first started iteration to the last finished one.
+
+        :param consumers: list of ResultConsumer instances of the workloads
+        """
+        if not consumers:
+            return 0
+        return max(max(c.load_finished_at for c in consumers)
+                   - min(c.load_started_at for c in consumers), 0)
+
+    def _run_subtasks_in_parallel(self, subtasks, consumers):
+        """Run each of the subtasks in its own thread.
+
+        Each workload has its own runner, context and ResultConsumer, so
+        the subtasks are independent of each other, but the abort of the
+        task aborts all of them.
+
+        :param subtasks: list of SubTask instances
+        :param consumers: list to add ResultConsumer of each finished
+                          workload to
+        :returns: False if the task is aborted, True otherwise
+        """
+        not_aborted = [True] * len(subtasks)
+
+        def run_subtask(idx, subtask):
+            try:
+                not_aborted[idx] = self._run_subtask(subtask, consumers)
+            except Exception as e:
+                LOG.exception(e)
+
+        threads = [threading.Thread(target=run_subtask, args=(idx, subtask))
+                   for idx, subtask in enumerate(subtasks)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        LOG.info("Load duration of %d parallel subtasks is: %s"
+                 % (len(subtasks), self._get_load_duration(consumers)))
+        return all(not_aborted)
+
+    def _group_subtasks(self):
+        """Group consecutive subtasks that are run in parallel.
+
+        :returns: list of lists of SubTask instances
+        """
+        groups = []
+        for subtask in self.config.subtasks:
+            if (subtask.run_in_parallel and groups
+                    and groups[-1][-1].run_in_parallel):
+                groups[-1].append(subtask)
+            else:
+                groups.append([subtask])
+        return groups
+
     @logging.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
 
         Test configuration is specified on engine initialization.
+        Subtasks are run one by one, except consecutive subtasks with
+        `run_in_parallel' flag, which are run concurrently. The load
+        duration of the task, where the concurrent subtasks are counted
+        once, is stored in the task summary.
 
         :returns: List of dicts, each dict containing the results of all the
                   corresponding benchmark test launches
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
+        self._context_reuse = self._find_context_reuse()
 
-        for subtask in self.config.subtasks:
-            for pos, workload in enumerate(subtask.workloads):
-
-                if ResultConsumer.is_task_in_aborting_status(
-                        self.task["uuid"]):
-                    LOG.info("Received aborting signal.")
-                    self.task.update_status(consts.TaskStatus.ABORTED)
-                    return
-
-                key = workload.make_key(pos)
-                LOG.info("Running benchmark with key: \n%s"
-                         % json.dumps(key, indent=2))
-                runner_obj = self._get_runner(workload.runner)
-                context_obj = self._prepare_context(
-                    workload.context, workload.name, self.admin)
-                try:
-                    with ResultConsumer(key, self.task, runner_obj,
-                                        self.abort_on_sla_failure):
-                        with context.ContextManager(context_obj):
-                            runner_obj.run(workload.name, context_obj,
-                                           workload.args)
-                except Exception as e:
-                    LOG.exception(e)
-
-        if objects.Task.get_status(
-                self.task["uuid"]) != consts.TaskStatus.ABORTED:
-            self.task.update_status(consts.TaskStatus.FINISHED)
+        aborted = False
+        try:
+            for subtasks in self._group_subtasks():
+                consumers = []
+                if len(subtasks) == 1:
+                    not_aborted = self._run_subtask(subtasks[0], consumers)
+                    self.load_duration += sum(
+                        self._get_load_duration([c]) for c in consumers)
+                else:
+                    not_aborted = self._run_subtasks_in_parallel(subtasks,
+                                                                 consumers)
+                    self.load_duration += self._get_load_duration(consumers)
+                if not not_aborted:
+                    aborted = True
+                    break
+        finally:
+            self._cleanup_shared_context()
+
+        if aborted or objects.Task.get_status(
+                self.task["uuid"]) == consts.TaskStatus.ABORTED:
+            # NOTE: the summary is stored when the task is aborted, while
+            #       the aborted workloads (and the ones run in parallel with
+            #       them) are still storing their results, so it is updated
+            #       once all of them are finished
+            self.task.update_status(consts.TaskStatus.ABORTED,
+                                    load_duration=self.load_duration)
+        else:
+            self.task.update_status(consts.TaskStatus.FINISHED,
+                                    load_duration=self.load_duration)
 
 
 class TaskConfig(object):
@@ -516,6 +912,7 @@ class SubTask(object):
         self.tags = config.get("tags", [])
         self.group = config.get("group")
         self.description = config.get("description")
+        self.run_in_parallel = config.get("run_in_parallel", False)
         self.workloads = [Workload(wconf)
                           for wconf
                           in config["workloads"]]
@@ -23,7 +23,9 @@ import abc
 
 import six
 
+from rally.common.i18n import _
 from rally.common.plugin import plugin
+from rally import exceptions
 
 
 def configure(name, namespace="default"):
@@ -47,3 +49,13 @@ class TaskExporter(plugin.Plugin):
     @abc.abstractmethod
     def validate(self):
         """Used to validate connection string."""
+
+    def load(self):
+        """Load results of the task back from the task storage.
+
+        :returns: iterable of task results in the format of task results
+                  JSON file, "result" of each task result can be iterator
+        """
+        raise exceptions.RallyException(
+            _("Task results can not be imported with %s plugin.")
+            % self.get_name())
@@ -13,6 +13,7 @@
 #    under the License.
 
 import abc
+import array
 import bisect
 import collections
 import math
@@ -65,6 +66,29 @@ class Chart(plugin.Plugin):
                                                      self.zipped_size)
             self._data[name].add_point(value)
 
+    def add_columns(self, columns):
+        """Add data of all iterations at once.
+
+        This is an alternative to add_iteration() for processing of the
+        whole workload, they must not be used together. Charts that do not
+        implement _map_columns() process the iterations one by one.
+
+        :param columns: utils.IterationsColumns instance
+        """
+        values = self._map_columns(columns)
+        if values is None:
+            for iteration in columns.iter_iterations():
+                self.add_iteration(iteration)
+            return
+        for name, column in values:
+            self._add_values(name, column)
+
+    def _add_values(self, name, values):
+        if name not in self._data:
+            self._data[name] = utils.GraphZipper(self.base_size,
+                                                 self.zipped_size)
+        self._data[name].add_points(values)
+
     def render(self):
         """Generate chart data ready for drawing."""
         return [(name, points.get_zipped_graph())
@@ -81,10 +105,25 @@ class Chart(plugin.Plugin):
             iteration["atomic_actions"].setdefault(name, 0)
         return iteration
 
+    def _get_atomic_names(self, columns):
+        """Get names of atomic actions, see _fix_atomic_actions()."""
+        names = list(columns.atomic)
+        names.extend(name for name in self._workload_info["atomic"]
+                     if name not in columns.atomic)
+        return names
+
     @abc.abstractmethod
     def _map_iteration_values(self, iteration):
         """Get values for processing, from given iteration."""
 
+    def _map_columns(self, columns):
+        """Get values for processing, from given iterations columns.
+
+        :returns: list of (name, sequence of values) pairs, or None if
+                  the chart processes iterations one by one only
+        """
+        return None
+
 
 class MainStackedAreaChart(Chart):
 
@@ -104,6 +143,20 @@ class MainStackedAreaChart(Chart):
                 result.append(("failed_duration", 0))
         return result
 
+    def _map_columns(self, columns):
+        errors = columns.error
+        result = [
+            ("duration",
+             [0 if e else v for e, v in zip(errors, columns.duration)]),
+            ("idle_duration",
+             [0 if e else v for e, v in zip(errors, columns.idle_duration)])]
+        if self._workload_info["iterations_failed"]:
+            result.append(
+                ("failed_duration",
+                 [d + i if e else 0 for e, d, i in zip(
+                     errors, columns.duration, columns.idle_duration)]))
+        return result
+
 
 class AtomicStackedAreaChart(Chart):
 
@@ -122,6 +175,21 @@ class AtomicStackedAreaChart(Chart):
             atomics.append(("failed_duration", failed_duration))
         return atomics
 
+    def _map_columns(self, columns):
+        atomics = [(name, columns.get_atomic(name))
+                   for name in self._get_atomic_names(columns)]
+        if self._workload_info["iterations_failed"]:
+            if atomics:
+                atomics_sums = [sum(v) for v in zip(*[a[1] for a in atomics])]
+            else:
+                atomics_sums = [0] * columns.count
+            atomics.append(
+                ("failed_duration",
+                 [d + i - a if e else 0 for e, d, i, a in zip(
+                     columns.error, columns.duration, columns.idle_duration,
+                     atomics_sums)]))
+        return atomics
+
 
 class AvgChart(Chart):
     """Base class for charts with average results."""
@@ -134,6 +202,11 @@ class AvgChart(Chart):
                 self._data[name] = streaming.MeanComputation()
             self._data[name].add(value or 0)
 
+    def _add_values(self, name, values):
+        if name not in self._data:
+            self._data[name] = streaming.MeanComputation()
+        self._data[name].add_values(values)
+
     def render(self):
         return [(k, v.result()) for k, v in self._data.items()]
 
@@ -144,9 +217,19 @@ class AtomicAvgChart(AvgChart):
         iteration = self._fix_atomic_actions(iteration)
         return list(iteration["atomic_actions"].items())
 
+    def _map_columns(self, columns):
+        return [(name, columns.get_atomic(name))
+                for name in self._get_atomic_names(columns)]
+
 
 class LoadProfileChart(Chart):
-    """Chart for parallel durations."""
+    """Chart for parallel durations.
+
+    Intervals of iterations are collected as they are added, and the
+    load is computed on rendering with a single sweep over the sorted
+    starts and ends of iterations, so the cost does not depend on the
+    durations of iterations or on the scale.
+    """
 
     widget = "StackedArea"
 
@@ -170,31 +253,268 @@ class LoadProfileChart(Chart):
                            for x in six.moves.range(int(scale))
                            if (self.step * x) < self._duration]
         self._time_axis.append(self._duration)
-        self._running = [0] * len(self._time_axis)
+        self._starts = array.array("d")
+        self._ends = array.array("d")
 
     def _map_iteration_values(self, iteration):
         return (iteration["timestamp"], iteration["duration"])
 
     def add_iteration(self, iteration):
-        timestamp, duration = self._map_iteration_values(iteration)
+        self._add_interval(*self._map_iteration_values(iteration))
+
+    def add_columns(self, columns):
+        for timestamp, duration in zip(columns.timestamp, columns.duration):
+            self._add_interval(timestamp, duration)
+
+    def _add_interval(self, timestamp, duration):
         ts_start = timestamp - self._tstamp_start
-        started_idx = bisect.bisect(self._time_axis, ts_start)
-        ended_idx = bisect.bisect(self._time_axis, ts_start + duration)
-        if self._time_axis[ended_idx - 1] == ts_start + duration:
-            ended_idx -= 1
-        for idx in range(started_idx + 1, ended_idx):
-            self._running[idx] += 1
-        if started_idx == ended_idx:
-            self._running[ended_idx] += duration / self.step
-        else:
-            self._running[started_idx] += (
-                self._time_axis[started_idx] - ts_start) / self.step
-            self._running[ended_idx] += (
-                ts_start + duration
-                - self._time_axis[ended_idx - 1]) / self.step
+        self._starts.append(ts_start)
+        self._ends.append(ts_start + (duration or 0))
+
+    def get_concurrency(self):
+        """Return exact number of running iterations over time.
+
+        :returns: list of (time, count) pairs, where count is the number
+                  of iterations running since the time until the next one
+        """
+        return [(ts, count) for ts, count, started, ended
+                in self._iter_events()]
+
+    def _iter_events(self):
+        """Sweep over sorted starts and ends of iterations.
+
+        :returns: generator of (time, running, started, ended) tuples for
+                  each distinct time of starts and ends, where running is
+                  the number of iterations running right after the time
+        """
+        starts = sorted(self._starts)
+        ends = sorted(self._ends)
+        s_idx = e_idx = running = 0
+        while s_idx < len(starts) or e_idx < len(ends):
+            if e_idx == len(ends) or (s_idx < len(starts)
+                                      and starts[s_idx] < ends[e_idx]):
+                ts = starts[s_idx]
+            else:
+                ts = ends[e_idx]
+            started = ended = 0
+            while s_idx < len(starts) and starts[s_idx] == ts:
+                s_idx += 1
+                started += 1
+            while e_idx < len(ends) and ends[e_idx] == ts:
+                e_idx += 1
+                ended += 1
+            running += started - ended
+            yield ts, running, started, ended
+
+    def _get_buckets(self):
+        """Compute load in each step of the time axis.
+
+        Each point of the time axis stands for the step which ends at the
+        point, the first one stands for the start of the load.
+
+        :returns: list of (avg_running, max_running, started, ended)
+                  tuples, one per point of the time axis
+        """
+        buckets = []
+        events = self._iter_events()
+        event = next(events, None)
+        prev_ts = running = started = ended = 0
+        # NOTE: iterations started at the start of the load are counted
+        #       in the first step
+        while event and event[0] <= 0:
+            running, started, ended = (event[1], started + event[2],
+                                       ended + event[3])
+            event = next(events, None)
+        buckets.append((0, running, 0, 0))
+        for ts in self._time_axis[1:]:
+            area = 0
+            max_running = running
+            while event and event[0] <= ts:
+                event_ts, event_running, event_started, event_ended = event
+                area += running * (event_ts - prev_ts)
+                prev_ts, running = event_ts, event_running
+                started += event_started
+                ended += event_ended
+                if event_ts < ts:
+                    max_running = max(max_running, running)
+                event = next(events, None)
+            area += running * (ts - prev_ts)
+            prev_ts = ts
+            buckets.append((area / self.step, max_running, started, ended))
+            started = ended = 0
+        return buckets
 
     def render(self):
-        return [(self._name, list(zip(self._time_axis, self._running)))]
+        running = [avg for avg, max_running, started, ended
+                   in self._get_buckets()]
+        return [(self._name, list(zip(self._time_axis, running)))]
+
+
+class LoadTimelineChart(LoadProfileChart):
+    """Chart for achieved concurrency and throughput over time.
+
+    Unlike the load profile, which shows the average number of running
+    iterations, it shows the peak number of running iterations and the
+    rates of started and finished iterations in each step, so the steps
+    where the runner did not keep up with the load are visible.
+    """
+
+    widget = "Lines"
+
+    def __init__(self, workload_info, scale=100):
+        super(LoadTimelineChart, self).__init__(workload_info, scale=scale)
+
+    def render(self):
+        lines = [("max parallel iterations", []),
+                 ("started iterations per second", []),
+                 ("finished iterations per second", [])]
+        for ts, bucket in zip(self._time_axis, self._get_buckets()):
+            avg_running, max_running, started, ended = bucket
+            # NOTE: nothing is started or finished in the first point,
+            #       which is the only one when the load has no duration
+            for (name, points), value in zip(
+                    lines, (max_running, started and started / self.step,
+                            ended and ended / self.step)):
+                points.append((ts, value))
+        return lines
+
+
+class TimeWindowChart(Chart):
+    """Base class for charts of iterations bucketed by time windows.
+
+    Iterations are put into fixed windows of the wall-clock time by the
+    time they finished at, so the changes of the load during the run are
+    visible. Each window keeps mergeable streaming computations only, so
+    iterations can be added in any order, and charts that processed parts
+    of the workload can be merged.
+    """
+
+    widget = "Lines"
+
+    def __init__(self, workload_info, window=None, scale=100):
+        """Setup chart with the size of windows.
+
+        :param workload_info: dict, generalized info about iterations
+        :param window: float size of windows in seconds
+        :param scale: int number of windows over the load duration, it is
+                      used if the window size is not specified
+        """
+        super(TimeWindowChart, self).__init__(workload_info)
+        self._tstamp_start = workload_info["tstamp_start"]
+        self.window = (window
+                       or workload_info["load_duration"] / float(scale)
+                       or 1.0)
+        self._windows = {}
+
+    def _get_window(self):
+        """Get streaming computations of a new window."""
+        return {"count": streaming.IncrementComputation(),
+                "errors": streaming.IncrementComputation()}
+
+    def _add_to_window(self, window, duration, error):
+        window["count"].add()
+        if error:
+            window["errors"].add()
+
+    def _map_iteration_values(self, iteration):
+        return (iteration["timestamp"], iteration["duration"] or 0,
+                bool(iteration["error"]))
+
+    def _add_finished(self, timestamp, duration, error):
+        idx = max(int((timestamp + duration - self._tstamp_start)
+                      // self.window), 0)
+        if idx not in self._windows:
+            self._windows[idx] = self._get_window()
+        self._add_to_window(self._windows[idx], duration, error)
+
+    def add_iteration(self, iteration):
+        self._add_finished(*self._map_iteration_values(iteration))
+
+    def add_columns(self, columns):
+        for values in zip(columns.timestamp, columns.duration,
+                          columns.error):
+            self._add_finished(*values)
+
+    def merge(self, other):
+        """Merge windows of the chart that processed other iterations.
+
+        :param other: chart instance of the same class and window size
+        """
+        for idx, window in other._windows.items():
+            if idx not in self._windows:
+                self._windows[idx] = self._get_window()
+            for name, ins in window.items():
+                self._windows[idx][name].merge(ins)
+
+    def _iter_windows(self):
+        """Yield (time, window) of each window, empty windows are None.
+
+        The time is the end of the window since the start of the load.
+        """
+        if not self._windows:
+            return
+        for idx in six.moves.range(max(self._windows) + 1):
+            yield (idx + 1) * self.window, self._windows.get(idx)
+
+
+class ThroughputTimelineChart(TimeWindowChart):
+    """Chart for rates of finished and failed iterations over time."""
+
+    def render(self):
+        lines = [("finished iterations per second", []),
+                 ("failed iterations per second", [])]
+        for ts, window in self._iter_windows():
+            for (name, points), key in zip(lines, ("count", "errors")):
+                count = window[key].result() if window else 0
+                points.append((ts, count / self.window))
+        return lines
+
+
+class ErrorRateTimelineChart(TimeWindowChart):
+    """Chart for the percent of failed iterations over time."""
+
+    def render(self):
+        points = []
+        for ts, window in self._iter_windows():
+            # NOTE: windows without iterations have no error rate, such
+            #       points are skipped by the chart
+            if window:
+                points.append((ts, round(window["errors"].result() * 100.0
+                                         / window["count"].result(), 1)))
+        return [("errors (%)", points)]
+
+
+class LatencyTimelineChart(TimeWindowChart):
+    """Chart for percentiles of durations of iterations over time.
+
+    Durations of successful iterations only are taken into account.
+    Percentiles of each window are computed from a single mergeable
+    PercentileComputation instance.
+    """
+
+    percentiles = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+    def _get_window(self):
+        window = super(LatencyTimelineChart, self)._get_window()
+        window["duration"] = streaming.PercentileComputation(0.5)
+        return window
+
+    def _add_to_window(self, window, duration, error):
+        super(LatencyTimelineChart, self)._add_to_window(window, duration,
+                                                         error)
+        if not error:
+            window["duration"].add(duration)
+
+    def render(self):
+        lines = [(name, []) for name, percent in self.percentiles]
+        for ts, window in self._iter_windows():
+            if not window or window["duration"].result() is None:
+                continue
+            for (name, points), (dummy, percent) in zip(
+                    lines, self.percentiles):
+                points.append(
+                    (ts, round(window["duration"].percentile(percent), 3)))
+        return lines
 
 
 class HistogramChart(Chart):
@@ -236,6 +556,18 @@ class HistogramChart(Chart):
                         self._data[name]["views"][i]["y"][bin_i] += 1
                         break
 
+    def _add_values(self, name, values):
+        if name not in self._data:
+            raise KeyError("Unexpected histogram name: %s" % name)
+        values = sorted(values)
+        for view in self._data[name]["views"]:
+            # NOTE: value goes to the first bin that is not less than it
+            counted = 0
+            for bin_i, bin_v in enumerate(view["x"]):
+                count = bisect.bisect_right(values, bin_v)
+                view["y"][bin_i] += count - counted
+                counted = count
+
     def render(self):
         data = []
         for name, hist in self._data.items():
@@ -264,6 +596,10 @@ class MainHistogramChart(HistogramChart):
     def _map_iteration_values(self, iteration):
         return [("task", 0 if iteration["error"] else iteration["duration"])]
 
+    def _map_columns(self, columns):
+        return [("task", [0 if e else v
+                          for e, v in zip(columns.error, columns.duration)])]
+
 
 class AtomicHistogramChart(HistogramChart):
 
@@ -280,6 +616,10 @@ class AtomicHistogramChart(HistogramChart):
         iteration = self._fix_atomic_actions(iteration)
         return list(iteration["atomic_actions"].items())
 
+    def _map_columns(self, columns):
+        return [(name, columns.get_atomic(name))
+                for name in self._get_atomic_names(columns)]
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Table(Chart):
@@ -349,32 +689,54 @@ class Table(Chart):
         return {"cols": self.columns, "rows": self.get_rows()}
 
 
+def _format_success_rate(st, has_result):
+    return "%.1f%%" % (st.result() * 100) if has_result else "n/a"
+
+
+def _format_count(st, has_result):
+    return st.result()
+
+
 class MainStatsTable(Table):
+    """Table with statistics of durations of atomic actions and iterations.
+
+    Tables filled with different parts of the iterations (e.g. by worker
+    processes of a runner) can be merged. Post-processing functions are
+    module level ones, so the table can be pickled.
+    """
 
     columns = ["Action", "Min (sec)", "Median (sec)", "90%ile (sec)",
                "95%ile (sec)", "Max (sec)", "Avg (sec)", "Success", "Count"]
 
     def __init__(self, *args, **kwargs):
         super(MainStatsTable, self).__init__(*args, **kwargs)
-        iters_num = self._workload_info["iterations_count"]
         for name in (list(self._workload_info["atomic"].keys()) + ["total"]):
-            self._data[name] = [
-                [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, iters_num), None],
-                [streaming.PercentileComputation(0.9, iters_num), None],
-                [streaming.PercentileComputation(0.95, iters_num), None],
+            self._data[name] = self._get_row()
+
+    def _get_row(self):
+        return [[streaming.MinComputation(), None],
+                [streaming.PercentileComputation(0.5), None],
+                [streaming.PercentileComputation(0.9), None],
+                [streaming.PercentileComputation(0.95), None],
                 [streaming.MaxComputation(), None],
                 [streaming.MeanComputation(), None],
-                [streaming.MeanComputation(),
-                 lambda st, has_result: ("%.1f%%" % (st.result() * 100)
-                                         if has_result else "n/a")],
-                [streaming.IncrementComputation(),
-                 lambda st, has_result: st.result()]]
+                [streaming.MeanComputation(), _format_success_rate],
+                [streaming.IncrementComputation(), _format_count]]
+
+    def _add_row(self, name):
+        # NOTE: atomic actions not known in advance are added in order of
+        #       appearance, "total" is kept the last
+        total = self._data.pop("total")
+        self._data[name] = self._get_row()
+        self._data["total"] = total
 
     def _map_iteration_values(self, iteration):
         return dict(iteration["atomic_actions"], total=iteration["duration"])
 
     def add_iteration(self, iteration):
+        for name in iteration["atomic_actions"]:
+            if name not in self._data:
+                self._add_row(name)
         for name, value in self._map_iteration_values(iteration).items():
             self._data[name][-1][0].add()
             if iteration["error"]:
@@ -384,6 +746,94 @@ class MainStatsTable(Table):
                 for idx, dummy in enumerate(self._data[name][:-2]):
                     self._data[name][idx][0].add(value)
 
+    def merge(self, other):
+        """Merge statistics of another MainStatsTable instance.
+
+        :param other: MainStatsTable filled with other iterations
+        """
+        for name, row in other._data.items():
+            if name not in self._data:
+                self._add_row(name)
+            for cell, other_cell in zip(self._data[name], row):
+                cell[0].merge(other_cell[0])
+
+
+class SchedulingTable(Table):
+    """Table with offered and achieved rate of iterations launches.
+
+    This table is filled only by runners that schedule iterations in
+    advance (e.g. rps runner in open loop mode), so each iteration result
+    has "scheduled_timestamp" in addition to the actual "timestamp".
+    The difference between them is the scheduling lag.
+    """
+
+    columns = ["Metric", "Min (sec)", "Median (sec)", "90%ile (sec)",
+               "95%ile (sec)", "Max (sec)", "Avg (sec)", "Count"]
+
+    def __init__(self, *args, **kwargs):
+        super(SchedulingTable, self).__init__(*args, **kwargs)
+        self._data["scheduling lag"] = [
+            [streaming.MinComputation(), None],
+            [streaming.PercentileComputation(0.5), None],
+            [streaming.PercentileComputation(0.9), None],
+            [streaming.PercentileComputation(0.95), None],
+            [streaming.MaxComputation(), None],
+            [streaming.MeanComputation(), None],
+            [streaming.IncrementComputation(),
+             lambda st, has_result: st.result()]]
+        self._scheduled = [streaming.MinComputation(),
+                           streaming.MaxComputation()]
+        self._started = [streaming.MinComputation(),
+                         streaming.MaxComputation()]
+
+    def _map_iteration_values(self, iteration):
+        return (iteration.get("scheduled_timestamp"),
+                iteration["timestamp"])
+
+    def add_iteration(self, iteration):
+        scheduled, started = self._map_iteration_values(iteration)
+        if scheduled is not None:
+            self._add_launch(scheduled, started)
+
+    def add_columns(self, columns):
+        scheduled, started = [], []
+        for s, t in zip(columns.scheduled_timestamp, columns.timestamp):
+            # NOTE: NaN means that the iteration was not scheduled
+            if s == s:
+                scheduled.append(s)
+                started.append(t)
+        if not scheduled:
+            return
+        for ins in self._scheduled:
+            ins.add_values(scheduled)
+        for ins in self._started:
+            ins.add_values(started)
+        lags = [max(t - s, 0) for s, t in zip(scheduled, started)]
+        for ins, fn in self._data["scheduling lag"]:
+            ins.add_values(lags)
+
+    def _add_launch(self, scheduled, started):
+        for ins in self._scheduled:
+            ins.add(scheduled)
+        for ins in self._started:
+            ins.add(started)
+        for ins, fn in self._data["scheduling lag"]:
+            ins.add(max(started - scheduled, 0))
+
+    def _get_rate(self, stamps):
+        count = self._data["scheduling lag"][-1][0].result()
+        period = (stamps[1].result() or 0) - (stamps[0].result() or 0)
+        return round((count - 1) / period, 3) if period > 0 else "n/a"
+
+    def render(self):
+        if not self._data["scheduling lag"][-1][0].result():
+            return {"cols": self.columns, "rows": [],
+                    "offered_rate": "n/a", "achieved_rate": "n/a"}
+        result = super(SchedulingTable, self).render()
+        result["offered_rate"] = self._get_rate(self._scheduled)
+        result["achieved_rate"] = self._get_rate(self._started)
+        return result
+
 
 class OutputChart(Chart):
     """Base class for charts related to scenario output."""
@@ -556,12 +1006,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload_info["iterations_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
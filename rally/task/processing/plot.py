@@ -14,26 +14,41 @@
 #    under the License.
 
 import collections
-import hashlib
 import json
+import multiprocessing
 
 import six
 
 from rally.common import objects
+from rally.common import streaming_algorithms as streaming
 from rally.common.plugin import plugin
+from rally.common import utils as rutils
 from rally.task.processing import charts
+from rally.task.processing import utils
 from rally.ui import utils as ui_utils
 
 
+# NOTE: the report template is rendered with this placeholder instead of
+#       the scenarios data, that is written by chunks in its place
+_SCENARIOS_PLACEHOLDER = "__rally_report_scenarios__"
+
+
 def _process_scenario(data, pos):
     main_area = charts.MainStackedAreaChart(data["info"])
     main_hist = charts.MainHistogramChart(data["info"])
-    main_stat = charts.MainStatsTable(data["info"])
     load_profile = charts.LoadProfileChart(data["info"])
+    load_timeline = charts.LoadTimelineChart(data["info"])
+    throughput = charts.ThroughputTimelineChart(data["info"])
+    error_rate = charts.ErrorRateTimelineChart(data["info"])
+    latency = charts.LatencyTimelineChart(data["info"])
+    scheduling = charts.SchedulingTable(data["info"])
     atomic_pie = charts.AtomicAvgChart(data["info"])
     atomic_area = charts.AtomicStackedAreaChart(data["info"])
     atomic_hist = charts.AtomicHistogramChart(data["info"])
 
+    # NOTE: iterations are walked once for errors and output, the workload
+    #       charts are computed from columns of the iterations afterwards
+    columns = utils.IterationsColumns(data["info"]["atomic"])
     errors = []
     output_errors = []
     additive_output_charts = []
@@ -66,9 +81,12 @@ def _process_scenario(data, pos):
             complete_charts.append(complete_chart)
         complete_output.append(complete_charts)
 
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
-            chart.add_iteration(itr)
+        columns.add_iteration(itr)
+
+    for chart in (main_area, main_hist, load_profile, load_timeline,
+                  throughput, error_rate, latency, scheduling, atomic_pie,
+                  atomic_area, atomic_hist):
+        chart.add_columns(columns)
 
     kw = data["key"]["kw"]
     cls, method = data["key"]["name"].split(".")
@@ -88,10 +106,16 @@ def _process_scenario(data, pos):
                     ("errors", len(errors))],
             "histogram": main_hist.render()},
         "load_profile": load_profile.render(),
+        "load_timeline": load_timeline.render(),
+        "timeline": {"throughput": throughput.render(),
+                     "errors": error_rate.render(),
+                     "latency": latency.render()},
+        "scheduling": scheduling.render(),
         "atomic": {"histogram": atomic_hist.render(),
                    "iter": atomic_area.render(),
                    "pie": atomic_pie.render()},
-        "table": main_stat.render(),
+        # NOTE: the table is already computed with the results info
+        "table": data["info"]["stat"],
         "additive_output": additive_output,
         "complete_output": complete_output,
         "output_errors": output_errors,
@@ -104,20 +128,29 @@ def _process_scenario(data, pos):
     }
 
 
-def _process_tasks(tasks_results):
-    tasks = []
-    source_dict = collections.defaultdict(list)
-    position = collections.defaultdict(lambda: -1)
+def _extend_result(result):
+    """Transform task result into extended format.
 
-    for scenario in tasks_results:
-        name = scenario["key"]["name"]
-        position[name] += 1
-        source_dict[name].append(scenario["key"]["kw"])
-        tasks.append(_process_scenario(scenario, position[name]))
+    If the result has aggregates of the iterations (see
+    objects.task.ResultAggregator), they are used as is, so the iterations
+    are not walked and may be given by a lazy iterator.
 
-    source = json.dumps(source_dict, indent=2, sort_keys=True)
-    return source, sorted(tasks, key=lambda r: (r["cls"], r["met"],
-                                                int(r["pos"])))
+    :param result: task result in old format
+    :returns: task result in new format
+    """
+    generic = {"id": None,
+               "task_uuid": None,
+               "key": result["key"],
+               "data": {"sla": result["sla"],
+                        "raw": result["result"],
+                        "full_duration": result["full_duration"],
+                        "load_duration": result["load_duration"]},
+               "created_at": None,
+               "updated_at": None}
+    for column in objects.task.ResultAggregator.COLUMNS:
+        if column in result:
+            generic[column] = result[column]
+    return objects.Task.extend_results([generic])[0]
 
 
 def _extend_results(results):
@@ -130,38 +163,312 @@ def _extend_results(results):
     :param results: tasks results list in old format
     :returns: tasks results list in new format
     """
-    extended_results = []
-    for result in results:
-        generic = {"id": None,
-                   "task_uuid": None,
-                   "key": result["key"],
-                   "data": {"sla": result["sla"],
-                            "raw": result["result"],
-                            "full_duration": result["full_duration"],
-                            "load_duration": result["load_duration"]},
-                   "created_at": None,
-                   "updated_at": None}
-        extended_results.extend(
-            objects.Task.extend_results([generic]))
-    return extended_results
-
-
-def plot(tasks_results, include_libs=False):
-    extended_results = _extend_results(tasks_results)
+    return [_extend_result(result) for result in results]
+
+
+def _order_tasks(tasks_results):
+    """Get source and order of tasks results in the report.
+
+    Only keys of the results are used, so the results can be processed
+    one by one in the order of the report.
+
+    :param tasks_results: tasks results list in old format
+    :returns: tuple (source dict, list of (result, position) tuples)
+    """
+    source_dict = collections.defaultdict(list)
+    position = collections.defaultdict(lambda: -1)
+    ordered = []
+    for result in tasks_results:
+        name = result["key"]["name"]
+        position[name] += 1
+        source_dict[name].append(result["key"]["kw"])
+        ordered.append((name.split(".", 1), position[name], result))
+    ordered.sort(key=lambda r: (r[0], r[1]))
+    return source_dict, [(result, pos) for _, pos, result in ordered]
+
+
+def _materialize(result):
+    """Make task result picklable, so it can be sent to a worker process.
+
+    :param result: task result in old format, its iterations can be given
+                   by a lazy iterator
+    :returns: copy of task result with iterations list
+    """
+    if isinstance(result["result"], list):
+        return result
+    return dict(result, result=list(result["result"]))
+
+
+def _parallel_map(func, items, workers=None):
+    """Apply function to items in worker processes, keeping the order.
+
+    Only a limited number of items is sent to the workers at once, so
+    items (and their results) are never kept in memory all together.
+
+    :param func: top-level function, so it can be pickled
+    :param items: iterable of picklable items
+    :param workers: number of worker processes, items are processed in the
+                    current process if it is not greater than 1
+    :returns: generator of func results in the order of items
+    """
+    if not workers or workers < 2:
+        for item in items:
+            yield func(item)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.apply_async(func, (item,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _process_result(job):
+    result, pos = job
+    return json.dumps(_process_scenario(_extend_result(result), pos))
+
+
+def _iter_report(tasks_results, include_libs=False, workers=None):
+    """Generate HTML report by chunks.
+
+    Each task result is extended and processed in a single pass over its
+    iterations and written right away, so the whole report data is never
+    kept in memory.
+
+    :param tasks_results: tasks results list in old format
+    :param include_libs: bool, whether to embed JS and CSS libraries
+    :param workers: number of processes to process task results in
+    :returns: generator of str chunks of the report
+    """
+    tasks_results = list(tasks_results)
+    source_dict, ordered = _order_tasks(tasks_results)
+    source = json.dumps(source_dict, indent=2, sort_keys=True)
     template = ui_utils.get_template("task/report.html")
-    source, data = _process_tasks(extended_results)
-    return template.render(source=json.dumps(source), data=json.dumps(data),
+    html = template.render(source=json.dumps(source),
+                           data=_SCENARIOS_PLACEHOLDER,
                            include_libs=include_libs)
+    head, tail = html.split(_SCENARIOS_PLACEHOLDER, 1)
+
+    if workers and workers > 1:
+        ordered = ((_materialize(result), pos) for result, pos in ordered)
 
+    yield head
+    yield "["
+    for idx, scenario in enumerate(_parallel_map(_process_result, ordered,
+                                                 workers)):
+        yield (", " if idx else "") + scenario
+    yield "]"
+    yield tail
 
-def trends(tasks_results):
+
+def plot(tasks_results, include_libs=False, workers=None):
+    return "".join(_iter_report(tasks_results, include_libs, workers))
+
+
+def plot_to_file(tasks_results, output, include_libs=False, workers=None):
+    """Write HTML report to the file incrementally.
+
+    :param tasks_results: tasks results list in old format
+    :param output: file object to write the report
+    :param include_libs: bool, whether to embed JS and CSS libraries
+    :param workers: number of processes to process task results in
+    """
+    for chunk in _iter_report(tasks_results, include_libs, workers):
+        output.write(chunk)
+
+
+def _summarize_result(result):
+    """Get the part of extended task result used by trends.
+
+    :param result: task result in old format
+    :returns: dict with key, sla and info of extended task result
+    """
+    extended = _extend_result(result)
+    return {"key": extended["key"], "sla": extended["sla"],
+            "info": extended["info"], "kw_hash": result.get("kw_hash")}
+
+
+def trends(tasks_results, workers=None):
+    """Generate trends HTML report.
+
+    :param tasks_results: tasks results list in old format
+    :param workers: number of processes to process task results in
+    """
+    if workers and workers > 1:
+        # NOTE: iterations are not needed if statistics are already known
+        tasks_results = (
+            dict(r, result=[]) if r.get("statistics") is not None
+            else _materialize(r) for r in tasks_results)
     trends = Trends()
-    for i, scenario in enumerate(_extend_results(tasks_results), 1):
+    for scenario in _parallel_map(_summarize_result, tasks_results, workers):
         trends.add_result(scenario)
     template = ui_utils.get_template("task/trends.html")
     return template.render(data=json.dumps(trends.get_data()))
 
 
+def _collect_durations(result):
+    """Get durations of the workload actions used by comparison.
+
+    :param result: task result in old format
+    :returns: dict with key and kw_hash of the task result, and durations
+              of each action of successful iterations, that are stored by
+              PercentileComputation instances, so they can be merged and
+              compared with bounded memory
+    """
+    extended = _extend_result(result)
+    durations = collections.OrderedDict(
+        (name, streaming.PercentileComputation(0.5))
+        for name in extended["info"]["atomic"])
+    total = streaming.PercentileComputation(0.5)
+    for itr in extended["iterations"]:
+        if itr["error"]:
+            continue
+        for name, value in itr["atomic_actions"].items():
+            if name not in durations:
+                durations[name] = streaming.PercentileComputation(0.5)
+            durations[name].add(value or 0)
+        total.add(itr["duration"])
+    durations["total"] = total
+    return {"key": extended["key"], "kw_hash": result.get("kw_hash"),
+            "durations": durations}
+
+
+def compare(base_results, new_results, alpha=0.05, threshold=0.1,
+            workers=None):
+    """Compare durations of workloads of two task runs.
+
+    :param base_results: tasks results list in old format of the base run
+    :param new_results: tasks results list in old format of the new run
+    :param alpha: significance level of the differences
+    :param threshold: minimal relative slowdown of a regression
+    :param workers: number of processes to process task results in
+    :returns: comparison data, see Comparison.get_data()
+    """
+    comparison = Comparison(alpha=alpha, threshold=threshold)
+    for results, base in ((base_results, True), (new_results, False)):
+        if workers and workers > 1:
+            results = (_materialize(r) for r in results)
+        for workload in _parallel_map(_collect_durations, results, workers):
+            comparison.add_result(workload, base=base)
+    return comparison.get_data()
+
+
+class Comparison(object):
+    """Compare workloads of two task runs.
+
+    Workloads are matched by the hash of their input configuration, like
+    in Trends. Durations of each action are compared by medians and by
+    the Mann-Whitney U test, so the difference is reported only if it is
+    statistically significant.
+    """
+
+    def __init__(self, alpha=0.05, threshold=0.1):
+        """Init comparison.
+
+        :param alpha: significance level, differences with greater
+                      p-value are not reported
+        :param threshold: minimal relative difference of medians to be
+                          reported, e.g. 0.1 is 10%
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self._workloads = {}
+
+    def add_result(self, result, base=False):
+        """Add workload durations of one of the runs.
+
+        :param result: dict returned by _collect_durations()
+        :param base: bool, whether the workload is of the base run
+        """
+        key = (result.get("kw_hash")
+               or rutils.make_config_hash(result["key"]["kw"]))
+        if key not in self._workloads:
+            name = result["key"]["name"]
+            self._workloads[key] = {"name": name,
+                                    "cls": name.split(".")[0],
+                                    "met": name.split(".")[1],
+                                    "config": json.dumps(result["key"]["kw"],
+                                                         indent=2),
+                                    "base": None,
+                                    "new": None}
+        run = "base" if base else "new"
+        durations = self._workloads[key][run]
+        if durations is None:
+            self._workloads[key][run] = result["durations"]
+            return
+        # NOTE: the same workload can be run several times in the task
+        for name, ins in result["durations"].items():
+            if name in durations:
+                durations[name].merge(ins)
+            else:
+                durations[name] = ins
+
+    def _compare_action(self, name, base, new):
+        row = {"name": name, "base": None, "new": None, "delta": None,
+               "delta_percent": None, "p_value": None, "status": "n/a"}
+        if base is not None:
+            row["base"] = base.result()
+        if new is not None:
+            row["new"] = new.result()
+        if row["base"] is None or row["new"] is None:
+            return row
+
+        row["delta"] = row["new"] - row["base"]
+        if row["base"]:
+            relative = row["delta"] / row["base"]
+            row["delta_percent"] = relative * 100
+        else:
+            relative = float("inf") if row["delta"] else 0
+        row["p_value"] = streaming.mann_whitney_u_test(base, new)[1]
+        if row["p_value"] >= self.alpha or abs(relative) < self.threshold:
+            row["status"] = "no change"
+        elif row["delta"] > 0:
+            row["status"] = "regression"
+        else:
+            row["status"] = "improvement"
+        return row
+
+    def get_data(self):
+        """Get comparison of the workloads.
+
+        :returns: list of workloads dicts sorted by name, each has
+                  "actions" list of dicts with medians of both runs,
+                  delta, p-value and status of the action (one of
+                  "regression", "improvement", "no change" or "n/a" if
+                  the action is missing in one of the runs), and
+                  "regressions" count. Workloads that are missing in one
+                  of the runs have "matched" False and no actions
+        """
+        data = []
+        for workload in self._workloads.values():
+            base = workload.pop("base")
+            new = workload.pop("new")
+            workload["matched"] = base is not None and new is not None
+            workload["actions"] = []
+            if workload["matched"]:
+                # NOTE: "total" is kept the last
+                names = [n for n in base if n != "total"]
+                names.extend(n for n in new
+                             if n not in base and n != "total")
+                for name in names + ["total"]:
+                    workload["actions"].append(self._compare_action(
+                        name, base.get(name), new.get(name)))
+            workload["regressions"] = len(
+                [a for a in workload["actions"]
+                 if a["status"] == "regression"])
+            data.append(workload)
+        self._workloads = {}
+        return sorted(data, key=lambda w: w["name"])
+
+
 class Trends(object):
     """Process tasks results and make trends data.
 
@@ -173,26 +480,10 @@ class Trends(object):
     def __init__(self):
         self._tasks = {}
 
-    def _to_str(self, obj):
-        """Convert object into string."""
-        if obj is None:
-            return "None"
-        elif isinstance(obj, six.string_types + (int, float)):
-            return str(obj).strip()
-        elif isinstance(obj, (list, tuple)):
-            return ",".join(sorted([self._to_str(v) for v in obj]))
-        elif isinstance(obj, dict):
-            return "|".join(sorted([":".join([self._to_str(k),
-                                              self._to_str(v)])
-                                    for k, v in obj.items()]))
-        raise TypeError("Unexpected type %(type)r of object %(obj)r"
-                        % {"obj": obj, "type": type(obj)})
-
-    def _make_hash(self, obj):
-        return hashlib.md5(self._to_str(obj).encode("utf8")).hexdigest()
-
     def add_result(self, result):
-        key = self._make_hash(result["key"]["kw"])
+        # NOTE: hash of the workload config is stored with the task result
+        key = (result.get("kw_hash")
+               or rutils.make_config_hash(result["key"]["kw"]))
         if key not in self._tasks:
             name = result["key"]["name"]
             self._tasks[key] = {"seq": 1,
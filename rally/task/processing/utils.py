@@ -13,6 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import array
+import collections
+import math
+
+import six
+
+
+NAN = float("nan")
+
 
 class GraphZipper(object):
 
@@ -73,5 +82,139 @@ class GraphZipper(object):
             self.ratio_value_points = [[1 - rest, value]]
             self.cached_ratios_sum = self.ratio_value_points[0][0]
 
+    def add_points(self, values):
+        """Add all points at once.
+
+        This gives the same graph as add_point() called for each value,
+        but the zipped points are computed from prefix sums of the values
+        instead of walking the points one by one.
+
+        :param values: sequence of numbers
+        """
+        if self.point_order or self.compression_ratio <= 1:
+            for value in values:
+                self.add_point(value)
+            return
+
+        count = len(values)
+        if count > self.base_size:
+            raise RuntimeError("GraphZipper is already full. "
+                               "You can't add more points.")
+
+        prefix_sums = [0.0]
+        total = 0.0
+        for value in values:
+            total += value
+            prefix_sums.append(total)
+
+        def integral(x):
+            idx = int(x)
+            if idx >= count:
+                return prefix_sums[count]
+            return prefix_sums[idx] + (x - idx) * values[idx]
+
+        ratio = self.compression_ratio
+        zipped = 0
+        while True:
+            end = (zipped + 1) * ratio
+            # NOTE: the window is complete at its last point, small error
+            #       is allowed since the ratio is float
+            point_order = int(math.ceil(end - 1e-9))
+            if point_order > count:
+                break
+            if point_order - ratio <= 1:
+                order = 1
+            elif point_order == self.base_size:
+                order = self.base_size
+            else:
+                order = point_order - int(ratio / 2.0)
+            value = (integral(min(end, count))
+                     - integral(zipped * ratio)) / ratio
+            self.zipped_graph.append([order, value])
+            zipped += 1
+
+        # NOTE: keep the rest of points, so add_point() can be used further
+        start = zipped * ratio
+        idx = int(start)
+        self.ratio_value_points = []
+        if idx < count:
+            self.ratio_value_points.append([idx + 1 - start, values[idx]])
+            self.ratio_value_points.extend(
+                [1, value] for value in values[idx + 1:])
+        self.cached_ratios_sum = count - start
+        self.point_order = count
+
     def get_zipped_graph(self):
         return self.zipped_graph
+
+
+class IterationsColumns(object):
+    """Iterations of the workload stored by columns.
+
+    Each iteration value is stored in its own array of floats, so charts
+    can process the whole workload at once with builtin functions instead
+    of handling iterations dicts one by one. Atomic actions missing in an
+    iteration are stored as NaN.
+    """
+
+    def __init__(self, atomic_names=()):
+        self.count = 0
+        self.timestamp = array.array("d")
+        self.duration = array.array("d")
+        self.idle_duration = array.array("d")
+        self.scheduled_timestamp = array.array("d")
+        self.error = array.array("b")
+        self.atomic = collections.OrderedDict(
+            (name, array.array("d")) for name in atomic_names)
+
+    def add_iteration(self, iteration):
+        self.timestamp.append(iteration["timestamp"])
+        self.duration.append(iteration["duration"] or 0)
+        self.idle_duration.append(iteration["idle_duration"] or 0)
+        scheduled = iteration.get("scheduled_timestamp")
+        self.scheduled_timestamp.append(
+            NAN if scheduled is None else scheduled)
+        self.error.append(1 if iteration["error"] else 0)
+
+        atomic_actions = iteration["atomic_actions"]
+        for name in atomic_actions:
+            if name not in self.atomic:
+                self.atomic[name] = array.array("d", [NAN]) * self.count
+        for name, column in self.atomic.items():
+            if name in atomic_actions:
+                column.append(atomic_actions[name] or 0)
+            else:
+                column.append(NAN)
+        self.count += 1
+
+    def get_atomic(self, name):
+        """Get durations of the atomic action, 0 for missing ones.
+
+        :param name: str name of the atomic action
+        :returns: array of floats
+        """
+        column = self.atomic.get(name)
+        if column is None:
+            return array.array("d", [0]) * self.count
+        # NOTE: NaN is the only value that is not equal to itself
+        return array.array("d", [v if v == v else 0 for v in column])
+
+    def iter_iterations(self):
+        """Generate iterations dicts back from the columns.
+
+        Error details are not stored, so failed iterations have
+        ["", "", ""] error.
+        """
+        for i in six.moves.range(self.count):
+            scheduled = self.scheduled_timestamp[i]
+            iteration = {
+                "timestamp": self.timestamp[i],
+                "duration": self.duration[i],
+                "idle_duration": self.idle_duration[i],
+                "error": ["", "", ""] if self.error[i] else [],
+                "atomic_actions": collections.OrderedDict(
+                    (name, column[i]) for name, column in self.atomic.items()
+                    if column[i] == column[i])}
+            if scheduled == scheduled:
+                iteration["scheduled_timestamp"] = scheduled
+            yield iteration
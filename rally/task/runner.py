@@ -16,17 +16,23 @@
 import abc
 import collections
 import copy
+import functools
 import multiprocessing
+import struct
+import threading
 import time
 
 import jsonschema
+from six.moves import queue as Queue
 
 from rally.common import logging
+from rally.common import objects
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.task import context
 from rally.task.processing import charts
 from rally.task import scenario
+from rally.task import sla
 from rally.task import types
 from rally.task import utils
 
@@ -44,10 +50,20 @@ def format_result_on_timeout(exc, timeout):
     }
 
 
+# NOTE: Runners map the same context object for all iterations, so the
+#       context manager of the last mapped object is kept to not instantiate
+#       and sort context classes per iteration.
+_scenario_context_manager = None
+
+
 def _get_scenario_context(iteration, context_obj):
-    context_obj = copy.deepcopy(context_obj)
-    context_obj["iteration"] = iteration
-    return context.ContextManager(context_obj).map_for_scenario()
+    global _scenario_context_manager
+
+    manager = _scenario_context_manager
+    if manager is None or manager.context_obj is not context_obj:
+        manager = context.ContextManager(context_obj)
+        _scenario_context_manager = manager
+    return manager.map_for_scenario(iteration)
 
 
 def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs):
@@ -87,6 +103,342 @@ def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs):
                                  scenario_kwargs))
 
 
+class _SLAAggregatingQueue(object):
+    """Queue wrapper that aggregates the results in a worker process.
+
+    Results are added to the SLA checker and to the statistics aggregator
+    (objects.task.ResultAggregator) of the worker. Both of them are put to
+    the queue periodically and replaced with new ones, so the parent
+    process merges the partial aggregates instead of checking and
+    aggregating each result. The results themselves are still passed to
+    the wrapped queue, because the parent stores them. Results with wrong
+    format are dropped, as the parent would do.
+    """
+
+    def __init__(self, queue, task_uuid, sla_config, flush_interval):
+        self.queue = queue
+        self.task = {"uuid": task_uuid}
+        self.sla_config = sla_config
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.sla_checker = sla.SLAChecker(self.sla_config)
+        self.aggregator = objects.task.ResultAggregator()
+        self.count = 0
+        self.flushed_at = time.time()
+
+    def put(self, result):
+        if not _result_has_valid_schema(result, self.task):
+            LOG.warning(
+                "Task %s | Worker is trying to send results in "
+                "wrong format" % self.task["uuid"])
+            return
+        self.queue.put(result)
+        with self._lock:
+            self.sla_checker.add_iteration(result)
+            self.aggregator.add_iteration(result)
+            self.count += 1
+            if time.time() - self.flushed_at >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        if self.count:
+            self.queue.put(self.sla_checker)
+            self.queue.put(self.aggregator)
+        self._reset()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+
+def _worker_with_sla(worker_process, task_uuid, sla_config, flush_interval,
+                     queue, *args, **kwargs):
+    """Run worker process target checking SLA and aggregating its results.
+
+    :param worker_process: target function of the worker process, that puts
+                           results to the queue passed as the first argument
+    :param task_uuid: uuid of the task, used only for logging
+    :param sla_config: workload config with the "sla" section
+    :param flush_interval: how often (in seconds) partial aggregates are
+                           sent to the parent
+    :param queue: queue object to append results and aggregates
+    """
+    aggregating_queue = _SLAAggregatingQueue(queue, task_uuid, sla_config,
+                                             flush_interval)
+    try:
+        worker_process(aggregating_queue, *args, **kwargs)
+    finally:
+        aggregating_queue.flush()
+
+
+_RESULT_SCHEMA = {
+    "fields": [("duration", float), ("timestamp", float),
+               ("idle_duration", float), ("output", dict),
+               ("atomic_actions", dict), ("error", list)]
+}
+_RESULT_FIELDS = frozenset(key for key, _type in _RESULT_SCHEMA["fields"])
+
+
+def _result_has_valid_schema(result, task):
+    """Check whatever result has valid schema or not.
+
+    :param result: iteration result dict
+    :param task: task dict, used only for logging
+    """
+    # NOTE(boris-42): We can't use here jsonschema, this method is called
+    #                 to check every iteration result schema. And this
+    #                 method works 200 times faster then jsonschema
+    #                 which totally makes sense.
+    for key, proper_type in _RESULT_SCHEMA["fields"]:
+        if key not in result:
+            LOG.warning("'%s' is not result" % key)
+            return False
+        if not isinstance(result[key], proper_type):
+            LOG.warning(
+                "Task %(uuid)s | result['%(key)s'] has wrong type "
+                "'%(actual_type)s', should be '%(proper_type)s'"
+                % {"uuid": task["uuid"],
+                   "key": key,
+                   "actual_type": type(result[key]),
+                   "proper_type": proper_type.__name__})
+            return False
+
+    for action, value in result["atomic_actions"].items():
+        if not isinstance(value, float):
+            LOG.warning(
+                "Task %(uuid)s | Atomic action %(action)s has wrong type "
+                "'%(type)s', should be 'float'"
+                % {"uuid": task["uuid"],
+                   "action": action,
+                   "type": type(value)})
+            return False
+
+    for e in result["error"]:
+        if not isinstance(e, str):
+            LOG.warning("error value has wrong type '%s', should be 'str'"
+                        % type(e))
+            return False
+
+    for key in ("additive", "complete"):
+        if key not in result["output"]:
+            LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
+                        % {"uuid": task["uuid"], "key": key})
+            return False
+
+        type_ = type(result["output"][key])
+        if type_ != list:
+            LOG.warning(
+                "Task %(uuid)s | Value of result['output']['%(key)s'] "
+                "has wrong type '%(type)s', must be 'list'"
+                % {"uuid": task["uuid"],
+                   "key": key, "type": type_.__name__})
+            return False
+
+    for key in result["output"]:
+        for output_data in result["output"][key]:
+            message = charts.validate_output(key, output_data)
+            if message:
+                LOG.warning("Task %(uuid)s | %(message)s"
+                            % {"uuid": task["uuid"], "message": message})
+                return False
+
+    return True
+
+
+# NOTE: Fixed part of a packed result: duration, timestamp, idle_duration,
+#       error id, output id, extra fields id and the number of atomic
+#       actions. It is followed by (name id, duration) pair per atomic
+#       action. Ids are 1-based indexes in the tables of the batch, 0 means
+#       no error, empty output or no extra fields (e.g. scheduled_timestamp
+#       of the rps runner).
+_PACKED_RESULT = struct.Struct("<dddHHHH")
+_PACKED_ATOMIC_ACTION = struct.Struct("<Hd")
+
+
+class _WorkerFinished(object):
+    """Marker put to the result queue by a worker after its last result."""
+
+
+class _PackedResults(object):
+    """Batch of validated iteration results packed into a buffer."""
+
+    def __init__(self, count, data, names, errors, outputs, extras):
+        self.count = count
+        self.data = data
+        self.names = names
+        self.errors = errors
+        self.outputs = outputs
+        self.extras = extras
+
+
+class _ResultPacker(object):
+    """Pack iteration results of a worker into _PackedResults batches."""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self._chunks = []
+        self._names = {}
+        self._errors = {}
+        self._outputs = []
+        self._extras = []
+
+    def add(self, result):
+        """Add validated iteration result to the batch.
+
+        :param result: iteration result dict
+        """
+        error_id = 0
+        if result["error"]:
+            error_id = self._errors.setdefault(tuple(result["error"]),
+                                               len(self._errors) + 1)
+        output_id = 0
+        if result["output"]["additive"] or result["output"]["complete"]:
+            self._outputs.append(result["output"])
+            output_id = len(self._outputs)
+        extra_id = 0
+        if len(result) > len(_RESULT_FIELDS):
+            self._extras.append(dict((k, v) for k, v in result.items()
+                                     if k not in _RESULT_FIELDS))
+            extra_id = len(self._extras)
+
+        atomic_actions = result["atomic_actions"]
+        self._chunks.append(_PACKED_RESULT.pack(
+            result["duration"], result["timestamp"],
+            result["idle_duration"], error_id, output_id, extra_id,
+            len(atomic_actions)))
+        for name, value in atomic_actions.items():
+            name_id = self._names.setdefault(name, len(self._names))
+            self._chunks.append(_PACKED_ATOMIC_ACTION.pack(name_id, value))
+        self.count += 1
+
+    def pop(self):
+        """Return the packed batch and start a new one."""
+        packed = _PackedResults(
+            self.count, b"".join(self._chunks),
+            sorted(self._names, key=self._names.get),
+            [list(e) for e in sorted(self._errors, key=self._errors.get)],
+            self._outputs, self._extras)
+        self._reset()
+        return packed
+
+
+def _unpack_results(packed):
+    """Generate iteration result dicts from the packed batch.
+
+    :param packed: _PackedResults instance
+    """
+    data = packed.data
+    names = packed.names
+    offset = 0
+    for i in range(packed.count):
+        (duration, timestamp, idle_duration, error_id, output_id, extra_id,
+         actions_count) = _PACKED_RESULT.unpack_from(data, offset)
+        offset += _PACKED_RESULT.size
+        # NOTE: OrderedDict is expensive on Python 2 and order does not
+        #       matter for less than two atomic actions
+        atomic_actions = (collections.OrderedDict() if actions_count > 1
+                          else {})
+        for j in range(actions_count):
+            name_id, value = _PACKED_ATOMIC_ACTION.unpack_from(data, offset)
+            offset += _PACKED_ATOMIC_ACTION.size
+            atomic_actions[names[name_id]] = value
+        result = {
+            "duration": duration,
+            "timestamp": timestamp,
+            "idle_duration": idle_duration,
+            "error": list(packed.errors[error_id - 1]) if error_id else [],
+            "output": (packed.outputs[output_id - 1] if output_id
+                       else {"additive": [], "complete": []}),
+            "atomic_actions": atomic_actions}
+        if extra_id:
+            result.update(packed.extras[extra_id - 1])
+        yield result
+
+
+class _ResultPackingQueue(object):
+    """Queue wrapper that validates and packs results in a worker process.
+
+    Results are validated once in the worker, so the parent process does
+    not check each of them, and sent as _PackedResults batches instead of
+    one pickled dict per iteration. A batch is sent when it reaches the
+    size limit, and a background thread sends the incomplete batch
+    periodically, so results of slow iterations are not delayed. Other
+    objects are put to the wrapped queue as is, after the pending results.
+    """
+
+    def __init__(self, queue, task_uuid, batch_size, flush_interval):
+        self.queue = queue
+        self.task = {"uuid": task_uuid}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.packer = _ResultPacker()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def put(self, item):
+        with self._lock:
+            if not isinstance(item, dict):
+                self._flush()
+                self.queue.put(item)
+            elif not _result_has_valid_schema(item, self.task):
+                LOG.warning(
+                    "Task %s | Worker is trying to send results in "
+                    "wrong format" % self.task["uuid"])
+            else:
+                self.packer.add(item)
+                if self.packer.count >= self.batch_size:
+                    self._flush()
+
+    def _flush(self):
+        if self.packer.count:
+            self.queue.put(self.packer.pop())
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                self._flush()
+
+    def close(self):
+        """Stop the background flushes and send the pending results.
+
+        _WorkerFinished marker is sent after the results, so the parent
+        does not wait for the worker exit to be noticed by polling.
+        """
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self._flush()
+            self.queue.put(_WorkerFinished())
+
+
+def _worker_with_result_packing(worker_process, task_uuid, batch_size,
+                                flush_interval, queue, *args, **kwargs):
+    """Run worker process target packing its results.
+
+    :param worker_process: target function of the worker process, that puts
+                           results to the queue passed as the first argument
+    :param task_uuid: uuid of the task, used only for logging
+    :param batch_size: max number of results in a packed batch
+    :param flush_interval: how often (in seconds) an incomplete batch is sent
+    :param queue: queue object to put packed results to
+    """
+    packing_queue = _ResultPackingQueue(queue, task_uuid, batch_size,
+                                        flush_interval)
+    try:
+        worker_process(packing_queue, *args, **kwargs)
+    finally:
+        packing_queue.close()
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -114,11 +466,28 @@ class ScenarioRunner(plugin.Plugin):
 
     CONFIG_SCHEMA = {}
 
+    # NOTE: Runners that start worker processes via _create_process_pool()
+    #       can check SLA in the workers, see check_sla_in_workers()
+    WORKER_SLA_SUPPORTED = False
+    WORKER_SLA_FLUSH_INTERVAL = 0.1
+
+    # NOTE: Workers started via _create_process_pool() validate results and
+    #       send them to the parent in packed batches of this size
+    PACK_RESULTS = True
+    RESULT_PACKING_BATCH_SIZE = 512
+    RESULT_PACKING_INTERVAL = 0.1
+
+    # NOTE: How long _join_processes() blocks on the result queue before
+    #       checking whether the worker processes are alive
+    PROCESS_CHECK_INTERVAL = 0.1
+
     def __init__(self, task, config, batch_size=0):
         """Runner constructor.
 
         It sets task and config to local variables. Also initialize
-        result_queue, where results will be put by _send_result method.
+        result_queue, where results will be put by _send_result method,
+        and results_available event, that is set each time something is
+        put to result_queue or worker_sla_results.
 
         :param task: Instance of objects.Task
         :param config: Dict with runner section from benchmark configuration
@@ -130,6 +499,10 @@ class ScenarioRunner(plugin.Plugin):
         self.run_duration = 0
         self.batch_size = batch_size
         self.result_batch = []
+        self.worker_sla_config = None
+        self.worker_sla_results = collections.deque()
+        self.worker_stats_results = collections.deque()
+        self.results_available = threading.Event()
 
     @staticmethod
     def validate(config):
@@ -167,18 +540,52 @@ class ScenarioRunner(plugin.Plugin):
         """Abort the execution of further benchmark scenario iterations."""
         self.aborted.set()
 
-    @staticmethod
-    def _create_process_pool(processes_to_start, worker_process,
+    def check_sla_in_workers(self, sla_config):
+        """Make worker processes check SLA if it is enabled in runner config.
+
+        With "worker_sla" option each worker process checks SLA of its own
+        results and aggregates their statistics. It periodically sends
+        partial aggregates (SLAChecker and objects.task.ResultAggregator
+        objects), that are put to worker_sla_results and
+        worker_stats_results, so the consumer merges them instead of
+        checking and aggregating every result in a single thread.
+
+        Most SLA criteria and the statistics are merged exactly. The
+        "outliers" SLA can't be merged exactly, because its threshold
+        depends on all durations, so it is approximate in this mode.
+
+        :param sla_config: workload config with the "sla" section
+        :returns: True if SLA is checked by the workers
+        """
+        if self.WORKER_SLA_SUPPORTED and self.config.get("worker_sla"):
+            self.worker_sla_config = sla_config
+            return True
+        return False
+
+    def _create_process_pool(self, processes_to_start, worker_process,
                              worker_args_gen):
         """Create a pool of processes with some defined target function.
 
         :param processes_to_start: number of processes to create in the pool
-        :param worker_process: target function for all processes in the pool
+        :param worker_process: target function for all processes in the pool,
+                               the first argument of it should be the queue
+                               to put results to
         :param worker_args_gen: generator of arguments for the target function
         :returns: the process pool as a deque
         """
         process_pool = collections.deque()
 
+        if self.worker_sla_config is not None:
+            worker_process = functools.partial(
+                _worker_with_sla, worker_process, self.task["uuid"],
+                self.worker_sla_config, self.WORKER_SLA_FLUSH_INTERVAL)
+
+        if self.PACK_RESULTS:
+            worker_process = functools.partial(
+                _worker_with_result_packing, worker_process,
+                self.task["uuid"], self.RESULT_PACKING_BATCH_SIZE,
+                self.RESULT_PACKING_INTERVAL)
+
         for i in range(processes_to_start):
             kwrgs = {"processes_to_start": processes_to_start,
                      "processes_counter": i}
@@ -196,103 +603,84 @@ class ScenarioRunner(plugin.Plugin):
         :param process_pool: pool of processes to join
         :result_queue: multiprocessing.Queue that receives the results
         """
+        processes_to_finish = len(process_pool)
         while process_pool:
             while process_pool and not process_pool[0].is_alive():
                 process_pool.popleft().join()
 
-            if result_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.001)
+            if process_pool:
+                # NOTE: block until a result arrives instead of polling the
+                #       queue, but wake up periodically to join the workers
+                try:
+                    result = result_queue.get(
+                        timeout=self.PROCESS_CHECK_INTERVAL)
+                except Queue.Empty:
+                    pass
+                else:
+                    if self._receive_result(result):
+                        processes_to_finish -= 1
+
+            if not processes_to_finish:
+                # NOTE: all the workers have sent their last results and
+                #       are exiting, so join them without polling
+                while process_pool:
+                    process_pool.popleft().join()
 
             while not result_queue.empty():
-                self._send_result(result_queue.get())
+                if self._receive_result(result_queue.get()):
+                    processes_to_finish -= 1
 
         self._flush_results()
         result_queue.close()
 
+    def _receive_result(self, result):
+        """Process an item received from a worker process.
+
+        :param result: iteration result dict, _PackedResults, SLAChecker
+                       or ResultAggregator with partial aggregates or
+                       _WorkerFinished marker
+        :returns: True if a worker has sent all its results
+        """
+        if isinstance(result, _WorkerFinished):
+            return True
+        elif isinstance(result, _PackedResults):
+            # NOTE: packed results are validated by the worker
+            for r in _unpack_results(result):
+                self._send_result(r, validate=False)
+        elif isinstance(result, sla.SLAChecker):
+            self.worker_sla_results.append(result)
+            self.results_available.set()
+        elif isinstance(result, objects.task.ResultAggregator):
+            self.worker_stats_results.append(result)
+            self.results_available.set()
+        else:
+            self._send_result(result)
+        return False
+
     def _flush_results(self):
         if self.result_batch:
             sorted_batch = sorted(self.result_batch)
             self.result_queue.append(sorted_batch)
             del self.result_batch[:]
+            self.results_available.set()
 
-    _RESULT_SCHEMA = {
-        "fields": [("duration", float), ("timestamp", float),
-                   ("idle_duration", float), ("output", dict),
-                   ("atomic_actions", dict), ("error", list)]
-    }
+    _RESULT_SCHEMA = _RESULT_SCHEMA
 
     def _result_has_valid_schema(self, result):
         """Check whatever result has valid schema or not."""
-        # NOTE(boris-42): We can't use here jsonschema, this method is called
-        #                 to check every iteration result schema. And this
-        #                 method works 200 times faster then jsonschema
-        #                 which totally makes sense.
-        for key, proper_type in self._RESULT_SCHEMA["fields"]:
-            if key not in result:
-                LOG.warning("'%s' is not result" % key)
-                return False
-            if not isinstance(result[key], proper_type):
-                LOG.warning(
-                    "Task %(uuid)s | result['%(key)s'] has wrong type "
-                    "'%(actual_type)s', should be '%(proper_type)s'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key,
-                       "actual_type": type(result[key]),
-                       "proper_type": proper_type.__name__})
-                return False
-
-        for action, value in result["atomic_actions"].items():
-            if not isinstance(value, float):
-                LOG.warning(
-                    "Task %(uuid)s | Atomic action %(action)s has wrong type "
-                    "'%(type)s', should be 'float'"
-                    % {"uuid": self.task["uuid"],
-                       "action": action,
-                       "type": type(value)})
-                return False
-
-        for e in result["error"]:
-            if not isinstance(e, str):
-                LOG.warning("error value has wrong type '%s', should be 'str'"
-                            % type(e))
-                return False
-
-        for key in ("additive", "complete"):
-            if key not in result["output"]:
-                LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
-                            % {"uuid": self.task["uuid"], "key": key})
-                return False
-
-            type_ = type(result["output"][key])
-            if type_ != list:
-                LOG.warning(
-                    "Task %(uuid)s | Value of result['output']['%(key)s'] "
-                    "has wrong type '%(type)s', must be 'list'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key, "type": type_.__name__})
-                return False
-
-        for key in result["output"]:
-            for output_data in result["output"][key]:
-                message = charts.validate_output(key, output_data)
-                if message:
-                    LOG.warning("Task %(uuid)s | %(message)s"
-                                % {"uuid": self.task["uuid"],
-                                   "message": message})
-                    return False
-
-        return True
+        return _result_has_valid_schema(result, self.task)
 
-    def _send_result(self, result):
+    def _send_result(self, result, validate=True):
         """Store partial result to send it to consumer later.
 
         :param result: Result dict to be sent. It should match the
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
+        :param validate: whether to check the result schema, False for
+                         results that are already validated by a worker
         """
 
-        if not self._result_has_valid_schema(result):
+        if validate and not self._result_has_valid_schema(result):
             LOG.warning(
                 "Task %(task)s | Runner `%(runner)s` is trying to send "
                 "results in wrong format"
@@ -306,6 +694,7 @@ class ScenarioRunner(plugin.Plugin):
                                   key=lambda r: result["timestamp"])
             self.result_queue.append(sorted_batch)
             del self.result_batch[:]
+            self.results_available.set()
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
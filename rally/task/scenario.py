@@ -112,11 +112,16 @@ class Scenario(plugin.Plugin,
         self._output = {"additive": [], "complete": []}
 
     @staticmethod
-    def _validate_helper(validators, clients, config, deployment):
+    def _validate_helper(validators, clients, config, deployment,
+                         cache=None):
         for validator in validators:
             try:
-                result = validator(config, clients=clients,
-                                   deployment=deployment)
+                if cache is None:
+                    result = validator(config, clients=clients,
+                                       deployment=deployment)
+                else:
+                    result = cache.call(validator, config, clients,
+                                        deployment)
             except Exception as e:
                 LOG.exception(e)
                 raise exceptions.InvalidScenarioArgument(e)
@@ -125,8 +130,13 @@ class Scenario(plugin.Plugin,
                     raise exceptions.InvalidScenarioArgument(result.msg)
 
     @classmethod
-    def validate(cls, name, config, admin=None, users=None, deployment=None):
-        """Semantic check of benchmark arguments."""
+    def validate(cls, name, config, admin=None, users=None, deployment=None,
+                 cache=None):
+        """Semantic check of benchmark arguments.
+
+        :param cache: optional validation.ValidationCache instance to share
+                      results of validators between calls
+        """
         validators = Scenario.get(name)._meta_get("validators", default=[])
 
         if not validators:
@@ -140,10 +150,12 @@ class Scenario(plugin.Plugin,
         # NOTE(boris-42): Potential bug, what if we don't have "admin" client
         #                 and scenario have "admin" validators.
         if admin:
-            cls._validate_helper(admin_validators, admin, config, deployment)
+            cls._validate_helper(admin_validators, admin, config, deployment,
+                                 cache=cache)
         if users:
             for user in users:
-                cls._validate_helper(user_validators, user, config, deployment)
+                cls._validate_helper(user_validators, user, config,
+                                     deployment, cache=cache)
 
     def sleep_between(self, min_sleep, max_sleep, atomic_delay=0.1):
         """Call an interruptable_sleep() for a random amount of seconds.
@@ -15,8 +15,10 @@
 #    under the License.
 
 import functools
+import json
 import os
 import re
+import threading
 
 from glanceclient import exc as glance_exc
 from novaclient import exceptions as nova_exc
@@ -65,6 +67,20 @@ def validator(fn):
             return (fn(config, clients, deployment, *args, **kwargs) or
                     ValidationResult(True))
 
+        # NOTE: validators with the same function and arguments give the
+        #       same result for the same config and credential, so the key
+        #       is used to share results between workloads
+        wrap_validator.cache_key = (fn, repr(args),
+                                    repr(sorted(kwargs.items())))
+        get_config = getattr(fn, "cache_config", None)
+
+        def cache_config(config):
+            if get_config is None:
+                return config
+            return get_config(config, *args, **kwargs)
+
+        wrap_validator.cache_config = cache_config
+
         def wrap_scenario(scenario):
             # TODO(boris-42): remove this in future.
             wrap_validator.permission = getattr(fn, "permission",
@@ -79,7 +95,95 @@ def validator(fn):
     return wrap_given
 
 
+def cache_on(get_config):
+    """Set the part of the workload config the validator depends on.
+
+    Results of the validator are shared between workloads which have equal
+    parts of the config instead of equal configs, e.g. a validator of an
+    image is called once for all workloads using the same image.
+
+    :param get_config: function that takes the workload config and the
+                       arguments of the validator and returns the part of
+                       the config the validator reads
+    """
+    def wrapper(fn):
+        fn.cache_config = get_config
+        return fn
+    return wrapper
+
+
+def _get_args(config, *param_names):
+    return [config.get("args", {}).get(name) for name in param_names]
+
+
+def _get_context(config, *context_names):
+    return [config.get("context", {}).get(name) for name in context_names]
+
+
+class ValidationCache(object):
+    """Results of validators shared between validations of workloads.
+
+    A validator is called only once for the same validator arguments,
+    part of the workload config it depends on (see cache_on) and
+    credential. Threads that ask for a result which is being computed wait
+    for it instead of calling the validator again.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(validator, config, clients):
+        credential = getattr(clients, "credential", None)
+        if isinstance(credential, objects.Credential):
+            credential = json.dumps(
+                credential.to_dict(include_permission=True), sort_keys=True)
+        else:
+            credential = id(clients)
+        cache_config = getattr(validator, "cache_config", None)
+        if cache_config is not None:
+            config = cache_config(config)
+        return (getattr(validator, "cache_key", validator),
+                json.dumps(config, sort_keys=True, default=repr),
+                credential)
+
+    def call(self, validator, config, clients, deployment):
+        """Call validator or return the result of an equal call.
+
+        :param validator: validator created by the validator() decorator
+        :param config: dict, configuration of the workload
+        :param clients: osclients.Clients instance
+        :param deployment: deployment object
+        :returns: ValidationResult
+        :raises: the exception raised by the validator
+        """
+        key = self._get_key(validator, config, clients)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_owner = entry is None
+            if is_owner:
+                entry = self._entries[key] = {"done": threading.Event()}
+
+        if not is_owner:
+            entry["done"].wait()
+            if "error" in entry:
+                raise entry["error"]
+            return entry["result"]
+
+        try:
+            entry["result"] = validator(config, clients=clients,
+                                        deployment=deployment)
+        except Exception as e:
+            entry["error"] = e
+            raise
+        finally:
+            entry["done"].set()
+        return entry["result"]
+
+
 @validator
+@cache_on(lambda config, param_name, **kwargs: _get_args(config, param_name))
 def number(config, clients, deployment, param_name, minval=None, maxval=None,
            nullable=False, integer_only=False):
     """Checks that parameter is number that pass specified condition.
@@ -145,6 +249,7 @@ def _file_access_ok(filename, mode, param_name, required=True):
 
 
 @validator
+@cache_on(lambda config, param_name, **kwargs: _get_args(config, param_name))
 def file_exists(config, clients, deployment, param_name, mode=os.R_OK,
                 required=True):
     """Validator checks parameter is proper path to file with proper mode.
@@ -200,6 +305,7 @@ def check_command_dict(command):
 
 
 @validator
+@cache_on(lambda config, param_name, **kwargs: _get_args(config, param_name))
 def valid_command(config, clients, deployment, param_name, required=True):
     """Checks that parameter is a proper command-specifying dictionary.
 
@@ -302,6 +408,7 @@ def _get_validated_flavor(config, clients, param_name):
 
 
 @validator
+@cache_on(lambda config: _get_args(config, "share_proto"))
 def validate_share_proto(config, clients, deployment):
     """Validates value of share protocol for creation of Manila share."""
     allowed = ("NFS", "CIFS", "GLUSTERFS", "HDFS", )
@@ -314,6 +421,8 @@ def validate_share_proto(config, clients, deployment):
 
 
 @validator
+@cache_on(lambda config, param_name, **kwargs: (
+    _get_args(config, param_name), _get_context(config, "images")))
 def image_exists(config, clients, deployment, param_name, nullable=False):
     """Returns validator for image_id
 
@@ -328,6 +437,8 @@ def image_exists(config, clients, deployment, param_name, nullable=False):
 
 
 @validator
+@cache_on(lambda config, param_name: (
+    _get_args(config, param_name), _get_context(config, "flavors")))
 def flavor_exists(config, clients, deployment, param_name):
     """Returns validator for flavor
 
@@ -338,6 +449,9 @@ def flavor_exists(config, clients, deployment, param_name):
 
 
 @validator
+@cache_on(lambda config, flavor_name, image_name: (
+    _get_args(config, flavor_name, image_name),
+    _get_context(config, "flavors", "images")))
 def image_valid_on_flavor(config, clients, deployment, flavor_name,
                           image_name):
     """Returns validator for image could be used for current flavor
@@ -374,6 +488,7 @@ def image_valid_on_flavor(config, clients, deployment, flavor_name,
 
 
 @validator
+@cache_on(lambda config, network_name: _get_args(config, network_name))
 def network_exists(config, clients, deployment, network_name):
     """Validator checks that network with network_name exist."""
 
@@ -391,6 +506,7 @@ def network_exists(config, clients, deployment, network_name):
 
 
 @validator
+@cache_on(lambda config, network_name: _get_args(config, network_name))
 def external_network_exists(config, clients, deployment, network_name):
     """Validator checks that external network with given name exists."""
     ext_network = config.get("args", {}).get(network_name)
@@ -478,6 +594,7 @@ def required_parameters(config, clients, deployment, *required_params):
 
 
 @validator
+@cache_on(lambda config, *args: _get_context(config, "api_versions"))
 def required_services(config, clients, deployment, *required_services):
     """Validator checks if specified OpenStack services are available.
 
@@ -508,6 +625,7 @@ def required_services(config, clients, deployment, *required_services):
 
 
 @validator
+@cache_on(lambda config, *args: None)
 def required_neutron_extensions(config, clients, deployment,
                                 *required_extensions):
     """Validator checks if the specified Neutron extension is available
@@ -523,6 +641,7 @@ def required_neutron_extensions(config, clients, deployment,
 
 
 @validator
+@cache_on(lambda config, service_name: None)
 def required_cinder_services(config, clients, deployment, service_name):
     """Validator checks that specified Cinder service is available.
 
@@ -545,6 +664,7 @@ def required_cinder_services(config, clients, deployment, service_name):
 
 
 @validator
+@cache_on(lambda config, *args, **kwargs: None)
 def required_clients(config, clients, deployment, *components, **kwargs):
     """Validator checks if specified OpenStack clients are available.
 
@@ -567,6 +687,7 @@ def required_clients(config, clients, deployment, *components, **kwargs):
 
 
 @validator
+@cache_on(lambda config, *args: sorted(config.get("context", {})))
 def required_contexts(config, clients, deployment, *context_names):
     """Validator checks if required benchmark contexts are specified.
 
@@ -581,6 +702,23 @@ def required_contexts(config, clients, deployment, *context_names):
 
 
 @validator
+@cache_on(lambda config, *args: config.get("runner", {}).get("type"))
+def required_runners(config, clients, deployment, *runner_types):
+    """Validator checks if the benchmark is run by one of given runners.
+
+    :param *runner_types: list of runner types the benchmark supports
+    """
+    runner_type = config.get("runner", {}).get("type", "serial")
+    if runner_type not in runner_types:
+        message = (_("Runner `%(runner)s` is not supported, use one of: "
+                     "%(runners)s") %
+                   {"runner": runner_type,
+                    "runners": ", ".join(runner_types)})
+        return ValidationResult(False, message)
+
+
+@validator
+@cache_on(lambda config, **kwargs: _get_context(config, "users"))
 def required_openstack(config, clients, deployment, admin=False, users=False):
     """Validator that requires OpenStack admin or (and) users.
 
@@ -612,6 +750,8 @@ def required_openstack(config, clients, deployment, admin=False, users=False):
 
 
 @validator
+@cache_on(lambda config, *args, **kwargs: _get_context(config,
+                                                       "api_versions"))
 def required_api_versions(config, clients, deployment, component, versions):
     """Validator checks component API versions."""
     versions = [str(v) for v in versions]
@@ -643,6 +783,7 @@ def required_api_versions(config, clients, deployment, component, versions):
 
 
 @validator
+@cache_on(lambda config, param_name: _get_args(config, param_name))
 def volume_type_exists(config, clients, deployment, param_name):
     """Returns validator for volume types.
 
@@ -684,6 +825,7 @@ def restricted_parameters(config, clients, deployment, param_names,
 
 
 @validator
+@cache_on(lambda config, *param_names: _get_args(config, *param_names))
 def validate_heat_template(config, clients, deployment, *param_names):
     """Validates heat template.
 
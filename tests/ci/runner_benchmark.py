@@ -0,0 +1,249 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare load generator overhead of scenario runners.
+
+Each runner configuration is used to launch Dummy scenario locally, without
+any deployment and database, and the following values are printed:
+
+    * wall time of load generation
+    * iterations per second
+    * CPU time (user + system) consumed by the load generator, including
+      its worker processes
+
+The throughput of passing results from worker processes to the parent is
+measured as well: worker processes put synthetic iteration results to the
+queue and ScenarioRunner._join_processes() receives them, with and without
+packing of the results in the workers.
+
+The overhead of mapping the task context to the context of each iteration
+is measured for different amounts of tenants, it should not depend on it.
+
+Usage:
+    python tests/ci/runner_benchmark.py [--times N] [--concurrency N]
+                                        [--sleep SECONDS]
+                                        [--join-results N]
+                                        [--context-iterations N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import multiprocessing
+import resource
+import time
+
+from six.moves import cPickle as pickle
+
+from rally import plugins
+from rally.task import runner
+
+
+def _cpu_time():
+    cpu = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        cpu += usage.ru_utime + usage.ru_stime
+    return cpu
+
+
+def run_benchmark(name, config, scenario="Dummy.dummy", args=None):
+    """Run scenario with given runner config and measure its overhead.
+
+    :param name: str benchmark name, used only for output
+    :param config: dict, runner configuration
+    :param scenario: str scenario name
+    :param args: dict, scenario arguments
+    :returns: dict with benchmark results
+    """
+    task = {"uuid": "runner-benchmark"}
+    context = {"task": task, "config": {}, "admin": {"credential": None}}
+    runner_obj = runner.ScenarioRunner.get(config["type"])(task, config)
+
+    cpu_started = _cpu_time()
+    started = time.time()
+    runner_obj.run(scenario, context, args or {})
+    duration = time.time() - started
+    cpu = _cpu_time() - cpu_started
+
+    iterations = sum(len(batch) for batch in runner_obj.result_queue)
+    return collections.OrderedDict([
+        ("name", name),
+        ("iterations", iterations),
+        ("duration", duration),
+        ("iterations/sec", iterations / duration if duration else 0),
+        ("cpu (sec)", cpu),
+        ("cpu per iteration (ms)",
+         1000.0 * cpu / iterations if iterations else 0)])
+
+
+def _put_results(queue, results_num, info=None):
+    atomic_actions = collections.OrderedDict([("nova.boot_server", 1.5),
+                                              ("nova.delete_server", 0.5)])
+    for i in range(results_num):
+        queue.put({"duration": 2.0, "timestamp": time.time(),
+                   "idle_duration": 0.0, "error": [],
+                   "output": {"additive": [], "complete": []},
+                   "atomic_actions": atomic_actions})
+
+
+def _get_ipc_bytes(pack_results):
+    result = {"duration": 2.0, "timestamp": time.time(),
+              "idle_duration": 0.0, "error": [],
+              "output": {"additive": [], "complete": []},
+              "atomic_actions": collections.OrderedDict(
+                  [("nova.boot_server", 1.5), ("nova.delete_server", 0.5)])}
+    if not pack_results:
+        return len(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+    packer = runner._ResultPacker()
+    for i in range(runner.ScenarioRunner.RESULT_PACKING_BATCH_SIZE):
+        packer.add(result)
+    return (float(len(pickle.dumps(packer.pop(), pickle.HIGHEST_PROTOCOL)))
+            / runner.ScenarioRunner.RESULT_PACKING_BATCH_SIZE)
+
+
+def run_join_benchmark(name, pack_results, results_num, processes):
+    """Measure results throughput of ScenarioRunner._join_processes().
+
+    :param name: str benchmark name, used only for output
+    :param pack_results: bool, whether workers pack results
+    :param results_num: int, number of results to put by each worker
+    :param processes: int, number of worker processes
+    :returns: dict with benchmark results
+    """
+    task = {"uuid": "runner-benchmark"}
+    runner_obj = runner.ScenarioRunner.get("constant")(task, {})
+    runner_obj.PACK_RESULTS = pack_results
+
+    result_queue = multiprocessing.Queue()
+    args_gen = iter(lambda: (result_queue, results_num), None)
+
+    cpu_started = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.time()
+    process_pool = runner_obj._create_process_pool(processes, _put_results,
+                                                   args_gen)
+    runner_obj._join_processes(process_pool, result_queue)
+    duration = time.time() - started
+    cpu_finished = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (cpu_finished.ru_utime + cpu_finished.ru_stime -
+           cpu_started.ru_utime - cpu_started.ru_stime)
+
+    results = sum(len(batch) for batch in runner_obj.result_queue)
+    return collections.OrderedDict([
+        ("name", name),
+        ("results", results),
+        ("duration", duration),
+        ("results/sec", results / duration if duration else 0),
+        ("parent cpu per result (us)",
+         1000000.0 * cpu / results if results else 0),
+        ("bytes per result", _get_ipc_bytes(pack_results))])
+
+
+def _get_users_context(tenants, users_per_tenant=10):
+    context_obj = {
+        "task": {"uuid": "runner-benchmark"},
+        "admin": {"credential": None},
+        "config": {"users": {"user_choice_method": "round_robin"}},
+        "users": [],
+        "tenants": {}}
+    for t in range(tenants):
+        tenant_id = "tenant-%d" % t
+        users = [{"id": "user-%d-%d" % (t, u), "tenant_id": tenant_id,
+                  "credential": {"username": "user-%d-%d" % (t, u),
+                                 "password": "secret"}}
+                 for u in range(users_per_tenant)]
+        context_obj["users"].extend(users)
+        context_obj["tenants"][tenant_id] = {
+            "id": tenant_id, "name": tenant_id, "users": users,
+            "networks": [{"id": "net-%d-%d" % (t, n), "subnets": ["s"]}
+                         for n in range(2)],
+            "images": ["image-%d-%d" % (t, i) for i in range(2)],
+            "servers": ["server-%d-%d" % (t, s) for s in range(5)]}
+    return context_obj
+
+
+def run_context_benchmark(tenants, iterations):
+    """Measure overhead of mapping the task context for each iteration.
+
+    :param tenants: int, number of tenants in the users context
+    :param iterations: int, number of iterations to map the context for
+    :returns: dict with benchmark results
+    """
+    context_obj = _get_users_context(tenants)
+    started = time.time()
+    for i in range(iterations):
+        runner._get_scenario_context(i, context_obj)
+    duration = time.time() - started
+    return collections.OrderedDict([
+        ("tenants", tenants),
+        ("iterations", iterations),
+        ("overhead per iteration (ms)", 1000.0 * duration / iterations)])
+
+
+def _print_results(results):
+    columns = list(results[0].keys())
+    print(" | ".join(columns))
+    for result in results:
+        print(" | ".join(
+            ("%.3f" % v) if isinstance(v, float) else str(v)
+            for v in result.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare CPU usage and throughput of scenario runners.")
+    parser.add_argument("--times", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sleep", type=float, default=0.01,
+                        help="Dummy.dummy sleep argument")
+    parser.add_argument("--join-results", type=int, default=100000,
+                        help="number of results to pass from workers to "
+                             "the parent, 0 disables the benchmark")
+    parser.add_argument("--context-iterations", type=int, default=1000,
+                        help="number of iterations to map the task context "
+                             "for, 0 disables the benchmark")
+    args = parser.parse_args()
+
+    plugins.load()
+
+    base = {"type": "constant", "times": args.times,
+            "concurrency": args.concurrency}
+    benchmarks = [
+        ("constant (thread per iteration)", dict(base)),
+        ("constant (worker_pool)", dict(base, worker_pool=True))]
+
+    _print_results([run_benchmark(name, config, args={"sleep": args.sleep})
+                    for name, config in benchmarks])
+
+    if args.join_results:
+        processes = multiprocessing.cpu_count()
+        results_num = args.join_results // processes
+        print()
+        _print_results([
+            run_join_benchmark("_join_processes (pickled dicts)", False,
+                               results_num, processes),
+            run_join_benchmark("_join_processes (packed results)", True,
+                               results_num, processes)])
+
+    if args.context_iterations:
+        print()
+        _print_results([run_context_benchmark(tenants,
+                                              args.context_iterations)
+                        for tenants in (10, 100, 1000)])
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,9 @@ import json
 import os.path
 
 import ddt
+import jsonschema
 import mock
+import six
 import yaml
 
 from rally.cli.commands import task
@@ -166,7 +168,8 @@ class TaskCommandsTestCase(test.TestCase):
             deployment_id, None)
         mock_task_start.assert_called_once_with(
             deployment_id, mock__load_task.return_value,
-            task=mock_task_validate.return_value, abort_on_sla_failure=False)
+            task=mock_task_validate.return_value, abort_on_sla_failure=False,
+            cleanup_between_workloads=True)
         mock__load_task.assert_called_once_with(task_path, None, None)
         mock_use.assert_called_once_with("some_new_uuid")
         mock_detailed.assert_called_once_with(task_id="some_new_uuid")
@@ -194,7 +197,8 @@ class TaskCommandsTestCase(test.TestCase):
             "any", mock__load_task.return_value, {})
         mock_task_start.assert_called_once_with(
             "any", mock__load_task.return_value,
-            task=mock_task_create.return_value, abort_on_sla_failure=False)
+            task=mock_task_create.return_value, abort_on_sla_failure=False,
+            cleanup_between_workloads=True)
         mock_detailed.assert_called_once_with(
             task_id=mock_task_create.return_value["uuid"])
         mock_task_create.assert_called_once_with("any", "some_tag")
@@ -224,7 +228,8 @@ class TaskCommandsTestCase(test.TestCase):
 
         mock_task_start.assert_called_once_with(
             "deployment", mock__load_task.return_value,
-            task=mock_task_create.return_value, abort_on_sla_failure=False)
+            task=mock_task_create.return_value, abort_on_sla_failure=False,
+            cleanup_between_workloads=True)
 
     @mock.patch("rally.cli.commands.task.api")
     def test_abort(self, mock_api):
@@ -240,13 +245,22 @@ class TaskCommandsTestCase(test.TestCase):
         self.assertRaises(exceptions.InvalidArgumentsException,
                           self.task.abort, None)
 
-    def test_status(self):
+    @ddt.data(consts.TaskStatus.RUNNING, consts.TaskStatus.FINISHED)
+    @mock.patch("rally.cli.commands.task.api.Task.get_summary")
+    def test_status(self, status, mock_task_get_summary):
         test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
-        value = {"task_id": "task", "status": "status"}
-        with mock.patch("rally.cli.commands.task.api.Task") as mock_task:
-            mock_task.get = mock.MagicMock(return_value=value)
+        mock_task_get_summary.return_value = {
+            "uuid": test_uuid, "status": status, "pass_sla": False,
+            "iterations_count": 10, "failed_iterations_count": 2}
+        with mock.patch("sys.stdout", new_callable=six.StringIO) as out:
             self.task.status(test_uuid)
-            mock_task.get.assert_called_once_with(test_uuid)
+        mock_task_get_summary.assert_called_once_with(test_uuid)
+        output = out.getvalue()
+        self.assertIn("Task %s: %s" % (test_uuid, status), output)
+        if status == consts.TaskStatus.FINISHED:
+            self.assertIn("Iterations: 10, failed: 2, SLA: FAIL", output)
+        else:
+            self.assertNotIn("Iterations", output)
 
     @mock.patch("rally.cli.commands.task.envutils.get_global")
     def test_status_no_task_id(self, mock_get_global):
@@ -378,9 +392,9 @@ class TaskCommandsTestCase(test.TestCase):
         mock_task.get_detailed.assert_called_once_with(test_uuid,
                                                        extended_results=True)
 
-    @mock.patch("json.dumps")
+    @mock.patch("rally.cli.commands.task.json_stream.dump")
     @mock.patch("rally.cli.commands.task.api.Task.get")
-    def test_results(self, mock_task_get, mock_json_dumps):
+    def test_results(self, mock_task_get, mock_json_stream_dump):
         task_id = "foo_task_id"
         data = [
             {"key": "foo_key", "data": {"raw": "foo_raw", "sla": [],
@@ -394,14 +408,15 @@ class TaskCommandsTestCase(test.TestCase):
                                 "sla": x["data"]["sla"]}, data)
         fake_task = fakes.FakeTask({"status": consts.TaskStatus.FINISHED})
         fake_task.get_results = mock.MagicMock(return_value=data)
+        fake_task.iter_result_iterations = lambda x: x["data"]["raw"]
         mock_task_get.return_value = fake_task
 
         self.task.results(task_id)
-        self.assertEqual(1, mock_json_dumps.call_count)
-        self.assertEqual(1, len(mock_json_dumps.call_args[0]))
-        self.assertSequenceEqual(result, mock_json_dumps.call_args[0][0])
-        self.assertEqual({"sort_keys": True, "indent": 4},
-                         mock_json_dumps.call_args[1])
+        fake_task.get_results.assert_called_once_with(load_iterations=False)
+        mock_json_stream_dump.assert_called_once_with(
+            mock.ANY, task.sys.stdout, sort_keys=True, indent=4)
+        self.assertSequenceEqual(result,
+                                 mock_json_stream_dump.call_args[0][0])
         mock_task_get.assert_called_once_with(task_id)
 
     @mock.patch("rally.cli.commands.task.sys.stdout")
@@ -429,67 +444,66 @@ class TaskCommandsTestCase(test.TestCase):
                           "load_duration": 1.2,
                           "full_duration": 2.3}} for key in keys]
 
-    @mock.patch("rally.cli.commands.task.jsonschema.validate",
-                return_value=None)
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                return_value=["result_1_from_file", "result_2_from_file"])
     @mock.patch("rally.cli.commands.task.os.path")
     @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.plot")
     @mock.patch("rally.cli.commands.task.api.Task.get")
     @mock.patch("rally.cli.commands.task.webbrowser")
     def test_trends(self, mock_webbrowser, mock_task_get, mock_plot,
-                    mock_open, mock_os_path, mock_validate):
+                    mock_open, mock_os_path, mock_task_load_results):
         mock_os_path.exists = lambda p: p.startswith("path_to_")
         mock_os_path.expanduser = lambda p: p + "_expanded"
         mock_os_path.realpath.side_effect = lambda p: "realpath_" + p
         results_iter = iter([self._make_result(["bar"]),
                              self._make_result(["spam"])])
-        mock_task_get.return_value.get_results.side_effect = results_iter
+        mock_task_get.return_value.get_results_summaries.side_effect = (
+            results_iter)
+        mock_task_get.return_value.iter_result_iterations = (
+            lambda x: x["data"]["raw"])
         mock_plot.trends.return_value = "rendered_trends_report"
-        mock_fd = mock.mock_open(
-            read_data="[\"result_1_from_file\", \"result_2_from_file\"]")
+        mock_fd = mock.mock_open()
         mock_open.side_effect = mock_fd
         ret = self.task.trends(tasks=["ab123456-38d8-4c8f-bbcc-fc8f74b004ae",
                                       "cd654321-38d8-4c8f-bbcc-fc8f74b004ae",
                                       "path_to_file"],
-                               out="output.html", out_format="html")
+                               out="output.html", out_format="html",
+                               workers=4)
         expected = [
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "bar_sla",
              "key": {"name": "bar", "pos": 0}, "result": "bar_raw"},
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "spam_sla",
              "key": {"name": "spam", "pos": 0}, "result": "spam_raw"},
             "result_1_from_file", "result_2_from_file"]
-        mock_plot.trends.assert_called_once_with(expected)
-        self.assertEqual([mock.call("path_to_file_expanded", "r"),
-                          mock.call("output.html_expanded", "w+")],
+        mock_plot.trends.assert_called_once_with(expected, workers=4)
+        self.assertEqual([mock.call("output.html_expanded", "w+")],
                          mock_open.mock_calls)
         self.assertIsNone(ret)
-        self.assertEqual([mock.call("result_1_from_file",
-                                    task.api.Task.TASK_RESULT_SCHEMA),
-                          mock.call("result_2_from_file",
-                                    task.api.Task.TASK_RESULT_SCHEMA)],
-                         mock_validate.mock_calls)
+        mock_task_load_results.assert_called_once_with(
+            "path_to_file_expanded")
         self.assertEqual([mock.call("ab123456-38d8-4c8f-bbcc-fc8f74b004ae"),
-                          mock.call().get_results(),
+                          mock.call().get_results_summaries(),
                           mock.call("cd654321-38d8-4c8f-bbcc-fc8f74b004ae"),
-                          mock.call().get_results()],
+                          mock.call().get_results_summaries()],
                          mock_task_get.mock_calls)
         self.assertFalse(mock_webbrowser.open_new_tab.called)
         mock_fd.return_value.write.assert_called_once_with(
             "rendered_trends_report")
 
-    @mock.patch("rally.cli.commands.task.jsonschema.validate",
-                return_value=None)
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                return_value=["result"])
     @mock.patch("rally.cli.commands.task.os.path")
     @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.plot")
     @mock.patch("rally.cli.commands.task.webbrowser")
     def test_trends_single_file_and_open_webbrowser(
             self, mock_webbrowser, mock_plot, mock_open, mock_os_path,
-            mock_validate):
+            mock_task_load_results):
         mock_os_path.exists.return_value = True
         mock_os_path.expanduser = lambda path: path
         mock_os_path.realpath.side_effect = lambda p: "realpath_" + p
-        mock_open.side_effect = mock.mock_open(read_data="[\"result\"]")
+        mock_open.side_effect = mock.mock_open()
         ret = self.task.trends(tasks=["path_to_file"], open_it=True,
                                out="output.html", out_format="html")
         self.assertIsNone(ret)
@@ -503,7 +517,7 @@ class TaskCommandsTestCase(test.TestCase):
     def test_trends_task_id_is_not_uuid_like(self, mock_task_get, mock_plot,
                                              mock_open, mock_os_path):
         mock_os_path.exists.return_value = False
-        mock_task_get.return_value.get_results.return_value = (
+        mock_task_get.return_value.get_results_summaries.return_value = (
             self._make_result(["foo"]))
 
         ret = self.task.trends(tasks=["ab123456-38d8-4c8f-bbcc-fc8f74b004ae"],
@@ -514,28 +528,109 @@ class TaskCommandsTestCase(test.TestCase):
                                out="output.html", out_format="html")
         self.assertEqual(1, ret)
 
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                side_effect=jsonschema.ValidationError("foo"))
     @mock.patch("rally.cli.commands.task.os.path")
-    @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.plot")
-    def test_trends_wrong_results_format(self, mock_plot,
-                                         mock_open, mock_os_path):
+    def test_trends_wrong_results_format(self, mock_plot, mock_os_path,
+                                         mock_task_load_results):
         mock_os_path.exists.return_value = True
-        mock_open.side_effect = mock.mock_open(read_data="[42]")
         ret = self.task.trends(tasks=["path_to_file"],
                                out="output.html", out_format="html")
         self.assertEqual(1, ret)
-
-        with mock.patch("rally.cli.commands.task.api.Task.TASK_RESULT_SCHEMA",
-                        {"type": "number"}):
-            ret = self.task.trends(tasks=["path_to_file"],
-                                   out="output.html", out_format="html")
-            self.assertIsNone(ret)
+        self.assertFalse(mock_plot.trends.called)
 
     def test_trends_no_tasks_given(self):
         ret = self.task.trends(tasks=[],
                                out="output.html", out_format="html")
         self.assertEqual(1, ret)
 
+    def _make_comparison(self):
+        return [{"name": "Foo.bar", "matched": True, "regressions": 1,
+                 "actions": [{"name": "foo", "base": 1.0, "new": 2.0,
+                              "delta": 1.0, "delta_percent": 100.0,
+                              "p_value": 0.001, "status": "regression"},
+                             {"name": "total", "base": 2.0, "new": None,
+                              "delta": None, "delta_percent": None,
+                              "p_value": None, "status": "n/a"}]},
+                {"name": "Spam.only_base", "matched": False,
+                 "regressions": 0, "actions": []}]
+
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                return_value=["result_from_file"])
+    @mock.patch("rally.cli.commands.task.os.path")
+    @mock.patch("rally.cli.commands.task.plot")
+    @mock.patch("rally.cli.commands.task.api.Task.get")
+    def test_compare(self, mock_task_get, mock_plot, mock_os_path,
+                     mock_task_load_results):
+        mock_os_path.exists = lambda p: p.startswith("path_to_")
+        mock_os_path.expanduser = lambda p: p + "_expanded"
+        mock_task_get.return_value.get_results_summaries.return_value = (
+            self._make_result(["bar"]))
+        mock_task_get.return_value.iter_result_iterations = (
+            lambda x: x["data"]["raw"])
+        mock_plot.compare.return_value = self._make_comparison()
+
+        with mock.patch("sys.stdout", new_callable=six.StringIO) as out:
+            ret = self.task.compare(
+                "ab123456-38d8-4c8f-bbcc-fc8f74b004ae", "path_to_file",
+                alpha=0.01, threshold=5.0, workers=4)
+
+        self.assertEqual(1, ret)
+        mock_task_get.assert_called_once_with(
+            "ab123456-38d8-4c8f-bbcc-fc8f74b004ae")
+        mock_task_load_results.assert_called_once_with(
+            "path_to_file_expanded")
+        mock_plot.compare.assert_called_once_with(
+            [{"load_duration": 1.2, "full_duration": 2.3, "sla": "bar_sla",
+              "key": {"name": "bar", "pos": 0}, "result": "bar_raw"}],
+            ["result_from_file"], alpha=0.01, threshold=0.05, workers=4)
+        output = out.getvalue()
+        self.assertIn("Foo.bar", output)
+        self.assertIn("regression", output)
+        self.assertIn("Workload is missing in one of the tasks.", output)
+        self.assertIn("Regressions found: 1", output)
+
+    @mock.patch("rally.cli.commands.task.os.path")
+    @mock.patch("rally.cli.commands.task.plot")
+    @mock.patch("rally.cli.commands.task.api.Task.get")
+    def test_compare_json(self, mock_task_get, mock_plot, mock_os_path):
+        mock_os_path.exists.return_value = False
+        mock_task_get.return_value.get_results_summaries.return_value = []
+        data = self._make_comparison()
+        mock_plot.compare.return_value = data
+
+        with mock.patch("sys.stdout", new_callable=six.StringIO) as out:
+            ret = self.task.compare("ab123456-38d8-4c8f-bbcc-fc8f74b004ae",
+                                    "cd654321-38d8-4c8f-bbcc-fc8f74b004ae",
+                                    tojson=True)
+
+        self.assertEqual(1, ret)
+        mock_plot.compare.assert_called_once_with(
+            [], [], alpha=0.05, threshold=0.1, workers=None)
+        self.assertEqual(data, json.loads(out.getvalue()))
+
+    @mock.patch("rally.cli.commands.task.os.path")
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_compare_task_id_is_not_uuid_like(self, mock_plot,
+                                              mock_os_path):
+        mock_os_path.exists.return_value = False
+        ret = self.task.compare("this-is-not-uuid",
+                                "cd654321-38d8-4c8f-bbcc-fc8f74b004ae")
+        self.assertEqual(1, ret)
+        self.assertFalse(mock_plot.compare.called)
+
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                side_effect=jsonschema.ValidationError("foo"))
+    @mock.patch("rally.cli.commands.task.os.path")
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_compare_wrong_results_format(self, mock_plot, mock_os_path,
+                                          mock_task_load_results):
+        mock_os_path.exists.return_value = True
+        ret = self.task.compare("path_to_file", "path_to_other_file")
+        self.assertEqual(1, ret)
+        self.assertFalse(mock_plot.compare.called)
+
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
                 return_value=None)
     @mock.patch("rally.cli.commands.task.os.path.realpath",
@@ -551,22 +646,31 @@ class TaskCommandsTestCase(test.TestCase):
         task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
         data = [
             {"key": {"name": "class.test", "pos": 0},
-             "data": {"raw": "foo_raw", "sla": "foo_sla",
+             "data": {"raw": [], "sla": "foo_sla",
                       "load_duration": 0.1,
-                      "full_duration": 1.2}},
+                      "full_duration": 1.2},
+             "id": 1, "iterations_count": 2, "statistics": "foo_stat"},
             {"key": {"name": "class.test", "pos": 0},
-             "data": {"raw": "bar_raw", "sla": "bar_sla",
+             "data": {"raw": [], "sla": "bar_sla",
                       "load_duration": 2.1,
-                      "full_duration": 2.2}}]
-
-        results = [{"key": x["key"],
-                    "result": x["data"]["raw"],
-                    "sla": x["data"]["sla"],
-                    "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
-                   for x in data]
-        mock_results = mock.Mock(return_value=data)
-        mock_task_get.return_value = mock.Mock(get_results=mock_results)
+                      "full_duration": 2.2},
+             "id": 2}]
+
+        results = [{"key": data[0]["key"],
+                    "result": "iterations_1",
+                    "sla": "foo_sla",
+                    "load_duration": 0.1,
+                    "full_duration": 1.2,
+                    "iterations_count": 2,
+                    "statistics": "foo_stat"},
+                   {"key": data[1]["key"],
+                    "result": "iterations_2",
+                    "sla": "bar_sla",
+                    "load_duration": 2.1,
+                    "full_duration": 2.2}]
+        mock_task_get.return_value = mock.Mock(
+            get_results_summaries=mock.Mock(return_value=data),
+            iter_result_iterations=lambda x: "iterations_%s" % x["id"])
         mock_plot.plot.return_value = "html_report"
 
         def reset_mocks():
@@ -574,10 +678,20 @@ class TaskCommandsTestCase(test.TestCase):
                 m.reset_mock()
         self.task.report(tasks=task_id, out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        mock_plot.plot_to_file.assert_called_once_with(
+            results, mock_open.side_effect(), include_libs=False,
+            workers=None)
+        self.assertFalse(mock_plot.plot.called)
         mock_task_get.assert_called_once_with(task_id)
+        (mock_task_get.return_value.get_results_summaries
+         .assert_called_once_with())
+
+        # HTML to stdout
+        reset_mocks()
+        self.task.report(tasks=task_id, workers=2)
+        self.assertFalse(mock_open.called)
+        mock_plot.plot.assert_called_once_with(results, include_libs=False,
+                                               workers=2)
 
         # JUnit
         reset_mocks()
@@ -592,14 +706,18 @@ class TaskCommandsTestCase(test.TestCase):
                          out_format="html")
         mock_webbrowser.open_new_tab.assert_called_once_with(
             "file://realpath_output.html")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot_to_file.assert_called_once_with(
+            results, mock_open.side_effect(), include_libs=False,
+            workers=None)
 
         # HTML with embedded JS/CSS
         reset_mocks()
         self.task.report(task_id, open_it=False, out="output.html",
                          out_format="html_static")
         self.assertFalse(mock_webbrowser.open_new_tab.called)
-        mock_plot.plot.assert_called_once_with(results, include_libs=True)
+        mock_plot.plot_to_file.assert_called_once_with(
+            results, mock_open.side_effect(), include_libs=True,
+            workers=None)
 
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
                 return_value=None)
@@ -636,30 +754,26 @@ class TaskCommandsTestCase(test.TestCase):
                     data))
 
         mock_results = mock.Mock(return_value=data)
-        mock_task_get.return_value = mock.Mock(get_results=mock_results)
-        mock_plot.plot.return_value = "html_report"
+        mock_task_get.return_value = mock.Mock(
+            get_results_summaries=mock_results,
+            iter_result_iterations=lambda x: x["data"]["raw"])
 
-        def reset_mocks():
-            for m in mock_task_get, mock_webbrowser, mock_plot, mock_open:
-                m.reset_mock()
         self.task.report(tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        mock_plot.plot_to_file.assert_called_once_with(
+            results, mock_open.side_effect(), include_libs=False,
+            workers=None)
         expected_get_calls = [mock.call(task) for task in tasks]
         mock_task_get.assert_has_calls(expected_get_calls, any_order=True)
 
-    @mock.patch("rally.cli.commands.task.json.load")
+    @mock.patch("rally.cli.commands.task.api.Task.load_results")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
-    @mock.patch("rally.cli.commands.task.jsonschema.validate",
-                return_value=None)
     @mock.patch("rally.cli.commands.task.os.path.realpath",
                 side_effect=lambda p: "realpath_%s" % p)
     @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.plot")
     def test_report_one_file(self, mock_plot, mock_open, mock_realpath,
-                             mock_validate, mock_path_exists, mock_json_load):
+                             mock_path_exists, mock_task_load_results):
 
         task_file = "/tmp/some_file.json"
         data = [
@@ -680,25 +794,20 @@ class TaskCommandsTestCase(test.TestCase):
                    for x in data]
 
         mock_plot.plot.return_value = "html_report"
-        mock_open.side_effect = mock.mock_open(read_data=results)
-
-        mock_json_load.return_value = results
+        mock_open.side_effect = mock.mock_open()
+        mock_task_load_results.return_value = results
 
-        def reset_mocks():
-            for m in mock_plot, mock_open, mock_json_load, mock_validate:
-                m.reset_mock()
         self.task.report(tasks=task_file, out="/tmp/1_test.html")
-        expected_open_calls = [mock.call(task_file, "r"),
-                               mock.call("/tmp/1_test.html", "w+")]
-        mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        mock_task_load_results.assert_called_once_with(task_file)
+        mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
+        mock_plot.plot_to_file.assert_called_once_with(
+            results, mock_open.side_effect(), include_libs=False,
+            workers=None)
 
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
-    @mock.patch("rally.cli.commands.task.json.load")
+    @mock.patch("rally.cli.commands.task.api.Task.load_results")
     @mock.patch("rally.cli.commands.task.open", create=True)
-    def test_report_exceptions(self, mock_open, mock_json_load,
+    def test_report_exceptions(self, mock_open, mock_task_load_results,
                                mock_path_exists):
 
         results = [
@@ -708,13 +817,14 @@ class TaskCommandsTestCase(test.TestCase):
                       "full_duration": 1.2}}]
 
         mock_open.side_effect = mock.mock_open(read_data=results)
-        mock_json_load.return_value = results
+        mock_task_load_results.side_effect = jsonschema.ValidationError(
+            "foo")
 
         ret = self.task.report(tasks="/tmp/task.json",
                                out="/tmp/tmp.hsml")
 
         self.assertEqual(ret, 1)
-        for m in mock_open, mock_json_load:
+        for m in mock_open, mock_task_load_results:
             m.reset_mock()
         mock_path_exists.return_value = False
         ret = self.task.report(tasks="/tmp/task.json",
@@ -723,9 +833,10 @@ class TaskCommandsTestCase(test.TestCase):
 
     @mock.patch("rally.cli.commands.task.sys.stderr")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
-    @mock.patch("rally.cli.commands.task.json.load")
+    @mock.patch("rally.cli.commands.task.api.Task.load_results",
+                return_value=[])
     @mock.patch("rally.cli.commands.task.open", create=True)
-    def test_report_invalid_format(self, mock_open, mock_json_load,
+    def test_report_invalid_format(self, mock_open, mock_task_load_results,
                                    mock_path_exists, mock_stderr):
         result = self.task.report(tasks="/tmp/task.json", out="/tmp/tmp.html",
                                   out_format="invalid")
@@ -817,26 +928,27 @@ class TaskCommandsTestCase(test.TestCase):
         self.assertTrue(mock_api.Task.delete.mock_calls == expected_calls)
 
     @mock.patch("rally.cli.commands.task.cliutils.print_list")
-    @mock.patch("rally.cli.commands.task.api.Task.get")
-    def test_sla_check(self, mock_task_get, mock_print_list):
-        data = [{"key": {"name": "fake_name",
-                         "pos": "fake_pos",
-                         "kw": "fake_kw"},
-                 "data": {"scenario_duration": 42.0,
-                          "raw": [],
-                          "sla": [{"benchmark": "KeystoneBasic.create_user",
-                                   "criterion": "max_seconds_per_iteration",
-                                   "pos": 0,
-                                   "success": False,
-                                   "detail": "Max foo, actually bar"}]}}]
-
-        mock_task_get().get_results.return_value = copy.deepcopy(data)
+    @mock.patch("rally.cli.commands.task.api.Task.get_summary")
+    def test_sla_check(self, mock_task_get_summary, mock_print_list):
+        data = {"status": consts.TaskStatus.FINISHED,
+                "sla_results": {"workloads": [
+                    {"name": "fake_name", "pos": "fake_pos",
+                     "sla": [{"criterion": "max_seconds_per_iteration",
+                              "success": False,
+                              "detail": "Max foo, actually bar"}]}]}}
+
+        mock_task_get_summary.return_value = copy.deepcopy(data)
         result = self.task.sla_check(task_id="fake_task_id")
         self.assertEqual(1, result)
-        mock_task_get.assert_called_with("fake_task_id")
+        mock_task_get_summary.assert_called_once_with("fake_task_id")
+        self.assertEqual(
+            [{"benchmark": "fake_name", "pos": "fake_pos",
+              "criterion": "max_seconds_per_iteration", "status": "FAIL",
+              "detail": "Max foo, actually bar"}],
+            [row.__dict__ for row in mock_print_list.call_args[0][0]])
 
-        data[0]["data"]["sla"][0]["success"] = True
-        mock_task_get().get_results.return_value = data
+        data["sla_results"]["workloads"][0]["sla"][0]["success"] = True
+        mock_task_get_summary.return_value = data
 
         result = self.task.sla_check(task_id="fake_task_id", tojson=True)
         self.assertEqual(0, result)
@@ -925,6 +1037,43 @@ class TaskCommandsTestCase(test.TestCase):
             mock.call("\n")])
         mock_task_exporter_get.assert_called_once_with("file-exporter")
 
+    @mock.patch("rally.cli.commands.task.api.Task.import_results",
+                return_value={"uuid": "fake_uuid"})
+    @mock.patch("rally.task.exporter.TaskExporter.get")
+    def test_import_results(self, mock_task_exporter_get,
+                            mock_task_import_results):
+        mock_client = mock_task_exporter_get.return_value.return_value
+        self.task.use = mock.Mock()
+        self.task.import_results("columnar-exporter:///fake_path",
+                                 deployment="deployment", tag="foo",
+                                 do_use=True)
+        mock_task_exporter_get.assert_called_once_with("columnar-exporter")
+        mock_task_import_results.assert_called_once_with(
+            "deployment", mock_client.load.return_value, tag="foo")
+        self.task.use.assert_called_once_with("fake_uuid")
+
+    @ddt.data(IOError, exceptions.RallyException)
+    @mock.patch("rally.cli.commands.task.api.Task.import_results")
+    @mock.patch("rally.task.exporter.TaskExporter.get")
+    def test_import_results_fails(self, error, mock_task_exporter_get,
+                                  mock_task_import_results):
+        mock_task_import_results.side_effect = error
+        self.assertEqual(1, self.task.import_results(
+            "columnar-exporter:///fake_path", deployment="deployment"))
+
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    @mock.patch("rally.task.exporter.TaskExporter.get")
+    def test_import_results_InvalidConnectionString(
+            self, mock_task_exporter_get, mock_stdout):
+        mock_task_exporter_get.return_value.side_effect = (
+            exceptions.InvalidConnectionString)
+        self.assertEqual(1, self.task.import_results(
+            "columnar-exporter:///", deployment="deployment"))
+        mock_stdout.write.assert_has_calls([
+            mock.call("The connection string is not valid: None. "
+                      "Please check your connection string."),
+            mock.call("\n")])
+
     @mock.patch("rally.cli.commands.task.plot.charts")
     @mock.patch("rally.cli.commands.task.sys.stdout")
     @mock.patch("rally.cli.commands.task.api.Task")
@@ -204,12 +204,12 @@ class CliUtilsTestCase(test.TestCase):
         ret = cliutils.run(["rally", "show", "keypairs"], self.categories)
         self.assertEqual(ret, 1)
 
-    @mock.patch("rally.common.db.task_get",
+    @mock.patch("rally.common.db.task_get_summary",
                 side_effect=exceptions.TaskNotFound(uuid=FAKE_TASK_UUID))
-    def test_run_task_not_found(self, mock_task_get):
+    def test_run_task_not_found(self, mock_task_get_summary):
         ret = cliutils.run(["rally", "task", "status", "%s" % FAKE_TASK_UUID],
                            self.categories)
-        self.assertTrue(mock_task_get.called)
+        self.assertTrue(mock_task_get_summary.called)
         self.assertEqual(ret, 1)
 
     @mock.patch("rally.cli.cliutils.validate_args",
@@ -22,6 +22,7 @@ from six import moves
 from rally.common import db
 from rally.common.db import api as db_api
 import rally.common.db.sqlalchemy.api as s_api
+from rally.common.db.sqlalchemy import models
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -193,6 +194,36 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_columns(self):
+        deploy = db.deployment_create({"name": "foo_deployment"})
+        task = self._create_task({"deployment_uuid": deploy["uuid"],
+                                  "verification_log": "foo_log",
+                                  "tag": "bar", "iterations_count": 3})
+        tasks = db.task_list(deployment="foo_deployment")
+        self.assertEqual(1, len(tasks))
+        self.assertEqual("foo_deployment", tasks[0]["deployment_name"])
+        self.assertEqual(task["uuid"], tasks[0]["uuid"])
+        self.assertEqual("bar", tasks[0]["tag"])
+        self.assertEqual(3, tasks[0]["iterations_count"])
+        self.assertIsNone(tasks[0]["sla_results"])
+        self.assertNotIn("verification_log", tasks[0])
+
+    def test_task_get_summary(self):
+        task = self._create_task({"status": consts.TaskStatus.FINISHED,
+                                  "pass_sla": False, "iterations_count": 3,
+                                  "sla_results": {"workloads": []}})
+        self.assertEqual(
+            {"uuid": task["uuid"], "status": consts.TaskStatus.FINISHED,
+             "pass_sla": False, "iterations_count": 3,
+             "failed_iterations_count": None, "load_duration": None,
+             "full_duration": None, "sla_results": {"workloads": []}},
+            db.task_get_summary(task["uuid"]))
+
+    def test_task_get_summary_not_found(self):
+        self.assertRaises(exceptions.TaskNotFound,
+                          db.task_get_summary,
+                          "f885f435-f6ca-4f3e-9b3e-aeb6837080f2")
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -215,6 +246,14 @@ class TasksTestCase(test.DBTestCase):
         res = db.task_result_get_all_by_uuid(task_id)
         self.assertEqual(len(res), 0)
 
+    def test_task_delete_with_result_chunks(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        db.task_result_chunk_create(result["id"], 0, [{"timestamp": 1}])
+        db.task_delete(task_id)
+        self.assertEqual(
+            0, s_api.get_session().query(models.TaskResultChunk).count())
+
     def test_task_delete_by_uuid_and_status(self):
         values = {
             "status": consts.TaskStatus.FINISHED,
@@ -253,6 +292,81 @@ class TasksTestCase(test.DBTestCase):
             self.assertEqual(res[0]["key"], data)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_result_create_with_kw_hash(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"},
+                                       {"raw": []}, kw_hash="foo_hash")
+        self.assertEqual("foo_hash", result["kw_hash"])
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual("foo_hash", res[0]["kw_hash"])
+
+    def test_task_result_get_all_by_uuid_with_chunks(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"},
+                                       {"raw": [], "sla": []})
+        db.task_result_chunk_create(result["id"], 0,
+                                    [{"timestamp": 1}, {"timestamp": 3}])
+        db.task_result_chunk_create(result["id"], 1, [{"timestamp": 2}])
+
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual(1, len(res))
+        self.assertEqual(
+            {"raw": [{"timestamp": 1}, {"timestamp": 2}, {"timestamp": 3}],
+             "sla": []},
+            res[0]["data"])
+
+    def test_task_result_update(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"},
+                                       {"raw": [], "sla": []})
+        db.task_result_chunk_create(result["id"], 0, [{"timestamp": 1}])
+
+        db.task_result_update(result["id"], {
+            "data": {"raw": [], "sla": ["foo"]},
+            "iterations_count": 1,
+            "statistics": {"atomic": {}}})
+
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual({"raw": [{"timestamp": 1}], "sla": ["foo"]},
+                         res[0]["data"])
+        self.assertEqual(1, res[0]["iterations_count"])
+        self.assertEqual({"atomic": {}}, res[0]["statistics"])
+
+        res = db.task_result_get_all_by_uuid(task_id, load_iterations=False)
+        self.assertEqual({"raw": [], "sla": ["foo"]}, res[0]["data"])
+
+    def test_task_result_chunk_get_all(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        for i in range(3):
+            db.task_result_chunk_create(result["id"], i, [{"timestamp": i}])
+
+        chunks = db.task_result_chunk_get_all(result["id"])
+        self.assertEqual([0, 1, 2], [c["chunk_order"] for c in chunks])
+        chunks = db.task_result_chunk_get_all(result["id"], 1, 1)
+        self.assertEqual([{"raw": [{"timestamp": 1}]}],
+                         [c["data"] for c in chunks])
+
+    def test_task_result_update_not_found(self):
+        self.assertRaises(exceptions.RallyException,
+                          db.task_result_update, 42, {})
+
+    def test_task_get_detailed_with_chunks(self):
+        task = self._create_task()
+        result = db.task_result_create(task["uuid"], {"name": "foo"},
+                                       {"raw": []})
+        db.task_result_chunk_create(result["id"], 0, [{"timestamp": 1}])
+
+        for detailed in (db.task_get_detailed(task["uuid"]),
+                         db.task_get_detailed_last()):
+            self.assertEqual({"raw": [{"timestamp": 1}]},
+                             detailed["results"][0]["data"])
+
+        for detailed in (db.task_get_detailed(task["uuid"],
+                                              load_iterations=False),
+                         db.task_get_detailed_last(load_iterations=False)):
+            self.assertEqual({"raw": []}, detailed["results"][0]["data"])
+
     def test_task_get_detailed(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -16,6 +16,7 @@
 """Tests for DB migration."""
 
 
+import json
 import pprint
 
 import alembic
@@ -29,6 +30,7 @@ import rally
 from rally.common import db
 from rally.common.db.sqlalchemy import api
 from rally.common.db.sqlalchemy import models
+from rally.common import utils
 from tests.unit.common.db import test_migrations_base
 from tests.unit import test as rtest
 
@@ -217,6 +219,9 @@ class MigrationWalkTestCase(rtest.DBTestCase,
         super(MigrationWalkTestCase, self).setUp()
         self.engine = api.get_engine()
 
+    def assertTableNotExists(self, engine, table):
+        self.assertNotIn(table, sa.inspect(engine).get_table_names())
+
     def assertColumnExists(self, engine, table, column):
         t = db_utils.get_table(engine, table)
         self.assertIn(column, t.c)
@@ -264,3 +269,203 @@ class MigrationWalkTestCase(rtest.DBTestCase,
         self.assertColumnExists(engine, "deployments", "credentials")
         self.assertColumnNotExists(engine, "deployments", "admin")
         self.assertColumnNotExists(engine, "deployments", "users")
+
+    def _check_5c6d4c1f7d3a(self, engine, data):
+        self.assertEqual(
+            "5c6d4c1f7d3a", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnsExists(engine, "task_result_chunks",
+                                 ["id", "task_result_id", "chunk_order",
+                                  "data", "created_at", "updated_at"])
+        self.assertIndexMembers(engine, "task_result_chunks",
+                                "task_result_chunk_result_id",
+                                ["task_result_id"])
+
+        task_results = db_utils.get_table(engine, "task_results")
+        chunks = db_utils.get_table(engine, "task_result_chunks")
+        with engine.connect() as conn:
+            result_id = conn.execute(task_results.insert(), [{
+                "key": "{}", "task_uuid": "5c6d4c1f7d3a",
+                "data": json.dumps({"raw": [{"timestamp": 2}], "sla": []})
+            }]).inserted_primary_key[0]
+            conn.execute(chunks.insert(), [
+                {"task_result_id": result_id, "chunk_order": 0,
+                 "data": json.dumps(
+                     {"raw": [{"timestamp": 1}, {"timestamp": 3}]})},
+                {"task_result_id": result_id, "chunk_order": 1,
+                 "data": json.dumps({"raw": [{"timestamp": 4}]})}])
+
+    def _post_downgrade_5c6d4c1f7d3a(self, engine):
+        self.assertTableNotExists(engine, "task_result_chunks")
+
+        task_results = db_utils.get_table(engine, "task_results")
+        with engine.connect() as conn:
+            results = conn.execute(task_results.select().where(
+                task_results.c.task_uuid == "5c6d4c1f7d3a")).fetchall()
+            self.assertEqual(1, len(results))
+            self.assertEqual(
+                {"raw": [{"timestamp": 1}, {"timestamp": 2},
+                         {"timestamp": 3}, {"timestamp": 4}],
+                 "sla": []},
+                json.loads(results[0].data))
+            conn.execute(task_results.delete().where(
+                task_results.c.task_uuid == "5c6d4c1f7d3a"))
+
+    def _pre_upgrade_e0a5df2c5153(self, engine):
+        task_results = db_utils.get_table(engine, "task_results")
+        chunks = db_utils.get_table(engine, "task_result_chunks")
+        iterations = [
+            {"timestamp": 3, "duration": 2, "error": [],
+             "atomic_actions": {}},
+            {"timestamp": 1, "duration": 4, "error": [],
+             "atomic_actions": {}},
+            {"timestamp": 2, "duration": 1, "error": ["err"],
+             "atomic_actions": {}}]
+        with engine.connect() as conn:
+            result_id = conn.execute(task_results.insert(), [{
+                "key": "{}", "task_uuid": "e0a5df2c5153",
+                "data": json.dumps({
+                    "raw": iterations[:2], "load_duration": 5,
+                    "full_duration": 6,
+                    "sla": [{"success": True}, {"success": False}]})
+            }]).inserted_primary_key[0]
+            conn.execute(chunks.insert(), [
+                {"task_result_id": result_id, "chunk_order": 0,
+                 "data": json.dumps({"raw": iterations[2:]})}])
+        return {"result_id": result_id, "iterations": iterations}
+
+    def _check_e0a5df2c5153(self, engine, data):
+        self.assertEqual(
+            "e0a5df2c5153", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnsExists(engine, "task_results",
+                                 ["iterations_count",
+                                  "failed_iterations_count", "min_duration",
+                                  "max_duration", "tstamp_start",
+                                  "load_duration", "full_duration",
+                                  "pass_sla", "statistics"])
+
+        task_results = db_utils.get_table(engine, "task_results")
+        chunks = db_utils.get_table(engine, "task_result_chunks")
+        with engine.connect() as conn:
+            result = conn.execute(task_results.select().where(
+                task_results.c.id == data["result_id"])).first()
+            self.assertEqual(
+                {"raw": [], "load_duration": 5, "full_duration": 6,
+                 "sla": [{"success": True}, {"success": False}]},
+                json.loads(result.data))
+            self.assertEqual(3, result.iterations_count)
+            self.assertEqual(1, result.failed_iterations_count)
+            self.assertEqual(2, result.min_duration)
+            self.assertEqual(4, result.max_duration)
+            self.assertEqual(1, result.tstamp_start)
+            self.assertEqual(5, result.load_duration)
+            self.assertEqual(6, result.full_duration)
+            self.assertFalse(result.pass_sla)
+            self.assertIsNone(result.statistics)
+
+            result_chunks = conn.execute(chunks.select().where(
+                chunks.c.task_result_id == data["result_id"]).order_by(
+                chunks.c.chunk_order)).fetchall()
+            self.assertEqual([0, 1], [c.chunk_order for c in result_chunks])
+            self.assertEqual(data["iterations"][2:],
+                             json.loads(result_chunks[0].data)["raw"])
+            self.assertEqual(data["iterations"][:2],
+                             json.loads(result_chunks[1].data)["raw"])
+
+            conn.execute(chunks.delete().where(
+                chunks.c.task_result_id == data["result_id"]))
+            conn.execute(task_results.delete().where(
+                task_results.c.id == data["result_id"]))
+
+    def _post_downgrade_e0a5df2c5153(self, engine):
+        self.assertColumnNotExists(engine, "task_results", "iterations_count")
+        self.assertColumnNotExists(engine, "task_results", "statistics")
+
+    def _pre_upgrade_f33f4610dcda(self, engine):
+        task_results = db_utils.get_table(engine, "task_results")
+        kw = {"args": {"foo": [1, 2]}, "runner": {"type": "constant"}}
+        with engine.connect() as conn:
+            result_ids = [conn.execute(task_results.insert(), [{
+                "key": json.dumps(key), "task_uuid": "f33f4610dcda",
+                "data": json.dumps({"raw": []})
+            }]).inserted_primary_key[0]
+                for key in ({"name": "Foo.bar", "kw": kw}, {})]
+        return {"result_ids": result_ids, "kw": kw}
+
+    def _check_f33f4610dcda(self, engine, data):
+        self.assertEqual(
+            "f33f4610dcda", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnsExists(engine, "task_results", ["kw_hash"])
+        self.assertIndexExists(engine, "task_results", "task_result_kw_hash")
+
+        task_results = db_utils.get_table(engine, "task_results")
+        with engine.connect() as conn:
+            results = conn.execute(task_results.select().where(
+                task_results.c.id.in_(data["result_ids"])).order_by(
+                task_results.c.id)).fetchall()
+            self.assertEqual([utils.make_config_hash(data["kw"]), None],
+                             [r.kw_hash for r in results])
+            conn.execute(task_results.delete().where(
+                task_results.c.id.in_(data["result_ids"])))
+
+    def _post_downgrade_f33f4610dcda(self, engine):
+        self.assertColumnNotExists(engine, "task_results", "kw_hash")
+
+    def _pre_upgrade_4f8a1c9e2b7d(self, engine):
+        tasks = db_utils.get_table(engine, "tasks")
+        task_results = db_utils.get_table(engine, "task_results")
+        with engine.connect() as conn:
+            for uuid, status in (("4f8a1c9e2b7d-1", "finished"),
+                                 ("4f8a1c9e2b7d-2", "running")):
+                conn.execute(tasks.insert(), [{
+                    "uuid": uuid, "status": status,
+                    "deployment_uuid": "4f8a1c9e2b7d"}])
+                for pos, success in enumerate((True, False)):
+                    conn.execute(task_results.insert(), [{
+                        "key": json.dumps({"name": "Foo.bar", "pos": pos}),
+                        "task_uuid": uuid,
+                        "data": json.dumps({
+                            "raw": [],
+                            "sla": [{"criterion": "foo",
+                                     "success": success}]}),
+                        "iterations_count": 10 + pos,
+                        "failed_iterations_count": pos,
+                        "load_duration": 2.5, "full_duration": 3.5}])
+        return {"uuids": ["4f8a1c9e2b7d-1", "4f8a1c9e2b7d-2"]}
+
+    def _check_4f8a1c9e2b7d(self, engine, data):
+        self.assertEqual(
+            "4f8a1c9e2b7d", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnsExists(engine, "tasks",
+                                 ["pass_sla", "iterations_count",
+                                  "failed_iterations_count", "load_duration",
+                                  "full_duration", "sla_results"])
+
+        tasks = db_utils.get_table(engine, "tasks")
+        task_results = db_utils.get_table(engine, "task_results")
+        with engine.connect() as conn:
+            finished, running = conn.execute(tasks.select().where(
+                tasks.c.uuid.in_(data["uuids"])).order_by(
+                tasks.c.uuid)).fetchall()
+            self.assertFalse(finished.pass_sla)
+            self.assertEqual(21, finished.iterations_count)
+            self.assertEqual(1, finished.failed_iterations_count)
+            self.assertEqual(5, finished.load_duration)
+            self.assertEqual(7, finished.full_duration)
+            self.assertEqual(
+                {"workloads": [
+                    {"name": "Foo.bar", "pos": 0,
+                     "sla": [{"criterion": "foo", "success": True}]},
+                    {"name": "Foo.bar", "pos": 1,
+                     "sla": [{"criterion": "foo", "success": False}]}]},
+                json.loads(finished.sla_results))
+            self.assertIsNone(running.iterations_count)
+            self.assertIsNone(running.sla_results)
+
+            conn.execute(task_results.delete().where(
+                task_results.c.task_uuid.in_(data["uuids"])))
+            conn.execute(tasks.delete().where(
+                tasks.c.uuid.in_(data["uuids"])))
+
+    def _post_downgrade_4f8a1c9e2b7d(self, engine):
+        self.assertColumnNotExists(engine, "tasks", "pass_sla")
+        self.assertColumnNotExists(engine, "tasks", "sla_results")
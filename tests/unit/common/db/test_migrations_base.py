@@ -103,6 +103,10 @@ class BaseWalkMigrationMixin(object):
         """
 
         self._configure(engine)
+        # NOTE: the DB schema is created from the models and stamped with
+        #       the head revision, so the migrations can not be applied to
+        #       it. Cleanup the DB to walk all the migrations from the init.
+        rally.common.db.sqlalchemy.api.get_backend().schema_cleanup()
         up_and_down_versions = self._up_and_down_versions()
         for ver_up, ver_down in up_and_down_versions:
             # upgrade -> downgrade -> upgrade
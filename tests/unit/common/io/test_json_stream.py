@@ -0,0 +1,130 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import ddt
+import six
+
+from rally.common.io import json_stream
+from tests.unit import test
+
+
+@ddt.ddt
+class DumpTestCase(test.TestCase):
+
+    @ddt.data({}, {"sort_keys": True, "indent": 4})
+    def test_dump(self, kwargs):
+        iterations = [{"foo": i, "bar": [i, "spam"]} for i in range(5)]
+        obj = [{"result": iter(iterations), "empty": iter([]),
+                "list": [1, 2], "key": {"name": u"f\xf6o"}}]
+        stream = six.StringIO()
+        json_stream.dump(obj, stream, **kwargs)
+        expected = json.dumps([{"result": iterations, "empty": [],
+                                "list": [1, 2], "key": {"name": u"f\xf6o"}}],
+                              **kwargs)
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_dump_generator(self):
+        stream = six.StringIO()
+        json_stream.dump(six.moves.map(str, range(3)), stream)
+        self.assertEqual("[\"0\", \"1\", \"2\"]", stream.getvalue())
+
+    def test_dump_not_serializable(self):
+        self.assertRaises(TypeError, json_stream.dump, object(),
+                          six.StringIO())
+
+
+@ddt.ddt
+class JSONStreamReaderTestCase(test.TestCase):
+
+    DOC = {"foo": [1, 22.5, -333, {"bar": u"sp\xe4m"}, [], {}],
+           "bar": {"x": "y"}, "spam": [], "empty": {}, "num": 123456789}
+
+    def _make_reader(self, doc, buffer_size=65536, **kwargs):
+        data = json.dumps(doc, **kwargs).encode("utf-8")
+        return json_stream.JSONStreamReader(io.BytesIO(data),
+                                            buffer_size=buffer_size)
+
+    @ddt.data(1, 2, 7, 65536)
+    def test_read_value(self, buffer_size):
+        for kwargs in ({}, {"indent": 4}, {"ensure_ascii": False}):
+            reader = self._make_reader(self.DOC, buffer_size, **kwargs)
+            self.assertEqual(self.DOC, reader.read_value())
+
+    @ddt.data(1, 3, 65536)
+    def test_iter_object_and_array(self, buffer_size):
+        reader = self._make_reader(self.DOC, buffer_size, sort_keys=True,
+                                   indent=2, ensure_ascii=False)
+        result = {}
+        for key in reader.iter_object():
+            if key in ("foo", "spam"):
+                result[key] = [reader.read_value()
+                               for idx in reader.iter_array()]
+            elif key == "empty":
+                result[key] = dict((k, reader.read_value())
+                                   for k in reader.iter_object())
+            else:
+                result[key] = reader.read_value()
+        self.assertEqual(self.DOC, result)
+        self.assertEqual(len(json.dumps(self.DOC, sort_keys=True, indent=2,
+                                        ensure_ascii=False).encode("utf-8")),
+                         reader.tell())
+
+    @ddt.data("[1, 2", "[1 2]", "{1: 2}", "{\"a\" 2}", "[\"foo]", "")
+    def test_invalid_document(self, doc):
+        def walk():
+            reader = json_stream.JSONStreamReader(
+                io.BytesIO(doc.encode("utf-8")), buffer_size=2)
+            if doc.startswith("{"):
+                for key in reader.iter_object():
+                    reader.read_value()
+            else:
+                for idx in reader.iter_array():
+                    reader.read_value()
+
+        self.assertRaises(ValueError, walk)
+
+
+class FileArrayTestCase(test.TestCase):
+
+    def setUp(self):
+        super(FileArrayTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def test_iter(self):
+        path = os.path.join(self.tmp_dir, "doc.json")
+        doc = {"bar": u"\xe4\xf6", "foo": [{"x": i} for i in range(100)]}
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(six.text_type(json.dumps(doc, sort_keys=True,
+                                             ensure_ascii=False)))
+
+        with open(path, "rb") as f:
+            reader = json_stream.JSONStreamReader(f, buffer_size=16)
+            for key in reader.iter_object():
+                if key == "foo":
+                    array = json_stream.FileArray(path, reader.tell())
+                    for idx in reader.iter_array():
+                        reader.read_value()
+                else:
+                    reader.read_value()
+
+        self.assertEqual(doc["foo"], list(array))
+        self.assertEqual(doc["foo"], list(array))
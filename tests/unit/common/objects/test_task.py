@@ -23,6 +23,7 @@ import jsonschema
 import mock
 
 from rally.common import objects
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -120,6 +121,19 @@ class TaskTestCase(test.TestCase):
         self.assertEqual(mock_db_task_list.return_value["uuis"],
                          tasks[0]["uuid"])
 
+    @mock.patch("rally.common.objects.task.db.deployment_get")
+    def test_to_dict(self, mock_deployment_get):
+        mock_deployment_get.return_value = {"name": "foo_deployment"}
+        task = objects.Task(task=dict(self.task, deployment_uuid="foo"))
+        self.assertEqual("foo_deployment",
+                         task.to_dict()["deployment_name"])
+        mock_deployment_get.assert_called_once_with("foo")
+
+        mock_deployment_get.reset_mock()
+        task = objects.Task(task=dict(self.task, deployment_name="bar"))
+        self.assertEqual("bar", task.to_dict()["deployment_name"])
+        self.assertFalse(mock_deployment_get.called)
+
     @mock.patch("rally.common.objects.deploy.db.task_update")
     @mock.patch("rally.common.objects.task.db.task_create")
     def test_update(self, mock_task_create, mock_task_update):
@@ -140,10 +154,12 @@ class TaskTestCase(test.TestCase):
         }
     )
     @ddt.unpack
+    @mock.patch("rally.common.objects.task.Task.summarize",
+                return_value={"pass_sla": True})
     @mock.patch("rally.common.objects.task.db.task_update_status")
     @mock.patch("rally.common.objects.task.db.task_update")
     def test_update_status(self, mock_task_update, mock_task_update_status,
-                           status, allowed_statuses):
+                           mock_task_summarize, status, allowed_statuses):
         task = objects.Task(task=self.task)
         task.update_status(consts.TaskStatus.FINISHED, allowed_statuses)
         if allowed_statuses:
@@ -157,9 +173,110 @@ class TaskTestCase(test.TestCase):
             self.assertFalse(mock_task_update_status.called)
             mock_task_update.assert_called_once_with(
                 self.task["uuid"],
-                {"status": consts.TaskStatus.FINISHED},
+                {"status": consts.TaskStatus.FINISHED, "pass_sla": True},
             )
 
+    @mock.patch("rally.common.objects.task.Task.summarize")
+    @mock.patch("rally.common.objects.task.db.task_update")
+    def test_update_status_not_final(self, mock_task_update,
+                                     mock_task_summarize):
+        task = objects.Task(task=self.task)
+        task.update_status(consts.TaskStatus.RUNNING)
+        mock_task_update.assert_called_once_with(
+            self.task["uuid"], {"status": consts.TaskStatus.RUNNING})
+        self.assertFalse(mock_task_summarize.called)
+
+    @mock.patch("rally.common.objects.task.Task.summarize",
+                return_value={"pass_sla": True, "load_duration": 10})
+    @mock.patch("rally.common.objects.task.db.task_update")
+    def test_update_status_with_load_duration(self, mock_task_update,
+                                              mock_task_summarize):
+        task = objects.Task(task=self.task)
+        task.update_status(consts.TaskStatus.FINISHED, load_duration=4)
+        mock_task_update.assert_called_once_with(
+            self.task["uuid"], {"status": consts.TaskStatus.FINISHED,
+                                "pass_sla": True, "load_duration": 4})
+
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_summarize(self, mock_task_result_get_all_by_uuid):
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"key": {"name": "Foo.bar", "pos": 0},
+             "data": {"sla": [{"criterion": "foo", "success": True}],
+                      "load_duration": 2, "full_duration": 3},
+             "iterations_count": 10, "failed_iterations_count": 1},
+            {"key": {"name": "Foo.spam", "pos": 1},
+             "data": {"sla": [{"criterion": "foo", "success": False}],
+                      "load_duration": 4, "full_duration": 5},
+             "iterations_count": 20, "failed_iterations_count": 2},
+            {"key": {"name": "Foo.eggs", "pos": 2},
+             "data": {"sla": []},
+             "iterations_count": None, "failed_iterations_count": None}]
+        task = objects.Task(task=self.task)
+        self.assertEqual(
+            {"pass_sla": False, "iterations_count": 30,
+             "failed_iterations_count": 3, "load_duration": 6,
+             "full_duration": 8,
+             "sla_results": {"workloads": [
+                 {"name": "Foo.bar", "pos": 0,
+                  "sla": [{"criterion": "foo", "success": True}]},
+                 {"name": "Foo.spam", "pos": 1,
+                  "sla": [{"criterion": "foo", "success": False}]},
+                 {"name": "Foo.eggs", "pos": 2, "sla": []}]}},
+            task.summarize())
+        mock_task_result_get_all_by_uuid.assert_called_once_with(
+            self.task["uuid"], False)
+
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_summarize_overlapping_loads(self,
+                                         mock_task_result_get_all_by_uuid):
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"key": {"name": "Foo.bar", "pos": 0},
+             "data": {"sla": [], "load_duration": ld, "full_duration": 1},
+             "iterations_count": 1, "failed_iterations_count": 0,
+             "tstamp_start": ts}
+            for ts, ld in ((10, 4), (12, 4), (11, 1), (20, 2), (None, 3))]
+        task = objects.Task(task=self.task)
+        self.assertEqual(11, task.summarize()["load_duration"])
+
+    def test_summarize_temporary(self):
+        task = objects.Task(temporary=True)
+        self.assertEqual(0, task.summarize()["iterations_count"])
+
+    @ddt.data(
+        {"status": consts.TaskStatus.FINISHED, "sla_results": None,
+         "stored": True},
+        {"status": consts.TaskStatus.RUNNING, "sla_results": None,
+         "stored": False},
+        {"status": consts.TaskStatus.FINISHED,
+         "sla_results": {"workloads": []}, "stored": False}
+    )
+    @ddt.unpack
+    @mock.patch("rally.common.objects.task.Task.summarize")
+    @mock.patch("rally.common.objects.task.db.task_update")
+    @mock.patch("rally.common.objects.task.db.task_get_summary")
+    def test_get_summary(self, mock_task_get_summary, mock_task_update,
+                         mock_task_summarize, status, sla_results, stored):
+        summary = {"uuid": "foo_uuid", "status": status,
+                   "sla_results": sla_results}
+        summary.update((k, None) for k in objects.Task.SUMMARY_COLUMNS
+                       if k != "sla_results")
+        mock_task_get_summary.return_value = dict(summary)
+        computed = dict((k, k) for k in objects.Task.SUMMARY_COLUMNS)
+        mock_task_summarize.return_value = computed
+
+        result = objects.Task.get_summary("foo_uuid")
+
+        mock_task_get_summary.assert_called_once_with("foo_uuid")
+        if sla_results is None:
+            self.assertEqual(dict(summary, **computed), result)
+        else:
+            self.assertEqual(summary, result)
+            self.assertFalse(mock_task_summarize.called)
+        if stored:
+            mock_task_update.assert_called_once_with("foo_uuid", computed)
+        else:
+            self.assertFalse(mock_task_update.called)
+
     @mock.patch("rally.common.objects.task.db.task_update")
     def test_update_verification_log(self, mock_task_update):
         mock_task_update.return_value = self.task
@@ -203,14 +320,14 @@ class TaskTestCase(test.TestCase):
 
         # serializable is default
         results = objects.Task.extend_results(obsolete)
-        self.assertIsInstance(results[0]["iterations"], type(iter([])))
+        self.assertNotIsInstance(results[0]["iterations"], list)
         self.assertEqual(list(results[0]["iterations"]), iterations)
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
         # serializable is False
         results = objects.Task.extend_results(obsolete, serializable=False)
-        self.assertIsInstance(results[0]["iterations"], type(iter([])))
+        self.assertNotIsInstance(results[0]["iterations"], list)
         self.assertEqual(list(results[0]["iterations"]), iterations)
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
@@ -225,30 +342,203 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    def test_extend_results_with_aggregates(
+            self, mock_task_result_chunk_get_all):
+        iterations = [{"timestamp": 1, "duration": 1, "error": [],
+                       "output": {"additive": [], "complete": []},
+                       "idle_duration": 0, "atomic_actions": {}}]
+        mock_task_result_chunk_get_all.return_value = [
+            {"data": {"raw": iterations}}]
+        results = [
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {}, "name": "Foo.bar", "pos": 0},
+             "data": {"raw": [], "sla": [], "full_duration": 40,
+                      "load_duration": 32},
+             "iterations_count": 1, "failed_iterations_count": 0,
+             "min_duration": 1, "max_duration": 1, "tstamp_start": 1,
+             "load_duration": 32, "full_duration": 40, "pass_sla": True,
+             "statistics": {"atomic": {}, "stat": "durations_stat"}}]
+
+        results = objects.Task.extend_results(results,
+                                              iterations_loaded=False)
+
+        self.assertEqual({"atomic": {}, "iterations_count": 1,
+                          "iterations_failed": 0, "max_duration": 1,
+                          "min_duration": 1, "tstamp_start": 1,
+                          "full_duration": 40, "load_duration": 32,
+                          "stat": "durations_stat"}, results[0]["info"])
+        self.assertEqual(["info", "iterations", "key", "sla"],
+                         sorted(results[0]))
+        self.assertFalse(mock_task_result_chunk_get_all.called)
+        self.assertEqual(iterations, list(results[0]["iterations"]))
+        mock_task_result_chunk_get_all.assert_called_once_with(11, 0, 10)
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    def test_extend_results_without_aggregates(
+            self, mock_task_result_chunk_get_all):
+        iterations = [{"timestamp": 1, "duration": 1, "error": [],
+                       "idle_duration": 0,
+                       "atomic_actions": {"foo": 0.5}}]
+        mock_task_result_chunk_get_all.return_value = [
+            {"data": {"raw": iterations}}]
+        results = [
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {}, "name": "Foo.bar", "pos": 0},
+             "data": {"raw": [], "sla": [], "full_duration": 40,
+                      "load_duration": 32},
+             "statistics": None}]
+
+        results = objects.Task.extend_results(results, serializable=True,
+                                              iterations_loaded=False)
+
+        info = results[0]["info"]
+        self.assertEqual({"foo": {"min_duration": 0.5, "max_duration": 0.5}},
+                         info["atomic"])
+        self.assertEqual(1, info["iterations_count"])
+        self.assertEqual(["foo", "total"],
+                         [row[0] for row in info["stat"]["rows"]])
+        self.assertEqual(
+            [dict(iterations[0], output={"additive": [], "complete": []})],
+            results[0]["iterations"])
+        self.assertEqual(2, mock_task_result_chunk_get_all.call_count)
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    def test_iter_result_iterations(self, mock_task_result_chunk_get_all):
+        mock_task_result_chunk_get_all.side_effect = [
+            [{"data": {"raw": [2, 3]}}, {"data": {"raw": [4]}}],
+            [{"data": {"raw": [5]}}]]
+        result = {"id": 42, "data": {"raw": [1]}}
+
+        self.assertEqual(
+            [1, 2, 3, 4, 5],
+            list(objects.Task.iter_result_iterations(result,
+                                                     chunks_per_page=2)))
+        self.assertEqual([mock.call(42, 0, 2), mock.call(42, 2, 2)],
+                         mock_task_result_chunk_get_all.call_args_list)
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    def test_iter_result_iterations_without_id(
+            self, mock_task_result_chunk_get_all):
+        result = {"id": None, "data": {"raw": [1]}}
+        self.assertEqual([1],
+                         list(objects.Task.iter_result_iterations(result)))
+        self.assertFalse(mock_task_result_chunk_get_all.called)
+
     @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
                 return_value="foo_results")
     def test_get_results(self, mock_task_result_get_all_by_uuid):
         task = objects.Task(task=self.task)
         results = task.get_results()
         mock_task_result_get_all_by_uuid.assert_called_once_with(
-            self.task["uuid"])
+            self.task["uuid"], True)
         self.assertEqual(results, "foo_results")
 
-    @mock.patch("rally.common.objects.task.db.task_result_create")
-    def test_append_results(self, mock_task_result_create):
+    @ddt.data(consts.TaskStatus.FINISHED, consts.TaskStatus.RUNNING)
+    @mock.patch("rally.common.objects.task.Task.iter_result_iterations")
+    @mock.patch("rally.common.objects.task.db.task_result_update")
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results_summaries(self, status,
+                                   mock_task_result_get_all_by_uuid,
+                                   mock_task_result_update,
+                                   mock_task_iter_result_iterations):
+        data = {"raw": [], "sla": [], "load_duration": 1, "full_duration": 2}
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"id": 1, "data": data, "statistics": {"foo": "bar"}},
+            {"id": 2, "data": data, "statistics": None}]
+        mock_task_iter_result_iterations.return_value = iter(
+            [{"timestamp": 1, "duration": 2, "error": [],
+              "atomic_actions": {"foo": 1}}])
+        task = objects.Task(task=dict(self.task, status=status))
+
+        results = task.get_results_summaries()
+
+        mock_task_result_get_all_by_uuid.assert_called_once_with(
+            self.task["uuid"], False)
+        mock_task_iter_result_iterations.assert_called_once_with(results[1])
+        self.assertEqual({"foo": "bar"}, results[0]["statistics"])
+        self.assertEqual(1, results[1]["iterations_count"])
+        self.assertEqual(["foo", "total"],
+                         [r[0] for r in
+                          results[1]["statistics"]["stat"]["rows"]])
+        if status == consts.TaskStatus.FINISHED:
+            values = mock_task_result_update.call_args[0][1]
+            mock_task_result_update.assert_called_once_with(2, values)
+            self.assertEqual(data, values["data"])
+            self.assertEqual(results[1]["statistics"], values["statistics"])
+        else:
+            self.assertFalse(mock_task_result_update.called)
+
+    @ddt.data(False, True)
+    @mock.patch("rally.common.objects.task.db.task_result_update")
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_create")
+    @mock.patch("rally.common.objects.task.db.task_result_create",
+                return_value={"id": 42})
+    def test_append_results(self, lazy, mock_task_result_create,
+                            mock_task_result_chunk_create,
+                            mock_task_result_update):
         task = objects.Task(task=self.task)
-        task.append_results("opt", "val")
+        task.RESULT_CHUNK_SIZE = 2
+        iterations = [{"timestamp": i, "duration": i, "error": [],
+                       "atomic_actions": {}} for i in range(3)]
+        key = {"name": "Foo.bar", "kw": {"args": {}}}
+        raw = iter(iterations) if lazy else iterations
+        task.append_results(key, {"raw": raw, "sla": [],
+                                  "load_duration": 1, "full_duration": 2})
+
+        data = {"raw": [], "sla": [], "load_duration": 1, "full_duration": 2}
         mock_task_result_create.assert_called_once_with(
-            self.task["uuid"], "opt", "val")
+            self.task["uuid"], key, data,
+            kw_hash=utils.make_config_hash({"args": {}}))
+        self.assertEqual([mock.call(42, 0, iterations[:2]),
+                          mock.call(42, 1, iterations[2:])],
+                         mock_task_result_chunk_create.call_args_list)
+        values = mock_task_result_update.call_args[0][1]
+        self.assertEqual(data, values["data"])
+        self.assertEqual(3, values["iterations_count"])
+        self.assertTrue(values["pass_sla"])
+
+    @mock.patch("rally.common.objects.task.db.task_result_create",
+                return_value={"id": 42})
+    @mock.patch("rally.common.objects.task.utils.make_config_hash",
+                return_value="foo_hash")
+    def test_create_result(self, mock_make_config_hash,
+                           mock_task_result_create):
+        task = objects.Task(task=self.task)
+        key = {"name": "Foo.bar", "kw": "foo_kw"}
+        self.assertEqual(42, task.create_result(key, "val"))
+        mock_task_result_create.assert_called_once_with(
+            self.task["uuid"], key, "val", kw_hash="foo_hash")
+        mock_make_config_hash.assert_called_once_with("foo_kw")
 
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_create")
+    def test_append_result_iterations(self, mock_task_result_chunk_create):
+        task = objects.Task(task=self.task)
+        task.append_result_iterations(42, 3, ["iter"])
+        mock_task_result_chunk_create.assert_called_once_with(
+            42, 3, ["iter"])
+
+    @mock.patch("rally.common.objects.task.db.task_result_update")
+    def test_update_result(self, mock_task_result_update):
+        task = objects.Task(task=self.task)
+        task.update_result(42, "val")
+        mock_task_result_update.assert_called_once_with(42, {"data": "val"})
+
+        mock_task_result_update.reset_mock()
+        task.update_result(42, "val", {"iterations_count": 1})
+        mock_task_result_update.assert_called_once_with(
+            42, {"data": "val", "iterations_count": 1})
+
+    @mock.patch("rally.common.objects.task.Task.summarize",
+                return_value={"pass_sla": True})
     @mock.patch("rally.common.objects.task.db.task_update")
-    def test_set_failed(self, mock_task_update):
+    def test_set_failed(self, mock_task_update, mock_task_summarize):
         mock_task_update.return_value = self.task
         task = objects.Task(task=self.task)
         task.set_failed("foo_type", "foo_error_message", "foo_trace")
         mock_task_update.assert_called_once_with(
             self.task["uuid"],
-            {"status": consts.TaskStatus.FAILED,
+            {"status": consts.TaskStatus.FAILED, "pass_sla": True,
              "verification_log": "[\"foo_type\", \"foo_error_message\", "
                                  "\"foo_trace\"]"},
         )
@@ -326,3 +616,81 @@ class TaskTestCase(test.TestCase):
             allowed_statuses=(consts.TaskStatus.RUNNING,
                               consts.TaskStatus.SOFT_ABORTING)
         )
+
+
+class ResultAggregatorTestCase(test.TestCase):
+
+    def test_aggregates(self):
+        aggregator = objects.task.ResultAggregator()
+        iterations = [
+            {"timestamp": 3, "duration": 2, "error": [],
+             "atomic_actions": {"foo": 1, "bar": 0.5}},
+            {"timestamp": 1, "duration": 4, "error": [],
+             "atomic_actions": {"foo": 3}},
+            {"timestamp": 2, "duration": 1, "error": ["err"],
+             "atomic_actions": {"foo": 0.2}}]
+        for itr in iterations:
+            aggregator.add_iteration(itr)
+
+        aggregates = aggregator.aggregates(
+            {"load_duration": 5, "full_duration": 6,
+             "sla": [{"success": True}, {"success": False}]})
+
+        stat = aggregates.pop("statistics")
+        self.assertEqual({"iterations_count": 3,
+                          "failed_iterations_count": 1,
+                          "min_duration": 2, "max_duration": 4,
+                          "tstamp_start": 1, "load_duration": 5,
+                          "full_duration": 6, "pass_sla": False},
+                         aggregates)
+        self.assertEqual({"foo": {"min_duration": 0.2, "max_duration": 3},
+                          "bar": {"min_duration": 0.5, "max_duration": 0.5}},
+                         stat["atomic"])
+        self.assertEqual(["foo", "bar", "total"],
+                         [row[0] for row in stat["stat"]["rows"]])
+        self.assertEqual(sorted(objects.task.ResultAggregator.COLUMNS),
+                         sorted(list(aggregates) + ["statistics"]))
+
+    def test_merge(self):
+        iterations = [
+            {"timestamp": 3, "duration": 2, "error": [],
+             "atomic_actions": {"foo": 1, "bar": 0.5}},
+            {"timestamp": 1, "duration": 4, "error": [],
+             "atomic_actions": {"foo": 3}},
+            {"timestamp": 2, "duration": 1, "error": ["err"],
+             "atomic_actions": {"foo": 0.2}}]
+        data = {"load_duration": 5, "full_duration": 6, "sla": []}
+        aggregator = objects.task.ResultAggregator()
+        for itr in iterations:
+            aggregator.add_iteration(itr)
+
+        merged = objects.task.ResultAggregator()
+        merged.merge(objects.task.ResultAggregator())
+        for itr in iterations:
+            partial = objects.task.ResultAggregator()
+            partial.add_iteration(itr)
+            merged.merge(partial)
+
+        self.assertEqual(aggregator.aggregates(data),
+                         merged.aggregates(data))
+
+    def test_aggregates_like_extend_results(self):
+        iterations = [{"timestamp": i, "duration": i % 7, "error": [],
+                       "idle_duration": 0,
+                       "output": {"additive": [], "complete": []},
+                       "atomic_actions": {"foo": i % 5, "bar": i % 3}}
+                      for i in range(1, 100)]
+        aggregator = objects.task.ResultAggregator()
+        for itr in iterations:
+            aggregator.add_iteration(itr)
+        data = {"raw": iterations, "sla": [], "load_duration": 5,
+                "full_duration": 6}
+        result = dict(aggregator.aggregates(data), id=None, task_uuid=None,
+                      key={}, data=data, created_at=None, updated_at=None)
+
+        with_aggregates = objects.Task.extend_results([result])
+        result["statistics"] = None
+        without_aggregates = objects.Task.extend_results([result])
+
+        self.assertEqual(without_aggregates[0]["info"],
+                         with_aggregates[0]["info"])
@@ -84,3 +84,26 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_concurrently(self):
+        self.assertEqual(
+            [3, 7, 11],
+            broker.run_concurrently(lambda a, b: a + b,
+                                    [(1, 2), (3, 4), (5, 6)], workers=2))
+        self.assertEqual([], broker.run_concurrently(mock.MagicMock(), []))
+
+    def test_run_concurrently_fails(self):
+        errors = [ValueError("first"), ValueError("second")]
+
+        def func(idx):
+            if idx in (1, 3):
+                raise errors[idx // 2]
+            return idx
+
+        called = []
+        e = self.assertRaises(
+            ValueError, broker.run_concurrently,
+            lambda idx: called.append(idx) or func(idx),
+            [(idx,) for idx in range(5)], workers=3)
+        self.assertIs(errors[0], e)
+        self.assertEqual(set(range(5)), set(called))
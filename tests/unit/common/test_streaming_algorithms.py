@@ -41,6 +41,13 @@ class MeanComputationTestCase(test.TestCase):
         excepted_mean = float(sum(stream)) / len(stream)
         self.assertEqual(excepted_mean, mean_computation.result())
 
+    def test_add_values(self):
+        mean_computation = algo.MeanComputation()
+        mean_computation.add(1)
+        mean_computation.add_values([2, 6])
+        mean_computation.add_values([])
+        self.assertEqual(3.0, mean_computation.result())
+
     def test_merge(self):
         single_mean = algo.MeanComputation()
 
@@ -120,6 +127,15 @@ class MinComputationTestCase(test.TestCase):
         [comp.add(i) for i in [3, 5.2, 2, -1, 1, 8, 33.4, 0, -3, 42, -2]]
         self.assertEqual(-3, comp.result())
 
+    def test_add_values(self):
+        comp = algo.MinComputation()
+        comp.add_values([])
+        self.assertIsNone(comp.result())
+        comp.add_values([3, 5.2, -1])
+        comp.add_values([2, 8])
+        self.assertEqual(-1, comp.result())
+        self.assertRaises(TypeError, comp.add_values, [1, None])
+
     def test_add_raises(self):
         comp = algo.MinComputation()
         self.assertRaises(TypeError, comp.add)
@@ -159,6 +175,15 @@ class MaxComputationTestCase(test.TestCase):
         [comp.add(i) for i in [3, 5.2, 2, -1, 1, 8, 33.4, 0, -3, 42, -2]]
         self.assertEqual(42, comp.result())
 
+    def test_add_values(self):
+        comp = algo.MaxComputation()
+        comp.add_values([])
+        self.assertIsNone(comp.result())
+        comp.add_values([3, 5.2, -1])
+        comp.add_values([2, 4])
+        self.assertEqual(5.2, comp.result())
+        self.assertRaises(TypeError, comp.add_values, ["foo"])
+
     def test_add_raises(self):
         comp = algo.MaxComputation()
         self.assertRaises(TypeError, comp.add)
@@ -221,11 +246,6 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
@@ -236,14 +256,155 @@ class PercentileComputationTestCase(test.TestCase):
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    @ddt.data(
+        {"stream": "mixed5000", "percent": 0.25, "expected": 25.105},
+        {"stream": "mixed5000", "percent": 0.50, "expected": 51.89},
+        {"stream": "mixed5000", "percent": 0.90, "expected": 82.813},
+        {"stream": "mixed5000", "percent": 0.99, "expected": 124})
+    @ddt.unpack
+    def test_add_and_result_long_stream(self, percent, stream, expected):
+        comp = algo.PercentileComputation(percent=percent)
+        [comp.add(i) for i in getattr(self, stream)]
+        self.assertIsNone(comp._values)
+        self.assertLessEqual(abs(comp.result() - expected), expected * 0.005)
+
+    @ddt.data(0.5, 0.95, 0.99)
+    def test_result_error_bound(self, percent):
+        values = [math.exp(i % 997 / 50.0) - 1 for i in range(100000)]
+        values += [-v for v in values[:1000]]
+        comp = algo.PercentileComputation(percent, accuracy=0.01)
+        [comp.add(v) for v in values]
+
+        exact = algo.PercentileComputation(percent, exact_size=len(values))
+        [exact.add(v) for v in values]
+        expected = exact.result()
+
+        self.assertLessEqual(abs(comp.result() - expected),
+                             abs(expected) * 0.01)
+        self.assertLessEqual(len(comp._buckets), 2048)
+
+    def test_max_buckets(self):
+        comp = algo.PercentileComputation(0.99, exact_size=0, max_buckets=10)
+        exact = algo.PercentileComputation(0.99)
+        for i in range(-100, 100):
+            comp.add(10 ** (i / 10.0))
+            exact.add(10 ** (i / 10.0))
+        self.assertEqual(10, len(comp._buckets))
+        self.assertEqual(200, sum(comp._buckets.values()))
+        # NOTE: only the lowest buckets are collapsed
+        self.assertLessEqual(abs(comp.result() - exact.result()),
+                             exact.result() * 0.005)
+
+    @ddt.data({"exact_size": 10000, "accuracy": 0.005},
+              {"exact_size": 1000, "accuracy": 0.005},
+              {"exact_size": 0, "accuracy": 0.005})
+    @ddt.unpack
+    def test_merge(self, exact_size, accuracy):
+        single = algo.PercentileComputation(0.95, exact_size=exact_size)
+        for val in self.mixed50 * 100:
+            single.add(val)
+
+        percentiles = [algo.PercentileComputation(0.95, exact_size=exact_size)
+                       for _ in six.moves.range(10)]
+        for idx, comp in enumerate(percentiles):
+            for val in (self.mixed50 * 100)[idx * 500:(idx + 1) * 500]:
+                comp.add(val)
+        percentiles[3].add(0)
+        single.add(0)
+
+        merged = percentiles[0]
+        for comp in percentiles[1:]:
+            merged.merge(comp)
+
+        self.assertEqual(single._count, merged._count)
+        self.assertLessEqual(abs(single.result() - merged.result()),
+                             single.result() * accuracy)
+
+    def test_merge_exact_to_buckets(self):
+        exact = algo.PercentileComputation(0.5)
+        [exact.add(v) for v in (1, 2, 3)]
+        long_stream = algo.PercentileComputation(0.5, exact_size=2)
+        [long_stream.add(v) for v in (4, 5, 6)]
+
+        exact.merge(long_stream)
+
+        self.assertEqual(6, exact._count)
+        self.assertLessEqual(abs(exact.result() - 3.5), 3.5 * 0.005)
+
+    def test_merge_different_accuracy(self):
+        self.assertRaises(ValueError,
+                          algo.PercentileComputation(0.5).merge,
+                          algo.PercentileComputation(0.5, accuracy=0.1))
+
+    @ddt.data(0, 3, 10000)
+    def test_add_values(self, exact_size):
+        comp = algo.PercentileComputation(0.5, exact_size=exact_size)
+        [comp.add(v) for v in self.mixed50[:2]]
+        comp.add_values(self.mixed50[2:])
+        single = algo.PercentileComputation(0.5, exact_size=exact_size)
+        [single.add(v) for v in self.mixed50]
+        self.assertEqual(single._count, comp._count)
+        self.assertEqual(single.result(), comp.result())
+        self.assertRaises(TypeError, comp.add_values, ["foo"])
+
     def test_add_raises(self):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertRaises(TypeError, comp.add)
+        self.assertRaises(TypeError, comp.add, "foo")
 
     def test_result_empty(self):
         self.assertRaises(TypeError, algo.PercentileComputation)
         comp = algo.PercentileComputation(0.50, 100)
         self.assertIsNone(comp.result())
+        self.assertRaises(ValueError, algo.PercentileComputation, 0.5,
+                          accuracy=1)
+
+    def test_percentile(self):
+        comp = algo.PercentileComputation(0.5)
+        self.assertIsNone(comp.percentile(0.9))
+        comp.add_values(range(1, 11))
+        self.assertEqual(5.5, comp.result())
+        self.assertEqual(5.5, comp.percentile(0.5))
+        self.assertAlmostEqual(9.1, comp.percentile(0.9))
+
+    @ddt.data(10000, 0)
+    def test_iter_counts(self, exact_size):
+        comp = algo.PercentileComputation(0.5, exact_size=exact_size)
+        comp.add_values([3, 1, 2, 1, 3, 3])
+        counts = list(comp.iter_counts())
+        self.assertEqual([2, 1, 3], [c for v, c in counts])
+        for (value, count), expected in zip(counts, (1, 2, 3)):
+            self.assertLessEqual(abs(value - expected), expected * 0.005)
+
+
+@ddt.ddt
+class MannWhitneyUTestTestCase(test.TestCase):
+
+    def _get_comp(self, values, exact_size=10000):
+        comp = algo.PercentileComputation(0.5, exact_size=exact_size)
+        comp.add_values(values)
+        return comp
+
+    @ddt.data(10000, 0)
+    def test_mann_whitney_u_test(self, exact_size):
+        first = self._get_comp([1, 2, 3, 4, 5, 6, 7, 8], exact_size)
+        second = self._get_comp([3, 5, 7, 9, 10, 11, 12, 13])
+        u, p_value = algo.mann_whitney_u_test(first, second)
+        # NOTE: the expected values are computed by scipy.stats.mannwhitneyu
+        self.assertEqual(10.5, u)
+        self.assertAlmostEqual(0.02708, p_value, places=5)
+        self.assertEqual(8, first._count)
+        self.assertEqual(8, second._count)
+
+    def test_mann_whitney_u_test_same(self):
+        u, p_value = algo.mann_whitney_u_test(self._get_comp([1, 1, 1]),
+                                              self._get_comp([1, 1]))
+        self.assertEqual(3, u)
+        self.assertEqual(1.0, p_value)
+
+    def test_mann_whitney_u_test_empty(self):
+        self.assertEqual((None, None), algo.mann_whitney_u_test(
+            self._get_comp([]), self._get_comp([1, 2])))
 
 
 class IncrementComputationTestCase(test.TestCase):
@@ -254,6 +415,8 @@ class IncrementComputationTestCase(test.TestCase):
             self.assertEqual(i - 1, comp.result())
             comp.add(42)
             self.assertEqual(i, comp.result())
+        comp.add_values([1, 2, 3])
+        self.assertEqual(102, comp.result())
 
     def test_merge(self):
         single_inc = algo.IncrementComputation()
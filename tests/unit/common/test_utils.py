@@ -451,6 +451,49 @@ class MergeTestCase(test.TestCase):
         self.assertEqual(out, expected_output)
 
 
+@ddt.ddt
+class ConfigHashTestCase(test.TestCase):
+
+    @ddt.data({"args": [None], "result": "None"},
+              {"args": [""], "result": ""},
+              {"args": [" str value "], "result": "str value"},
+              {"args": [" 42 "], "result": "42"},
+              {"args": ["42"], "result": "42"},
+              {"args": [42], "result": "42"},
+              {"args": [42.00], "result": "42.0"},
+              {"args": [[3.2, 1, " foo ", None]], "result": "1,3.2,None,foo"},
+              {"args": [(" def", "abc", [22, 33])], "result": "22,33,abc,def"},
+              {"args": [{}], "result": ""},
+              {"args": [{1: 2, "a": " b c "}], "result": "1:2|a:b c"},
+              {"args": [{"foo": "bar", (1, 2): [5, 4, 3]}],
+               "result": "1,2:3,4,5|foo:bar"},
+              {"args": [1, 2], "raises": TypeError},
+              {"args": [set()], "raises": TypeError})
+    @ddt.unpack
+    def test_config_to_str(self, args, result=None, raises=None):
+        if raises:
+            self.assertRaises(raises, utils.config_to_str, *args)
+        else:
+            self.assertEqual(result, utils.config_to_str(*args))
+
+    @mock.patch("rally.common.utils.config_to_str")
+    @mock.patch("rally.common.utils.hashlib")
+    def test_make_config_hash(self, mock_hashlib, mock_config_to_str):
+        mock_hashlib.md5.return_value.hexdigest.return_value = "md5_digest"
+        mock_config_to_str.return_value.encode.return_value = "foo_str"
+
+        self.assertEqual("md5_digest", utils.make_config_hash("foo_obj"))
+        mock_config_to_str.assert_called_once_with("foo_obj")
+        mock_config_to_str.return_value.encode.assert_called_once_with(
+            "utf8")
+        mock_hashlib.md5.assert_called_once_with("foo_str")
+
+    def test_make_config_hash_order(self):
+        self.assertEqual(
+            utils.make_config_hash({"foo": [1, 2], "bar": {"a": 1, "b": 2}}),
+            utils.make_config_hash({"bar": {"b": 2, "a": 1}, "foo": [2, 1]}))
+
+
 class TimeoutThreadTestCase(test.TestCase):
     def test_timeout_thread(self):
         """Create and kill thread by timeout.
@@ -485,6 +528,27 @@ class TimeoutThreadTestCase(test.TestCase):
         self.assertTrue(time_elapsed < 11,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_timeout_thread_terminate_method(self, mock_terminate_thread):
+        queue = Queue.Queue()
+        watched = mock.Mock()
+        watched.isAlive.return_value = True
+        queue.put((watched, time.time()))
+        queue.put((None, None))
+
+        utils.timeout_thread(queue)
+
+        watched.terminate.assert_called_once_with()
+        self.assertFalse(mock_terminate_thread.called)
+
+    @mock.patch("rally.common.utils.ctypes")
+    def test_cancel_thread_termination(self, mock_ctypes):
+        utils.cancel_thread_termination(42)
+        mock_set_async_exc = mock_ctypes.pythonapi.PyThreadState_SetAsyncExc
+        mock_set_async_exc.assert_called_once_with(
+            mock_ctypes.c_long.return_value, None)
+        mock_ctypes.c_long.assert_called_once_with(42)
+
 
 class LockedDictTestCase(test.TestCase):
 
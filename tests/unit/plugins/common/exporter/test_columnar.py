@@ -0,0 +1,148 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import ddt
+import mock
+
+from rally import exceptions
+from rally.plugins.common.exporter import columnar
+from tests.unit import test
+
+COLUMNAR = "rally.plugins.common.exporter.columnar."
+
+
+def make_iterations(count):
+    iterations = []
+    for i in range(count):
+        itr = {"timestamp": 10 + i * 0.5, "duration": i * 0.25,
+               "idle_duration": i % 3, "error": [],
+               "output": {"additive": [], "complete": []},
+               "atomic_actions": {"foo": i * 0.1}}
+        if i % 4 == 1:
+            itr["error"] = ["FooError", "foo", "trace"]
+        if i % 5 == 2:
+            itr["atomic_actions"]["bar"] = None
+        if i % 6 == 3:
+            itr["scheduled_timestamp"] = 9 + i * 0.5
+        iterations.append(itr)
+    return iterations
+
+
+@ddt.ddt
+class ChunkTestCase(test.TestCase):
+
+    @ddt.data(0, 1, 10)
+    def test_encode_decode_chunk(self, count):
+        iterations = make_iterations(count)
+        atomic_names = []
+        payload = columnar.encode_chunk(iterations, atomic_names)
+        self.assertEqual(["foo", "bar"][:len(atomic_names)], atomic_names)
+        decoded_names = []
+        self.assertEqual(iterations,
+                         columnar.decode_chunk(payload, decoded_names))
+        self.assertEqual(atomic_names, decoded_names)
+
+    def test_encode_decode_chunk_sparse(self):
+        iterations = [
+            {"timestamp": 1, "duration": None, "idle_duration": 0,
+             "error": [], "atomic_actions": {"foo": 1},
+             "scenario_output": {"data": {"x": 1}, "errors": ""}},
+            {"timestamp": 2, "duration": 1, "idle_duration": 0,
+             "error": [], "atomic_actions": {"spam": 2},
+             "output": {"additive": [{"title": "foo"}], "complete": []}}]
+        atomic_names = ["spam"]
+        payload = columnar.encode_chunk(iterations, atomic_names)
+        self.assertEqual(["spam", "foo"], atomic_names)
+        self.assertEqual(iterations,
+                         columnar.decode_chunk(payload, ["spam"]))
+
+
+@ddt.ddt
+class ColumnarExporterTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ColumnarExporterTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "results.rcol")
+
+    @ddt.data(
+        {"connection": "",
+         "raises": exceptions.InvalidConnectionString},
+        {"connection": "columnar-exporter:///",
+         "raises": exceptions.InvalidConnectionString},
+        {"connection": "columnar-exporter:///fake_path",
+         "raises": None},
+    )
+    @ddt.unpack
+    def test_validate(self, connection, raises):
+        if raises:
+            self.assertRaises(raises, columnar.ColumnarExporter, connection)
+        else:
+            exporter = columnar.ColumnarExporter(connection)
+            self.assertEqual("fake_path", exporter.path)
+
+    @mock.patch(COLUMNAR + "objects.Task.iter_result_iterations")
+    @mock.patch(COLUMNAR + "api.Task.get")
+    def test_export_and_load(self, mock_task_get,
+                             mock_task_iter_result_iterations):
+        results = []
+        for name, count in (("Foo.bar", 2500), ("Foo.spam", 0)):
+            results.append({"key": {"name": name, "pos": 0, "kw": {}},
+                            "data": {"raw": make_iterations(count),
+                                     "sla": [{"success": True}],
+                                     "load_duration": 1.5,
+                                     "full_duration": 2.5}})
+        mock_task_get.return_value.get_results_summaries.return_value = (
+            results)
+        mock_task_iter_result_iterations.side_effect = (
+            lambda result: iter(result["data"]["raw"]))
+
+        exporter = columnar.ColumnarExporter(
+            "columnar-exporter:///" + self.path)
+        exporter.export("fake_uuid")
+        mock_task_get.assert_called_once_with("fake_uuid")
+
+        loaded = [dict(r, result=list(r["result"])) for r in exporter.load()]
+        self.assertEqual(
+            [{"key": r["key"], "result": r["data"]["raw"],
+              "sla": r["data"]["sla"], "load_duration": 1.5,
+              "full_duration": 2.5} for r in results],
+            loaded)
+
+        # NOTE: iterations that are not consumed are skipped
+        self.assertEqual(["Foo.bar", "Foo.spam"],
+                         [r["key"]["name"] for r in exporter.load()])
+
+    @mock.patch(COLUMNAR + "api.Task.get")
+    def test_export_running_task(self, mock_task_get):
+        mock_task_get.return_value.get_results_summaries.return_value = []
+        exporter = columnar.ColumnarExporter(
+            "columnar-exporter:///" + self.path)
+        self.assertRaises(exceptions.RallyException, exporter.export,
+                          "fake_uuid")
+
+    @ddt.data(b"foo", columnar.MAGIC + b"W\x00",
+              columnar.MAGIC + b"I\x00\x00\x00\x00")
+    def test_load_invalid_file(self, content):
+        with open(self.path, "wb") as f:
+            f.write(content)
+        exporter = columnar.ColumnarExporter(
+            "columnar-exporter:///" + self.path)
+        self.assertRaises(exceptions.RallyException, list, exporter.load())
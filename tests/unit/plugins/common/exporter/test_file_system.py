@@ -32,42 +32,43 @@ class FileExporterTestCase(test.TestCase):
 
     @mock.patch("rally.plugins.common.exporter.file_system.os.path.exists")
     @mock.patch.object(__builtin__, "open", autospec=True)
-    @mock.patch("rally.plugins.common.exporter.file_system.json.dumps")
+    @mock.patch("rally.plugins.common.exporter.file_system.json_stream.dump")
     @mock.patch("rally.api.Task.get")
-    def test_file_exporter_export(self, mock_task_get, mock_dumps, mock_open,
-                                  mock_exists):
+    def test_file_exporter_export(self, mock_task_get, mock_json_stream_dump,
+                                  mock_open, mock_exists):
         mock_task = mock.Mock()
         mock_exists.return_value = True
         mock_task_get.return_value = mock_task
         mock_task.get_results.return_value = [{
             "key": "fake_key",
             "data": {
-                "raw": "bar_raw",
+                "raw": [],
                 "sla": "baz_sla",
                 "load_duration": "foo_load_duration",
                 "full_duration": "foo_full_duration",
             }
         }]
-        mock_dumps.return_value = "fake_results"
         input_mock = mock.MagicMock(spec=file)
         mock_open.return_value = input_mock
 
         exporter = file_system.FileExporter("file-exporter:///fake_path.json")
         exporter.export("fake_uuid")
 
-        mock_open().__enter__().write.assert_called_once_with("fake_results")
         mock_task_get.assert_called_once_with("fake_uuid")
+        mock_task.get_results.assert_called_once_with(load_iterations=False)
+        mock_task.iter_result_iterations.assert_called_once_with(
+            mock_task.get_results.return_value[0])
         expected_dict = [
             {
                 "load_duration": "foo_load_duration",
                 "full_duration": "foo_full_duration",
-                "result": "bar_raw",
+                "result": mock_task.iter_result_iterations.return_value,
                 "key": "fake_key",
                 "sla": "baz_sla"
             }
         ]
-        mock_dumps.assert_called_once_with(expected_dict, sort_keys=True,
-                                           indent=4)
+        mock_json_stream_dump.assert_called_once_with(
+            expected_dict, mock_open().__enter__(), sort_keys=True, indent=4)
 
     @mock.patch("rally.api.Task.get")
     def test_file_exporter_export_running_task(self, mock_task_get):
@@ -79,6 +80,13 @@ class FileExporterTestCase(test.TestCase):
         self.assertRaises(exceptions.RallyException, exporter.export,
                           "fake_uuid")
 
+    @mock.patch("rally.api.Task.load_results")
+    def test_file_exporter_load(self, mock_task_load_results):
+        exporter = file_system.FileExporter("file-exporter:///fake_path.json")
+        self.assertEqual(mock_task_load_results.return_value,
+                         exporter.load())
+        mock_task_load_results.assert_called_once_with("fake_path.json")
+
     @ddt.data(
         {"connection": "",
          "raises": exceptions.InvalidConnectionString},
@@ -13,11 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import jsonschema
 import mock
 
+from rally import exceptions
 from rally.plugins.common.runners import constant
 from rally.task import runner
+from rally.task import sla
 from tests.unit import fakes
 from tests.unit import test
 
@@ -97,6 +101,123 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             )
             self.assertIn(call, mock_thread.mock_calls)
 
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_pool_thread(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        timeout_queue = mock.MagicMock()
+        context = {"users": [{"tenant_id": "t1", "credential": "c1",
+                              "id": "uuid1"}]}
+
+        constant._worker_pool_thread(mock_queue, iter(range(10)), 0,
+                                     timeout_queue, 4, context, "Dummy",
+                                     "dummy", (), mock_event)
+
+        self.assertEqual(
+            [mock.call(i, context) for i in range(4)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(4, mock_runner._run_scenario_once.call_count)
+        mock_runner._run_scenario_once.assert_called_with(
+            "Dummy", "dummy", mock_runner._get_scenario_context.return_value,
+            ())
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * 4,
+            mock_queue.put.call_args_list)
+        self.assertFalse(timeout_queue.put.called)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_pool_thread_with_timeout(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        timeout_queue = mock.MagicMock()
+        mock_runner._run_scenario_once.side_effect = [
+            "result", exceptions.ThreadTimeoutException(), "result"]
+
+        constant._worker_pool_thread(mock_queue, iter(range(10)), 2,
+                                     timeout_queue, 3, {}, "Dummy",
+                                     "dummy", (), mock_event)
+
+        self.assertEqual(3, timeout_queue.put.call_count)
+        for call in timeout_queue.put.call_args_list:
+            watcher, deadline = call[0][0]
+            self.assertIsInstance(watcher, constant._IterationWatcher)
+            self.assertFalse(watcher.isAlive())
+        self.assertEqual([mock.call("result")] * 2,
+                         mock_queue.put.call_args_list)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_pool_thread_aborted(self, mock_runner):
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(side_effect=[False, True]))
+        mock_queue = mock.MagicMock()
+
+        constant._worker_pool_thread(mock_queue, iter(range(10)), 0,
+                                     mock.MagicMock(), 10, {}, "Dummy",
+                                     "dummy", (), mock_event)
+
+        self.assertEqual(1, mock_runner._run_scenario_once.call_count)
+        self.assertEqual(1, mock_queue.put.call_count)
+
+    def test__iteration_watcher(self):
+        watcher = constant._IterationWatcher()
+        self.assertEqual(threading.current_thread().ident, watcher.ident)
+        self.assertTrue(watcher.isAlive())
+        watcher.finish()
+        self.assertFalse(watcher.isAlive())
+        self.assertFalse(watcher.is_alive())
+
+    @mock.patch(RUNNERS + "constant.utils")
+    def test__iteration_watcher_terminate(self, mock_utils):
+        watcher = constant._IterationWatcher()
+        watcher.terminate()
+        mock_utils.terminate_thread.assert_called_once_with(watcher.ident)
+
+        watcher.finish()
+        mock_utils.cancel_thread_termination.assert_called_once_with(
+            watcher.ident)
+
+        watcher.terminate()
+        self.assertEqual(1, mock_utils.terminate_thread.call_count)
+
+    @mock.patch(RUNNERS + "constant.utils")
+    def test__iteration_watcher_terminate_finished(self, mock_utils):
+        watcher = constant._IterationWatcher()
+        watcher.finish()
+        watcher.terminate()
+
+        self.assertFalse(mock_utils.terminate_thread.called)
+        self.assertFalse(mock_utils.cancel_thread_termination.called)
+
+    @mock.patch(RUNNERS + "constant.utils.timeout_thread")
+    @mock.patch(RUNNERS + "constant.threading.Thread")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_pool_process(self, mock_runner, mock_thread,
+                                  mock_timeout_thread):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock()
+        iteration_gen = iter(range(10))
+        info = {"processes_to_start": 1, "processes_counter": 1}
+
+        constant._worker_pool_process(mock_queue, iteration_gen, 1, 3, 4,
+                                      {}, "Dummy", "dummy", (), mock_event,
+                                      info)
+
+        # NOTE: 3 worker threads plus one timeout thread
+        self.assertEqual(4, mock_thread.call_count)
+        self.assertEqual(4, mock_thread.return_value.start.call_count)
+        self.assertEqual(4, mock_thread.return_value.join.call_count)
+        self.assertEqual(mock_timeout_thread,
+                         mock_thread.call_args_list[0][1]["target"])
+        for call in mock_thread.call_args_list[1:]:
+            self.assertEqual(constant._worker_pool_thread,
+                             call[1]["target"])
+            args = call[1]["args"]
+            self.assertEqual((mock_queue, iteration_gen, 1), args[:3])
+            self.assertEqual((4, {}, "Dummy", "dummy", (), mock_event),
+                             args[4:])
+
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
         mock_queue = mock.MagicMock()
@@ -120,6 +241,33 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
+    def test__run_scenario_worker_pool(self):
+        self.config["worker_pool"] = True
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+        self.assertEqual(len(runner_obj.result_queue), self.config["times"])
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertIsNotNone(result)
+
+    def test__run_scenario_worker_sla(self):
+        self.config["worker_sla"] = True
+        sla_config = {"sla": {"failure_rate": {"max": 0}}}
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+        self.assertTrue(runner_obj.check_sla_in_workers(sla_config))
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+        self.assertEqual(len(runner_obj.result_queue), self.config["times"])
+
+        sla_checker = sla.SLAChecker(sla_config)
+        for partial in runner_obj.worker_sla_results:
+            self.assertTrue(sla_checker.merge(partial))
+        self.assertEqual(self.config["times"],
+                         sla_checker.sla_criteria[0].total)
+
     def test__run_scenario_exception(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
 
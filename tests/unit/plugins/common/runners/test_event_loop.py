@@ -0,0 +1,219 @@
+# Copyright 2016: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rally import exceptions
+from rally.plugins.common.runners import event_loop
+from rally.task import scenario
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+asyncio = event_loop.asyncio
+requires_asyncio = testtools.skipIf(asyncio is None,
+                                    "asyncio is available since Python 3.4")
+
+
+class FakeAsyncScenario(scenario.Scenario):
+
+    def sleep(self, duration=0):
+        return asyncio.sleep(duration)
+
+    def fail(self):
+        future = asyncio.Future()
+        future.set_exception(ValueError("failed"))
+        return future
+
+    def cancel(self):
+        future = asyncio.Future()
+        asyncio.get_event_loop().call_soon(future.cancel)
+        return future
+
+    def sync(self, **kwargs):
+        self.add_output(additive={"title": "foo", "description": "",
+                                  "data": [["a", 1]],
+                                  "chart_plugin": "StackedArea"})
+
+    def sync_fail(self):
+        raise ValueError("sync failed")
+
+
+class EventLoopWorkerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(EventLoopWorkerTestCase, self).setUp()
+        if asyncio is not None:
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.addCleanup(self.loop.close)
+            self.addCleanup(asyncio.set_event_loop, None)
+        self.context = {"task": {"uuid": "foo"}, "iteration": 1}
+
+    def _run_once(self, method_name, timeout=0, **kwargs):
+        future = event_loop._run_scenario_once_async(
+            self.loop, FakeAsyncScenario, method_name, self.context, kwargs,
+            timeout)
+        return self.loop.run_until_complete(future)
+
+    @requires_asyncio
+    def test__run_scenario_once_async(self):
+        result = self._run_once("sleep", duration=0.01)
+
+        self.assertEqual([], result["error"])
+        self.assertGreaterEqual(result["duration"], 0.01)
+        self.assertIsInstance(result["timestamp"], float)
+        self.assertEqual(0, result["idle_duration"])
+        self.assertEqual({"additive": [], "complete": []}, result["output"])
+        self.assertEqual({}, result["atomic_actions"])
+
+    @requires_asyncio
+    def test__run_scenario_once_async_failed(self):
+        result = self._run_once("fail")
+        self.assertEqual(["ValueError", "failed"], result["error"][:2])
+
+    @requires_asyncio
+    def test__run_scenario_once_async_timeout(self):
+        result = self._run_once("sleep", timeout=0.01, duration=10)
+
+        self.assertEqual(["ThreadTimeoutException",
+                          "Iteration interrupted due to timeout."],
+                         result["error"][:2])
+        self.assertLess(result["duration"], 10)
+
+    @requires_asyncio
+    def test__run_scenario_once_async_cancelled(self):
+        result = self._run_once("cancel")
+        self.assertEqual("CancelledError", result["error"][0])
+
+    @requires_asyncio
+    def test__run_scenario_once_async_sync_scenario(self):
+        result = self._run_once("sync", timeout=1)
+
+        self.assertEqual([], result["error"])
+        self.assertEqual(1, len(result["output"]["additive"]))
+
+        result = self._run_once("sync_fail")
+        self.assertEqual(["ValueError", "sync failed"], result["error"][:2])
+
+    @requires_asyncio
+    @mock.patch(RUNNERS + "event_loop.runner._get_scenario_context")
+    def test__iteration_scheduler(self, mock__get_scenario_context):
+        mock__get_scenario_context.side_effect = lambda i, ctx: dict(
+            ctx, iteration=i)
+        aborted = mock.Mock(is_set=mock.Mock(return_value=False))
+        queue = mock.Mock()
+        scheduler = event_loop._IterationScheduler(
+            self.loop, queue, iter(range(20)), 0, 3, 7, self.context,
+            FakeAsyncScenario, "sleep", {"duration": 0.001}, aborted)
+        max_running = []
+        original_launch = scheduler._launch
+
+        def launch():
+            original_launch()
+            max_running.append(scheduler.running)
+        scheduler._launch = launch
+
+        scheduler.run()
+
+        self.assertEqual(7, queue.put.call_count)
+        self.assertEqual(3, max(max_running))
+        self.assertEqual(0, scheduler.running)
+        self.assertEqual(
+            list(range(7)),
+            [c[0][0] for c in mock__get_scenario_context.call_args_list])
+
+    @requires_asyncio
+    def test__iteration_scheduler_aborted(self):
+        aborted = mock.Mock(is_set=mock.Mock(return_value=True))
+        queue = mock.Mock()
+        scheduler = event_loop._IterationScheduler(
+            self.loop, queue, iter(range(20)), 0, 3, 7, self.context,
+            FakeAsyncScenario, "sleep", {}, aborted)
+
+        scheduler.run()
+
+        self.assertFalse(queue.put.called)
+
+    @requires_asyncio
+    @mock.patch(RUNNERS + "event_loop._IterationScheduler")
+    @mock.patch(RUNNERS + "event_loop.asyncio.set_event_loop")
+    @mock.patch(RUNNERS + "event_loop.asyncio.new_event_loop")
+    def test__worker_process(self, mock_new_event_loop, mock_set_event_loop,
+                             mock___iteration_scheduler):
+        loop = mock_new_event_loop.return_value
+
+        event_loop._worker_process("queue", "gen", 1, 2, 3, "ctx", "cls",
+                                   "method", "args", "aborted", {})
+
+        mock___iteration_scheduler.assert_called_once_with(
+            loop, "queue", "gen", 1, 2, 3, "ctx", "cls", "method", "args",
+            "aborted")
+        mock___iteration_scheduler.return_value.run.assert_called_once_with()
+        self.assertEqual([mock.call(loop), mock.call(None)],
+                         mock_set_event_loop.call_args_list)
+        loop.close.assert_called_once_with()
+
+
+class AsyncioScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncioScenarioRunnerTestCase, self).setUp()
+        self.config = {"times": 4, "concurrency": 2, "timeout": 2,
+                       "type": "asyncio", "max_cpu_count": 2}
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        self.task = mock.MagicMock()
+
+    def test_validate(self):
+        event_loop.AsyncioScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config["type"] = "asyncio"
+        self.config["worker_pool"] = True
+        self.assertRaises(jsonschema.ValidationError,
+                          event_loop.AsyncioScenarioRunner.validate,
+                          self.config)
+
+    @requires_asyncio
+    def test__run_scenario(self):
+        runner_obj = event_loop.AsyncioScenarioRunner(self.task, self.config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context,
+                                 {"duration": 0.01})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(self.config["times"], len(results))
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    @requires_asyncio
+    def test__run_scenario_aborted(self):
+        runner_obj = event_loop.AsyncioScenarioRunner(self.task, self.config)
+        runner_obj.abort()
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    def test__run_scenario_without_asyncio(self):
+        runner_obj = event_loop.AsyncioScenarioRunner(self.task, self.config)
+        with mock.patch.object(event_loop, "asyncio", None):
+            self.assertRaises(exceptions.RallyException,
+                              runner_obj._run_scenario, fakes.FakeScenario,
+                              "do_it", self.context, {})
@@ -13,10 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ddt
 import jsonschema
 import mock
 
 from rally.plugins.common.runners import rps
+from rally.plugins.common.runners import rps as rps_runner_module
 from rally.task import runner
 from tests.unit import fakes
 from tests.unit import test
@@ -26,6 +28,7 @@ RUNNERS_BASE = "rally.task.runner."
 RUNNERS = "rally.plugins.common.runners."
 
 
+@ddt.ddt
 class RPSScenarioRunnerTestCase(test.TestCase):
 
     def setUp(self):
@@ -59,6 +62,141 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           rps.RPSScenarioRunner.validate, config)
 
+    @ddt.data({"start": 1, "end": 10, "duration": 5},
+              {"start": 10, "end": 1, "step": 0.5, "duration": 5})
+    def test_rps_profile_validate(self, profile):
+        config = {
+            "type": "rps",
+            "rps": profile,
+            "times": 1,
+            "arrival": "poisson",
+            "open_loop": True
+        }
+        rps.RPSScenarioRunner.validate(config)
+
+    @ddt.data({"rps": {"start": 1, "end": 10}},
+              {"rps": {"start": 0, "end": 10, "duration": 1}},
+              {"rps": {"start": 1, "end": 10, "duration": 1, "foo": 1}},
+              {"rps": 1, "arrival": "foo"})
+    def test_rps_profile_validate_failed(self, config):
+        config.update({"type": "rps", "times": 1})
+        self.assertRaises(jsonschema.ValidationError,
+                          rps.RPSScenarioRunner.validate, config)
+
+    @ddt.data(
+        {"rps": 5, "expected": [5, 5, 5]},
+        {"rps": {"start": 1, "end": 5, "duration": 4},
+         "expected": [1, 3, 5]},
+        {"rps": {"start": 5, "end": 1, "duration": 4},
+         "expected": [5, 3, 1]},
+        {"rps": {"start": 1, "end": 4, "step": 1, "duration": 1},
+         "expected": [1, 3, 4]},
+        {"rps": {"start": 4, "end": 1, "step": 1, "duration": 1},
+         "expected": [4, 2, 1]})
+    @ddt.unpack
+    def test__get_rps_function(self, rps, expected):
+        get_rps = rps_runner_module._get_rps_function(rps)
+        self.assertEqual(expected, [get_rps(t) for t in (0, 2, 10)])
+
+    @mock.patch(RUNNERS + "rps.random.expovariate")
+    def test__get_interval_function(self, mock_expovariate):
+        self.assertEqual(
+            0.25, rps_runner_module._get_interval_function("uniform")(4))
+        get_interval = rps_runner_module._get_interval_function("poisson")
+        self.assertEqual(mock_expovariate.return_value, get_interval(4))
+        mock_expovariate.assert_called_once_with(4)
+
+    def test__get_rps_per_worker(self):
+        self.assertEqual(
+            2.5, rps.RPSScenarioRunner._get_rps_per_worker(10, 4))
+        self.assertEqual(
+            {"start": 0.5, "end": 2.5, "step": 1.0, "duration": 10},
+            rps.RPSScenarioRunner._get_rps_per_worker(
+                {"start": 2, "end": 10, "step": 4, "duration": 10}, 4))
+
+    @mock.patch(RUNNERS_BASE + "_run_scenario_once")
+    def test__scheduled_worker_thread(self, mock__run_scenario_once):
+        mock__run_scenario_once.return_value = {"timestamp": 2}
+        mock_queue = mock.MagicMock()
+        slots = mock.MagicMock()
+
+        rps._scheduled_worker_thread(mock_queue, "cls", "method", "ctx",
+                                     {"a": 1}, 1, slots)
+
+        mock__run_scenario_once.assert_called_once_with(
+            "cls", "method", "ctx", {"a": 1})
+        mock_queue.put.assert_called_once_with(
+            {"timestamp": 2, "scheduled_timestamp": 1})
+        slots.release.assert_called_once_with()
+
+    @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__scheduled_worker_process(self, mock_runner, mock_thread,
+                                       mock_time):
+        mock_thread.return_value.isAlive.return_value = False
+        mock_time.time.side_effect = [10, 10, 10.5, 11.5]
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=False))
+        mock_queue = mock.MagicMock()
+        context = {"users": [], "task": {"uuid": "foo"}}
+        info = {"processes_to_start": 2, "processes_counter": 1}
+
+        rps._scheduled_worker_process(
+            mock_queue, iter(range(10)), 0, 2, 3, 5, context, "Dummy",
+            "dummy", (), mock_event, info)
+
+        # NOTE: the second process is shifted by half of the interval
+        self.assertEqual([mock.call(0.25), mock.call(0.25)],
+                         mock_event.wait.call_args_list)
+        self.assertEqual(3, mock_thread.call_count)
+        scheduled = [c[1]["args"][5] for c in mock_thread.call_args_list]
+        self.assertEqual([10.25, 10.75, 11.25], scheduled)
+        self.assertEqual(
+            [mock.call(i, context) for i in range(3)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(3, mock_thread.return_value.join.call_count)
+
+    @mock.patch(RUNNERS + "rps.threading.BoundedSemaphore")
+    @mock.patch(RUNNERS + "rps.LOG")
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__scheduled_worker_process_saturated(
+            self, mock_runner, mock_thread, mock_log, mock_bounded_semaphore):
+        mock_thread.return_value.isAlive.return_value = False
+        mock_bounded_semaphore.return_value.acquire.side_effect = [
+            False, True, False, True]
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=False))
+        info = {"processes_to_start": 1, "processes_counter": 0}
+
+        rps._scheduled_worker_process(
+            mock.MagicMock(), iter(range(10)), 0, 1000, 2, 1,
+            {"task": {"uuid": "foo"}}, "Dummy", "dummy", (), mock_event,
+            info)
+
+        mock_bounded_semaphore.assert_called_once_with(1)
+        self.assertEqual(2, mock_thread.call_count)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__scheduled_worker_process_aborted(self, mock_runner,
+                                               mock_thread):
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=True),
+            wait=mock.MagicMock(return_value=True))
+        info = {"processes_to_start": 1, "processes_counter": 0}
+
+        rps._scheduled_worker_process(
+            mock.MagicMock(), iter(range(10)), 0, 0.1, 5, 1,
+            {"task": {"uuid": "foo"}}, "Dummy", "dummy", (), mock_event,
+            info)
+
+        self.assertFalse(mock_thread.called)
+
     def test_validate_failed(self):
         config = {"type": "rps", "a": 10}
         self.assertRaises(jsonschema.ValidationError,
@@ -149,6 +287,21 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
+    @ddt.data({"open_loop": True, "rps": 20},
+              {"arrival": "poisson", "rps": 20},
+              {"rps": {"start": 10, "end": 20, "duration": 1}})
+    def test__run_scenario_scheduled(self, config):
+        config.update({"times": 10, "timeout": 5, "max_concurrency": 5})
+        runner_obj = rps.RPSScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 fakes.FakeContext({}).context, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(config["times"], len(results))
+        for result in results:
+            self.assertIn("scheduled_timestamp", result)
+
     @mock.patch(RUNNERS + "rps.time.sleep")
     def test__run_scenario_exception(self, mock_sleep):
         config = {"times": 4, "rps": 10}
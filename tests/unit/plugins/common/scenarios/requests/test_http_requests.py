@@ -37,3 +37,28 @@ class RequestScenarioTestCase(test.TestCase):
         mock_choice.assert_called_once_with([{"url": "sample_url"}])
         mock__check_request.assert_called_once_with(
             status_code=200, url="sample_url")
+
+
+class AsyncRequestScenarioTestCase(test.TestCase):
+
+    @mock.patch("%s.requests.utils.AsyncRequestScenario._check_request" % SCN)
+    def test_check_request(self, mock__check_request):
+        scenario = http_requests.AsyncHttpRequests(test.get_test_context())
+        self.assertEqual(mock__check_request.return_value,
+                         scenario.check_request("sample_url", "GET", 200,
+                                                params={"a": 1}))
+        mock__check_request.assert_called_once_with("sample_url", "GET", 200,
+                                                    params={"a": 1})
+
+    @mock.patch("%s.requests.utils.AsyncRequestScenario._check_request" % SCN)
+    @mock.patch("%s.requests.http_requests.random.choice" % SCN)
+    def test_check_random_request(self, mock_choice, mock__check_request):
+        mock_choice.return_value = {"url": "sample_url"}
+        scenario = http_requests.AsyncHttpRequests(test.get_test_context())
+        self.assertEqual(mock__check_request.return_value,
+                         scenario.check_random_request(
+                             status_code=200,
+                             requests=[{"url": "sample_url"}]))
+        mock_choice.assert_called_once_with([{"url": "sample_url"}])
+        mock__check_request.assert_called_once_with(
+            status_code=200, url="sample_url")
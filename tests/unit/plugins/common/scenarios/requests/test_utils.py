@@ -11,11 +11,18 @@
 #    under the License.
 
 
+import ddt
 import mock
+import testtools
 
+from rally import exceptions
 from rally.plugins.common.scenarios.requests import utils
 from tests.unit import test
 
+asyncio = utils.asyncio
+requires_asyncio = testtools.skipIf(asyncio is None,
+                                    "asyncio is available since Python 3.4")
+
 
 class RequestsTestCase(test.TestCase):
 
@@ -36,3 +43,121 @@ class RequestsTestCase(test.TestCase):
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+
+@ddt.ddt
+class BuildRequestTestCase(test.TestCase):
+
+    @ddt.data(
+        {"kwargs": {"url": "http://example.com", "method": "get"},
+         "expected": ("example.com", 80, False,
+                      b"GET / HTTP/1.1\r\nConnection: close\r\n"
+                      b"Content-Length: 0\r\nHost: example.com\r\n\r\n")},
+        {"kwargs": {"url": "https://example.com:8443/a?b=1", "method": "GET",
+                    "params": {"c": 2}, "headers": {"X-Foo": "bar"}},
+         "expected": ("example.com", 8443, True,
+                      b"GET /a?b=1&c=2 HTTP/1.1\r\nConnection: close\r\n"
+                      b"Content-Length: 0\r\nHost: example.com:8443\r\n"
+                      b"X-Foo: bar\r\n\r\n")},
+        {"kwargs": {"url": "http://example.com/", "method": "POST",
+                    "json_data": {"a": 1}},
+         "expected": ("example.com", 80, False,
+                      b"POST / HTTP/1.1\r\nConnection: close\r\n"
+                      b"Content-Length: 8\r\n"
+                      b"Content-Type: application/json\r\n"
+                      b"Host: example.com\r\n\r\n{\"a\": 1}")},
+        {"kwargs": {"url": "http://example.com/", "method": "POST",
+                    "data": {"a": 1}},
+         "expected": ("example.com", 80, False,
+                      b"POST / HTTP/1.1\r\nConnection: close\r\n"
+                      b"Content-Length: 3\r\n"
+                      b"Content-Type: application/x-www-form-urlencoded\r\n"
+                      b"Host: example.com\r\n\r\na=1")})
+    @ddt.unpack
+    def test__build_request(self, kwargs, expected):
+        self.assertEqual(expected, utils._build_request(**kwargs))
+
+    def test__build_request_wrong_scheme(self):
+        self.assertRaises(ValueError, utils._build_request,
+                          "ftp://example.com", "GET")
+
+
+class AsyncRequestsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncRequestsTestCase, self).setUp()
+        if asyncio is not None:
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.addCleanup(self.loop.close)
+            self.addCleanup(asyncio.set_event_loop, None)
+
+    def _check_request(self, status_code, response):
+        scenario = utils.AsyncRequestScenario(test.get_test_context())
+        connection = asyncio.Future(loop=self.loop)
+        transport = mock.Mock()
+        with mock.patch.object(self.loop, "create_connection") as mock_cc:
+            with mock.patch.object(self.loop, "create_task",
+                                   return_value=connection):
+                future = scenario._check_request(
+                    url="http://example.com", method="GET",
+                    status_code=status_code)
+        protocol = mock_cc.call_args[0][0]()
+        mock_cc.assert_called_once_with(mock.ANY, "example.com", 80,
+                                        ssl=False)
+        connection.set_result((transport, protocol))
+        protocol.connection_made(transport)
+        transport.write.assert_called_once_with(protocol.request)
+        protocol.data_received(response)
+        self.loop.run_until_complete(asyncio.wait([future]))
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.check_request")
+        self.assertTrue(transport.close.called)
+        return future
+
+    @requires_asyncio
+    def test__check_request(self):
+        future = self._check_request(200, b"HTTP/1.1 200 OK\r\n\r\n")
+        self.assertEqual(200, future.result())
+
+    @requires_asyncio
+    def test__check_request_wrong_status(self):
+        future = self._check_request(201, b"HTTP/1.1 200 OK\r\n")
+        self.assertRaises(ValueError, future.result)
+
+    @requires_asyncio
+    def test__check_request_malformed_response(self):
+        future = self._check_request(200, b"foo\r\n")
+        self.assertRaises(ValueError, future.result)
+
+    @requires_asyncio
+    def test__check_request_cancelled(self):
+        scenario = utils.AsyncRequestScenario(test.get_test_context())
+        connection = asyncio.Future(loop=self.loop)
+        with mock.patch.object(self.loop, "create_connection"):
+            with mock.patch.object(self.loop, "create_task",
+                                   return_value=connection):
+                future = scenario._check_request(
+                    url="http://example.com", method="GET", status_code=200)
+        future.cancel()
+        self.loop.run_until_complete(asyncio.wait([future]))
+
+        self.assertEqual({}, scenario.atomic_actions())
+        self.assertTrue(connection.cancelled())
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils.asyncio",
+                new=None)
+    def test__check_request_without_asyncio(self):
+        scenario = utils.AsyncRequestScenario(test.get_test_context())
+        self.assertRaises(exceptions.RallyException, scenario._check_request,
+                          url="http://example.com", method="GET",
+                          status_code=200)
+
+    @requires_asyncio
+    def test__status_code_protocol_connection_lost(self):
+        waiter = asyncio.Future(loop=self.loop)
+        protocol = utils._StatusCodeProtocol(b"request", waiter)
+        protocol.data_received(b"HTTP/1.1 2")
+        self.assertFalse(waiter.done())
+        protocol.connection_lost(None)
+        self.assertRaises(IOError, waiter.result)
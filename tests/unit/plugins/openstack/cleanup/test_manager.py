@@ -187,6 +187,43 @@ class SeekAndDestroyTestCase(test.TestCase):
             admin=mock__get_cached_client.return_value)
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
+    @mock.patch("%s.SeekAndDestroy._get_resource_id" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__gen_publisher_exclude(self, mock__get_cached_client,
+                                    mock__get_resource_id):
+        mock_mgr = self._manager([[1, 2, 3]])
+        mock__get_resource_id.side_effect = lambda a, u, r: "id%s" % r
+        admin = mock.MagicMock()
+        publish = manager.SeekAndDestroy(
+            mock_mgr, admin, None, exclude={"id2", "id4"})._gen_publisher()
+
+        queue = []
+        publish(queue)
+        self.assertEqual([(admin, None, 1), (admin, None, 3)], queue)
+
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__get_resource_id(self, mock__get_cached_client):
+        mock_mgr = mock.MagicMock()
+        user = {"tenant_id": "t1", "id": "u1"}
+        destroyer = manager.SeekAndDestroy(mock_mgr, "admin", [user])
+
+        self.assertEqual(mock_mgr.return_value.id.return_value,
+                         destroyer._get_resource_id("admin", user, "raw"))
+        mock_mgr.assert_called_once_with(
+            resource="raw", admin=mock__get_cached_client.return_value,
+            user=mock__get_cached_client.return_value, tenant_uuid="t1")
+
+    @mock.patch("%s.SeekAndDestroy._get_resource_id" % BASE)
+    @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
+    def test_list_ids(self, mock__gen_publisher, mock__get_resource_id):
+        mock__gen_publisher.return_value = lambda queue: queue.extend(
+            [("admin", "u1", 1), ("admin", "u2", 2)])
+        mock__get_resource_id.side_effect = lambda a, u, r: "%s-%s" % (u, r)
+
+        self.assertEqual(
+            {"u1-1", "u2-2"},
+            manager.SeekAndDestroy(mock.MagicMock(), None, None).list_ids())
+
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     def test__gen_publisher_admin_only(self, mock__get_cached_client):
         mock_mgr = self._manager([Exception, Exception, [1, 2, 3]],
@@ -415,16 +452,57 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(
                 mock_find_resource_managers.return_value[0], "admin",
-                ["user"], None
+                ["user"], None, exclude=None
             ),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1], "admin",
-                ["user"], None
+                ["user"], None, exclude=None
             ),
             mock.call().exterminate()
         ])
 
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[mock.MagicMock(_service="a", _resource="x"),
+                              mock.MagicMock(_service="b", _resource="y")])
+    def test_cleanup_with_exclude(self, mock_find_resource_managers,
+                                  mock_seek_and_destroy):
+        manager.cleanup(names=["a", "b"], admin_required=False,
+                        users=["user"], exclude={"a.x": {"id1"}})
+
+        mock_seek_and_destroy.assert_has_calls([
+            mock.call(mock_find_resource_managers.return_value[0], None,
+                      ["user"], None, exclude={"id1"}),
+            mock.call().exterminate(),
+            mock.call(mock_find_resource_managers.return_value[1], None,
+                      ["user"], None, exclude=None),
+            mock.call().exterminate()
+        ])
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[mock.MagicMock(_service="a", _resource="x"),
+                              mock.MagicMock(_service="b", _resource="y")])
+    def test_list_resource_ids(self, mock_find_resource_managers,
+                               mock_seek_and_destroy):
+        mock_seek_and_destroy.return_value.list_ids.side_effect = [
+            {"id1"}, set()]
+
+        self.assertEqual(
+            {"a.x": {"id1"}, "b.y": set()},
+            manager.list_resource_ids(names=["a", "b"], admin_required=True,
+                                      admin="admin", users=["user"]))
+        mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
+        mock_seek_and_destroy.assert_has_calls([
+            mock.call(mock_find_resource_managers.return_value[0], "admin",
+                      ["user"], None),
+            mock.call().list_ids(),
+            mock.call(mock_find_resource_managers.return_value[1], "admin",
+                      ["user"], None),
+            mock.call().list_ids()
+        ])
+
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
@@ -443,13 +521,15 @@ class ResourceManagerTestCase(test.TestCase):
             mock.call(
                 mock_find_resource_managers.return_value[0], "admin",
                 ["user"],
-                {"cinder": {"service_type": "volume", "version": "1"}}
+                {"cinder": {"service_type": "volume", "version": "1"}},
+                exclude=None
             ),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1], "admin",
                 ["user"],
-                {"cinder": {"service_type": "volume", "version": "1"}}
+                {"cinder": {"service_type": "volume", "version": "1"}},
+                exclude=None
             ),
             mock.call().exterminate()
         ])
@@ -57,3 +57,7 @@ class VolumeTypeGeneratorTestCase(test.ContextTestCase):
                               admin=True).volume_types.delete
         delete.assert_has_calls(
             [mock.call("foo_id"), mock.call("bar_id")])
+
+    def test_parallel(self):
+        self.assertTrue(
+            volume_types.VolumeTypeGenerator._meta_get("parallel"))
@@ -67,16 +67,41 @@ class AdminCleanupTestCase(test.TestCase):
                 mock_find_resource_managers.return_value[0],
                 ctx["admin"],
                 ctx["users"],
-                None),
+                None, exclude=None),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
                 ctx["admin"],
                 ctx["users"],
-                None),
+                None, exclude=None),
             mock.call().exterminate()
         ])
 
+    def test_per_workload(self):
+        self.assertTrue(admin.AdminCleanup._meta_get("per_workload"))
+
+    @mock.patch("rally.plugins.openstack.context.cleanup.base.manager")
+    def test_cleanup_shared_context(self, mock_manager):
+        ctx = {
+            "config": {"admin_cleanup": ["a", "b"]},
+            "admin": mock.MagicMock(),
+            "users": mock.MagicMock(),
+            "task": mock.MagicMock(),
+            "shared_context": True
+        }
+
+        admin_cleanup = admin.AdminCleanup(ctx)
+        admin_cleanup.setup()
+        admin_cleanup.cleanup()
+
+        mock_manager.list_resource_ids.assert_called_once_with(
+            names=("a", "b"), admin_required=True, admin=ctx["admin"],
+            users=ctx["users"], api_versions=None)
+        mock_manager.cleanup.assert_called_once_with(
+            names=("a", "b"), admin_required=True, admin=ctx["admin"],
+            users=ctx["users"], api_versions=None,
+            exclude=mock_manager.list_resource_ids.return_value)
+
     @mock.patch("%s.manager.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
@@ -110,12 +135,12 @@ class AdminCleanupTestCase(test.TestCase):
                 mock_find_resource_managers.return_value[0],
                 ctx["admin"],
                 ctx["users"],
-                ctx["config"]["api_versions"]),
+                ctx["config"]["api_versions"], exclude=None),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
                 ctx["admin"],
                 ctx["users"],
-                ctx["config"]["api_versions"]),
+                ctx["config"]["api_versions"], exclude=None),
             mock.call().exterminate()
         ])
@@ -0,0 +1,47 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.plugins.openstack.context.cleanup import base
+from tests.unit import test
+
+
+BASE = "rally.plugins.openstack.context.cleanup.base"
+
+
+class CleanupMixinTestCase(test.TestCase):
+
+    def test__get_cleanup_kwargs_is_abstract(self):
+
+        class FakeCleanup(base.CleanupMixin):
+            pass
+
+        self.assertRaises(TypeError, FakeCleanup)
+
+    @mock.patch("%s.manager" % BASE)
+    def test_setup_and_cleanup(self, mock_manager):
+
+        class FakeCleanup(base.CleanupMixin):
+            context = {"shared_context": True}
+
+            def _get_cleanup_kwargs(self):
+                return {"names": ["foo"]}
+
+        cleanup_ctx = FakeCleanup()
+        cleanup_ctx.setup()
+        cleanup_ctx.cleanup()
+
+        mock_manager.list_resource_ids.assert_called_once_with(names=["foo"])
+        mock_manager.cleanup.assert_called_once_with(
+            exclude=mock_manager.list_resource_ids.return_value,
+            names=["foo"])
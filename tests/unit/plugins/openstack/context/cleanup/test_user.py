@@ -65,14 +65,38 @@ class UserCleanupTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(
                 mock_find_resource_managers.return_value[0],
-                None, ctx["users"], None),
+                None, ctx["users"], None, exclude=None),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
-                None, ctx["users"], None),
+                None, ctx["users"], None, exclude=None),
             mock.call().exterminate()
         ])
 
+    def test_per_workload(self):
+        self.assertTrue(user.UserCleanup._meta_get("per_workload"))
+
+    @mock.patch("rally.plugins.openstack.context.cleanup.base.manager")
+    def test_cleanup_shared_context(self, mock_manager):
+        ctx = {
+            "config": {"cleanup": ["a", "b"]},
+            "users": mock.MagicMock(),
+            "task": mock.MagicMock(),
+            "shared_context": True
+        }
+
+        user_cleanup = user.UserCleanup(ctx)
+        user_cleanup.setup()
+        user_cleanup.cleanup()
+
+        mock_manager.list_resource_ids.assert_called_once_with(
+            names=("a", "b"), admin_required=False, users=ctx["users"],
+            api_versions=None)
+        mock_manager.cleanup.assert_called_once_with(
+            names=("a", "b"), admin_required=False, users=ctx["users"],
+            api_versions=None,
+            exclude=mock_manager.list_resource_ids.return_value)
+
     @mock.patch("%s.manager.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
@@ -106,12 +130,12 @@ class UserCleanupTestCase(test.TestCase):
                 mock_find_resource_managers.return_value[0],
                 None,
                 ctx["users"],
-                ctx["config"]["api_versions"]),
+                ctx["config"]["api_versions"], exclude=None),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
                 None,
                 ctx["users"],
-                ctx["config"]["api_versions"]),
+                ctx["config"]["api_versions"], exclude=None),
             mock.call().exterminate()
         ])
@@ -35,6 +35,9 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
             tenants[str(id_)] = {"name": str(id_)}
         return tenants
 
+    def test_parallel(self):
+        self.assertTrue(images.ImageGenerator._meta_get("parallel"))
+
     def test_init_validation(self):
         self.context["config"] = {
             "images": {
@@ -107,6 +110,7 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         wrapper = mock_wrap.return_value
 
         new_context = copy.deepcopy(self.context)
+        new_context["config"]["images"]["resource_management_workers"] = 20
         for tenant_id in new_context["tenants"].keys():
             new_context["tenants"][tenant_id]["images"] = [
                 wrapper.create_image.return_value.id
@@ -132,6 +136,39 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         mock_clients.assert_has_calls(
             [mock.call(mock.ANY, api_info=api_versions)] * tenants)
 
+    @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_failure_keeps_created_images(self, mock_clients,
+                                                mock_wrap):
+        tenants = self._gen_tenants(2)
+        users = [{"id": 0, "tenant_id": tenant_id,
+                  "credential": mock.MagicMock()} for tenant_id in tenants]
+        self.context.update({
+            "config": {
+                "images": {
+                    "image_url": "mock_url",
+                    "image_type": "qcow2",
+                    "image_container": "bare",
+                    "images_per_tenant": 2,
+                    "resource_management_workers": 1
+                }
+            },
+            "users": users,
+            "tenants": tenants
+        })
+        mock_wrap.return_value.create_image.side_effect = [
+            mock.Mock(id="foo"), mock.Mock(id="bar"), mock.Mock(id="spam"),
+            RuntimeError]
+
+        images_ctx = images.ImageGenerator(self.context)
+        self.assertRaises(RuntimeError, images_ctx.setup)
+
+        # NOTE: images created before the failure are cleaned up
+        self.assertEqual(
+            [["foo", "bar"], ["spam"]],
+            [self.context["tenants"][user["tenant_id"]]["images"]
+             for user in users])
+
     @ddt.data(
         {},
         {"api_versions": {"glance": {"version": 2, "service_type": "image"}}})
@@ -191,10 +228,10 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         mock_wrap.assert_has_calls(wrapper_calls, any_order=True)
 
         glance_client = mock_clients.return_value.glance.return_value
-        glance_client.images.delete.assert_has_calls([mock.call(i)
-                                                      for i in created_images])
-        glance_client.images.get.assert_has_calls([mock.call(i)
-                                                   for i in created_images])
+        glance_client.images.delete.assert_has_calls(
+            [mock.call(i) for i in created_images], any_order=True)
+        glance_client.images.get.assert_has_calls(
+            [mock.call(i) for i in created_images], any_order=True)
 
         mock_clients.assert_has_calls(
             [mock.call(mock.ANY, api_info=api_versions)] * tenants_count,
@@ -40,6 +40,7 @@ class NetworkTestCase(test.TestCase):
     def test__init__default(self, mock_wrap, mock_clients):
         context = network_context.Network(self.get_context())
         self.assertEqual(context.config["networks_per_tenant"], 1)
+        self.assertEqual(context.config["resource_management_workers"], 20)
         self.assertEqual(context.config["start_cidr"],
                          network_context.Network.DEFAULT_CONFIG["start_cidr"])
 
@@ -75,7 +76,7 @@ class NetworkTestCase(test.TestCase):
             mock.call(tenant, add_router=True,
                       subnets_num=1, network_create_args={"fakearg": "fake"})
             for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
+        mock_create.assert_has_calls(create_calls, any_order=True)
 
         mock_utils.iterate_per_tenants.assert_called_once_with(
             net_context.context["users"])
@@ -87,6 +88,50 @@ class NetworkTestCase(test.TestCase):
         self.assertSequenceEqual(sorted(expected_networks),
                                  sorted(actual_networks))
 
+    @mock.patch(NET + "wrap")
+    @mock.patch("rally.plugins.openstack.context.network.networks.broker")
+    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_concurrently(self, mock_clients, mock_utils, mock_broker,
+                                mock_wrap):
+        mock_utils.iterate_per_tenants.return_value = [
+            ("foo_user", "foo_tenant"),
+            ("bar_user", "bar_tenant")]
+        net_context = network_context.Network(
+            self.get_context(resource_management_workers=7))
+
+        net_context.setup()
+
+        mock_broker.run_concurrently.assert_called_once_with(
+            net_context._create_networks,
+            [("foo_tenant",), ("bar_tenant",)], workers=7)
+
+    @mock.patch(NET + "wrap")
+    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_failure_keeps_created_networks(self, mock_clients,
+                                                  mock_utils, mock_wrap):
+        mock_utils.iterate_per_tenants.return_value = [
+            ("foo_user", "foo_tenant"),
+            ("bar_user", "bar_tenant")]
+
+        def create_network(tenant_id, **kwargs):
+            if tenant_id == "bar_tenant":
+                raise RuntimeError()
+            return tenant_id + "-net"
+
+        mock_wrap.return_value.create_network.side_effect = create_network
+        net_context = network_context.Network(self.get_context())
+
+        self.assertRaises(RuntimeError, net_context.setup)
+
+        # NOTE: networks of the tenants which succeeded are cleaned up
+        self.assertEqual(
+            ["foo_tenant-net"],
+            net_context.context["tenants"]["foo_tenant"]["networks"])
+        self.assertEqual(
+            [], net_context.context["tenants"]["bar_tenant"]["networks"])
+
     @mock.patch("rally.osclients.Clients")
     @mock.patch(NET + "wrap")
     def test_cleanup(self, mock_wrap, mock_clients):
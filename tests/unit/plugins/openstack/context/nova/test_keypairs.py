@@ -57,16 +57,18 @@ class KeyPairContextTestCase(test.TestCase):
 
     def test_keypair_setup(self):
         keypair_ctx = keypairs.Keypair(self.ctx_without_keys)
-        keypair_ctx._generate_keypair = mock.Mock(side_effect=[
-            {"id": "key_id_1", "key": "key_1", "name": "key_name_1"},
-            {"id": "key_id_2", "key": "key_2", "name": "key_name_2"},
-        ])
+        keypair_ctx._generate_keypair = mock.Mock(
+            side_effect=lambda credential: {
+                "id": credential.replace("credential", "key_id"),
+                "key": credential.replace("credential", "key"),
+                "name": credential.replace("credential", "key_name")})
 
         keypair_ctx.setup()
         self.assertEqual(keypair_ctx.context, self.ctx_with_keys)
 
         keypair_ctx._generate_keypair.assert_has_calls(
-            [mock.call("credential_1"), mock.call("credential_2")])
+            [mock.call("credential_1"), mock.call("credential_2")],
+            any_order=True)
 
     @mock.patch("%s.keypairs.resource_manager.cleanup" % CTX)
     def test_keypair_cleanup(self, mock_cleanup):
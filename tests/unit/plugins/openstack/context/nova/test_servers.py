@@ -46,7 +46,8 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
             "tenants": self._gen_tenants(tenants_count)})
 
         inst = servers.ServerGenerator(self.context)
-        self.assertEqual({"auto_assign_nic": False, "servers_per_tenant": 5},
+        self.assertEqual({"auto_assign_nic": False, "servers_per_tenant": 5,
+                          "resource_management_workers": 20},
                          inst.config)
 
     @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN,
@@ -102,6 +103,7 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
         })
 
         new_context = copy.deepcopy(self.context)
+        new_context["config"]["servers"]["resource_management_workers"] = 20
         for id_ in new_context["tenants"]:
             new_context["tenants"][id_].setdefault("servers", [])
             for i in range(servers_per_tenant):
@@ -271,6 +271,25 @@ class QuotasTestCase(test.TestCase):
         self.assertFalse(mock_nova_quotas.delete.called)
         self.assertFalse(mock_neutron_quotas.delete.called)
 
+    @mock.patch("rally.plugins.openstack.context."
+                "quotas.quotas.osclients.Clients")
+    @mock.patch("rally.plugins.openstack.context."
+                "quotas.quotas.broker.run_concurrently")
+    def test_tenants_concurrently(self, mock_run_concurrently, mock_clients):
+        ctx = copy.deepcopy(self.context)
+        ctx["config"]["quotas"] = {"nova": {"cores": 1},
+                                   "resource_management_workers": 5}
+        quotas_ctx = quotas.Quotas(ctx)
+
+        quotas_ctx.setup()
+        quotas_ctx.cleanup()
+
+        tenants = [(tenant_id,) for tenant_id in ctx["tenants"]]
+        self.assertEqual(
+            [mock.call(quotas_ctx._update_quotas, tenants, workers=5),
+             mock.call(quotas_ctx._delete_quotas, tenants, workers=5)],
+            mock_run_concurrently.call_args_list)
+
     @ddt.data(
         {"quotas_ctxt": {"nova": {"cpu": 1}},
          "quotas_class_path": "nova_quotas.NovaQuotas"},
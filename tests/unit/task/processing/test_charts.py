@@ -20,11 +20,21 @@ import mock
 
 from rally.common.plugin import plugin
 from rally.task.processing import charts
+from rally.task.processing import utils
 from tests.unit import test
 
 CHARTS = "rally.task.processing.charts."
 
 
+def make_columns(iterations, atomic_names=()):
+    columns = utils.IterationsColumns(atomic_names)
+    for itr in iterations:
+        columns.add_iteration(dict({"timestamp": 0, "duration": 0,
+                                    "idle_duration": 0, "error": [],
+                                    "atomic_actions": {}}, **itr))
+    return columns
+
+
 class ChartTestCase(test.TestCase):
 
     class Chart(charts.Chart):
@@ -69,6 +79,31 @@ class ChartTestCase(test.TestCase):
         self.assertEqual([("foo_a", "a_points"), ("foo_b", "b_points")],
                          chart.render())
 
+    @mock.patch(CHARTS + "utils.GraphZipper")
+    def test_add_columns_and_render(self, mock_graph_zipper):
+        class Chart(self.Chart):
+            def _map_columns(self, columns):
+                return [("foo_duration", columns.duration)]
+
+        chart = Chart(self.wload_info, 24)
+        columns = make_columns([{"duration": 1}, {"duration": 2}])
+        chart.add_columns(columns)
+        mock_graph_zipper.assert_called_once_with(42, 24)
+        mock_graph_zipper.return_value.add_points.assert_called_once_with(
+            columns.duration)
+        self.assertEqual(
+            [("foo_duration",
+              mock_graph_zipper.return_value.get_zipped_graph.return_value)],
+            chart.render())
+
+    def test_add_columns_fallback(self):
+        chart = self.Chart(self.wload_info)
+        chart.add_iteration = mock.Mock()
+        columns = make_columns([{"duration": 1}, {"duration": 2}])
+        chart.add_columns(columns)
+        self.assertEqual([mock.call(itr) for itr in columns.iter_iterations()],
+                         chart.add_iteration.mock_calls)
+
     def test__fix_atomic_actions(self):
         chart = self.Chart(self.wload_info)
         self.assertEqual(
@@ -103,6 +138,26 @@ class MainStackedAreaChartTestCase(test.TestCase):
                     ("failed_duration", [[1, 0], [2, 1.6], [3, 4.7]])]
         self.assertEqual(expected, chart.render())
 
+    def test_add_columns_and_render(self):
+        columns = make_columns([
+            {"duration": 1.1, "idle_duration": 2.2, "error": []},
+            {"error": ["foo_err"], "duration": 1.1, "idle_duration": 0.5},
+            {"duration": 1.3, "idle_duration": 3.4, "error": ["foo_err"]}])
+        chart = charts.MainStackedAreaChart({"iterations_count": 3,
+                                             "iterations_failed": 0}, 10)
+        chart.add_columns(columns)
+        self.assertEqual([("duration", [[1, 1.1], [2, 0], [3, 0]]),
+                          ("idle_duration", [[1, 2.2], [2, 0], [3, 0]])],
+                         chart.render())
+
+        chart = charts.MainStackedAreaChart({"iterations_count": 3,
+                                             "iterations_failed": 2}, 10)
+        chart.add_columns(columns)
+        self.assertEqual([("duration", [[1, 1.1], [2, 0], [3, 0]]),
+                          ("idle_duration", [[1, 2.2], [2, 0], [3, 0]]),
+                          ("failed_duration", [[1, 0], [2, 1.6], [3, 4.7]])],
+                         chart.render())
+
 
 class AtomicStackedAreaChartTestCase(test.TestCase):
 
@@ -139,6 +194,25 @@ class AtomicStackedAreaChartTestCase(test.TestCase):
         [chart.add_iteration(iteration) for iteration in iterations]
         self.assertEqual(expected, sorted(chart.render()))
 
+    def test_add_columns_and_render(self):
+        columns = make_columns([
+            {"atomic_actions": {"foo": 1.1}, "error": []},
+            {"atomic_actions": collections.OrderedDict(
+                [("foo", 1.1), ("bar", 1.2)]),
+             "error": ["foo_err"], "duration": 40, "idle_duration": 2},
+            {"atomic_actions": {"bar": 1.2},
+             "error": ["foo_err"], "duration": 5.5, "idle_duration": 2.5}])
+        chart = charts.AtomicStackedAreaChart(
+            {"iterations_count": 3, "iterations_failed": 2,
+             "atomic": collections.OrderedDict([("foo", {}), ("bar", {}),
+                                                ("spam", {})])}, 10)
+        chart.add_columns(columns)
+        self.assertEqual([("foo", [[1, 1.1], [2, 1.1], [3, 0]]),
+                          ("bar", [[1, 0], [2, 1.2], [3, 1.2]]),
+                          ("spam", [[1, 0], [2, 0], [3, 0]]),
+                          ("failed_duration", [[1, 0], [2, 39.7], [3, 6.8]])],
+                         chart.render())
+
 
 class AvgChartTestCase(test.TestCase):
 
@@ -166,6 +240,14 @@ class AtomicAvgChartTestCase(test.TestCase):
          for a in ([("foo", 2), ("bar", 5)], [("foo", 4)], [("bar", 7)])]
         self.assertEqual([("bar", 4.0), ("foo", 2.0)], sorted(chart.render()))
 
+    def test_add_columns_and_render(self):
+        chart = charts.AtomicAvgChart({"iterations_count": 3,
+                                       "atomic": {"foo": {}, "bar": {}}})
+        chart.add_columns(make_columns(
+            [{"atomic_actions": collections.OrderedDict(a)}
+             for a in ([("foo", 2), ("bar", 5)], [("foo", 4)], [("bar", 7)])]))
+        self.assertEqual([("foo", 2.0), ("bar", 4.0)], chart.render())
+
 
 @ddt.ddt
 class LoadProfileChartTestCase(test.TestCase):
@@ -180,7 +262,7 @@ class LoadProfileChartTestCase(test.TestCase):
          "kwargs": {"scale": 8},
          "expected": [("parallel iterations",
                        [(0.0, 0), (1.25, 0.8), (2.5, 0.8), (3.75, 2),
-                        (5.0, 2.0), (6.25, 1.8), (7.5, 0.6000000000000001),
+                        (5.0, 2.0), (6.25, 1.8), (7.5, 0.6),
                         (8.75, 1.4), (10.0, 0.2)])]},
         {"info": {"iterations_count": 6,
                   "tstamp_start": 0.0,
@@ -211,6 +293,152 @@ class LoadProfileChartTestCase(test.TestCase):
             chart.add_iteration({"timestamp": ts, "duration": duration})
         self.assertEqual(expected, chart.render())
 
+        chart = charts.LoadProfileChart(info, **kwargs)
+        chart.add_columns(make_columns(
+            [{"timestamp": itr[0], "duration": itr[1]}
+             for itr in iterations]))
+        self.assertEqual(expected, chart.render())
+
+    def test_get_concurrency(self):
+        chart = charts.LoadProfileChart(
+            {"iterations_count": 4, "tstamp_start": 10.0,
+             "load_duration": 2.0})
+        for ts, duration in ((10.0, 0.5), (10.5, 0.5), (10.5, 1.0),
+                             (11.0, 0)):
+            chart.add_iteration({"timestamp": ts, "duration": duration})
+        self.assertEqual([(0.0, 1), (0.5, 2), (1.0, 1), (1.5, 0)],
+                         chart.get_concurrency())
+
+    def test_render_long_iterations(self):
+        chart = charts.LoadProfileChart(
+            {"iterations_count": 2, "tstamp_start": 0.0,
+             "load_duration": 1000.0}, scale=5)
+        chart.add_iteration({"timestamp": 0.0, "duration": 1000.0})
+        chart.add_iteration({"timestamp": 100.0, "duration": 700.0})
+        self.assertEqual(
+            [("parallel iterations",
+              [(0.0, 0), (280.0, 1.6428571428571428), (560.0, 2.0),
+               (840.0, 1.8571428571428572), (1120.0, 0.5714285714285714),
+               (1400.0, 0.0)])],
+            chart.render())
+
+
+class LoadTimelineChartTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        chart = charts.LoadTimelineChart({"iterations_count": 9,
+                                          "tstamp_start": 0.0,
+                                          "load_duration": 8.0}, scale=8)
+        self.assertIsInstance(chart, charts.LoadProfileChart)
+        for ts, duration in ((0.0, 0.5), (0.5, 0.5), (2.0, 4.0), (2.0, 2.0),
+                             (4.0, 2.0), (6.0, 0.5), (6.5, 0.5), (7.5, 0.5),
+                             (7.5, 1.5)):
+            chart.add_iteration({"timestamp": ts, "duration": duration})
+        axis = [0.0, 1.25, 2.5, 3.75, 5.0, 6.25, 7.5, 8.75, 10.0]
+        self.assertEqual(
+            [("max parallel iterations",
+              list(zip(axis, [1, 1, 2, 2, 2, 2, 1, 2, 1]))),
+             ("started iterations per second",
+              list(zip(axis, [0, 1.6, 1.6, 0, 0.8, 0.8, 2.4, 0, 0]))),
+             ("finished iterations per second",
+              list(zip(axis, [0, 1.6, 0, 0, 0.8, 1.6, 1.6, 0.8, 0.8])))],
+            chart.render())
+
+    def test_render_empty(self):
+        chart = charts.LoadTimelineChart({"iterations_count": 0,
+                                          "tstamp_start": 0.0,
+                                          "load_duration": 0.0})
+        self.assertEqual([("max parallel iterations", [(0.0, 0)]),
+                          ("started iterations per second", [(0.0, 0)]),
+                          ("finished iterations per second", [(0.0, 0)])],
+                         chart.render())
+
+
+class TimeWindowChartTestCase(test.TestCase):
+
+    info = {"iterations_count": 5, "tstamp_start": 10.0,
+            "load_duration": 4.0}
+    iterations = [
+        {"timestamp": 10.0, "duration": 0.5, "error": []},
+        {"timestamp": 10.2, "duration": 0.6, "error": ["err"]},
+        {"timestamp": 10.5, "duration": 1.0, "error": []},
+        {"timestamp": 12.0, "duration": 1.5, "error": []},
+        {"timestamp": 12.5, "duration": 1.0, "error": []}]
+
+    def _make_chart(self, chart_cls, iterations=None, **kwargs):
+        chart = chart_cls(self.info, scale=4, **kwargs)
+        for itr in self.iterations if iterations is None else iterations:
+            chart.add_iteration(itr)
+        return chart
+
+    def test___init__(self):
+        self.assertEqual(
+            1.0, charts.ThroughputTimelineChart(self.info, scale=4).window)
+        self.assertEqual(
+            2.5, charts.ThroughputTimelineChart(self.info, window=2.5).window)
+        self.assertEqual(1.0, charts.ThroughputTimelineChart(
+            dict(self.info, load_duration=0)).window)
+
+    def test_throughput_render(self):
+        chart = self._make_chart(charts.ThroughputTimelineChart)
+        self.assertEqual(
+            [("finished iterations per second",
+              [(1.0, 2.0), (2.0, 1.0), (3.0, 0.0), (4.0, 2.0)]),
+             ("failed iterations per second",
+              [(1.0, 1.0), (2.0, 0.0), (3.0, 0.0), (4.0, 0.0)])],
+            chart.render())
+
+    def test_throughput_render_window(self):
+        chart = self._make_chart(charts.ThroughputTimelineChart, window=2.0)
+        self.assertEqual(
+            [("finished iterations per second", [(2.0, 1.5), (4.0, 1.0)]),
+             ("failed iterations per second", [(2.0, 0.5), (4.0, 0.0)])],
+            chart.render())
+
+    def test_error_rate_render(self):
+        chart = self._make_chart(charts.ErrorRateTimelineChart)
+        self.assertEqual([("errors (%)", [(1.0, 50.0), (2.0, 0.0),
+                                          (4.0, 0.0)])],
+                         chart.render())
+
+    def test_latency_render(self):
+        chart = self._make_chart(charts.LatencyTimelineChart)
+        self.assertEqual(
+            [("p50", [(1.0, 0.5), (2.0, 1.0), (4.0, 1.25)]),
+             ("p95", [(1.0, 0.5), (2.0, 1.0), (4.0, 1.475)]),
+             ("p99", [(1.0, 0.5), (2.0, 1.0), (4.0, 1.495)])],
+            chart.render())
+
+    def test_add_columns(self):
+        columns = utils.IterationsColumns()
+        for itr in self.iterations:
+            columns.add_iteration(dict(itr, idle_duration=0,
+                                       atomic_actions={}))
+        for chart_cls in (charts.ThroughputTimelineChart,
+                          charts.ErrorRateTimelineChart,
+                          charts.LatencyTimelineChart):
+            chart = chart_cls(self.info, scale=4)
+            chart.add_columns(columns)
+            self.assertEqual(self._make_chart(chart_cls).render(),
+                             chart.render())
+
+    def test_merge(self):
+        for chart_cls in (charts.ThroughputTimelineChart,
+                          charts.ErrorRateTimelineChart,
+                          charts.LatencyTimelineChart):
+            chart = self._make_chart(chart_cls, self.iterations[:2])
+            chart.merge(self._make_chart(chart_cls, self.iterations[2:]))
+            self.assertEqual(self._make_chart(chart_cls).render(),
+                             chart.render())
+
+    def test_render_empty(self):
+        for chart_cls in (charts.ThroughputTimelineChart,
+                          charts.ErrorRateTimelineChart,
+                          charts.LatencyTimelineChart):
+            chart = self._make_chart(chart_cls, [])
+            self.assertEqual([[] for line in chart.render()],
+                             [points for name, points in chart.render()])
+
 
 @ddt.ddt
 class HistogramChartTestCase(test.TestCase):
@@ -233,6 +461,10 @@ class HistogramChartTestCase(test.TestCase):
         self.assertIsInstance(chart, charts.HistogramChart)
         [chart.add_iteration({"foo": x}) for x in ({"bar": 1.2}, {"bar": 2.4},
                                                    {"bar": 4.2})]
+        other_chart = self.HistogramChart({"iterations_count": 3})
+        other_chart._add_values("bar", [4.2, 1.2, 2.4])
+        self.assertRaises(KeyError, other_chart._add_values, "foo", [1])
+        self.assertEqual(chart.render(), other_chart.render())
         expected = {
             "data": [
                 [{"disabled": None, "key": "bar", "view": "Square Root Choice",
@@ -284,6 +516,13 @@ class MainHistogramChartTestCase(test.TestCase):
             {"duration": 1.1, "idle_duration": 2.2, "error": None},
             {"error": True},
             {"duration": 1.3, "idle_duration": 3.4, "error": None})]
+        other_chart = charts.MainHistogramChart(
+            {"iterations_count": 3, "min_duration": 2, "max_duration": 7})
+        other_chart.add_columns(make_columns([
+            {"duration": 1.1, "idle_duration": 2.2, "error": None},
+            {"error": True, "duration": 8},
+            {"duration": 1.3, "idle_duration": 3.4, "error": None}]))
+        self.assertEqual(chart.render(), other_chart.render())
         expected = {
             "data": [
                 [{"disabled": None, "key": "task",
@@ -314,6 +553,11 @@ class AtomicHistogramChartTestCase(test.TestCase):
         self.assertIsInstance(chart, charts.HistogramChart)
         [chart.add_iteration({"atomic_actions": a})
          for a in ({"foo": 1.6, "bar": 3.1}, {"foo": 2.8}, {"bar": 5.5})]
+        other_chart = charts.AtomicHistogramChart(chart._workload_info)
+        other_chart.add_columns(make_columns(
+            [{"atomic_actions": a}
+             for a in ({"foo": 1.6, "bar": 3.1}, {"foo": 2.8}, {"bar": 5.5})]))
+        self.assertEqual(chart.render(), other_chart.render())
         expected = {
             "data": [
                 [{"disabled": 0, "key": "foo", "view": "Square Root Choice",
@@ -490,6 +734,18 @@ class MainStatsTableTestCase(test.TestCase):
                 ["foo", 1.2, 2.7, 3.9, 4.05, 4.2, 2.7, "66.7%", 3],
                 ["bar", 5.6, 5.6, 5.6, 5.6, 5.6, 5.6, "50.0%", 2],
                 ["total", 5.2, 8.75, 11.59, 11.945, 12.3, 8.75, "50.0%", 4]]
+        },
+        {
+            "info": {"iterations_count": 2,
+                     "atomic": collections.OrderedDict()},
+            "data": [
+                generate_iteration(1.6, False, ("foo", 1.2)),
+                generate_iteration(5.2, False, ("bar", 4.2), ("foo", 1.0))
+            ],
+            "expected_rows": [
+                ["foo", 1.0, 1.1, 1.18, 1.19, 1.2, 1.1, "100.0%", 2],
+                ["bar", 4.2, 4.2, 4.2, 4.2, 4.2, 4.2, "100.0%", 1],
+                ["total", 1.6, 3.4, 4.84, 5.02, 5.2, 3.4, "100.0%", 2]]
         }
     )
     @ddt.unpack
@@ -504,6 +760,72 @@ class MainStatsTableTestCase(test.TestCase):
                     "rows": expected_rows}
         self.assertEqual(expected, table.render())
 
+    def test_merge(self):
+        data = [generate_iteration(1.6, False, ("foo", 1.2)),
+                generate_iteration(5.2, False, ("bar", 4.2), ("foo", 1.0)),
+                generate_iteration(3.0, True, ("foo", 2.0))]
+        table = charts.MainStatsTable({"atomic": {}})
+        for el in data:
+            table.add_iteration(el)
+
+        first = charts.MainStatsTable({"atomic": {}})
+        first.add_iteration(data[0])
+        second = charts.MainStatsTable({"atomic": {}})
+        for el in data[1:]:
+            second.add_iteration(el)
+        first.merge(second)
+
+        self.assertEqual(table.render(), first.render())
+
+
+class SchedulingTableTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        table = charts.SchedulingTable({"iterations_count": 4})
+        self.assertIsInstance(table, charts.Table)
+        for scheduled, started in ((10.0, 10.0), (10.5, 10.75),
+                                   (11.0, 12.5), (11.5, 12.5)):
+            table.add_iteration({"scheduled_timestamp": scheduled,
+                                 "timestamp": started})
+
+        self.assertEqual(
+            {"cols": charts.SchedulingTable.columns,
+             "rows": [["scheduling lag", 0.0, 0.625, 1.35, 1.425,
+                       1.5, 0.688, 4]],
+             "offered_rate": 2.0,
+             "achieved_rate": 1.2},
+            table.render())
+
+    def test_add_columns_and_render(self):
+        iterations = [{"scheduled_timestamp": scheduled, "timestamp": started}
+                      for scheduled, started in ((10.0, 10.0), (10.5, 10.75),
+                                                 (11.0, 12.5), (11.5, 12.5))]
+        iterations.insert(2, {"timestamp": 11.0})
+        table = charts.SchedulingTable({"iterations_count": 5})
+        table.add_columns(make_columns(iterations))
+        self.assertEqual(
+            {"cols": charts.SchedulingTable.columns,
+             "rows": [["scheduling lag", 0.0, 0.625, 1.35, 1.425,
+                       1.5, 0.688, 4]],
+             "offered_rate": 2.0,
+             "achieved_rate": 1.2},
+            table.render())
+
+        table = charts.SchedulingTable({"iterations_count": 1})
+        table.add_columns(make_columns([{"timestamp": 1.0}]))
+        self.assertEqual([], table.render()["rows"])
+
+    def test_render_without_scheduled_iterations(self):
+        table = charts.SchedulingTable({"iterations_count": 2})
+        table.add_iteration({"timestamp": 1.0})
+        table.add_iteration({"timestamp": 2.0})
+
+        self.assertEqual({"cols": charts.SchedulingTable.columns,
+                          "rows": [],
+                          "offered_rate": "n/a",
+                          "achieved_rate": "n/a"},
+                         table.render())
+
 
 class OutputChartTestCase(test.TestCase):
 
@@ -30,12 +30,16 @@ class PlotTestCase(test.TestCase):
     @mock.patch(PLOT + "charts")
     def test__process_scenario(self, mock_charts):
         for mock_ins, ret in [
-                (mock_charts.MainStatsTable, "main_stats"),
                 (mock_charts.MainStackedAreaChart, "main_stacked"),
                 (mock_charts.AtomicStackedAreaChart, "atomic_stacked"),
                 (mock_charts.OutputStackedAreaDeprecatedChart,
                  "output_stacked"),
                 (mock_charts.LoadProfileChart, "load_profile"),
+                (mock_charts.LoadTimelineChart, "load_timeline"),
+                (mock_charts.ThroughputTimelineChart, "throughput"),
+                (mock_charts.ErrorRateTimelineChart, "error_rate"),
+                (mock_charts.LatencyTimelineChart, "latency"),
+                (mock_charts.SchedulingTable, "scheduling"),
                 (mock_charts.MainHistogramChart, "main_histogram"),
                 (mock_charts.AtomicHistogramChart, "atomic_histogram"),
                 (mock_charts.AtomicAvgChart, "atomic_avg")]:
@@ -53,7 +57,7 @@ class PlotTestCase(test.TestCase):
                          "full_duration": 40, "load_duration": 32,
                          "iterations_count": 10, "iterations_passed": 10,
                          "max_duration": 14, "min_duration": 5,
-                         "output_names": [],
+                         "output_names": [], "stat": "main_stats",
                          "tstamp_end": 25, "tstamp_start": 2}}
 
         task_data = plot._process_scenario(data, 1)
@@ -71,59 +75,150 @@ class PlotTestCase(test.TestCase):
                                "pie": [("success", 10), ("errors", 0)]},
                 "iterations_count": 10, "errors": [],
                 "load_profile": "load_profile",
+                "load_timeline": "load_timeline",
+                "timeline": {"throughput": "throughput",
+                             "errors": "error_rate", "latency": "latency"},
+                "scheduling": "scheduling",
                 "additive_output": [],
                 "complete_output": [[], [], [], [], [], [], [], [], [], []],
                 "output_errors": [],
                 "sla": [], "sla_success": True, "table": "main_stats"})
 
-    @mock.patch(PLOT + "_process_scenario")
-    @mock.patch(PLOT + "json.dumps", return_value="json_data")
-    def test__process_tasks(self, mock_json_dumps, mock__process_scenario):
-        tasks_results = [{"key": {"name": i, "kw": "kw_" + i}}
-                         for i in ("a", "b", "c", "b")]
-        mock__process_scenario.side_effect = lambda a, b: (
-            {"cls": "%s_cls" % a["key"]["name"],
-             "name": str(b),
-             "met": "dummy",
-             "pos": str(b)})
-        source, tasks = plot._process_tasks(tasks_results)
-        self.assertEqual(source, "json_data")
-        mock_json_dumps.assert_called_once_with(
-            {"a": ["kw_a"], "b": ["kw_b", "kw_b"], "c": ["kw_c"]},
-            sort_keys=True, indent=2)
+    def test__order_tasks(self):
+        tasks_results = [{"key": {"name": n, "kw": "kw_%s" % n}}
+                         for n in ("a.x", "b.y", "c.z", "b.y")]
+        source, ordered = plot._order_tasks(tasks_results)
         self.assertEqual(
-            tasks,
-            [{"cls": "a_cls", "met": "dummy", "name": "0", "pos": "0"},
-             {"cls": "b_cls", "met": "dummy", "name": "0", "pos": "0"},
-             {"cls": "b_cls", "met": "dummy", "name": "1", "pos": "1"},
-             {"cls": "c_cls", "met": "dummy", "name": "0", "pos": "0"}])
+            {"a.x": ["kw_a.x"], "b.y": ["kw_b.y", "kw_b.y"],
+             "c.z": ["kw_c.z"]},
+            source)
+        self.assertEqual([(tasks_results[0], 0), (tasks_results[1], 0),
+                          (tasks_results[3], 1), (tasks_results[2], 0)],
+                         ordered)
 
     @ddt.data({},
               {"include_libs": True},
               {"include_libs": False})
     @ddt.unpack
-    @mock.patch(PLOT + "_process_tasks")
-    @mock.patch(PLOT + "_extend_results")
+    @mock.patch(PLOT + "_process_scenario")
+    @mock.patch(PLOT + "_extend_result")
     @mock.patch(PLOT + "ui_utils.get_template")
-    @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
-    def test_plot(self, mock_dumps, mock_get_template, mock__extend_results,
-                  mock__process_tasks, **ddt_kwargs):
-        mock__process_tasks.return_value = "source", "scenarios"
-        mock_get_template.return_value.render.return_value = "tasks_html"
-        mock__extend_results.return_value = ["extended_result"]
-        html = plot.plot("tasks_results", **ddt_kwargs)
-        self.assertEqual(html, "tasks_html")
-        mock__extend_results.assert_called_once_with("tasks_results")
+    def test_plot(self, mock_get_template, mock__extend_result,
+                  mock__process_scenario, **ddt_kwargs):
+        tasks_results = [{"key": {"name": n, "kw": {"n": n}}}
+                         for n in ("b.y", "a.x")]
+        mock_get_template.return_value.render.return_value = (
+            "head %s tail" % plot._SCENARIOS_PLACEHOLDER)
+        mock__extend_result.side_effect = lambda r: r["key"]["name"]
+        mock__process_scenario.side_effect = lambda r, pos: [r, pos]
+
+        html = plot.plot(tasks_results, **ddt_kwargs)
+
+        self.assertEqual(
+            "head [[\"a.x\", 0], [\"b.y\", 0]] tail", html)
         mock_get_template.assert_called_once_with("task/report.html")
-        mock__process_tasks.assert_called_once_with(["extended_result"])
-        if "include_libs" in ddt_kwargs:
-            mock_get_template.return_value.render.assert_called_once_with(
-                data="json_scenarios", source="json_source",
-                include_libs=ddt_kwargs["include_libs"])
-        else:
-            mock_get_template.return_value.render.assert_called_once_with(
-                data="json_scenarios", source="json_source",
-                include_libs=False)
+        mock_get_template.return_value.render.assert_called_once_with(
+            data=plot._SCENARIOS_PLACEHOLDER,
+            source=json.dumps(json.dumps(
+                {"a.x": [{"n": "a.x"}], "b.y": [{"n": "b.y"}]},
+                indent=2, sort_keys=True)),
+            include_libs=ddt_kwargs.get("include_libs", False))
+        self.assertEqual([mock.call(r) for r in tasks_results[::-1]],
+                         mock__extend_result.mock_calls)
+
+    @mock.patch(PLOT + "_iter_report")
+    def test_plot_to_file(self, mock__iter_report):
+        mock__iter_report.return_value = iter(["foo", "bar"])
+        output = mock.Mock()
+        plot.plot_to_file("tasks_results", output, include_libs=True,
+                          workers=3)
+        mock__iter_report.assert_called_once_with("tasks_results", True, 3)
+        self.assertEqual([mock.call("foo"), mock.call("bar")],
+                         output.write.mock_calls)
+
+    @mock.patch(PLOT + "_process_scenario")
+    @mock.patch(PLOT + "_extend_result")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch(PLOT + "_parallel_map")
+    def test_plot_workers(self, mock__parallel_map, mock_get_template,
+                          mock__extend_result, mock__process_scenario):
+        tasks_results = [{"key": {"name": "a.x", "kw": {}},
+                          "result": iter(["foo_iteration"])}]
+        mock_get_template.return_value.render.return_value = (
+            "head %s tail" % plot._SCENARIOS_PLACEHOLDER)
+        mock__parallel_map.side_effect = lambda f, jobs, workers: [
+            json.dumps(result["result"]) for result, pos in jobs]
+
+        self.assertEqual("head [[\"foo_iteration\"]] tail",
+                         plot.plot(tasks_results, workers=4))
+        mock__parallel_map.assert_called_once_with(
+            plot._process_result, mock.ANY, 4)
+
+    @mock.patch(PLOT + "_process_scenario")
+    @mock.patch(PLOT + "_extend_result")
+    def test__process_result(self, mock__extend_result,
+                             mock__process_scenario):
+        mock__process_scenario.return_value = {"foo": "bar"}
+        self.assertEqual("{\"foo\": \"bar\"}",
+                         plot._process_result(("result", 2)))
+        mock__extend_result.assert_called_once_with("result")
+        mock__process_scenario.assert_called_once_with(
+            mock__extend_result.return_value, 2)
+
+    def test__materialize(self):
+        result = {"key": "foo", "result": ["foo_iteration"]}
+        self.assertIs(result, plot._materialize(result))
+        result = {"key": "foo", "result": iter(["foo_iteration"])}
+        self.assertEqual({"key": "foo", "result": ["foo_iteration"]},
+                         plot._materialize(result))
+
+    @mock.patch(PLOT + "multiprocessing.Pool")
+    def test__parallel_map_serial(self, mock_pool):
+        self.assertEqual([2, 4, 6],
+                         list(plot._parallel_map(lambda x: x * 2, [1, 2, 3])))
+        self.assertEqual(
+            [2, 4], list(plot._parallel_map(lambda x: x * 2, [1, 2], 1)))
+        self.assertFalse(mock_pool.called)
+
+    @mock.patch(PLOT + "multiprocessing.Pool")
+    def test__parallel_map(self, mock_pool):
+        pool = mock_pool.return_value
+        pool.apply_async.side_effect = lambda func, args: mock.Mock(
+            get=mock.Mock(return_value=func(*args)))
+
+        results = plot._parallel_map(abs, [-1, 2, -3, 4, -5], 2)
+
+        self.assertEqual([1, 2], [next(results), next(results)])
+        # NOTE: only two items per worker are sent to the pool at once
+        self.assertEqual(5, pool.apply_async.call_count)
+        self.assertEqual([3, 4, 5], list(results))
+        mock_pool.assert_called_once_with(2)
+        pool.close.assert_called_once_with()
+        pool.terminate.assert_called_once_with()
+        pool.join.assert_called_once_with()
+
+    @mock.patch(PLOT + "multiprocessing.Pool")
+    def test__parallel_map_stopped(self, mock_pool):
+        pool = mock_pool.return_value
+        results = plot._parallel_map(abs, [-1, 2, -3, 4, -5], 2)
+        next(results)
+        results.close()
+        self.assertFalse(pool.close.called)
+        pool.terminate.assert_called_once_with()
+        pool.join.assert_called_once_with()
+
+    @mock.patch(PLOT + "_extend_result")
+    def test__summarize_result(self, mock__extend_result):
+        mock__extend_result.return_value = {
+            "key": "foo_key", "sla": "foo_sla", "info": "foo_info",
+            "iterations": "foo_iterations"}
+        self.assertEqual(
+            {"key": "foo_key", "sla": "foo_sla", "info": "foo_info",
+             "kw_hash": None},
+            plot._summarize_result({}))
+        mock__extend_result.assert_called_once_with({})
+        self.assertEqual("foo_hash", plot._summarize_result(
+            {"kw_hash": "foo_hash"})["kw_hash"])
 
     @mock.patch(PLOT + "objects.Task.extend_results")
     def test__extend_results(self, mock_task_extend_results):
@@ -137,6 +232,8 @@ class PlotTestCase(test.TestCase):
         generic_results = [
             {"id": None, "created_at": None, "updated_at": None,
              "task_uuid": None, "key": "%s_key" % k,
+             "full_duration": "%s_full_duration" % k,
+             "load_duration": "%s_load_duration" % k,
              "data": {"raw": "%s_result" % k,
                       "full_duration": "%s_full_duration" % k,
                       "load_duration": "%s_load_duration" % k,
@@ -150,12 +247,23 @@ class PlotTestCase(test.TestCase):
     def test__extend_results_empty(self):
         self.assertEqual([], plot._extend_results([]))
 
+    @ddt.data({}, {"workers": 2})
+    @ddt.unpack
     @mock.patch(PLOT + "Trends")
     @mock.patch(PLOT + "ui_utils.get_template")
-    @mock.patch(PLOT + "_extend_results")
-    def test_trends(self, mock__extend_results, mock_get_template,
-                    mock_trends):
-        mock__extend_results.return_value = ["foo", "bar"]
+    @mock.patch(PLOT + "_parallel_map")
+    def test_trends(self, mock__parallel_map, mock_get_template,
+                    mock_trends, workers=None):
+        tasks_results = [{"result": iter(["foo_iteration"])},
+                         {"result": iter(["bar_iteration"]),
+                          "statistics": {}}]
+        items = []
+
+        def parallel_map(func, tasks_results, workers):
+            items.extend(tasks_results)
+            return ["foo", "bar"]
+
+        mock__parallel_map.side_effect = parallel_map
         trends = mock.Mock()
         trends.get_data.return_value = ["foo", "bar"]
         mock_trends.return_value = trends
@@ -163,12 +271,159 @@ class PlotTestCase(test.TestCase):
         template.render.return_value = "trends html"
         mock_get_template.return_value = template
 
-        self.assertEqual("trends html", plot.trends("tasks_results"))
+        self.assertEqual("trends html",
+                         plot.trends(tasks_results, workers=workers))
+        mock__parallel_map.assert_called_once_with(
+            plot._summarize_result, mock.ANY, workers)
+        if workers:
+            self.assertEqual([{"result": ["foo_iteration"]},
+                              {"result": [], "statistics": {}}], items)
+        else:
+            self.assertEqual(tasks_results, items)
         self.assertEqual([mock.call("foo"), mock.call("bar")],
                          trends.add_result.mock_calls)
         mock_get_template.assert_called_once_with("task/trends.html")
         template.render.assert_called_once_with(data="[\"foo\", \"bar\"]")
 
+    @mock.patch(PLOT + "_extend_result")
+    def test__collect_durations(self, mock__extend_result):
+        mock__extend_result.return_value = {
+            "key": "foo_key", "sla": [],
+            "info": {"atomic": {"foo": {}, "bar": {}}},
+            "iterations": [
+                {"error": [], "duration": 3,
+                 "atomic_actions": {"foo": 1, "spam": 2}},
+                {"error": ["err"], "duration": 10,
+                 "atomic_actions": {"foo": 10}},
+                {"error": [], "duration": 5,
+                 "atomic_actions": {"foo": 3, "bar": None}}]}
+
+        workload = plot._collect_durations({"kw_hash": "foo_hash"})
+
+        self.assertEqual("foo_key", workload["key"])
+        self.assertEqual("foo_hash", workload["kw_hash"])
+        durations = workload["durations"]
+        self.assertEqual(["bar", "foo", "spam", "total"],
+                         sorted(durations))
+        self.assertEqual("total", list(durations)[-1])
+        self.assertEqual(2, durations["foo"].result())
+        self.assertEqual(0, durations["bar"].result())
+        self.assertEqual(2, durations["spam"].result())
+        self.assertEqual(4, durations["total"].result())
+
+    @ddt.data({}, {"workers": 2})
+    @ddt.unpack
+    @mock.patch(PLOT + "Comparison")
+    @mock.patch(PLOT + "_parallel_map")
+    def test_compare(self, mock__parallel_map, mock_comparison,
+                     workers=None):
+        base_results = [{"result": iter(["foo_iteration"])}]
+        new_results = [{"result": iter(["bar_iteration"])}]
+        items = []
+
+        def parallel_map(func, tasks_results, workers):
+            items.append(list(tasks_results))
+            return ["workload_%d" % len(items)]
+
+        mock__parallel_map.side_effect = parallel_map
+
+        data = plot.compare(base_results, new_results, alpha=0.01,
+                            threshold=0.2, workers=workers)
+
+        comparison = mock_comparison.return_value
+        self.assertEqual(comparison.get_data.return_value, data)
+        mock_comparison.assert_called_once_with(alpha=0.01, threshold=0.2)
+        self.assertEqual(
+            [mock.call(plot._collect_durations, mock.ANY, workers)] * 2,
+            mock__parallel_map.mock_calls)
+        if workers:
+            self.assertEqual([[{"result": ["foo_iteration"]}],
+                              [{"result": ["bar_iteration"]}]], items)
+        else:
+            self.assertEqual([base_results, new_results], items)
+        self.assertEqual([mock.call("workload_1", base=True),
+                          mock.call("workload_2", base=False)],
+                         comparison.add_result.mock_calls)
+
+
+class ComparisonTestCase(test.TestCase):
+
+    def _make_result(self, name, durations, kw=None):
+        result = {"key": {"name": name, "kw": kw or {"foo": name}},
+                  "durations": {}}
+        for action, values in durations.items():
+            comp = plot.streaming.PercentileComputation(0.5)
+            comp.add_values(values)
+            result["durations"][action] = comp
+        return result
+
+    def test___init__(self):
+        comparison = plot.Comparison()
+        self.assertEqual(0.05, comparison.alpha)
+        self.assertEqual(0.1, comparison.threshold)
+        self.assertEqual({}, comparison._workloads)
+
+    def test_add_result_and_get_data(self):
+        comparison = plot.Comparison()
+        fast = [1.0 + i / 100.0 for i in range(30)]
+        slow = [2.0 + i / 100.0 for i in range(30)]
+        comparison.add_result(
+            self._make_result("Foo.bar", {"a": fast, "b": slow,
+                                          "total": fast}), base=True)
+        comparison.add_result(
+            self._make_result("Foo.bar", {"a": slow, "b": fast, "c": fast,
+                                          "total": fast}))
+        comparison.add_result(
+            self._make_result("Spam.only_base", {"total": fast}),
+            base=True)
+
+        data = comparison.get_data()
+
+        self.assertEqual(["Foo.bar", "Spam.only_base"],
+                         [w["name"] for w in data])
+        workload, only_base = data
+        self.assertTrue(workload["matched"])
+        self.assertEqual(1, workload["regressions"])
+        self.assertEqual(["a", "b", "c", "total"],
+                         [a["name"] for a in workload["actions"]])
+        self.assertEqual(["regression", "improvement", "n/a", "no change"],
+                         [a["status"] for a in workload["actions"]])
+        action = workload["actions"][0]
+        self.assertAlmostEqual(1.145, action["base"])
+        self.assertAlmostEqual(2.145, action["new"])
+        self.assertAlmostEqual(1.0, action["delta"])
+        self.assertAlmostEqual(100.0 / 1.145, action["delta_percent"])
+        self.assertLess(action["p_value"], 0.001)
+        self.assertIsNone(workload["actions"][2]["base"])
+        self.assertFalse(only_base["matched"])
+        self.assertEqual([], only_base["actions"])
+        self.assertEqual(0, only_base["regressions"])
+
+    def test_add_result_merge(self):
+        comparison = plot.Comparison()
+        for values in ([1, 2], [3, 4, 5]):
+            comparison.add_result(
+                self._make_result("Foo.bar", {"total": values}), base=True)
+        comparison.add_result(
+            self._make_result("Foo.bar", {"total": [3, 4]}))
+
+        data = comparison.get_data()
+
+        self.assertEqual(3, data[0]["actions"][0]["base"])
+
+    def test_threshold(self):
+        comparison = plot.Comparison(threshold=0.5)
+        comparison.add_result(self._make_result(
+            "Foo.bar", {"total": [1.0 + i / 100.0 for i in range(30)]}),
+            base=True)
+        comparison.add_result(self._make_result(
+            "Foo.bar", {"total": [1.2 + i / 100.0 for i in range(30)]}))
+
+        action = comparison.get_data()[0]["actions"][0]
+
+        self.assertLess(action["p_value"], comparison.alpha)
+        self.assertEqual("no change", action["status"])
+
 
 @ddt.ddt
 class TrendsTestCase(test.TestCase):
@@ -178,41 +433,6 @@ class TrendsTestCase(test.TestCase):
         self.assertEqual({}, trends._tasks)
         self.assertRaises(TypeError, plot.Trends, 42)
 
-    @ddt.data({"args": [None], "result": "None"},
-              {"args": [""], "result": ""},
-              {"args": [" str value "], "result": "str value"},
-              {"args": [" 42 "], "result": "42"},
-              {"args": ["42"], "result": "42"},
-              {"args": [42], "result": "42"},
-              {"args": [42.00], "result": "42.0"},
-              {"args": [[3.2, 1, " foo ", None]], "result": "1,3.2,None,foo"},
-              {"args": [(" def", "abc", [22, 33])], "result": "22,33,abc,def"},
-              {"args": [{}], "result": ""},
-              {"args": [{1: 2, "a": " b c "}], "result": "1:2|a:b c"},
-              {"args": [{"foo": "bar", (1, 2): [5, 4, 3]}],
-               "result": "1,2:3,4,5|foo:bar"},
-              {"args": [1, 2], "raises": TypeError},
-              {"args": [set()], "raises": TypeError})
-    @ddt.unpack
-    def test__to_str(self, args, result=None, raises=None):
-        trends = plot.Trends()
-        if raises:
-            self.assertRaises(raises, trends._to_str, *args)
-        else:
-            self.assertEqual(result, trends._to_str(*args))
-
-    @mock.patch(PLOT + "hashlib")
-    def test__make_hash(self, mock_hashlib):
-        mock_hashlib.md5.return_value.hexdigest.return_value = "md5_digest"
-        trends = plot.Trends()
-        trends._to_str = mock.Mock()
-        trends._to_str.return_value.encode.return_value = "foo_str"
-
-        self.assertEqual("md5_digest", trends._make_hash("foo_obj"))
-        trends._to_str.assert_called_once_with("foo_obj")
-        trends._to_str.return_value.encode.assert_called_once_with("utf8")
-        mock_hashlib.md5.assert_called_once_with("foo_str")
-
     def _make_result(self, salt, sla_success=True):
         return {
             "key": {"kw": salt + "_kw", "name": "Scenario.name_%s" % salt},
@@ -275,6 +495,16 @@ class TrendsTestCase(test.TestCase):
                        ("median", [(1, 1.55)]), ("min", [(1, 1.2)])]}]
         self.assertEqual(expected, self._sort_trends(trends.get_data()))
 
+    def test_add_result_with_kw_hash(self):
+        trends = plot.Trends()
+        for i in 0, 1:
+            result = self._make_result(str(i))
+            result["key"]["name"] = "Scenario.name"
+            result["kw_hash"] = "foo_hash"
+            trends.add_result(result)
+        self.assertEqual(["foo_hash"], list(trends._tasks))
+        self.assertEqual(2, trends._tasks["foo_hash"]["seq"])
+
     def test_add_result_once_and_get_data(self):
         trends = plot.Trends()
         trends.add_result(self._make_result("foo", sla_success=False))
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 import ddt
 
 from rally.task.processing import utils
@@ -47,3 +49,80 @@ class GraphZipperTestCase(test.TestCase):
         self.assertRaises(TypeError, merger.add_point)
         [merger.add_point(1) for value in range(10)]
         self.assertRaises(RuntimeError, merger.add_point, 1)
+
+    @ddt.data({"base_size": 10, "zipped_size": 8},
+              {"base_size": 90, "zipped_size": 8},
+              {"base_size": 1001, "zipped_size": 1000},
+              {"base_size": 2500, "zipped_size": 1000},
+              {"base_size": 10, "zipped_size": 20},
+              {"base_size": 10, "zipped_size": 8, "count": 7},
+              {"base_size": 90, "zipped_size": 8, "count": 50},
+              {"base_size": 90, "zipped_size": 8, "count": 0})
+    @ddt.unpack
+    def test_add_points(self, base_size, zipped_size, count=None):
+        count = base_size if count is None else count
+        values = [(i * 7919 % 113) / 10.0 for i in range(base_size)]
+        merger = utils.GraphZipper(base_size, zipped_size)
+        [merger.add_point(value) for value in values]
+
+        other = utils.GraphZipper(base_size, zipped_size)
+        other.add_points(values[:count])
+        [other.add_point(value) for value in values[count:]]
+
+        graph = merger.get_zipped_graph()
+        other_graph = other.get_zipped_graph()
+        self.assertEqual([p[0] for p in graph], [p[0] for p in other_graph])
+        for point, other_point in zip(graph, other_graph):
+            self.assertAlmostEqual(point[1], other_point[1])
+
+    def test_add_points_keeps_last_point(self):
+        merger = utils.GraphZipper(2999, 1000)
+        merger.add_points([1] * 2999)
+        graph = merger.get_zipped_graph()
+        self.assertEqual(1000, len(graph))
+        self.assertEqual(2999, graph[-1][0])
+        self.assertAlmostEqual(1, graph[-1][1])
+
+    def test_add_points_raises(self):
+        merger = utils.GraphZipper(10, 8)
+        self.assertRaises(RuntimeError, merger.add_points, [1] * 11)
+        merger.add_points([1] * 10)
+        self.assertRaises(RuntimeError, merger.add_points, [1])
+
+
+class IterationsColumnsTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        columns = utils.IterationsColumns(["foo"])
+        columns.add_iteration(
+            {"timestamp": 1, "duration": 2, "idle_duration": 3,
+             "error": [], "atomic_actions": {"foo": 1.5},
+             "scheduled_timestamp": 0.5})
+        columns.add_iteration(
+            {"timestamp": 2, "duration": None, "idle_duration": 0,
+             "error": ["foo_err"], "atomic_actions": {"bar": None}})
+
+        self.assertEqual(2, columns.count)
+        self.assertEqual([1, 2], list(columns.timestamp))
+        self.assertEqual([2, 0], list(columns.duration))
+        self.assertEqual([3, 0], list(columns.idle_duration))
+        self.assertEqual([0, 1], list(columns.error))
+        self.assertEqual(0.5, columns.scheduled_timestamp[0])
+        self.assertNotEqual(columns.scheduled_timestamp[1],
+                            columns.scheduled_timestamp[1])
+        self.assertEqual(["foo", "bar"], list(columns.atomic))
+        self.assertEqual([1.5, 0], list(columns.get_atomic("foo")))
+        self.assertEqual([0, 0], list(columns.get_atomic("bar")))
+        self.assertEqual([0, 0], list(columns.get_atomic("spam")))
+
+    def test_iter_iterations(self):
+        iterations = [
+            {"timestamp": 1.0, "duration": 2.0, "idle_duration": 3.0,
+             "error": [], "scheduled_timestamp": 0.5,
+             "atomic_actions": collections.OrderedDict(
+                 [("foo", 1.5), ("bar", 0.5)])},
+            {"timestamp": 2.0, "duration": 0.0, "idle_duration": 0.0,
+             "error": ["", "", ""], "atomic_actions": {"bar": 1.0}}]
+        columns = utils.IterationsColumns()
+        [columns.add_iteration(itr) for itr in iterations]
+        self.assertEqual(iterations, list(columns.iter_iterations()))
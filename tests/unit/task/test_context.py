@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import ddt
 import jsonschema
 import mock
@@ -198,6 +200,133 @@ class ContextManagerTestCase(test.TestCase):
         mock_context.return_value.assert_has_calls(
             [mock.call.setup(), mock.call.setup()], any_order=True)
 
+    @mock.patch("rally.task.context.Context.get")
+    def test_setup_with_names(self, mock_context_get):
+        mock_context = mock.MagicMock()
+        mock_context.return_value = mock.MagicMock(__lt__=lambda x, y: True)
+        mock_context_get.return_value = mock_context
+        ctx_object = {"config": {"a": [], "b": []}}
+
+        manager = context.ContextManager(ctx_object, names=["b"])
+        manager.setup()
+
+        mock_context_get.assert_called_once_with("b")
+        mock_context.assert_called_once_with(ctx_object)
+        mock_context.return_value.setup.assert_called_once_with()
+
+    def _make_contexts(self, mock_context_get, orders, parallel=()):
+        contexts = {}
+        for name, order in orders.items():
+            ctx = mock.MagicMock(
+                __lt__=lambda x, y: (x.get_order(), x.get_name())
+                < (y.get_order(), y.get_name()))
+            ctx.get_order.return_value = order
+            ctx.get_name.return_value = name
+            ctx._meta_get.return_value = name in parallel
+            contexts[name] = ctx
+        mock_context_get.side_effect = lambda name: mock.MagicMock(
+            return_value=contexts[name])
+        return contexts
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_setup_concurrently(self, mock_context_get):
+        contexts = self._make_contexts(mock_context_get,
+                                       {"a": 1, "b": 2, "c": 2, "d": 3},
+                                       parallel=("b", "c", "d"))
+        events = {"b": threading.Event(), "c": threading.Event()}
+        calls = []
+
+        def setup(name):
+            calls.append(name)
+            if name in events:
+                # NOTE: both contexts are set up at the same time, so each
+                #       of them sees the event of the other one
+                events[name].set()
+                other = "c" if name == "b" else "b"
+                self.assertTrue(events[other].wait(5))
+
+        for name, ctx in contexts.items():
+            ctx.setup.side_effect = lambda name=name: setup(name)
+
+        manager = context.ContextManager(
+            {"config": {"a": {}, "b": {}, "c": {}, "d": {}}})
+        manager.setup()
+
+        self.assertEqual("a", calls[0])
+        self.assertEqual({"b", "c"}, set(calls[1:3]))
+        self.assertEqual("d", calls[3])
+        self.assertEqual(contexts["a"], manager._visited[0])
+        self.assertEqual({contexts["b"], contexts["c"]},
+                         set(manager._visited[1:3]))
+        self.assertEqual(contexts["d"], manager._visited[3])
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_setup_not_parallel(self, mock_context_get):
+        contexts = self._make_contexts(mock_context_get,
+                                       {"a": 1, "b": 1, "c": 1},
+                                       parallel=("a", "c"))
+        calls = []
+        for name, ctx in contexts.items():
+            ctx.setup.side_effect = lambda name=name: calls.append(name)
+        contexts["b"].setup.side_effect = ValueError
+
+        manager = context.ContextManager(
+            {"config": {"a": {}, "b": {}, "c": {}}})
+        self.assertRaises(ValueError, manager.setup)
+
+        # NOTE: contexts of the same order which are not configured as
+        #       parallel ones are set up one by one
+        self.assertEqual(["a"], calls)
+        self.assertFalse(contexts["c"].setup.called)
+        self.assertEqual([contexts["a"], contexts["b"]], manager._visited)
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_setup_concurrently_fails(self, mock_context_get):
+        contexts = self._make_contexts(mock_context_get,
+                                       {"a": 1, "b": 1, "c": 2},
+                                       parallel=("a", "b"))
+        contexts["a"].setup.side_effect = ValueError
+
+        manager = context.ContextManager(
+            {"config": {"a": {}, "b": {}, "c": {}}})
+        self.assertRaises(ValueError, manager.setup)
+        contexts["b"].setup.assert_called_once_with()
+        self.assertFalse(contexts["c"].setup.called)
+        self.assertEqual({contexts["a"], contexts["b"]},
+                         set(manager._visited))
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_cleanup_concurrently(self, mock_context_get):
+        contexts = self._make_contexts(mock_context_get,
+                                       {"a": 1, "b": 2, "c": 2},
+                                       parallel=("b", "c"))
+        calls = []
+        for name, ctx in contexts.items():
+            ctx.cleanup.side_effect = lambda name=name: calls.append(name)
+        contexts["b"].cleanup.side_effect = Exception
+
+        manager = context.ContextManager(
+            {"config": {"a": {}, "b": {}, "c": {}}})
+        manager.cleanup()
+
+        self.assertEqual(["c", "a"], calls)
+        contexts["b"].cleanup.assert_called_once_with()
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_split_per_workload(self, mock_context_get):
+        contexts = {
+            "a": mock.MagicMock(**{"_meta_get.return_value": False}),
+            "b": mock.MagicMock(**{"_meta_get.return_value": True}),
+            "c": mock.MagicMock(**{"_meta_get.return_value": False})}
+        mock_context_get.side_effect = lambda name: contexts[name]
+
+        self.assertEqual(
+            (["a", "c"], ["b"]),
+            context.ContextManager.split_per_workload(
+                {"c": {}, "b": [], "a": {}}))
+        contexts["a"]._meta_get.assert_called_once_with(
+            "per_workload", default=False)
+
     @mock.patch("rally.task.context.Context.get")
     def test_cleanup(self, mock_context_get):
         mock_context = mock.MagicMock()
@@ -231,6 +360,36 @@ class ContextManagerTestCase(test.TestCase):
         mock_context.return_value.assert_has_calls(
             [mock.call.cleanup(), mock.call.cleanup()], any_order=True)
 
+    @mock.patch("rally.task.context.Context.get")
+    def test_map_for_scenario(self, mock_context_get):
+        def map_a(context_obj):
+            return {"a": context_obj["tenants"][context_obj["iteration"]],
+                    "iteration": context_obj["iteration"]}
+
+        def map_b(context_obj):
+            context_obj["b"] = True
+            return context_obj
+
+        mappers = {"a": mock.Mock(map_for_scenario=map_a, order=1),
+                   "b": mock.Mock(map_for_scenario=map_b, order=2)}
+        for ctx in mappers.values():
+            ctx.__lt__ = lambda x, y: x.order < y.order
+        mock_context_get.side_effect = lambda name: (
+            lambda ctx_object: mappers[name])
+        ctx_object = {"config": {"a": {}, "b": {}},
+                      "tenants": [{"id": 0}, {"id": 1}]}
+
+        manager = context.ContextManager(ctx_object)
+        result = manager.map_for_scenario(1)
+        self.assertEqual({"a": {"id": 1}, "iteration": 1, "b": True}, result)
+        result["a"]["id"] = 42
+        self.assertEqual({"a": {"id": 0}, "iteration": 0, "b": True},
+                         manager.map_for_scenario(0))
+
+        self.assertEqual({"config": {"a": {}, "b": {}},
+                          "tenants": [{"id": 0}, {"id": 1}]}, ctx_object)
+        self.assertEqual(2, mock_context_get.call_count)
+
     @mock.patch("rally.task.context.ContextManager.cleanup")
     @mock.patch("rally.task.context.ContextManager.setup")
     def test_with_statement(
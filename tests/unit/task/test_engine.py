@@ -17,6 +17,9 @@
 
 import collections
 import copy
+import functools
+import threading
+import time
 
 import jsonschema
 import mock
@@ -231,7 +234,7 @@ class TaskEngineTestCase(test.TestCase):
         mock_scenario_validate.assert_called_once_with(
             "name", {"runner": "runner", "args": "args"},
             admin="admin", users=["user"],
-            deployment=deployment)
+            deployment=deployment, cache=None)
 
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.scenario.Scenario.validate",
@@ -305,14 +308,53 @@ class TaskEngineTestCase(test.TestCase):
 
         admin = user = mock_clients.return_value
         fake_deployment = mock_deployment_get.return_value
+        cache = mock__validate_config_semantic_helper.call_args[0][5]
+        self.assertIsInstance(cache, engine.validation.ValidationCache)
         expected_calls = [
-            mock.call(admin, user, wconf1, 0, fake_deployment),
-            mock.call(admin, user, wconf2, 1, fake_deployment),
-            mock.call(admin, user, wconf3, 0, fake_deployment)
+            mock.call(admin, user, wconf1, 0, fake_deployment, cache),
+            mock.call(admin, user, wconf2, 1, fake_deployment, cache),
+            mock.call(admin, user, wconf3, 0, fake_deployment, cache)
         ]
         mock__validate_config_semantic_helper.assert_has_calls(
             expected_calls, any_order=True)
 
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.osclients.Clients")
+    @mock.patch("rally.task.engine.users_ctx")
+    @mock.patch("rally.task.engine.TaskEngine"
+                "._validate_config_semantic_helper")
+    @mock.patch("rally.task.engine.objects.Deployment.get",
+                return_value="FakeDeployment")
+    def test__validate_config_semantic_fails(
+            self, mock_deployment_get,
+            mock__validate_config_semantic_helper,
+            mock_users_ctx, mock_clients, mock_task_config):
+        mock_users_ctx.UserGenerator = fakes.FakeUserContext
+
+        wconfs = [engine.Workload({"name": "a", "runner": "r%d" % i})
+                  for i in range(5)]
+        mock_task_instance = mock.MagicMock()
+        mock_task_instance.subtasks = [mock.MagicMock(workloads=wconfs)]
+        errors = {
+            1: exceptions.InvalidTaskConfig(name="a", pos=1, config="",
+                                            reason="first"),
+            3: exceptions.InvalidTaskConfig(name="a", pos=3, config="",
+                                            reason="second")}
+
+        def validate(admin, user, workload, pos, deployment, cache):
+            if pos in errors:
+                raise errors[pos]
+
+        mock__validate_config_semantic_helper.side_effect = validate
+        eng = engine.TaskEngine(mock_task_instance, mock.MagicMock())
+        eng.admin = "admin"
+
+        e = self.assertRaises(exceptions.InvalidTaskConfig,
+                              eng._validate_config_semantic,
+                              mock_task_instance)
+        self.assertIs(errors[1], e)
+        self.assertEqual(5, mock__validate_config_semantic_helper.call_count)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.ResultConsumer")
@@ -331,7 +373,7 @@ class TaskEngineTestCase(test.TestCase):
         eng.run()
         task.update_status.assert_has_calls([
             mock.call(consts.TaskStatus.RUNNING),
-            mock.call(consts.TaskStatus.FINISHED)
+            mock.call(consts.TaskStatus.FINISHED, load_duration=0)
         ])
 
     @mock.patch("rally.task.engine.objects.task.Task.get_status")
@@ -349,6 +391,8 @@ class TaskEngineTestCase(test.TestCase):
 
         mock_context_manager_setup.side_effect = Exception
         mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_result_consumer.return_value.load_started_at = float("inf")
+        mock_result_consumer.return_value.load_finished_at = 0
 
         mock_task_instance = mock.MagicMock()
         mock_subtask = mock.MagicMock()
@@ -379,6 +423,8 @@ class TaskEngineTestCase(test.TestCase):
         mock_result_consumer.is_task_in_aborting_status.side_effect = [False,
                                                                        False,
                                                                        True]
+        mock_result_consumer.return_value.load_started_at = 1
+        mock_result_consumer.return_value.load_finished_at = 2
         config = {
             "a.task": [{"runner": {"type": "a", "b": 1}}],
             "b.task": [{"runner": {"type": "a", "b": 1}}],
@@ -393,7 +439,8 @@ class TaskEngineTestCase(test.TestCase):
         eng.run()
 
         self.assertEqual(2, fake_runner.run.call_count)
-        self.assertEqual(mock.call(consts.TaskStatus.ABORTED),
+        self.assertEqual(mock.call(consts.TaskStatus.ABORTED,
+                                   load_duration=2),
                          task.update_status.mock_calls[-1])
 
     @mock.patch("rally.common.objects.Task.get_status")
@@ -419,9 +466,284 @@ class TaskEngineTestCase(test.TestCase):
         mock_scenario_runner.get.return_value = fake_runner_cls
         eng = engine.TaskEngine(config, task)
         eng.run()
-        self.assertEqual(mock.call(consts.TaskStatus.ABORTED),
+        self.assertEqual(mock.call(consts.TaskStatus.ABORTED,
+                                   load_duration=0),
                          task.update_status.mock_calls[-1])
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run__task_aborted_during_workload(
+            self, mock_scenario_runner, mock_scenario,
+            mock_context_manager_setup, mock_context_manager_cleanup,
+            mock_result_consumer, mock_task_get_status):
+        task = mock.MagicMock()
+        status = [consts.TaskStatus.RUNNING]
+        mock_task_get_status.side_effect = lambda uuid: status[0]
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_result_consumer.return_value.load_started_at = 1
+        mock_result_consumer.return_value.load_finished_at = 3
+
+        def abort(*args):
+            # NOTE: ResultConsumer.wait_and_abort() stores the summary of
+            #       the task while the workload is still running
+            status[0] = consts.TaskStatus.ABORTED
+            task.update_status(consts.TaskStatus.ABORTED)
+
+        fake_runner = mock_scenario_runner.get.return_value.return_value
+        fake_runner.run.side_effect = abort
+        eng = engine.TaskEngine({"a.task": [{"runner": {"type": "a"}}]},
+                                task)
+
+        eng.run()
+
+        self.assertEqual(
+            [mock.call(consts.TaskStatus.RUNNING),
+             mock.call(consts.TaskStatus.ABORTED),
+             mock.call(consts.TaskStatus.ABORTED, load_duration=2)],
+            task.update_status.mock_calls)
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test_abort(self, mock_task_config):
+        task = mock.MagicMock()
+        eng = engine.TaskEngine({}, task)
+        eng.abort()
+        task.abort.assert_called_once_with(soft=False)
+
+        eng.result_consumers = [mock.MagicMock(), mock.MagicMock()]
+        eng.abort()
+        for result_consumer in eng.result_consumers:
+            result_consumer.abort.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test_abort_soft(self, mock_task_config):
+        task = mock.MagicMock()
+        eng = engine.TaskEngine({}, task)
+        eng.result_consumers = [mock.MagicMock()]
+
+        eng.abort(soft=True)
+
+        task.abort.assert_called_once_with(soft=True)
+        self.assertFalse(eng.result_consumers[0].abort.called)
+
+    def _make_v2_config(self, run_in_parallel):
+        return {"version": 2, "title": "foo",
+                "subtasks": [
+                    {"title": name, "run_in_parallel": parallel,
+                     "workloads": [{"name": name,
+                                    "runner": {"type": "a"}}]}
+                    for name, parallel in zip(("a.task", "b.task", "c.task",
+                                               "d.task"),
+                                              run_in_parallel)]}
+
+    def test__group_subtasks(self):
+        eng = engine.TaskEngine(
+            self._make_v2_config([True, True, False, True]), mock.Mock())
+        self.assertEqual(
+            [["a.task", "b.task"], ["c.task"], ["d.task"]],
+            [[s.title for s in group] for group in eng._group_subtasks()])
+
+        eng = engine.TaskEngine(
+            self._make_v2_config([False, True, True, True]), mock.Mock())
+        self.assertEqual(
+            [["a.task"], ["b.task", "c.task", "d.task"]],
+            [[s.title for s in group] for group in eng._group_subtasks()])
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_in_parallel(
+            self, mock_scenario_runner, mock_scenario,
+            mock_context_manager_setup, mock_context_manager_cleanup,
+            mock_result_consumer, mock_task_get_status):
+        task = mock.MagicMock()
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_result_consumer.side_effect = [
+            mock.Mock(load_started_at=1, load_finished_at=3),
+            mock.Mock(load_started_at=2, load_finished_at=4),
+            mock.Mock(load_started_at=5, load_finished_at=6)]
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        started = threading.Event()
+        running = []
+
+        def run(name, context, args):
+            # NOTE: the first two subtasks are run concurrently, so both
+            #       of them are running when the event is set
+            running.append(name)
+            if len(running) == 2:
+                started.set()
+            started.wait(5)
+
+        def get_runner(config):
+            runner_obj = mock.MagicMock()
+            runner_obj.run.side_effect = run
+            return runner_obj
+
+        eng = engine.TaskEngine(
+            self._make_v2_config([True, True, False]), task)
+        eng._get_runner = get_runner
+
+        eng.run()
+
+        self.assertTrue(started.is_set())
+        self.assertEqual({"a.task", "b.task"}, set(running[:2]))
+        self.assertEqual("c.task", running[2])
+        self.assertEqual(3, mock_result_consumer.call_count)
+        self.assertEqual([], eng.result_consumers)
+        task.update_status.assert_has_calls([
+            mock.call(consts.TaskStatus.RUNNING),
+            mock.call(consts.TaskStatus.FINISHED, load_duration=4)])
+
+    def test__get_load_duration(self):
+        self.assertEqual(0, engine.TaskEngine._get_load_duration([]))
+        consumers = [mock.Mock(load_started_at=1, load_finished_at=3),
+                     mock.Mock(load_started_at=2, load_finished_at=5)]
+        self.assertEqual(4, engine.TaskEngine._get_load_duration(consumers))
+        consumers = [mock.Mock(load_started_at=float("inf"),
+                               load_finished_at=0)]
+        self.assertEqual(0, engine.TaskEngine._get_load_duration(consumers))
+
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test_run_in_parallel_aborted(self, mock__run_workload,
+                                     mock_result_consumer):
+        task = mock.MagicMock()
+        mock_result_consumer.is_task_in_aborting_status.side_effect = [
+            False, True]
+        eng = engine.TaskEngine(
+            self._make_v2_config([True, True, False]), task)
+
+        eng.run()
+
+        self.assertEqual(1, mock__run_workload.call_count)
+        self.assertEqual(mock.call(consts.TaskStatus.ABORTED,
+                                   load_duration=0),
+                         task.update_status.mock_calls[-1])
+
+    @mock.patch("rally.task.engine.SharedContext.get_key")
+    @mock.patch("rally.task.engine.TaskEngine._prepare_context")
+    def test__find_context_reuse(self, mock_task_engine__prepare_context,
+                                 mock_shared_context_get_key):
+        mock_task_engine__prepare_context.side_effect = (
+            lambda ctx, name, credential: name)
+
+        def get_workload_ids(eng):
+            return [id(s.workloads[0]) for s in eng.config.subtasks]
+
+        keys = {"a.task": "k1", "b.task": "k1",
+                "c.task": "k1", "d.task": "k1"}
+        mock_shared_context_get_key.side_effect = keys.get
+        eng = engine.TaskEngine(
+            self._make_v2_config([False, False, True, True]), mock.Mock())
+        a, b, c, d = get_workload_ids(eng)
+        self.assertEqual({a: (False, True), b: (True, False)},
+                         eng._find_context_reuse())
+
+        keys["a.task"] = "k2"
+        eng = engine.TaskEngine(
+            self._make_v2_config([False, False, False, False]), mock.Mock())
+        a, b, c, d = get_workload_ids(eng)
+        self.assertEqual({a: (False, False), b: (False, True),
+                          c: (True, True), d: (True, False)},
+                         eng._find_context_reuse())
+
+        keys.pop("c.task")
+        mock_shared_context_get_key.side_effect = (
+            lambda name: keys[name])
+        eng = engine.TaskEngine(
+            self._make_v2_config([False, False, False, False]), mock.Mock())
+        a, b, c, d = get_workload_ids(eng)
+        self.assertEqual({a: (False, False), b: (False, False),
+                          d: (False, False)},
+                         eng._find_context_reuse())
+
+    @mock.patch("rally.task.engine.SharedContext")
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_in_shared_context(self, mock_task_config,
+                                    mock_shared_context):
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                cleanup_between_workloads=False)
+        shared = mock_shared_context.return_value
+        workload = engine.Workload({"name": "a.task", "args": {"a": 1}})
+        runner_obj = mock.MagicMock()
+
+        eng._run_in_shared_context(workload, runner_obj, "ctx1", False, True)
+        mock_shared_context.assert_called_once_with("ctx1", False)
+        shared.setup.assert_called_once_with()
+        shared.start_workload.assert_called_once_with("ctx1")
+        runner_obj.run.assert_called_once_with(
+            "a.task", shared.start_workload.return_value, {"a": 1})
+        shared.finish_workload.assert_called_once_with()
+        self.assertFalse(shared.cleanup.called)
+        self.assertEqual(shared, eng._shared_context)
+
+        shared.start_workload.reset_mock()
+        runner_obj.run.side_effect = TestException
+        self.assertRaises(TestException, eng._run_in_shared_context,
+                          workload, runner_obj, "ctx2", True, False)
+        self.assertEqual(1, mock_shared_context.call_count)
+        shared.start_workload.assert_called_once_with("ctx2")
+        self.assertEqual(2, shared.finish_workload.call_count)
+        shared.cleanup.assert_called_once_with()
+        self.assertIsNone(eng._shared_context)
+
+    @mock.patch("rally.task.engine.SharedContext")
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__run_in_shared_context_setup_fails(self, mock_task_config,
+                                                mock_shared_context):
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock())
+        shared = mock_shared_context.return_value
+        shared.setup.side_effect = [TestException, None]
+        workload = engine.Workload({"name": "a.task"})
+        runner_obj = mock.MagicMock()
+
+        self.assertRaises(TestException, eng._run_in_shared_context,
+                          workload, runner_obj, "ctx1", False, True)
+        self.assertIsNone(eng._shared_context)
+        self.assertFalse(runner_obj.run.called)
+
+        eng._run_in_shared_context(workload, runner_obj, "ctx2", True, True)
+        mock_shared_context.assert_called_with("ctx2", True)
+        self.assertEqual(shared, eng._shared_context)
+        runner_obj.run.assert_called_once_with(
+            "a.task", shared.start_workload.return_value, {})
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.SharedContext")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_with_shared_context(
+            self, mock_scenario_runner, mock_scenario, mock_context_manager,
+            mock_shared_context, mock_result_consumer, mock_task_get_status):
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_result_consumer.return_value.load_started_at = 1
+        mock_result_consumer.return_value.load_finished_at = 2
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        mock_shared_context.get_key.side_effect = (
+            lambda ctx: "k2" if ctx["scenario_name"] == "d.task" else "k1")
+        task = mock.MagicMock()
+        eng = engine.TaskEngine(
+            self._make_v2_config([False, False, False, False]), task)
+
+        eng.run()
+
+        mock_shared_context.assert_called_once_with(mock.ANY, True)
+        shared = mock_shared_context.return_value
+        self.assertEqual(3, shared.start_workload.call_count)
+        shared.cleanup.assert_called_once_with()
+        self.assertIsNone(eng._shared_context)
+        mock_context_manager.assert_called_once_with(mock.ANY)
+        self.assertEqual(
+            "d.task", mock_context_manager.call_args[0][0]["scenario_name"])
+
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.scenario.Scenario.get")
     def test__prepare_context(self, mock_scenario_get, mock_task_config):
@@ -482,6 +804,20 @@ class TaskEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    def setUp(self):
+        super(ResultConsumerTestCase, self).setUp()
+        patcher = mock.patch(
+            "rally.task.engine.objects.task.ResultAggregator")
+        self.mock_result_aggregator = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_runner(self, sla_in_workers=False, **kwargs):
+        runner = mock.MagicMock(worker_sla_results=collections.deque(),
+                                worker_stats_results=collections.deque(),
+                                **kwargs)
+        runner.check_sla_in_workers.return_value = sla_in_workers
+        return runner
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -493,7 +829,7 @@ class ResultConsumerTestCase(test.TestCase):
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
-        runner = mock.MagicMock()
+        runner = self._get_runner()
 
         results = [
             [{"duration": 1, "timestamp": 3}],
@@ -509,9 +845,75 @@ class ResultConsumerTestCase(test.TestCase):
             mock.call({"duration": 1, "timestamp": 3}),
             mock.call({"duration": 2, "timestamp": 2})])
 
-        self.assertEqual([{"duration": 2, "timestamp": 2},
-                          {"duration": 1, "timestamp": 3}],
-                         consumer_obj.results)
+        task.create_result.assert_called_once_with(
+            key, {"raw": [], "load_duration": 0, "full_duration": 0,
+                  "sla": []})
+        task.append_result_iterations.assert_called_once_with(
+            task.create_result.return_value, 0,
+            [{"duration": 2, "timestamp": 2},
+             {"duration": 1, "timestamp": 3}])
+        self.assertEqual(2, consumer_obj.iterations_count)
+        self.assertEqual([], consumer_obj.chunk)
+        aggregator = self.mock_result_aggregator.return_value
+        aggregator.add_iteration.assert_has_calls([
+            mock.call({"duration": 1, "timestamp": 3}),
+            mock.call({"duration": 2, "timestamp": 2})])
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_by_chunks(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = self._get_runner()
+        runner.result_queue = collections.deque(
+            [[{"duration": 1, "timestamp": 3},
+              {"duration": 1, "timestamp": 1}],
+             [{"duration": 1, "timestamp": 2}]])
+
+        consumer_obj = engine.ResultConsumer(key, task, runner, False)
+        consumer_obj.ITERATIONS_CHUNK_SIZE = 2
+        with consumer_obj:
+            pass
+
+        result_id = task.create_result.return_value
+        self.assertEqual(
+            [mock.call(result_id, 0, [{"duration": 1, "timestamp": 1},
+                                      {"duration": 1, "timestamp": 3}]),
+             mock.call(result_id, 1, [{"duration": 1, "timestamp": 2}])],
+            task.append_result_iterations.call_args_list)
+        self.assertEqual(3, consumer_obj.iterations_count)
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_flushes_chunk_by_interval(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = self._get_runner(result_queue=collections.deque(),
+                                  results_available=threading.Event())
+
+        consumer_obj = engine.ResultConsumer(key, task, runner, False)
+        consumer_obj.CHUNK_FLUSH_INTERVAL = 0.01
+        with consumer_obj:
+            runner.result_queue.append([{"duration": 1, "timestamp": 3}])
+            runner.results_available.set()
+            for i in range(1000):
+                if task.append_result_iterations.called:
+                    break
+                time.sleep(0.01)
+            task.append_result_iterations.assert_called_once_with(
+                task.create_result.return_value, 0,
+                [{"duration": 1, "timestamp": 3}])
+            self.assertTrue(consumer_obj.thread.is_alive())
+
+        self.assertEqual(1, task.append_result_iterations.call_count)
 
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.engine.time.time")
@@ -529,21 +931,21 @@ class ResultConsumerTestCase(test.TestCase):
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
-        runner = mock.MagicMock()
+        runner = self._get_runner()
 
         results = []
         runner.result_queue = collections.deque(results)
         with engine.ResultConsumer(
                 key, task, runner, False):
             pass
-        task.append_results.assert_has_calls([mock.call(
-            key, {
-                "raw": [],
-                "full_duration": 1,
-                "sla": mock_sla_results,
-                "load_duration": 0
-            }
-        )], any_order=True)
+        data = {"raw": [], "full_duration": 1, "sla": mock_sla_results,
+                "load_duration": 0}
+        aggregator = self.mock_result_aggregator.return_value
+        aggregator.aggregates.assert_called_once_with(data)
+        task.update_result.assert_called_once_with(
+            task.create_result.return_value, data,
+            aggregator.aggregates.return_value)
+        self.assertFalse(task.append_result_iterations.called)
 
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -557,7 +959,7 @@ class ResultConsumerTestCase(test.TestCase):
                                                        False]
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
-        runner = mock.MagicMock()
+        runner = self._get_runner()
 
         runner.result_queue = collections.deque(
             [[{"duration": 1, "timestamp": 1},
@@ -575,7 +977,7 @@ class ResultConsumerTestCase(test.TestCase):
     def test_consume_results_abort_manually(self, mock_sla_checker,
                                             mock_event, mock_thread,
                                             mock_task_get_status):
-        runner = mock.MagicMock(result_queue=False)
+        runner = self._get_runner(result_queue=False)
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -607,7 +1009,7 @@ class ResultConsumerTestCase(test.TestCase):
                                                        False]
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
-        runner = mock.MagicMock()
+        runner = self._get_runner()
         runner.result_queue = collections.deque(
             [[{"duration": 1, "timestamp": 4}]] * 4)
 
@@ -627,7 +1029,7 @@ class ResultConsumerTestCase(test.TestCase):
         mock_sla_checker.return_value = mock_sla_instance
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
-        runner = mock.MagicMock()
+        runner = self._get_runner()
         runner.result_queue = collections.deque([1])
         exc = TestException()
         try:
@@ -639,6 +1041,81 @@ class ResultConsumerTestCase(test.TestCase):
         mock_sla_instance.set_unexpected_failure.assert_has_calls(
             [mock.call(exc)])
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_sla_in_workers(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_sla_instance.merge.side_effect = [True, False]
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = self._get_runner(sla_in_workers=True)
+        runner.result_queue = collections.deque(
+            [[{"duration": 1, "timestamp": 3}],
+             [{"duration": 2, "timestamp": 2}]])
+        runner.worker_sla_results.extend(["partial1", "partial2"])
+        runner.worker_stats_results.extend(["stats1", "stats2"])
+
+        with engine.ResultConsumer(key, task, runner, True) as consumer_obj:
+            pass
+
+        runner.check_sla_in_workers.assert_called_once_with(key["kw"])
+        self.assertFalse(mock_sla_instance.add_iteration.called)
+        self.assertEqual([mock.call("partial1"), mock.call("partial2")],
+                         mock_sla_instance.merge.call_args_list)
+        mock_aggregator = self.mock_result_aggregator.return_value
+        self.assertFalse(mock_aggregator.add_iteration.called)
+        self.assertEqual([mock.call("stats1"), mock.call("stats2")],
+                         mock_aggregator.merge.call_args_list)
+        mock_sla_instance.set_aborted_on_sla.assert_called_once_with()
+        runner.abort.assert_called_once_with()
+        self.assertEqual(2, consumer_obj.iterations_count)
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_waits_for_results(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = self._get_runner(result_queue=collections.deque(),
+                                  results_available=threading.Event())
+
+        with engine.ResultConsumer(key, task, runner, False) as consumer_obj:
+            runner.result_queue.append([{"duration": 1, "timestamp": 3}])
+            runner.results_available.set()
+            for i in range(1000):
+                if consumer_obj.iterations_count:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(1, consumer_obj.iterations_count)
+            self.assertTrue(consumer_obj.thread.is_alive())
+
+        self.assertFalse(consumer_obj.thread.is_alive())
+
+    @mock.patch("rally.task.engine.threading.Thread")
+    @mock.patch("rally.common.objects.Task.get_status")
+    def test_wait_and_abort_on_abort_requested(self, mock_task_get_status,
+                                               mock_thread):
+        runner = self._get_runner()
+        task = mock.MagicMock()
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+
+        res = engine.ResultConsumer(mock.MagicMock(), task, runner, True)
+        res.abort()
+        res.wait_and_abort()
+
+        self.assertTrue(res.wakeup.is_set())
+        runner.abort.assert_called_once_with()
+        task.update_status.assert_called_once_with(
+            consts.TaskStatus.ABORTED)
+        self.assertFalse(mock_task_get_status.called)
+
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
@@ -649,7 +1126,7 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_task_engine__get_runner,
             mock_sleep, mock_task_engine__prepare_context,
             mock_task_get_status, mock_event, mock_thread):
-        runner = mock.MagicMock()
+        runner = self._get_runner()
         key = mock.MagicMock()
         task = mock.MagicMock()
         mock_task_get_status.side_effect = (consts.TaskStatus.RUNNING,
@@ -676,7 +1153,7 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_task_engine__get_runner, mock_sleep,
             mock_task_engine__prepare_context, mock_task_get_status,
             mock_event, mock_thread):
-        runner = mock.MagicMock()
+        runner = self._get_runner()
         key = mock.MagicMock()
         task = mock.MagicMock()
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -694,6 +1171,109 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertEqual(4, mock_task_get_status.call_count)
 
 
+class SharedContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SharedContextTestCase, self).setUp()
+        self.managers = []
+
+        def create_manager(context_obj, names=None):
+            manager = mock.MagicMock(context_obj=context_obj, names=names)
+            self.managers.append(manager)
+            return manager
+
+        patcher = mock.patch("rally.task.engine.context.ContextManager")
+        self.mock_context_manager = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_context_manager.side_effect = create_manager
+        self.mock_context_manager.split_per_workload.side_effect = (
+            lambda config: (sorted(set(config) - {"cleanup"}),
+                            sorted(set(config) & {"cleanup"})))
+
+    def _get_context_obj(self, name, config):
+        return {"task": "task", "admin": {"credential": "admin"},
+                "scenario_name": name, "config": config}
+
+    def test_get_key(self):
+        key = engine.SharedContext.get_key(self._get_context_obj(
+            "a.task", {"users": {"tenants": 2}, "cleanup": ["nova"]}))
+        self.assertEqual(
+            key, engine.SharedContext.get_key(self._get_context_obj(
+                "b.task", {"users": {"tenants": 2}, "cleanup": ["glance"]})))
+        self.assertNotEqual(
+            key, engine.SharedContext.get_key(self._get_context_obj(
+                "a.task", {"users": {"tenants": 3}, "cleanup": ["nova"]})))
+
+    def test_workloads(self):
+        context_obj = self._get_context_obj(
+            "a.task", {"users": {}, "cleanup": ["nova"]})
+        shared = engine.SharedContext(context_obj)
+        self.assertEqual(1, len(self.managers))
+        self.assertIs(context_obj, self.managers[0].context_obj)
+        self.assertEqual(["users"], self.managers[0].names)
+
+        shared.setup()
+        self.managers[0].setup.assert_called_once_with()
+
+        context_obj["users"] = ["user"]
+        workload_obj = shared.start_workload(self._get_context_obj(
+            "b.task", {"users": {}, "cleanup": ["glance"]}))
+        self.assertEqual(
+            {"task": "task", "admin": {"credential": "admin"},
+             "scenario_name": "b.task", "users": ["user"],
+             "config": {"users": {}, "cleanup": ["glance"]},
+             "shared_context": True},
+            workload_obj)
+        self.assertIs(workload_obj, self.managers[1].context_obj)
+        self.assertEqual(["cleanup"], self.managers[1].names)
+        self.managers[1].setup.assert_called_once_with()
+
+        shared.finish_workload()
+        self.managers[1].cleanup.assert_called_once_with()
+        self.assertFalse(self.managers[0].cleanup.called)
+
+        shared.cleanup()
+        self.managers[0].cleanup.assert_called_once_with()
+        self.managers[1].cleanup.assert_called_once_with()
+
+    def test_workloads_without_cleanup_between_workloads(self):
+        shared = engine.SharedContext(
+            self._get_context_obj("a.task", {"users": {}}),
+            cleanup_between_workloads=False)
+        for name in ("a.task", "b.task"):
+            shared.start_workload(
+                self._get_context_obj(name, {"users": {}, "cleanup": []}))
+            shared.finish_workload()
+        for manager in self.managers:
+            self.assertFalse(manager.cleanup.called)
+
+        calls = []
+        for idx, manager in enumerate(self.managers):
+            manager.cleanup.side_effect = functools.partial(calls.append,
+                                                            idx)
+        shared.cleanup()
+        self.assertEqual([2, 1, 0], calls)
+
+    def test_setup_fails(self):
+        shared = engine.SharedContext(
+            self._get_context_obj("a.task", {"users": {}}))
+        self.managers[0].setup.side_effect = TestException
+        self.assertRaises(TestException, shared.setup)
+        self.managers[0].cleanup.assert_called_once_with()
+
+    def test_start_workload_fails(self):
+        shared = engine.SharedContext(
+            self._get_context_obj("a.task", {"users": {}}))
+        self.mock_context_manager.side_effect = None
+        manager = self.mock_context_manager.return_value
+        manager.setup.side_effect = TestException
+        self.assertRaises(TestException, shared.start_workload,
+                          self._get_context_obj("a.task", {"users": {}}))
+        manager.cleanup.assert_called_once_with()
+        shared.cleanup()
+        self.assertEqual(1, manager.cleanup.call_count)
+
+
 class TaskTestCase(test.TestCase):
     @mock.patch("jsonschema.validate")
     def test_validate_json(self, mock_validate):
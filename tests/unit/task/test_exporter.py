@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally import exceptions
 from rally.task import exporter
 from tests.unit import test
 
@@ -32,4 +33,8 @@ class ExporterTestCase(test.TestCase):
         self.assertRaises(TypeError, exporter.TaskExporter, "fake_connection")
 
     def test_task_export_instantiate(self):
-        TestExporter("fake_connection")
\ No newline at end of file
+        TestExporter("fake_connection")
+
+    def test_task_export_load(self):
+        self.assertRaises(exceptions.RallyException,
+                          TestExporter("fake_connection").load)
@@ -14,10 +14,14 @@
 #    under the License.
 
 import collections
+import copy
 import multiprocessing
+import time
 
 import ddt
 import mock
+from six.moves import cPickle as pickle
+from six.moves import queue as Queue
 
 from rally.plugins.common.runners import serial
 from rally.task import runner
@@ -49,7 +53,10 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
 
     @mock.patch(BASE + "context.ContextManager")
     def test_get_scenario_context(self, mock_context_manager):
+        self.addCleanup(setattr, runner, "_scenario_context_manager", None)
+        runner._scenario_context_manager = None
         mock_context_obj = {}
+        mock_context_manager.return_value.context_obj = mock_context_obj
         mock_map_for_scenario = (
             mock_context_manager.return_value.map_for_scenario)
 
@@ -58,9 +65,14 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
             mock_map_for_scenario.return_value,
             result
         )
+        runner._get_scenario_context(14, mock_context_obj)
 
-        mock_context_manager.assert_called_once_with({"iteration": 13})
-        mock_map_for_scenario.assert_called_once_with()
+        mock_context_manager.assert_called_once_with(mock_context_obj)
+        self.assertEqual([mock.call(13), mock.call(14)],
+                         mock_map_for_scenario.call_args_list)
+
+        runner._get_scenario_context(1, {})
+        self.assertEqual(2, mock_context_manager.call_count)
 
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
@@ -132,6 +144,299 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+class ScenarioContextOverheadTestCase(test.TestCase):
+    """Overhead of scenario context mapping.
+
+    The wall time is measured by tests/ci/runner_benchmark.py.
+    """
+
+    ITERATIONS = 200
+
+    def _get_context(self, tenants, users_per_tenant=10):
+        context_obj = {
+            "task": {"uuid": "foo"},
+            "admin": {"credential": None},
+            "config": {"users": {"user_choice_method": "round_robin"}},
+            "users": [],
+            "tenants": {}}
+        for t in range(tenants):
+            tenant_id = "tenant-%d" % t
+            users = [{"id": "user-%d-%d" % (t, u), "tenant_id": tenant_id,
+                      "credential": {"username": "user-%d-%d" % (t, u),
+                                     "password": "secret"}}
+                     for u in range(users_per_tenant)]
+            context_obj["users"].extend(users)
+            context_obj["tenants"][tenant_id] = {
+                "id": tenant_id, "name": tenant_id, "users": users,
+                "networks": [{"id": "net-%d-%d" % (t, n), "subnets": ["s"]}
+                             for n in range(2)],
+                "images": ["image-%d-%d" % (t, i) for i in range(2)],
+                "servers": ["server-%d-%d" % (t, s) for s in range(5)]}
+        return context_obj
+
+    @mock.patch("rally.task.context.copy")
+    def test_copy_does_not_depend_on_tenants_amount(self, mock_copy):
+        mock_copy.deepcopy.side_effect = copy.deepcopy
+        copied = []
+        for tenants in (10, 1000):
+            context_obj = self._get_context(tenants)
+            for i in range(self.ITERATIONS):
+                scenario_context = runner._get_scenario_context(i,
+                                                                context_obj)
+            tenant_id = sorted(context_obj["tenants"])[
+                (self.ITERATIONS - 1) % tenants]
+            self.assertEqual(tenant_id, scenario_context["tenant"]["id"])
+            self.assertNotIn("tenants", scenario_context)
+
+            # NOTE: deep copy of the whole context makes the overhead of
+            #       each iteration grow linearly with the amount of tenants
+            self.assertEqual(self.ITERATIONS, mock_copy.deepcopy.call_count)
+            copied.append(mock_copy.deepcopy.call_args_list[0][0][0])
+            mock_copy.deepcopy.reset_mock()
+
+        self.assertNotIn("tenants", copied[0])
+        self.assertNotIn("users", copied[0])
+        self.assertEqual(copied[0], copied[1])
+
+
+def _make_result(**kwargs):
+    result = {"duration": 1.0, "timestamp": 2.0, "idle_duration": 0.0,
+              "error": [], "output": {"additive": [], "complete": []},
+              "atomic_actions": collections.OrderedDict()}
+    result.update(kwargs)
+    return result
+
+
+@ddt.ddt
+class ResultPackingTestCase(test.TestCase):
+
+    @ddt.data(
+        [],
+        [_make_result()],
+        [_make_result(duration=0.5, timestamp=1475000000.123456,
+                      idle_duration=0.25)],
+        [_make_result(error=["Exception", "foo", "trace"]),
+         _make_result(),
+         _make_result(error=["Exception", "foo", "trace"]),
+         _make_result(error=["ValueError", "bar", "trace"])],
+        [_make_result(atomic_actions=collections.OrderedDict(
+            [("foo", 1.5), ("bar", 0.5)])),
+         _make_result(atomic_actions=collections.OrderedDict(
+             [("bar", 0.1), ("baz", 0.2)]))],
+        [_make_result(output={"additive": [{"title": "foo"}],
+                              "complete": []}),
+         _make_result(scheduled_timestamp=1.5)])
+    def test_pack_unpack(self, results):
+        packer = runner._ResultPacker()
+        for result in results:
+            packer.add(result)
+        self.assertEqual(len(results), packer.count)
+
+        packed = packer.pop()
+
+        self.assertEqual(0, packer.count)
+        unpacked = list(runner._unpack_results(packed))
+        self.assertEqual(results, unpacked)
+        for result, unpacked_result in zip(results, unpacked):
+            self.assertEqual(list(result["atomic_actions"]),
+                             list(unpacked_result["atomic_actions"]))
+
+    def test_pack_interns_names_and_errors(self):
+        packer = runner._ResultPacker()
+        error = ["Exception", "foo", "trace"]
+        for i in range(10):
+            packer.add(_make_result(
+                error=error, atomic_actions={"foo": 1.0, "bar": 2.0}))
+
+        packed = packer.pop()
+
+        self.assertEqual([error], packed.errors)
+        self.assertEqual(["bar", "foo"], sorted(packed.names))
+        self.assertEqual(
+            10 * (runner._PACKED_RESULT.size +
+                  2 * runner._PACKED_ATOMIC_ACTION.size),
+            len(packed.data))
+
+    def test_packed_results_are_smaller(self):
+        packer = runner._ResultPacker()
+        results = [_make_result(
+            timestamp=float(i),
+            atomic_actions=collections.OrderedDict(
+                [("nova.boot_server", 1.0), ("nova.delete_server", 2.0)]))
+            for i in range(100)]
+        for result in results:
+            packer.add(result)
+
+        packed_size = len(pickle.dumps(packer.pop(), 2))
+        pickled_size = sum(len(pickle.dumps(r, 2)) for r in results)
+        self.assertLess(packed_size * 4, pickled_size)
+
+
+class ResultPackingQueueTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ResultPackingQueueTestCase, self).setUp()
+        self.queue = mock.Mock()
+        self.packing_queue = runner._ResultPackingQueue(self.queue, "uuid",
+                                                        2, 100)
+        self.addCleanup(self.packing_queue.close)
+
+    def _get_put_results(self):
+        results = []
+        for call in self.queue.put.call_args_list:
+            item = call[0][0]
+            if isinstance(item, runner._PackedResults):
+                results.append(list(runner._unpack_results(item)))
+            elif isinstance(item, runner._WorkerFinished):
+                results.append("finished")
+            else:
+                results.append(item)
+        return results
+
+    def test_put(self):
+        results = [_make_result(timestamp=float(i)) for i in range(5)]
+        for result in results:
+            self.packing_queue.put(result)
+
+        self.assertEqual([results[0:2], results[2:4]],
+                         self._get_put_results())
+
+        self.packing_queue.close()
+        self.assertEqual([results[0:2], results[2:4], results[4:],
+                          "finished"],
+                         self._get_put_results())
+
+    def test_put_not_a_result(self):
+        result = _make_result()
+        self.packing_queue.put(result)
+        self.packing_queue.put("checker")
+        self.packing_queue.put("checker")
+
+        self.assertEqual([[result], "checker", "checker"],
+                         self._get_put_results())
+
+    @mock.patch(BASE + "LOG")
+    def test_put_invalid_result(self, mock_log):
+        self.packing_queue.put(_make_result(duration=1))
+        self.packing_queue.close()
+
+        self.assertEqual(["finished"], self._get_put_results())
+        self.assertTrue(mock_log.warning.called)
+
+    def test_flush_periodically(self):
+        self.packing_queue.close()
+        self.queue.reset_mock()
+        packing_queue = runner._ResultPackingQueue(self.queue, "uuid",
+                                                   100, 0.001)
+        self.addCleanup(packing_queue.close)
+        result = _make_result()
+        packing_queue.put(result)
+
+        for i in range(1000):
+            if self.queue.put.called:
+                break
+            time.sleep(0.01)
+        self.assertEqual([[result]], self._get_put_results())
+
+    @mock.patch(BASE + "_ResultPackingQueue")
+    def test__worker_with_result_packing(self, mock___result_packing_queue):
+        worker_process = mock.Mock(side_effect=ValueError)
+
+        self.assertRaises(ValueError, runner._worker_with_result_packing,
+                          worker_process, "uuid", 2, 1, "queue", "a", b="b")
+
+        mock___result_packing_queue.assert_called_once_with(
+            "queue", "uuid", 2, 1)
+        packing_queue = mock___result_packing_queue.return_value
+        worker_process.assert_called_once_with(packing_queue, "a", b="b")
+        packing_queue.close.assert_called_once_with()
+
+
+class SLAAggregatingQueueTestCase(test.TestCase):
+
+    @mock.patch(BASE + "time.time")
+    @mock.patch(BASE + "objects.task.ResultAggregator")
+    @mock.patch(BASE + "sla.SLAChecker")
+    def test_put(self, mock_sla_checker, mock_result_aggregator, mock_time):
+        mock_time.side_effect = [0, 0.5, 1, 1, 1.5, 2]
+        checkers = [mock.Mock(), mock.Mock(), mock.Mock()]
+        mock_sla_checker.side_effect = checkers
+        aggregators = [mock.Mock(), mock.Mock(), mock.Mock()]
+        mock_result_aggregator.side_effect = aggregators
+        queue = mock.Mock()
+        r1, r2, r3 = [_make_result(duration=float(i)) for i in range(3)]
+
+        aggregating_queue = runner._SLAAggregatingQueue(queue, "foo_uuid",
+                                                        "config", 1)
+        aggregating_queue.put(r1)
+        aggregating_queue.put(r2)
+        aggregating_queue.put(r3)
+
+        self.assertEqual(
+            [mock.call(r1), mock.call(r2), mock.call(checkers[0]),
+             mock.call(aggregators[0]), mock.call(r3)],
+            queue.put.call_args_list)
+        checkers[0].add_iteration.assert_has_calls(
+            [mock.call(r1), mock.call(r2)])
+        checkers[1].add_iteration.assert_called_once_with(r3)
+        aggregators[0].add_iteration.assert_has_calls(
+            [mock.call(r1), mock.call(r2)])
+        aggregators[1].add_iteration.assert_called_once_with(r3)
+        self.assertEqual(1, aggregating_queue.count)
+        self.assertEqual([mock.call("config")] * 2,
+                         mock_sla_checker.call_args_list)
+
+    @mock.patch(BASE + "objects.task.ResultAggregator")
+    @mock.patch(BASE + "sla.SLAChecker")
+    def test_put_invalid_result(self, mock_sla_checker,
+                                mock_result_aggregator):
+        queue = mock.Mock()
+        aggregating_queue = runner._SLAAggregatingQueue(queue, "foo_uuid",
+                                                        "config", 10)
+
+        aggregating_queue.put(_make_result(duration="foo"))
+        aggregating_queue.put({"duration": 1.0})
+
+        self.assertFalse(queue.put.called)
+        self.assertFalse(
+            mock_sla_checker.return_value.add_iteration.called)
+        self.assertFalse(
+            mock_result_aggregator.return_value.add_iteration.called)
+        self.assertEqual(0, aggregating_queue.count)
+
+    @mock.patch(BASE + "objects.task.ResultAggregator")
+    @mock.patch(BASE + "sla.SLAChecker")
+    def test_flush(self, mock_sla_checker, mock_result_aggregator):
+        queue = mock.Mock()
+        aggregating_queue = runner._SLAAggregatingQueue(queue, "foo_uuid",
+                                                        "config", 10)
+
+        aggregating_queue.flush()
+        self.assertFalse(queue.put.called)
+
+        aggregating_queue.count = 1
+        checker = aggregating_queue.sla_checker
+        aggregator = aggregating_queue.aggregator
+        aggregating_queue.flush()
+        self.assertEqual([mock.call(checker), mock.call(aggregator)],
+                         queue.put.call_args_list)
+        self.assertEqual(0, aggregating_queue.count)
+
+    @mock.patch(BASE + "_SLAAggregatingQueue")
+    def test__worker_with_sla(self, mock__sla_aggregating_queue):
+        worker_process = mock.Mock(side_effect=ValueError)
+
+        self.assertRaises(ValueError, runner._worker_with_sla,
+                          worker_process, "foo_uuid", "config", 1, "queue",
+                          "a", b="b")
+
+        mock__sla_aggregating_queue.assert_called_once_with(
+            "queue", "foo_uuid", "config", 1)
+        aggregating_queue = mock__sla_aggregating_queue.return_value
+        worker_process.assert_called_once_with(aggregating_queue, "a", b="b")
+        aggregating_queue.flush.assert_called_once_with()
+
+
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -212,6 +517,158 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertEqual(processes, process.join.call_count)
         mock_result_queue.close.assert_called_once_with()
 
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_blocks_on_queue(
+            self, mock_scenario_runner__send_result):
+        process = mock.MagicMock(
+            is_alive=mock.MagicMock(side_effect=[True, True, False]))
+        process_pool = collections.deque([process])
+        mock_result_queue = mock.MagicMock(
+            empty=mock.MagicMock(return_value=True),
+            get=mock.MagicMock(side_effect=[{"duration": 1}, Queue.Empty]))
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(process_pool, mock_result_queue)
+
+        self.assertEqual(
+            [mock.call(timeout=runner_obj.PROCESS_CHECK_INTERVAL)] * 2,
+            mock_result_queue.get.call_args_list)
+        mock_scenario_runner__send_result.assert_called_once_with(
+            {"duration": 1})
+        process.join.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_finished_workers(
+            self, mock_scenario_runner__send_result):
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=True))
+        process_pool = collections.deque([process] * 2)
+        mock_result_queue = mock.MagicMock(
+            empty=mock.MagicMock(side_effect=[False, True, True]),
+            get=mock.MagicMock(side_effect=[
+                {"duration": 1}, runner._WorkerFinished(),
+                runner._WorkerFinished()]))
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(process_pool, mock_result_queue)
+
+        mock_scenario_runner__send_result.assert_called_once_with(
+            {"duration": 1})
+        self.assertEqual(2, process.join.call_count)
+        self.assertEqual(3, mock_result_queue.get.call_count)
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_with_sla_aggregates(
+            self, mock_scenario_runner__send_result):
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        process_pool = collections.deque([process])
+        partial = runner.sla.SLAChecker({"sla": {}})
+        stats = runner.objects.task.ResultAggregator()
+        mock_result_queue = mock.MagicMock(
+            empty=mock.MagicMock(side_effect=[False, False, False, True]),
+            get=mock.MagicMock(side_effect=[{"duration": 1}, partial,
+                                            stats]))
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(process_pool, mock_result_queue)
+
+        mock_scenario_runner__send_result.assert_called_once_with(
+            {"duration": 1})
+        self.assertEqual([partial], list(runner_obj.worker_sla_results))
+        self.assertEqual([stats], list(runner_obj.worker_stats_results))
+        self.assertTrue(runner_obj.results_available.is_set())
+
+    @ddt.data(
+        {"supported": False, "config": {"worker_sla": True},
+         "expected": False},
+        {"supported": True, "config": {}, "expected": False},
+        {"supported": True, "config": {"worker_sla": False},
+         "expected": False},
+        {"supported": True, "config": {"worker_sla": True},
+         "expected": True})
+    @ddt.unpack
+    def test_check_sla_in_workers(self, supported, config, expected):
+        runner_obj = self._get_runner(config=config)
+        runner_obj.WORKER_SLA_SUPPORTED = supported
+
+        self.assertEqual(expected,
+                         runner_obj.check_sla_in_workers({"sla": {}}))
+        self.assertEqual({"sla": {}} if expected else None,
+                         runner_obj.worker_sla_config)
+
+    @mock.patch(BASE + "multiprocessing.Process")
+    def test__create_process_pool_with_worker_sla(self, mock_process):
+        runner_obj = self._get_runner(task={"uuid": "foo_uuid"},
+                                      config={"worker_sla": True})
+        runner_obj.WORKER_SLA_SUPPORTED = True
+        runner_obj.check_sla_in_workers({"sla": {}})
+
+        def worker_process(queue, i):
+            pass
+
+        runner_obj._create_process_pool(1, worker_process, iter([("q", 1)]))
+
+        target = mock_process.call_args[1]["target"]
+        self.assertEqual(runner._worker_with_result_packing, target.func)
+        target = target.args[0]
+        self.assertEqual(runner._worker_with_sla, target.func)
+        self.assertEqual(
+            (worker_process, "foo_uuid", {"sla": {}},
+             runner_obj.WORKER_SLA_FLUSH_INTERVAL), target.args)
+        self.assertEqual(("q", 1), mock_process.call_args[1]["args"])
+
+    @mock.patch(BASE + "multiprocessing.Process")
+    def test__create_process_pool_with_result_packing(self, mock_process):
+        runner_obj = self._get_runner(task={"uuid": "foo_uuid"})
+
+        def worker_process(queue, i):
+            pass
+
+        runner_obj._create_process_pool(1, worker_process, iter([("q", 1)]))
+
+        target = mock_process.call_args[1]["target"]
+        self.assertEqual(runner._worker_with_result_packing, target.func)
+        self.assertEqual(
+            (worker_process, "foo_uuid",
+             runner_obj.RESULT_PACKING_BATCH_SIZE,
+             runner_obj.RESULT_PACKING_INTERVAL), target.args)
+
+        runner_obj.PACK_RESULTS = False
+        runner_obj._create_process_pool(1, worker_process, iter([("q", 1)]))
+        self.assertEqual(worker_process,
+                         mock_process.call_args[1]["target"])
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_with_packed_results(
+            self, mock_scenario_runner__send_result):
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        process_pool = collections.deque([process])
+        packer = runner._ResultPacker()
+        results = [_make_result(timestamp=float(i)) for i in range(3)]
+        for result in results:
+            packer.add(result)
+        mock_result_queue = mock.MagicMock(
+            empty=mock.MagicMock(side_effect=[False, True]),
+            get=mock.MagicMock(return_value=packer.pop()))
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(process_pool, mock_result_queue)
+
+        self.assertEqual(
+            [mock.call(r, validate=False) for r in results],
+            mock_scenario_runner__send_result.call_args_list)
+
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
             def _run_scenario(self, *args, **kwargs):
@@ -318,6 +775,7 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertIsNone(runner_._send_result(result))
         self.assertEqual([], runner_.result_batch)
         self.assertEqual(collections.deque([[result]]), runner_.result_queue)
+        self.assertTrue(runner_.results_available.is_set())
 
     @mock.patch("rally.task.runner.LOG")
     def test__send_result_with_invalid_schema(self, mock_log):
@@ -81,6 +81,18 @@ class ScenarioTestCase(test.TestCase):
             validator.assert_called_with(config, clients=clients,
                                          deployment=deployment)
 
+    def test__validate_helper_with_cache(self):
+        validators = [mock.MagicMock(), mock.MagicMock()]
+        cache = mock.MagicMock()
+        cache.call.return_value = validation.ValidationResult(True)
+        scenario.Scenario._validate_helper(validators, "cl", "config",
+                                           "deployment", cache=cache)
+        self.assertEqual(
+            [mock.call(v, "config", "cl", "deployment") for v in validators],
+            cache.call.call_args_list)
+        for validator in validators:
+            self.assertFalse(validator.called)
+
     @mock.patch("rally.task.scenario.LOG")
     def test__validate_helper_somethingwent_wrong(self, mock_log):
         validator = mock.MagicMock()
@@ -138,7 +150,7 @@ class ScenarioTestCase(test.TestCase):
         scenario.Scenario.validate("Testing.validate_admin_validators",
                                    args, admin="admin", deployment=deployment)
         mock_scenario__validate_helper.assert_called_once_with(
-            validators, "admin", args, deployment)
+            validators, "admin", args, deployment, cache=None)
 
         Testing.validate_admin_validators.unregister()
 
@@ -161,8 +173,8 @@ class ScenarioTestCase(test.TestCase):
             "Testing.validate_user_validators", args, users=["u1", "u2"])
 
         mock_scenario__validate_helper.assert_has_calls([
-            mock.call(validators, "u1", args, None),
-            mock.call(validators, "u2", args, None)
+            mock.call(validators, "u1", args, None, cache=None),
+            mock.call(validators, "u2", args, None, cache=None)
         ])
 
         Testing.validate_user_validators.unregister()
@@ -21,6 +21,7 @@ import mock
 from novaclient import exceptions as nova_exc
 import six
 
+from rally.common import objects
 from rally.common.plugin import plugin
 from rally import consts
 from rally import exceptions
@@ -55,6 +56,123 @@ class ValidationUtilsTestCase(test.TestCase):
             ("conf", "client", "deploy", "a", "b", "c", 1),
             scenario._meta_get("validators")[0]("conf", "client", "deploy"))
 
+        self.assertEqual(
+            (validator_func, repr(("a", "b", "c")), repr([("d", 1)])),
+            scenario._meta_get("validators")[0].cache_key)
+        self.assertEqual(
+            "conf", scenario._meta_get("validators")[0].cache_config("conf"))
+
+    def test_validator_cache_on(self):
+
+        @plugin.from_func()
+        def scenario():
+            pass
+
+        scenario._meta_init()
+
+        @validation.validator
+        @validation.cache_on(lambda config, a, b=None: (config["args"][a], b))
+        def validator_func(config, clients, deployment, a, b=None):
+            pass
+
+        validator_func("foo", b=2)(scenario)
+
+        self.assertEqual(
+            (1, 2),
+            scenario._meta_get("validators")[0].cache_config(
+                {"args": {"foo": 1, "bar": 3}}))
+
+
+class ValidationCacheTestCase(test.TestCase):
+
+    def _get_validator(self, cache_key="key", **kwargs):
+        validator = mock.MagicMock(**kwargs)
+        validator.cache_key = cache_key
+        validator.cache_config.side_effect = lambda config: config
+        return validator
+
+    def test_call(self):
+        cache = validation.ValidationCache()
+        validator = self._get_validator()
+        clients = mock.MagicMock()
+
+        result = cache.call(validator, {"a": 1, "b": 2}, clients, "deploy")
+        self.assertEqual(validator.return_value, result)
+        validator.assert_called_once_with({"a": 1, "b": 2}, clients=clients,
+                                          deployment="deploy")
+
+        same_validator = self._get_validator()
+        self.assertEqual(
+            result,
+            cache.call(same_validator, {"b": 2, "a": 1}, clients, "deploy"))
+        self.assertFalse(same_validator.called)
+
+        other_validator = self._get_validator(cache_key="other")
+        cache.call(other_validator, {"a": 1, "b": 2}, clients, "deploy")
+        cache.call(validator, {"a": 2}, clients, "deploy")
+        cache.call(validator, {"a": 1, "b": 2}, mock.MagicMock(), "deploy")
+        self.assertEqual(1, other_validator.call_count)
+        self.assertEqual(3, validator.call_count)
+
+    @mock.patch(MODULE + "_get_validated_image")
+    def test_call_shared_by_different_workloads(
+            self, mock__get_validated_image):
+        mock__get_validated_image.return_value = (
+            validation.ValidationResult(True), None)
+
+        @plugin.from_func()
+        def scenario():
+            pass
+
+        scenario._meta_init()
+        validation.image_exists("image")(scenario)
+        validator = scenario._meta_get("validators")[0]
+        cache = validation.ValidationCache()
+        clients = mock.MagicMock()
+
+        configs = [
+            {"args": {"image": {"name": "cirros"}, "flavor": "m1.tiny"},
+             "runner": {"type": "constant", "times": 10}},
+            {"args": {"image": {"name": "cirros"}, "flavor": "m1.small"},
+             "runner": {"type": "serial"}, "sla": {"failure_rate": {}}},
+            {"args": {"image": {"name": "fedora"}, "flavor": "m1.tiny"},
+             "runner": {"type": "constant", "times": 10}}]
+        for config in configs:
+            self.assertTrue(
+                cache.call(validator, config, clients, "deploy").is_valid)
+
+        self.assertEqual(
+            [mock.call(configs[0], clients, "image"),
+             mock.call(configs[2], clients, "image")],
+            mock__get_validated_image.call_args_list)
+
+    def test_call_same_credential(self):
+        cache = validation.ValidationCache()
+        validator = self._get_validator()
+        credential = {"auth_url": "url", "username": "user",
+                      "password": "pwd"}
+        clients = [
+            mock.MagicMock(credential=objects.Credential(
+                **credential)) for i in range(2)]
+
+        cache.call(validator, {}, clients[0], "deploy")
+        cache.call(validator, {}, clients[1], "deploy")
+        validator.assert_called_once_with({}, clients=clients[0],
+                                          deployment="deploy")
+
+    def test_call_fails(self):
+        cache = validation.ValidationCache()
+        error = ValueError("foo")
+        validator = self._get_validator(side_effect=error)
+        clients = mock.MagicMock()
+
+        for i in range(2):
+            e = self.assertRaises(ValueError, cache.call, validator, {},
+                                  clients, "deploy")
+            self.assertIs(error, e)
+        validator.assert_called_once_with({}, clients=clients,
+                                          deployment="deploy")
+
 
 @ddt.ddt
 class ValidatorsTestCase(test.TestCase):
@@ -651,6 +769,23 @@ class ValidatorsTestCase(test.TestCase):
                            None, None)
         self.assertTrue(result.is_valid, result.msg)
 
+    def test_required_runners(self):
+        validator = self._unwrap_validator(validation.required_runners,
+                                           "r1", "r2")
+        result = validator({"runner": {"type": "r2"}}, None, None)
+        self.assertTrue(result.is_valid, result.msg)
+
+        result = validator({"runner": {"type": "r3"}}, None, None)
+        self.assertFalse(result.is_valid, result.msg)
+
+        result = validator({}, None, None)
+        self.assertFalse(result.is_valid, result.msg)
+
+        validator = self._unwrap_validator(validation.required_runners,
+                                           "serial")
+        result = validator({}, None, None)
+        self.assertTrue(result.is_valid, result.msg)
+
     def test_required_openstack_with_admin(self):
         validator = self._unwrap_validator(validation.required_openstack,
                                            admin=True)
@@ -15,7 +15,10 @@
 
 """ Test for api. """
 
+import json
 import os
+import shutil
+import tempfile
 
 import ddt
 import jsonschema
@@ -174,7 +177,8 @@ class TaskAPITestCase(test.TestCase):
         mock_task_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       admin=mock_deployment_get.return_value["admin"],
-                      users=[], abort_on_sla_failure=False),
+                      users=[], abort_on_sla_failure=False,
+                      cleanup_between_workloads=True),
             mock.call().run(),
         ])
 
@@ -244,6 +248,91 @@ class TaskAPITestCase(test.TestCase):
         self.assertFalse(mock_task.get_status.called)
         self.assertFalse(mock_time.sleep.called)
 
+    def _write_results_file(self, results):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "results.json")
+        with open(path, "w") as f:
+            f.write(json.dumps(results, sort_keys=True, indent=4))
+        return path
+
+    def test_load_results(self):
+        iterations = [{"timestamp": 10 + i, "duration": i + 1.0,
+                       "idle_duration": 0, "error": [],
+                       "atomic_actions": {"foo": i + 0.5}} for i in range(3)]
+        results = [{"key": {"name": "Foo.bar", "pos": 0, "kw": {}},
+                    "result": iterations,
+                    "sla": [{"criterion": "foo", "detail": "bar",
+                             "success": True}],
+                    "load_duration": 5.0, "full_duration": 7.0}]
+        path = self._write_results_file(results)
+
+        loaded = api.Task.load_results(path)
+
+        self.assertEqual(1, len(loaded))
+        self.assertNotIsInstance(loaded[0]["result"], list)
+        self.assertEqual(iterations, list(loaded[0]["result"]))
+        self.assertEqual(iterations, list(loaded[0]["result"]))
+        for key in ("key", "sla", "load_duration", "full_duration"):
+            self.assertEqual(results[0][key], loaded[0][key])
+        self.assertEqual(3, loaded[0]["iterations_count"])
+        self.assertEqual(1.0, loaded[0]["min_duration"])
+        self.assertEqual(3.0, loaded[0]["max_duration"])
+        self.assertEqual(10, loaded[0]["tstamp_start"])
+        self.assertTrue(loaded[0]["pass_sla"])
+        self.assertEqual(["foo"], list(loaded[0]["statistics"]["atomic"]))
+
+    @ddt.data({"result": [{"duration": "foo"}]},
+              {"result": []},
+              {"load_duration": "foo"})
+    def test_load_results_invalid(self, changes):
+        result = {"key": {"name": "Foo.bar", "pos": 0, "kw": {}},
+                  "result": [{"duration": 1.0, "idle_duration": 0,
+                              "error": [], "atomic_actions": {},
+                              "timestamp": 1}],
+                  "sla": [], "load_duration": 5.0, "full_duration": 7.0}
+        result.update(changes)
+        path = self._write_results_file([result])
+        self.assertRaises(jsonschema.ValidationError,
+                          api.Task.load_results, path)
+
+    @mock.patch("rally.api.objects.Task")
+    @mock.patch("rally.api.objects.Deployment.get",
+                return_value={"uuid": "deployment_uuid"})
+    def test_import_results(self, mock_deployment_get, mock_task):
+        iterations = iter([{"duration": 1}, {"duration": 2}])
+        task_results = [{"key": "foo_key", "result": iterations,
+                         "sla": "foo_sla", "load_duration": 3,
+                         "full_duration": 4}]
+        task = api.Task.import_results("deployment", task_results,
+                                       tag="foo")
+
+        self.assertEqual(mock_task.return_value, task)
+        mock_deployment_get.assert_called_once_with("deployment")
+        mock_task.assert_called_once_with(deployment_uuid="deployment_uuid",
+                                          tag="foo")
+        task.append_results.assert_called_once_with(
+            "foo_key", {"raw": iterations, "sla": "foo_sla",
+                        "load_duration": 3, "full_duration": 4})
+        self.assertEqual(
+            [mock.call(consts.TaskStatus.RUNNING),
+             mock.call(consts.TaskStatus.FINISHED)],
+            task.update_status.call_args_list)
+
+    @mock.patch("rally.api.objects.Task")
+    @mock.patch("rally.api.objects.Deployment.get",
+                return_value={"uuid": "deployment_uuid"})
+    def test_import_results_fails(self, mock_deployment_get, mock_task):
+        task = mock_task.return_value
+        task.append_results.side_effect = ValueError("foo")
+        self.assertRaises(ValueError, api.Task.import_results,
+                          "deployment", [{"key": "foo_key", "result": [],
+                                          "sla": [], "load_duration": 3,
+                                          "full_duration": 4}])
+        task.set_failed.assert_called_once_with("ValueError", "foo",
+                                                mock.ANY)
+        task.update_status.assert_called_once_with(consts.TaskStatus.RUNNING)
+
     @mock.patch("rally.common.objects.task.db.task_delete")
     def test_delete(self, mock_task_delete):
         api.Task.delete(self.task_uuid)
@@ -257,12 +346,19 @@ class TaskAPITestCase(test.TestCase):
         mock_task_delete.assert_called_once_with(
             self.task_uuid, status=None)
 
+    @mock.patch("rally.api.objects.Task.get_summary")
+    def test_get_summary(self, mock_task_get_summary):
+        self.assertEqual(mock_task_get_summary.return_value,
+                         api.Task.get_summary("task_uuid"))
+        mock_task_get_summary.assert_called_once_with("task_uuid")
+
     @mock.patch("rally.api.objects.Task")
     def test_get_detailed(self, mock_task):
         mock_task.get_detailed.return_value = "detailed_task_data"
         self.assertEqual("detailed_task_data",
                          api.Task.get_detailed("task_uuid"))
-        mock_task.get_detailed.assert_called_once_with("task_uuid")
+        mock_task.get_detailed.assert_called_once_with(
+            "task_uuid", load_iterations=True)
 
     @mock.patch("rally.api.objects.Task")
     def test_get_detailed_with_extended_results(self, mock_task):
@@ -272,8 +368,10 @@ class TaskAPITestCase(test.TestCase):
         self.assertEqual({"uuid": "foo_uuid", "results": "extended_results"},
                          api.Task.get_detailed("foo_uuid",
                                                extended_results=True))
-        mock_task.get_detailed.assert_called_once_with("foo_uuid")
-        mock_task.extend_results.assert_called_once_with("raw_results")
+        mock_task.get_detailed.assert_called_once_with(
+            "foo_uuid", load_iterations=False)
+        mock_task.extend_results.assert_called_once_with(
+            "raw_results", iterations_loaded=False)
 
 
 class BaseDeploymentTestCase(test.TestCase):